@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""Benchmark: a mention raid against DiscordChannel with and without scheduling limits.
+
+Feeds fake Discord messages to DiscordChannel._on_message: many raiders
+each sending a mention every 100ms, plus one regular user asking a question
+50ms after each answer (asked sooner, it would join the previous turn).
+Coalescing is off, so every mention reaches the scheduler. The agent
+callback calls a fake provider that takes a fixed time per request plus a
+little per request already in flight, roughly like an upstream that slows
+down under load. Reports the peak number of
+concurrent LLM calls, the regular user's reply latency and how many raid
+messages got the busy reply.
+
+Usage:
+    uv run python scripts/bench_agent_scheduler.py
+"""
+
+import asyncio
+import itertools
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from tokamak.agent.scheduler import AgentScheduler  # noqa: E402
+from tokamak.bus import MessageBus  # noqa: E402
+from tokamak.channels.discord import DiscordChannel  # noqa: E402
+from tokamak.config.schema import DiscordConfig  # noqa: E402
+from tokamak.session import SessionManager  # noqa: E402
+
+RAIDERS = 50
+MESSAGES_PER_RAIDER = 10
+RAID_INTERVAL = 0.1
+REGULAR_QUESTIONS = 20
+BASE_LATENCY = 0.05
+LATENCY_PER_INFLIGHT = 0.002
+
+
+class FakeProvider:
+    """Provider stand-in whose latency grows with concurrent requests."""
+
+    def __init__(self):
+        self.inflight = 0
+        self.peak = 0
+        self.calls = 0
+
+    async def chat(self) -> str:
+        self.inflight += 1
+        self.calls += 1
+        self.peak = max(self.peak, self.inflight)
+        try:
+            await asyncio.sleep(BASE_LATENCY + LATENCY_PER_INFLIGHT * self.inflight)
+            return "answer"
+        finally:
+            self.inflight -= 1
+
+
+def fake_message(message_id: int, user_id: int, guild_id: int, replied: dict[int, float]):
+    message = MagicMock()
+    message.id = message_id
+    message.content = f"question {message_id}"
+    message.author.id = user_id
+    message.author.display_name = f"user{user_id}"
+    message.guild.id = guild_id
+    message.channel.id = 10
+
+    async def reply(content):
+        replied.setdefault(message_id, time.perf_counter())
+        return MagicMock(edit=AsyncMock(), delete=AsyncMock())
+
+    message.reply = reply
+    message.channel.send = AsyncMock(return_value=MagicMock())
+    return message
+
+
+async def run(scheduler: AgentScheduler) -> dict:
+    provider = FakeProvider()
+
+    async def on_message(session, content, **kwargs) -> str:
+        return await provider.chat()
+
+    channel = DiscordChannel(
+        config=DiscordConfig(token="bench", coalesce_window_seconds=0),
+        bus=MessageBus(),
+        session_manager=SessionManager(),
+        on_message_callback=on_message,
+        scheduler=scheduler,
+    )
+    channel._running = True
+    channel._is_bot_mentioned = lambda message: True
+
+    replied: dict[int, float] = {}
+    sent_at: dict[int, float] = {}
+    handlers: list[asyncio.Task] = []
+
+    def deliver(message_id: int, user_id: int, guild_id: int) -> None:
+        sent_at[message_id] = time.perf_counter()
+        message = fake_message(message_id, user_id, guild_id, replied)
+        # discord.py runs every event handler as its own task
+        handlers.append(asyncio.create_task(channel._on_message(message)))
+
+    ids = itertools.count(1)
+    regular_ids: list[int] = []
+
+    async def raid() -> None:
+        for _ in range(MESSAGES_PER_RAIDER):
+            for raider in range(RAIDERS):
+                deliver(next(ids), 1000 + raider, guild_id=2)
+            await asyncio.sleep(RAID_INTERVAL)
+
+    async def regular() -> None:
+        for _ in range(REGULAR_QUESTIONS):
+            message_id = next(ids)
+            regular_ids.append(message_id)
+            deliver(message_id, 1, guild_id=1)
+            while message_id not in replied:
+                await asyncio.sleep(0.005)
+            await asyncio.sleep(0.05)
+
+    await asyncio.gather(raid(), regular())
+    await asyncio.gather(*handlers)
+    # Turns stay pending until their reply is sent, after the scheduler slot frees
+    while scheduler.running or scheduler.queued or channel._pending_turns:
+        await asyncio.sleep(0.01)
+
+    latencies = sorted(replied[i] - sent_at[i] for i in regular_ids if i in replied)
+    return {
+        "peak": provider.peak,
+        "calls": provider.calls,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "shed": scheduler.shed,
+    }
+
+
+async def main() -> None:
+    logger.remove()
+    cases = {
+        "unbounded": AgentScheduler(max_concurrency=10_000, max_queue=10_000, max_user_queue=100),
+        "default": AgentScheduler(),
+    }
+    header = (
+        f"{'scheduler':>10} {'peak LLM':>9} {'LLM calls':>10} {'shed':>5} "
+        f"{'regular p50 ms':>15} {'regular p95 ms':>15}"
+    )
+    print(header)
+    print("-" * len(header))
+    for name, scheduler in cases.items():
+        r = await run(scheduler)
+        print(
+            f"{name:>10} {r['peak']:>9} {r['calls']:>10} {r['shed']:>5} "
+            f"{r['p50'] * 1000:>15.0f} {r['p95'] * 1000:>15.0f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
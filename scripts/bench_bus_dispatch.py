@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""Benchmark: outbound dispatch throughput across concurrent destinations.
+
+Publishes the same number of messages per destination to a MessageBus whose
+subscriber simulates a send taking a fixed time, and measures how long it
+takes to deliver everything. With per-destination workers, the time should
+stay close to one destination's worth of sends as destinations are added;
+dispatch_concurrency=1 shows the old serial behaviour for comparison.
+
+Usage:
+    uv run python scripts/bench_bus_dispatch.py
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tokamak.bus import MessageBus, OutboundMessage  # noqa: E402
+
+SEND_SECONDS = 0.01
+MESSAGES_PER_DESTINATION = 20
+
+
+async def run(destinations: int, concurrency: int) -> float:
+    bus = MessageBus(dispatch_concurrency=concurrency)
+    done = asyncio.Event()
+    total = destinations * MESSAGES_PER_DESTINATION
+    delivered = 0
+
+    async def send(msg: OutboundMessage) -> None:
+        nonlocal delivered
+        await asyncio.sleep(SEND_SECONDS)
+        delivered += 1
+        if delivered == total:
+            done.set()
+
+    bus.subscribe_outbound("discord", send)
+    dispatcher = asyncio.create_task(bus.dispatch_outbound())
+    start = time.perf_counter()
+    for i in range(MESSAGES_PER_DESTINATION):
+        for chat in range(destinations):
+            await bus.publish_outbound(
+                OutboundMessage(channel="discord", chat_id=str(chat), content=str(i))
+            )
+    await done.wait()
+    elapsed = time.perf_counter() - start
+    bus.stop()
+    await dispatcher
+    return elapsed
+
+
+async def main() -> None:
+    header = f"{'destinations':>12} {'serial s':>9} {'pooled s':>9} {'msgs/s':>9} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for destinations in (1, 2, 4, 8, 16):
+        serial = await run(destinations, concurrency=1)
+        pooled = await run(destinations, concurrency=16)
+        rate = destinations * MESSAGES_PER_DESTINATION / pooled
+        print(
+            f"{destinations:>12} {serial:>9.3f} {pooled:>9.3f} {rate:>9.0f} "
+            f"{serial / pooled:>7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
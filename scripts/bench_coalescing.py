@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Benchmark: LLM calls per conversation with and without message coalescing.
+
+Simulated users ask questions as bursts of 1-4 Discord messages with short
+typing gaps between them, then wait for the answer before the next
+question. Each message goes through DiscordChannel._on_message with a fake
+agent whose answer takes a fixed time. Timings are scaled down 10x from
+real life (typing gaps of 0.2-0.8s, 2s answers, a 1.5s window).
+
+Usage:
+    uv run python scripts/bench_coalescing.py
+"""
+
+import asyncio
+import random
+import sys
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from tokamak.agent.scheduler import AgentScheduler  # noqa: E402
+from tokamak.bus import MessageBus  # noqa: E402
+from tokamak.channels.discord import DiscordChannel  # noqa: E402
+from tokamak.config.schema import DiscordConfig  # noqa: E402
+from tokamak.session import SessionManager  # noqa: E402
+
+SCALE = 0.1
+USERS = 20
+QUESTIONS_PER_USER = 5
+ANSWER_SECONDS = 2.0 * SCALE
+
+
+class FakeAgent:
+    def __init__(self):
+        self.calls = 0
+        self.answers = 0
+
+    async def __call__(self, session, content, **kwargs) -> str:
+        self.calls += 1
+        await asyncio.sleep(ANSWER_SECONDS)
+        self.answers += 1
+        return "answer"
+
+
+def fake_message(message_id: int, user_id: int, answered: asyncio.Event):
+    message = MagicMock()
+    message.id = message_id
+    message.content = f"part {message_id}"
+    message.author.id = user_id
+    message.author.display_name = f"user{user_id}"
+    message.guild.id = 1
+    message.channel.id = 10
+
+    async def reply(content):
+        answered.set()
+        return MagicMock(edit=AsyncMock(), delete=AsyncMock())
+
+    message.reply = reply
+    message.channel.send = AsyncMock(return_value=MagicMock())
+    return message
+
+
+async def user(channel: DiscordChannel, user_id: int, rng: random.Random, ids) -> None:
+    for _ in range(QUESTIONS_PER_USER):
+        answered = asyncio.Event()
+        for part in range(rng.randint(1, 4)):
+            if part:
+                await asyncio.sleep(rng.uniform(0.2, 0.8) * SCALE)
+            await channel._on_message(fake_message(next(ids), user_id, answered))
+        await asyncio.wait_for(answered.wait(), timeout=30)
+        # Reads the answer before asking again
+        await asyncio.sleep(rng.uniform(1.0, 3.0) * SCALE)
+
+
+async def run(window: float, cancel: bool) -> FakeAgent:
+    agent = FakeAgent()
+    channel = DiscordChannel(
+        config=DiscordConfig(
+            token="bench", coalesce_window_seconds=window, cancel_superseded_runs=cancel
+        ),
+        bus=MessageBus(),
+        session_manager=SessionManager(),
+        on_message_callback=agent,
+        scheduler=AgentScheduler(max_concurrency=USERS, max_user_queue=10),
+    )
+    channel._running = True
+    channel._is_bot_mentioned = lambda message: True
+
+    rng = random.Random(7)
+    ids = iter(range(1, 1_000_000))
+    await asyncio.gather(*(user(channel, 100 + i, rng, ids) for i in range(USERS)))
+    while channel.scheduler.running or channel.scheduler.queued or channel._pending_turns:
+        await asyncio.sleep(0.01)
+    return agent
+
+
+async def main() -> None:
+    logger.remove()
+    conversations = USERS * QUESTIONS_PER_USER
+    cases = {
+        "per message": (0.0, False),
+        "restart only": (0.0, True),
+        "window 1.5s": (1.5 * SCALE, False),
+        "window + restart": (1.5 * SCALE, True),
+    }
+    header = f"{'mode':>17} {'LLM calls':>10} {'answers':>8} {'calls/question':>15}"
+    print(header)
+    print("-" * len(header))
+    for name, (window, cancel) in cases.items():
+        agent = await run(window, cancel)
+        print(
+            f"{name:>17} {agent.calls:>10} {agent.answers:>8} {agent.calls / conversations:>15.2f}"
+        )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Benchmark: reply latency with moderation inline vs. in the background pipeline.
+
+Users send questions to DiscordChannel._on_message while a fake toxicity
+detector takes a fixed time per check. "inline" awaits the detector before
+handing the message to the channel, as the handler used to; "pipeline"
+lets the channel queue the check on ModerationPipeline. Reports reply
+latency from message arrival and how many messages were checked.
+
+Usage:
+    uv run python scripts/bench_moderation_pipeline.py
+"""
+
+import asyncio
+import statistics
+import sys
+import time
+from pathlib import Path
+from unittest.mock import AsyncMock, MagicMock
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from loguru import logger  # noqa: E402
+
+from tokamak.agent.scheduler import AgentScheduler  # noqa: E402
+from tokamak.bus import MessageBus  # noqa: E402
+from tokamak.channels.discord import DiscordChannel  # noqa: E402
+from tokamak.config.schema import DiscordConfig  # noqa: E402
+from tokamak.moderation import ModerationPipeline, ModerationResult  # noqa: E402
+from tokamak.session import SessionManager  # noqa: E402
+
+USERS = 20
+QUESTIONS_PER_USER = 5
+MODERATION_SECONDS = 0.4
+ANSWER_SECONDS = 0.2
+
+
+class FakeDetector:
+    def __init__(self):
+        self.checked = 0
+
+    async def detect(self, message: str) -> ModerationResult:
+        await asyncio.sleep(MODERATION_SECONDS)
+        self.checked += 1
+        return ModerationResult(is_toxic=False)
+
+
+async def agent(session, content, **kwargs) -> str:
+    await asyncio.sleep(ANSWER_SECONDS)
+    return "answer"
+
+
+def fake_message(message_id: int, user_id: int, replied: asyncio.Event):
+    message = MagicMock()
+    message.id = message_id
+    message.content = f"question {message_id}"
+    message.author.id = user_id
+    message.author.display_name = f"user{user_id}"
+    message.guild.id = 1
+    message.channel.id = 10
+
+    async def reply(content):
+        replied.set()
+        return MagicMock(edit=AsyncMock(), delete=AsyncMock())
+
+    message.reply = reply
+    message.channel.send = AsyncMock(return_value=MagicMock())
+    return message
+
+
+async def run(inline: bool) -> dict:
+    detector = FakeDetector()
+    pipeline = None if inline else ModerationPipeline(detector, workers=USERS)
+    channel = DiscordChannel(
+        config=DiscordConfig(token="bench", coalesce_window_seconds=0),
+        bus=MessageBus(),
+        session_manager=SessionManager(),
+        on_message_callback=agent,
+        moderation=pipeline,
+        scheduler=AgentScheduler(max_concurrency=USERS),
+    )
+    channel._running = True
+    channel._is_bot_mentioned = lambda message: True
+    latencies: list[float] = []
+
+    async def user(user_id: int, ids) -> None:
+        for _ in range(QUESTIONS_PER_USER):
+            replied = asyncio.Event()
+            message = fake_message(next(ids), user_id, replied)
+            started = time.perf_counter()
+            if inline:
+                await detector.detect(message.content)
+            await channel._on_message(message)
+            await replied.wait()
+            latencies.append(time.perf_counter() - started)
+
+    ids = iter(range(1, 1_000_000))
+    await asyncio.gather(*(user(100 + i, ids) for i in range(USERS)))
+    if pipeline:
+        await pipeline.join()
+        await pipeline.close()
+    latencies.sort()
+    return {
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "checked": detector.checked,
+    }
+
+
+async def main() -> None:
+    logger.remove()
+    header = f"{'moderation':>10} {'reply p50 ms':>13} {'reply p95 ms':>13} {'checked':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, inline in (("inline", True), ("pipeline", False)):
+        r = await run(inline)
+        print(f"{name:>10} {r['p50'] * 1000:>13.0f} {r['p95'] * 1000:>13.0f} {r['checked']:>8}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
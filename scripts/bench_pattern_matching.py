@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-keyword substring scan vs. Aho-Corasick matcher.
+
+Generates synthetic answer patterns (mixed Korean/English keywords) at
+increasing library sizes and times one lookup per user message with the
+previous ``any(kw in message_lower ...)`` loop and with KeywordMatcher.
+
+Usage:
+    uv run python scripts/bench_pattern_matching.py
+"""
+
+import random
+import sys
+import time
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tokamak.utils.keywords import KeywordMatcher  # noqa: E402
+
+SIZES = (10, 100, 1000, 5000, 20000)
+KEYWORDS_PER_PATTERN = 6
+SYLLABLES = "가나다라마바사아자차카타파하토카막스테이킹보상거래소지갑브리지롤업"
+LETTERS = "abcdefghijklmnopqrstuvwxyz"
+MESSAGES = [
+    "토카막 네트워크 스테이킹 보상은 언제 들어오나요? 어제 TON을 예치했는데 아직 안 보여요.",
+    "How do I bridge WTON from L1 to the Rollup Hub testnet and what are the fees?",
+    "오늘 날씨 어때요?",
+]
+
+
+def synthetic_groups(count: int, rng: random.Random) -> list[list[str]]:
+    groups = []
+    for _ in range(count):
+        keywords = []
+        for _ in range(KEYWORDS_PER_PATTERN):
+            if rng.random() < 0.5:
+                keywords.append("".join(rng.choices(SYLLABLES, k=rng.randint(2, 4))))
+            else:
+                keywords.append("".join(rng.choices(LETTERS, k=rng.randint(4, 9))))
+        groups.append(keywords)
+    return groups
+
+
+def naive_match(groups: list[list[str]], message: str) -> list[int]:
+    message_lower = message.lower()
+    return [i for i, keywords in enumerate(groups) if any(kw in message_lower for kw in keywords)]
+
+
+def per_call_us(stmt, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    rng = random.Random(42)
+    header = (
+        f"{'patterns':>9} {'keywords':>9} {'build ms':>9} {'states':>8} "
+        f"{'scan µs':>10} {'automaton µs':>13} {'speedup':>8}"
+    )
+    print(f"{len(MESSAGES)} messages per lookup round, {KEYWORDS_PER_PATTERN} keywords/pattern\n")
+    print(header)
+    print("-" * len(header))
+    for size in SIZES:
+        groups = synthetic_groups(size, rng)
+        start = time.perf_counter()
+        matcher = KeywordMatcher(groups)
+        build_ms = (time.perf_counter() - start) * 1000
+        number = max(10, 20000 // size)
+
+        naive_us = per_call_us(lambda: [naive_match(groups, m) for m in MESSAGES], number)
+        matcher_us = per_call_us(lambda: [matcher.match(m) for m in MESSAGES], number)
+        print(
+            f"{size:9} {matcher.keyword_count:9} {build_ms:9.1f} {matcher.state_count:8} "
+            f"{naive_us:10.1f} {matcher_us:13.1f} {naive_us / matcher_us:7.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Microbenchmark: dict-list session history vs. slotted ring buffer.
+
+Compares the previous Session storage (a list of dicts with ISO timestamps,
+re-sliced on overflow, rebuilt on every get_history) with the current one.
+
+Usage:
+    uv run python scripts/bench_session_messages.py
+"""
+
+import sys
+import timeit
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tokamak.session import Session  # noqa: E402
+
+MAX_MESSAGES = 100
+HISTORY = 20
+SAMPLE = [
+    ("user", "스테이킹 보상은 언제 들어오나요? 어제 TON을 예치했는데 아직 안 보여요."),
+    ("assistant", "스테이킹 보상은 보통 다음 커밋 이후에 반영돼요. 조금만 기다려 주세요!"),
+]
+
+
+class LegacySession:
+    """The previous list-of-dicts implementation, kept here for comparison."""
+
+    def __init__(self, max_messages: int = MAX_MESSAGES):
+        self.messages: list[dict[str, Any]] = []
+        self.max_messages = max_messages
+        self.updated_at = datetime.now()
+
+    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
+        msg = {"role": role, "content": content, "timestamp": datetime.now().isoformat(), **kwargs}
+        self.messages.append(msg)
+        self.updated_at = datetime.now()
+        if len(self.messages) > self.max_messages:
+            self.messages = self.messages[-self.max_messages :]
+
+    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+        recent = (
+            self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
+        )
+        return [{"role": m["role"], "content": m["content"]} for m in recent]
+
+
+def fill(session: Any) -> None:
+    for i in range(MAX_MESSAGES):
+        role, content = SAMPLE[i % 2]
+        # Fresh string per message, like text arriving from Discord
+        session.add_message(role, content + f" #{i}", author_name="tester", message_id=str(i))
+
+
+def session_memory(factory: Any, sessions: int = 200) -> float:
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    held = []
+    for _ in range(sessions):
+        session = factory()
+        fill(session)
+        held.append(session)
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    total = sum(stat.size_diff for stat in after.compare_to(before, "filename"))
+    return total / sessions
+
+
+def per_call_us(stmt: Any, number: int) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def bench(name: str, factory: Any) -> dict[str, float]:
+    full = factory()
+    fill(full)
+    role, content = SAMPLE[0]
+    return {
+        "name": name,
+        "memory_kb": session_memory(factory) / 1024,
+        "append_us": per_call_us(lambda: full.add_message(role, content), 20000),
+        "history_us": per_call_us(lambda: full.get_history(max_messages=HISTORY), 20000),
+        "history_iter_us": per_call_us(
+            lambda: [m["content"] for m in full.get_history(max_messages=HISTORY)], 20000
+        ),
+    }
+
+
+def main() -> None:
+    rows = [
+        bench("before (dict list)", LegacySession),
+        bench("after (ring buffer)", lambda: Session(key="bench", max_messages=MAX_MESSAGES)),
+    ]
+    print(f"{MAX_MESSAGES} messages per session, history window {HISTORY}\n")
+    header = (
+        f"{'':22} {'KiB/session':>12} {'append µs':>10} {'history µs':>11} {'hist+iter µs':>13}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        print(
+            f"{r['name']:22} {r['memory_kb']:12.1f} {r['append_us']:10.2f} "
+            f"{r['history_us']:11.2f} {r['history_iter_us']:13.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Microbenchmark: per-character loops vs. tokamak.utils.text script detection.
+
+Times Hangul detection (the loop AgentLoop used before) and Korean/English
+ratio counting on short and long messages, English-only and mixed, since an
+English answer is the worst case for the loop: it has to scan every char.
+
+Usage:
+    uv run python scripts/bench_text_utils.py
+"""
+
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tokamak.utils.text import contains_hangul, script_stats  # noqa: E402
+
+ENGLISH = "Tokamak Network is an on-demand L2 platform. Stake TON to earn seigniorage! "
+MIXED = "토카막 네트워크는 온디맨드 L2 플랫폼이에요. TON을 스테이킹하면 시뇨리지를 받아요 🚀 "
+MESSAGES = {
+    "english short": ENGLISH,
+    "english 4KB": ENGLISH * 55,
+    "mixed short": MIXED,
+    "mixed 4KB": MIXED * 45,
+}
+
+
+def loop_contains_hangul(text: str) -> bool:
+    for char in text:
+        if "가" <= char <= "힯":
+            return True
+        if "ㄱ" <= char <= "ㆎ":
+            return True
+    return False
+
+
+def loop_script_stats(text: str) -> tuple[int, int, int, int]:
+    hangul = latin = digits = other = 0
+    for char in text:
+        if "가" <= char <= "힯" or "ㄱ" <= char <= "ㆎ":
+            hangul += 1
+        elif char.isascii() and char.isalpha():
+            latin += 1
+        elif char.isdigit():
+            digits += 1
+        elif not char.isspace():
+            other += 1
+    return hangul, latin, digits, other
+
+
+def per_call_us(stmt, number: int = 2000) -> float:
+    return min(timeit.repeat(stmt, number=number, repeat=5)) / number * 1e6
+
+
+def main() -> None:
+    header = f"{'message':>14} {'chars':>6} {'':>8} {'loop µs':>9} {'fast µs':>9} {'speedup':>8}"
+    print(header)
+    print("-" * len(header))
+    for name, text in MESSAGES.items():
+        for label, slow, fast in (
+            ("hangul", loop_contains_hangul, contains_hangul),
+            ("stats", loop_script_stats, script_stats),
+        ):
+            slow_us = per_call_us(lambda: slow(text))
+            fast_us = per_call_us(lambda: fast(text))
+            print(
+                f"{name:>14} {len(text):6} {label:>8} {slow_us:9.2f} {fast_us:9.2f} "
+                f"{slow_us / fast_us:7.1f}x"
+            )
+
+
+if __name__ == "__main__":
+    main()
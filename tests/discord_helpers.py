@@ -0,0 +1,79 @@
+"""Fake Discord messages and a DiscordChannel wired for tests."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+from tokamak.agent.scheduler import AgentScheduler
+from tokamak.bus import MessageBus
+from tokamak.channels.discord import DiscordChannel
+from tokamak.config.schema import DiscordConfig
+from tokamak.moderation import ModerationPipeline
+from tokamak.session import SessionManager
+
+
+def make_message(
+    message_id: int, content: str | None = None, user_id: int = 1, guild_id: int = 1
+) -> MagicMock:
+    """
+    Build a mention as discord.py would deliver it.
+
+    ``message.reply`` returns the same posted-reply mock every time, so tests
+    can check edits and deletes through ``message.reply.return_value``.
+    """
+    message = MagicMock()
+    message.id = message_id
+    message.content = content if content is not None else f"question {message_id}"
+    message.author.id = user_id
+    message.author.display_name = f"user{user_id}"
+    message.guild.id = guild_id
+    message.channel.id = 10
+    message.reply = AsyncMock(return_value=MagicMock(edit=AsyncMock(), delete=AsyncMock()))
+    message.channel.send = AsyncMock(return_value=MagicMock())
+    return message
+
+
+def make_channel(
+    callback,
+    scheduler: AgentScheduler | None = None,
+    moderation: ModerationPipeline | None = None,
+    on_toxic_content=None,
+    **config,
+) -> DiscordChannel:
+    """
+    Build a running channel that treats every message as a mention.
+
+    Args:
+        callback: Agent callback answering each turn.
+        scheduler: Scheduler for agent runs; a default one if None.
+        moderation: Optional background moderation pipeline.
+        on_toxic_content: Called for flagged messages.
+        **config: DiscordConfig overrides; coalescing is off unless given.
+    """
+    config.setdefault("coalesce_window_seconds", 0)
+    channel = DiscordChannel(
+        config=DiscordConfig(token="x", **config),
+        bus=MessageBus(),
+        session_manager=SessionManager(),
+        on_message_callback=callback,
+        on_toxic_content=on_toxic_content,
+        moderation=moderation,
+        scheduler=scheduler,
+    )
+    channel._running = True
+    channel._is_bot_mentioned = lambda message: True
+    return channel
+
+
+async def idle(channel: DiscordChannel) -> None:
+    """Wait until moderation, pending turns and agent runs have all finished."""
+    if channel.moderation:
+        await channel.moderation.join()
+    for _ in range(200):
+        if (
+            not channel._pending_turns
+            and not channel.scheduler.running
+            and not channel.scheduler.queued
+        ):
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("channel did not become idle")
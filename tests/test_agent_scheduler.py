@@ -0,0 +1,173 @@
+"""Tests for the agent run scheduler and its use in the Discord channel."""
+
+import asyncio
+
+import pytest
+
+from tests.discord_helpers import make_channel, make_message
+from tokamak.agent.scheduler import AgentScheduler
+from tokamak.channels.discord import BUSY_REPLY
+
+
+class Gate:
+    """Jobs that record their start and wait until released."""
+
+    def __init__(self):
+        self.started: list[str] = []
+        self.running = 0
+        self.max_running = 0
+        self.release = asyncio.Event()
+
+    def job(self, name: str):
+        async def run() -> None:
+            self.started.append(name)
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+            try:
+                await self.release.wait()
+            finally:
+                self.running -= 1
+
+        return run
+
+
+async def settle() -> None:
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+class TestAgentScheduler:
+    """Tests for concurrency, ordering, fairness and shedding."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self):
+        scheduler = AgentScheduler(max_concurrency=2)
+        gate = Gate()
+        for i in range(5):
+            assert scheduler.submit(f"u{i}", "g", gate.job(str(i)))
+        await settle()
+        assert scheduler.running == 2
+        assert scheduler.queued == 3
+
+        gate.release.set()
+        await settle()
+        assert gate.max_running == 2
+        assert scheduler.completed == 5
+
+    @pytest.mark.asyncio
+    async def test_user_jobs_run_in_order_one_at_a_time(self):
+        scheduler = AgentScheduler(max_concurrency=4, max_user_queue=5)
+        order: list[int] = []
+        running = 0
+
+        def job(i: int):
+            async def run() -> None:
+                nonlocal running
+                running += 1
+                assert running == 1
+                await asyncio.sleep(0.001)
+                order.append(i)
+                running -= 1
+
+            return run
+
+        for i in range(4):
+            scheduler.submit("u", "g", job(i))
+        await asyncio.sleep(0.05)
+        assert order == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_round_robin_across_users_and_groups(self):
+        scheduler = AgentScheduler(max_concurrency=1, max_user_queue=10)
+        gate = Gate()
+        scheduler.submit("blocker", "g0", gate.job("blocker"))
+        for i in range(3):
+            scheduler.submit("raider", "g1", gate.job(f"raider{i}"))
+        scheduler.submit("other", "g1", gate.job("other"))
+        scheduler.submit("elsewhere", "g2", gate.job("elsewhere"))
+
+        gate.release.set()
+        await settle()
+        assert gate.started.index("other") < gate.started.index("raider1")
+        assert gate.started.index("elsewhere") < gate.started.index("raider1")
+
+    @pytest.mark.asyncio
+    async def test_sheds_when_queue_is_full(self):
+        scheduler = AgentScheduler(max_concurrency=1, max_queue=2, max_user_queue=5)
+        gate = Gate()
+        assert scheduler.submit("a", "g", gate.job("a"))
+        await settle()
+        assert scheduler.submit("b", "g", gate.job("b"))
+        assert scheduler.submit("c", "g", gate.job("c"))
+        assert not scheduler.submit("d", "g", gate.job("d"))
+        assert scheduler.stats()["shed"] == 1
+        await scheduler.close()
+
+    @pytest.mark.asyncio
+    async def test_sheds_per_user(self):
+        scheduler = AgentScheduler(max_concurrency=1, max_user_queue=1)
+        gate = Gate()
+        scheduler.submit("blocker", "g", gate.job("blocker"))
+        await settle()
+        assert scheduler.submit("a", "g", gate.job("a1"))
+        assert not scheduler.submit("a", "g", gate.job("a2"))
+        assert scheduler.submit("b", "g", gate.job("b1"))
+        await scheduler.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_job_frees_its_slot(self):
+        scheduler = AgentScheduler(max_concurrency=1)
+
+        async def broken() -> None:
+            raise RuntimeError("boom")
+
+        done = asyncio.Event()
+
+        async def ok() -> None:
+            done.set()
+
+        scheduler.submit("a", "g", broken)
+        scheduler.submit("b", "g", ok)
+        await asyncio.wait_for(done.wait(), timeout=1.0)
+        assert scheduler.failed == 1
+
+
+class TestDiscordScheduling:
+    """Tests for agent runs going through the scheduler."""
+
+    @pytest.mark.asyncio
+    async def test_replies_are_scheduled_and_busy_reply_when_full(self):
+        release = asyncio.Event()
+
+        async def callback(session, content, **kwargs) -> str:
+            await release.wait()
+            return "answer"
+
+        scheduler = AgentScheduler(max_concurrency=1, max_queue=1)
+        channel = make_channel(callback, scheduler)
+        first, second, third = (make_message(i, user_id=i) for i in (1, 2, 3))
+
+        await channel._on_message(first)
+        await channel._on_message(second)
+        await channel._on_message(third)
+        await settle()
+        assert scheduler.running == 1 and scheduler.queued == 1
+        third.reply.assert_awaited_once_with(BUSY_REPLY)
+
+        release.set()
+        await asyncio.sleep(0.01)
+        first.reply.assert_awaited_once_with("answer")
+        second.reply.assert_awaited_once_with("answer")
+
+    @pytest.mark.asyncio
+    async def test_handler_returns_before_the_agent_finishes(self):
+        release = asyncio.Event()
+
+        async def callback(session, content, **kwargs) -> str:
+            await release.wait()
+            return "answer"
+
+        channel = make_channel(callback)
+        await asyncio.wait_for(channel._on_message(make_message(1)), timeout=0.1)
+        release.set()
+        await channel.scheduler.close()
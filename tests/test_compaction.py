@@ -0,0 +1,129 @@
+"""Tests for incremental conversation compaction."""
+
+import asyncio
+from functools import partial
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tokamak.agent.compaction import SessionCompactor
+from tokamak.agent.loop import AgentLoop
+from tokamak.providers import LLMProvider, LLMResponse
+from tokamak.session import Session, SessionManager, SQLiteSessionStore
+
+
+def make_provider(*summaries: str) -> AsyncMock:
+    provider = AsyncMock()
+    provider.chat.side_effect = [LLMResponse(content=s) for s in summaries]
+    return provider
+
+
+def fill(session: Session, count: int, start: int = 0) -> None:
+    for i in range(start, start + count):
+        session.add_message("user" if i % 2 == 0 else "assistant", f"turn {i} " + "x" * 200)
+
+
+class TestSessionCompactor:
+    """Tests for when and what gets summarized."""
+
+    @pytest.mark.asyncio
+    async def test_folds_all_but_recent(self):
+        session = Session(key="t")
+        fill(session, 10)
+        compactor = SessionCompactor(make_provider("summary one"), keep_recent_messages=4)
+
+        assert await compactor.compact(session)
+
+        assert session.summary == "summary one"
+        history = session.get_history(max_messages=20)
+        assert [m["content"].split(" ")[1] for m in history] == ["6", "7", "8", "9"]
+
+    @pytest.mark.asyncio
+    async def test_incremental_pass_only_sends_new_turns(self):
+        session = Session(key="t")
+        fill(session, 10)
+        provider = make_provider("summary one", "summary two")
+        compactor = SessionCompactor(provider, keep_recent_messages=4)
+        await compactor.compact(session)
+
+        fill(session, 4, start=10)
+        await compactor.compact(session)
+
+        prompt = provider.chat.call_args.kwargs["messages"][0]["content"]
+        assert "summary one" in prompt
+        assert "turn 5 " not in prompt
+        assert "turn 6 " in prompt and "turn 9 " in prompt
+        assert "turn 10 " not in prompt
+        assert session.summary == "summary two"
+        assert compactor.stats()["compactions"] == 2
+
+    def test_trigger_threshold(self):
+        session = Session(key="t")
+        fill(session, 10)
+        compactor = SessionCompactor(AsyncMock(), trigger_tokens=100_000)
+
+        assert not compactor.needs_compaction(session)
+        compactor.trigger_tokens = 100
+        assert compactor.needs_compaction(session)
+
+    @pytest.mark.asyncio
+    async def test_failed_summary_leaves_session_unchanged(self):
+        session = Session(key="t")
+        fill(session, 10)
+        provider = AsyncMock()
+        provider.chat.return_value = LLMResponse(content="boom", finish_reason="error")
+        compactor = SessionCompactor(provider, keep_recent_messages=4)
+
+        assert not await compactor.compact(session)
+        assert session.summary == ""
+        assert len(session.get_history(max_messages=20)) == 10
+
+    @pytest.mark.asyncio
+    async def test_schedule_runs_once_per_session(self):
+        session = Session(key="t")
+        fill(session, 10)
+        provider = make_provider("summary")
+        compactor = SessionCompactor(provider, trigger_tokens=100, keep_recent_messages=4)
+
+        compactor.schedule(session)
+        compactor.schedule(session)
+        await asyncio.sleep(0)
+        await asyncio.sleep(0)
+
+        assert provider.chat.call_count == 1
+        assert session.summary == "summary"
+
+
+class TestSummaryInPrompt:
+    """Tests for sending summary plus recent turns."""
+
+    def test_summary_added_to_system_prompt(self):
+        session = Session(key="t")
+        fill(session, 6)
+        session.apply_summary("user asked about staking", until=session.messages[3].timestamp)
+        provider = AsyncMock(spec=LLMProvider)
+        provider.format_system_content.side_effect = partial(
+            LLMProvider.format_system_content, None
+        )
+        agent = AgentLoop(provider=provider, system_prompt="base", enable_korean_review=False)
+
+        messages = agent._build_messages(session, "next question")
+
+        assert "user asked about staking" in messages[0]["content"]
+        assert len(messages) == 1 + 2 + 1
+
+    @pytest.mark.asyncio
+    async def test_summary_persisted(self, tmp_path):
+        manager = SessionManager(store=SQLiteSessionStore(tmp_path / "s.db"))
+        await manager.start()
+        session = manager.get_or_create("k")
+        fill(session, 4)
+        session.apply_summary("kept", until=session.messages[1].timestamp)
+        await manager.close()
+
+        restarted = SessionManager(store=SQLiteSessionStore(tmp_path / "s.db"))
+        await restarted.start()
+        loaded = restarted.get_or_create("k")
+        assert loaded.summary == "kept"
+        assert len(loaded.get_history()) == 2
+        await restarted.close()
@@ -0,0 +1,214 @@
+"""Tests for the cached async resolver and address pinning."""
+
+import asyncio
+import json
+import socket
+
+import httpcore
+import pytest
+
+from tokamak.agent.tools import WebFetchTool
+from tokamak.utils.dns import (
+    AsyncResolver,
+    PinnedNetworkBackend,
+    UnsafeAddressError,
+    is_public_ip,
+)
+
+
+class FakeResolver(AsyncResolver):
+    """Resolver answering from a fixed table instead of the network."""
+
+    def __init__(self, records: dict[str, list[str]], **kwargs):
+        super().__init__(**kwargs)
+        self.records = records
+        self.lookups: list[str] = []
+
+    async def _lookup(self, host: str) -> list[str]:
+        self.lookups.append(host)
+        await asyncio.sleep(0.01)
+        if host not in self.records:
+            raise socket.gaierror(socket.EAI_NONAME, host)
+        return self.records[host]
+
+
+class RecordingBackend(httpcore.AsyncNetworkBackend):
+    """Inner backend that records connection targets."""
+
+    def __init__(self, fail: set[str] | None = None):
+        self.targets: list[str] = []
+        self.fail = fail or set()
+
+    async def connect_tcp(self, host, port, timeout=None, local_address=None, socket_options=None):
+        self.targets.append(host)
+        if host in self.fail:
+            raise httpcore.ConnectError(f"refused {host}")
+        return object()
+
+    async def sleep(self, seconds):
+        await asyncio.sleep(seconds)
+
+
+class TestIsPublicIp:
+    """Tests for the address predicate."""
+
+    def test_rejects_internal_ranges(self):
+        for address in ("10.0.0.1", "127.0.0.1", "169.254.169.254", "0.0.0.0", "::1", "fe80::1"):
+            assert not is_public_ip(address), address
+
+    def test_rejects_ipv4_mapped_internal(self):
+        assert not is_public_ip("::ffff:127.0.0.1")
+
+    def test_accepts_public(self):
+        assert is_public_ip("93.184.216.34")
+        assert is_public_ip("2606:2800:220:1:248:1893:25c8:1946")
+
+
+class TestAsyncResolver:
+    """Tests for caching, negative caching and de-duplication."""
+
+    @pytest.mark.asyncio
+    async def test_cache_hit(self):
+        resolver = FakeResolver({"example.com": ["93.184.216.34"]})
+
+        assert await resolver.resolve("example.com") == ["93.184.216.34"]
+        assert await resolver.resolve("EXAMPLE.com.") == ["93.184.216.34"]
+
+        assert resolver.lookups == ["example.com"]
+        stats = resolver.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    @pytest.mark.asyncio
+    async def test_expired_entry_is_refreshed(self):
+        resolver = FakeResolver({"example.com": ["93.184.216.34"]}, ttl_seconds=0)
+
+        await resolver.resolve("example.com")
+        await resolver.resolve("example.com")
+
+        assert len(resolver.lookups) == 2
+
+    @pytest.mark.asyncio
+    async def test_negative_cache(self):
+        resolver = FakeResolver({})
+
+        for _ in range(2):
+            with pytest.raises(socket.gaierror):
+                await resolver.resolve("missing.example")
+
+        assert resolver.lookups == ["missing.example"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_lookups_share_query(self):
+        resolver = FakeResolver({"example.com": ["93.184.216.34"]})
+
+        results = await asyncio.gather(*(resolver.resolve("example.com") for _ in range(5)))
+
+        assert all(r == ["93.184.216.34"] for r in results)
+        assert resolver.lookups == ["example.com"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_lookup_does_not_strand_waiters(self):
+        resolver = FakeResolver({"example.com": ["93.184.216.34"]})
+
+        owner = asyncio.create_task(resolver.resolve("example.com"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(resolver.resolve("example.com"))
+        await asyncio.sleep(0)
+        owner.cancel()
+
+        assert await asyncio.wait_for(waiter, timeout=1.0) == ["93.184.216.34"]
+        assert owner.cancelled()
+        assert resolver.lookups == ["example.com", "example.com"]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_waiter_leaves_lookup_running(self):
+        resolver = FakeResolver({"example.com": ["93.184.216.34"]})
+
+        owner = asyncio.create_task(resolver.resolve("example.com"))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(resolver.resolve("example.com"))
+        await asyncio.sleep(0)
+        waiter.cancel()
+
+        assert await owner == ["93.184.216.34"]
+        assert waiter.cancelled()
+
+    @pytest.mark.asyncio
+    async def test_ip_literal_skips_lookup(self):
+        resolver = FakeResolver({})
+
+        assert await resolver.resolve("8.8.8.8") == ["8.8.8.8"]
+        assert resolver.lookups == []
+
+    @pytest.mark.asyncio
+    async def test_any_internal_record_is_unsafe(self):
+        resolver = FakeResolver({"mixed.example": ["93.184.216.34", "10.0.0.5"]})
+
+        with pytest.raises(UnsafeAddressError):
+            await resolver.resolve_public("mixed.example")
+
+    @pytest.mark.asyncio
+    async def test_max_entries(self):
+        resolver = FakeResolver(
+            {f"h{i}.example": ["93.184.216.34"] for i in range(3)}, max_entries=2
+        )
+
+        for i in range(3):
+            await resolver.resolve(f"h{i}.example")
+
+        assert resolver.stats()["entries"] == 2
+
+
+class TestPinnedNetworkBackend:
+    """Tests for connecting only to vetted addresses."""
+
+    @pytest.mark.asyncio
+    async def test_connects_to_vetted_ip(self):
+        inner = RecordingBackend()
+        backend = PinnedNetworkBackend(FakeResolver({"example.com": ["93.184.216.34"]}), inner)
+
+        await backend.connect_tcp("example.com", 443)
+
+        assert inner.targets == ["93.184.216.34"]
+
+    @pytest.mark.asyncio
+    async def test_refuses_internal_host(self):
+        inner = RecordingBackend()
+        backend = PinnedNetworkBackend(FakeResolver({"evil.example": ["127.0.0.1"]}), inner)
+
+        with pytest.raises(httpcore.ConnectError):
+            await backend.connect_tcp("evil.example", 80)
+
+        assert inner.targets == []
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_next_address(self):
+        inner = RecordingBackend(fail={"93.184.216.34"})
+        resolver = FakeResolver({"example.com": ["93.184.216.34", "93.184.216.35"]})
+        backend = PinnedNetworkBackend(resolver, inner)
+
+        await backend.connect_tcp("example.com", 443)
+
+        assert inner.targets == ["93.184.216.34", "93.184.216.35"]
+
+
+class TestWebToolSafety:
+    """Tests for the async URL safety check in web tools."""
+
+    @pytest.mark.asyncio
+    async def test_blocks_internal_hostname(self):
+        tool = WebFetchTool(resolver=FakeResolver({"intranet.example": ["192.168.1.10"]}))
+
+        result = json.loads(await tool.execute(url="http://intranet.example/admin"))
+
+        assert result["error"] == "Access to internal networks is not allowed"
+
+    @pytest.mark.asyncio
+    async def test_unresolvable_hostname(self):
+        tool = WebFetchTool(resolver=FakeResolver({}))
+
+        result = json.loads(await tool.execute(url="https://nowhere.example/"))
+
+        assert result["error"] == "Cannot resolve hostname: nowhere.example"
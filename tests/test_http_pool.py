@@ -0,0 +1,75 @@
+"""Tests for the shared HTTP client pool."""
+
+import asyncio
+
+import httpx
+import pytest
+
+from tokamak.config.schema import HttpConfig
+from tokamak.utils.dns import AsyncResolver, PinnedNetworkBackend
+from tokamak.utils.http import HttpClientPool, pinned_transport
+
+
+class InternalResolver(AsyncResolver):
+    """Resolver that maps every name to a loopback address."""
+
+    async def _lookup(self, host: str) -> list[str]:
+        return ["127.0.0.1"]
+
+
+class TestHttpClientPool:
+    """Tests for HttpClientPool lifecycle and per-host limits."""
+
+    @pytest.mark.asyncio
+    async def test_client_is_shared_until_closed(self):
+        pool = HttpClientPool()
+        await pool.start()
+        first = pool.client
+
+        async with pool.acquire("https://docs.tokamak.network/a") as client:
+            assert client is first
+
+        await pool.close()
+        assert first.is_closed
+        assert pool.client is not first
+        await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_per_host_limit(self):
+        pool = HttpClientPool(HttpConfig(max_connections_per_host=1))
+        active = 0
+        peak = 0
+
+        async def borrow(url: str) -> None:
+            nonlocal active, peak
+            async with pool.acquire(url):
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+
+        await asyncio.gather(*(borrow("https://discord.com/api/v10/x") for _ in range(3)))
+        assert peak == 1
+
+        peak = 0
+        await asyncio.gather(borrow("https://a.example/"), borrow("https://b.example/"))
+        assert peak == 2
+
+        assert pool._host_slots == {}
+        await pool.close()
+
+
+class TestPinnedTransport:
+    """Tests that connections really go through PinnedNetworkBackend."""
+
+    def test_backend_is_wrapped(self):
+        # Fails if an httpx/httpcore upgrade moves the private attributes we patch
+        transport = pinned_transport(AsyncResolver())
+        assert isinstance(transport._pool._network_backend, PinnedNetworkBackend)
+
+    @pytest.mark.asyncio
+    async def test_requests_to_internal_addresses_are_refused(self):
+        pool = HttpClientPool(resolver=InternalResolver())
+        with pytest.raises(httpx.ConnectError, match="non-public"):
+            await pool.client.get("http://intranet.example/")
+        await pool.close()
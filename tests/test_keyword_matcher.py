@@ -0,0 +1,87 @@
+"""Tests for the Aho-Corasick keyword matcher."""
+
+from tokamak.agent.prompts import ANSWER_PATTERNS, get_matching_patterns, match_pattern_ids
+from tokamak.utils.keywords import KeywordMatcher, keyword_variants, normalize_text
+
+
+class TestNormalization:
+    """Tests for text normalization and keyword variants."""
+
+    def test_normalize_folds_case_width_and_whitespace(self):
+        assert normalize_text("ＳＴＡＫＩＮＧ  Tokamak\tNetwork") == "staking tokamak network"
+
+    def test_normalize_drops_spaces_only_between_hangul(self):
+        assert normalize_text("토카막  네트워크 staking 보상") == "토카막네트워크 staking 보상"
+
+    def test_particle_variants_follow_final_consonant(self):
+        assert keyword_variants("토카막이 뭐") == ["토카막이란뭐", "토카막이뭐", "토카막은뭐"]
+        assert keyword_variants("토카막 네트워크가") == [
+            "토카막네트워크란",
+            "토카막네트워크가",
+            "토카막네트워크는",
+        ]
+
+    def test_non_particle_endings_unchanged(self):
+        # 인 has a final consonant, so 가 here is not a subject particle
+        assert keyword_variants("무엇인가") == ["무엇인가"]
+        assert keyword_variants("staking") == ["staking"]
+
+
+class TestKeywordMatcher:
+    """Tests for single-pass matching."""
+
+    def test_reports_every_matching_group(self):
+        matcher = KeywordMatcher([["he", "she"], ["his"], ["hers"], ["xyz"]])
+        assert matcher.match("ushers") == [0, 2]
+        assert matcher.match("this") == [1]
+        assert matcher.match("nothing") == []
+
+    def test_overlapping_keywords_via_failure_links(self):
+        matcher = KeywordMatcher([["abcd"], ["bc"], ["c"]])
+        assert matcher.match("xabcy") == [1, 2]
+
+    def test_whitespace_and_particle_tolerance(self):
+        matcher = KeywordMatcher([["토카막 네트워크가"]])
+        assert matcher.match("토카막네트워크는 뭐예요?") == [0]
+        assert matcher.match("토카막 네트워크란?") == [0]
+        assert matcher.match("토카막 스테이킹") == []
+
+    def test_matches_naive_substring_scan(self):
+        groups = [p["keywords"] for p in ANSWER_PATTERNS]
+        matcher = KeywordMatcher(groups)
+        for message in [
+            "스테이킹 방법 알려주세요",
+            "TON 구매하고 DEX에서 거래하고 싶어요",
+            "What is Tokamak Network?",
+            "Where to buy WTON and how to wrap?",
+        ]:
+            lowered = message.lower()
+            expected = [i for i, kws in enumerate(groups) if any(k in lowered for k in kws)]
+            assert matcher.match(message) == expected
+
+
+class TestPatternMatchingTolerance:
+    """Tests for get_matching_patterns using the automaton."""
+
+    def test_spacing_variation_matches(self):
+        assert "토카막 네트워크가 뭔가요" in get_matching_patterns("토카막네트워크는 무엇인가요")
+
+    def test_keywords_do_not_match_across_english_words(self):
+        assert match_pattern_ids("Let's take a look at this") == []
+        groups = [p["keywords"] for p in ANSWER_PATTERNS]
+        for message in [
+            "Let's take a look at this",
+            "Is it a dao rather than a company?",
+            "I was wapping files, then we were tired",
+            "go vern ance",
+        ]:
+            lowered = message.lower()
+            expected = [i for i, kws in enumerate(groups) if any(k in lowered for k in kws)]
+            assert match_pattern_ids(message) == expected
+
+    def test_multi_word_english_keyword_matches(self):
+        assert match_pattern_ids("Where  to\tbuy TON?") == match_pattern_ids("where to buy ton?")
+        assert match_pattern_ids("Where to buy TON?")
+
+    def test_full_width_input_matches(self):
+        assert get_matching_patterns("ＳＴＡＫＩＮＧ") == get_matching_patterns("staking")
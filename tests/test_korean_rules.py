@@ -0,0 +1,180 @@
+"""Tests for the Korean review rule engine and review modes."""
+
+import asyncio
+
+import pytest
+
+from tests.discord_helpers import make_channel, make_message
+from tokamak.agent.korean_rules import apply_korean_rules
+from tokamak.agent.loop import AgentLoop
+from tokamak.agent.response_cache import ResponseCache
+from tokamak.providers import LLMProvider, LLMResponse
+from tokamak.session import Session
+
+
+class ReviewProvider(LLMProvider):
+    """Provider returning a fixed answer, then a fixed review."""
+
+    def __init__(self, answer: str, reviewed: str):
+        super().__init__()
+        self.answer = answer
+        self.reviewed = reviewed
+        self.review_calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        if messages[0]["role"] == "user" and "Korean quality check" in messages[0]["content"]:
+            self.review_calls += 1
+            return LLMResponse(content=self.reviewed)
+        return LLMResponse(content=self.answer)
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+class TestApplyKoreanRules:
+    """Tests for the deterministic fixes."""
+
+    def test_brand_name_and_particle(self):
+        result = apply_korean_rules("토카막은 L2 플랫폼이에요.")
+        assert result.text == "토카막 네트워크는 L2 플랫폼이에요."
+        assert result.fixes == ["brand_name"]
+
+    def test_brand_typos(self):
+        assert apply_korean_rules("토라막 네트워크").text == "토카막 네트워크"
+
+    def test_token_symbols_stay_english(self):
+        result = apply_korean_rules("톤을 더블유톤으로 바꾸세요")
+        assert result.text == "TON을 WTON으로 바꾸세요"
+
+    def test_words_containing_ton_untouched(self):
+        assert apply_korean_rules("톤앤매너를 지켜요").text == "톤앤매너를 지켜요"
+
+    def test_particles_after_known_terms(self):
+        result = apply_korean_rules("DAO이 결정하고 TON는 토큰, L2으로 이동")
+        assert result.text == "DAO가 결정하고 TON은 토큰, L2로 이동"
+
+    def test_emoji_header_and_limit(self):
+        result = apply_korean_rules("**🔍 안내**\n🎉 하나 🚀 둘 ✨ 셋 🔥 넷")
+        assert result.text == "**안내**\n🎉 하나 🚀 둘 ✨ 셋 넷"
+        assert {"emoji_header", "emoji_limit"} <= set(result.fixes)
+
+    def test_trailing_spaces(self):
+        assert apply_korean_rules("안녕하세요  \n반가워요\t").text == "안녕하세요\n반가워요"
+
+    def test_unfixable_issues_are_flagged(self):
+        result = apply_korean_rules("토카막 롤업 허브 https://a.io https://a.io")
+        assert result.flags == ["brand_name", "duplicate_url"]
+        assert result.needs_llm
+
+    def test_clean_text_unchanged(self):
+        text = "토카막 네트워크는 TON 스테이킹을 지원해요."
+        result = apply_korean_rules(text)
+        assert result.text == text
+        assert not result.fixes and not result.needs_llm
+
+
+class TestReviewModes:
+    """Tests for how AgentLoop combines rules and LLM review."""
+
+    @pytest.mark.asyncio
+    async def test_hybrid_skips_llm_when_rules_suffice(self):
+        provider = ReviewProvider("토카막은 좋은 L2 플랫폼이에요.", "unused")
+        agent = AgentLoop(provider=provider, korean_review_mode="hybrid")
+
+        result = await agent.run(Session(key="k"), "소개해줘")
+
+        assert result == "토카막 네트워크는 좋은 L2 플랫폼이에요."
+        assert provider.review_calls == 0
+
+    @pytest.mark.asyncio
+    async def test_hybrid_calls_llm_for_flagged_issue(self):
+        provider = ReviewProvider(
+            "토카막 롤업 허브를 써보세요.", "토카막 네트워크 롤업 허브를 써보세요."
+        )
+        agent = AgentLoop(provider=provider, korean_review_mode="hybrid")
+
+        result = await agent.run(Session(key="k"), "추천해줘")
+
+        assert result == "토카막 네트워크 롤업 허브를 써보세요."
+        assert provider.review_calls == 1
+
+    @pytest.mark.asyncio
+    async def test_deferred_review_edits_after_send(self):
+        provider = ReviewProvider(
+            "토카막 롤업 허브를 써보세요.", "토카막 네트워크 롤업 허브를 써보세요."
+        )
+        agent = AgentLoop(provider=provider, korean_review_deferred=True)
+        revised = asyncio.Event()
+        revisions = []
+
+        async def on_revised(text):
+            revisions.append(text)
+            revised.set()
+
+        result = await agent.run(Session(key="k"), "추천해줘", on_revised=on_revised)
+
+        assert result == "토카막 롤업 허브를 써보세요."
+        await asyncio.wait_for(revised.wait(), timeout=1)
+        assert revisions == ["토카막 네트워크 롤업 허브를 써보세요."]
+
+    @pytest.mark.asyncio
+    async def test_deferred_review_updates_cached_answer(self):
+        provider = ReviewProvider(
+            "토카막 롤업 허브를 써보세요.", "토카막 네트워크 롤업 허브를 써보세요."
+        )
+        cache = ResponseCache()
+        agent = AgentLoop(provider=provider, korean_review_deferred=True, response_cache=cache)
+        revised = asyncio.Event()
+
+        async def on_revised(text):
+            revised.set()
+
+        await agent.run(Session(key="k"), "추천해줘", on_revised=on_revised)
+        await asyncio.wait_for(revised.wait(), timeout=1)
+
+        assert await agent.run(Session(key="k2"), "추천해줘") == (
+            "토카막 네트워크 롤업 허브를 써보세요."
+        )
+
+
+class TestDeferredRevisionInDiscord:
+    """Tests for applying a deferred revision to the sent reply and the session."""
+
+    @pytest.mark.asyncio
+    async def test_revision_replaces_answer_in_session(self):
+        revised = asyncio.Event()
+
+        async def callback(session, content, on_revised=None, **kwargs) -> str:
+            async def revise() -> None:
+                await on_revised("고친 답변")
+                revised.set()
+
+            asyncio.create_task(revise())
+            return "처음 답변"
+
+        channel = make_channel(callback)
+        message = make_message(1, "질문")
+        await channel._on_message(message)
+        await asyncio.wait_for(revised.wait(), timeout=1)
+
+        session = channel.session_manager.get("discord:1:1")
+        assert [m.content for m in session.messages] == ["질문", "고친 답변"]
+        message.reply.return_value.edit.assert_awaited_once_with(content="고친 답변")
+
+    @pytest.mark.asyncio
+    async def test_revision_of_suppressed_reply_is_dropped(self):
+        revisions: list[asyncio.Task] = []
+
+        async def callback(session, content, on_revised=None, **kwargs) -> str:
+            revisions.append(asyncio.create_task(on_revised("고친 답변")))
+            await asyncio.sleep(0.05)
+            return "처음 답변"
+
+        channel = make_channel(callback)
+        message = make_message(1, "질문")
+        await channel._on_message(message)
+        await asyncio.sleep(0.01)
+        await channel._suppress_reply(message)
+
+        await asyncio.wait_for(revisions[0], timeout=1)
+        message.reply.assert_not_awaited()
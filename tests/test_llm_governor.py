@@ -0,0 +1,163 @@
+"""Tests for rate limiting and prioritization of LLM requests."""
+
+import asyncio
+
+import pytest
+
+from tokamak.providers import GovernedProvider, LLMProvider, LLMResponse, ModelBudget, llm_caller
+from tokamak.providers.caller import CALLER_MODERATION, CALLER_NEWS, current_caller
+
+
+class RecordingProvider(LLMProvider):
+    """Provider that records the caller of each request and can be held open."""
+
+    def __init__(self, total_tokens: int = 0):
+        super().__init__()
+        self.total_tokens = total_tokens
+        self.order: list[str] = []
+        self.release = asyncio.Event()
+        self.release.set()
+        self.active = 0
+        self.max_active = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.order.append(current_caller())
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await self.release.wait()
+        finally:
+            self.active -= 1
+        usage = {"total_tokens": self.total_tokens} if self.total_tokens else {}
+        return LLMResponse(content="ok", usage=usage)
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+async def tagged_chat(provider: LLMProvider, caller: str) -> LLMResponse:
+    with llm_caller(caller):
+        return await provider.chat(MESSAGES)
+
+
+class TestCallerTag:
+    """Tests for the caller context variable."""
+
+    @pytest.mark.asyncio
+    async def test_tag_is_scoped_and_inherited_by_tasks(self):
+        assert current_caller() == "agent"
+        with llm_caller(CALLER_NEWS):
+            inner = await asyncio.create_task(asyncio.to_thread(current_caller))
+            assert current_caller() == CALLER_NEWS
+        assert inner == CALLER_NEWS
+        assert current_caller() == "agent"
+
+
+class TestGovernor:
+    """Tests for budgets, priorities and deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self):
+        inner = RecordingProvider()
+        inner.release.clear()
+        governor = GovernedProvider(inner, ModelBudget(max_concurrency=2))
+
+        tasks = [asyncio.create_task(governor.chat(MESSAGES)) for _ in range(5)]
+        await asyncio.sleep(0.01)
+        assert inner.active == 2
+        inner.release.set()
+        await asyncio.gather(*tasks)
+
+        assert inner.max_active == 2
+        assert governor.stats()["classes"]["interactive"]["requests"] == 5
+
+    @pytest.mark.asyncio
+    async def test_higher_priority_goes_first(self):
+        inner = RecordingProvider()
+        inner.release.clear()
+        governor = GovernedProvider(inner, ModelBudget(max_concurrency=1))
+
+        blocker = asyncio.create_task(governor.chat(MESSAGES))
+        await asyncio.sleep(0)
+        queued = [
+            asyncio.create_task(tagged_chat(governor, CALLER_NEWS)),
+            asyncio.create_task(tagged_chat(governor, CALLER_MODERATION)),
+            asyncio.create_task(tagged_chat(governor, "agent")),
+        ]
+        await asyncio.sleep(0.01)
+        inner.release.set()
+        await asyncio.gather(blocker, *queued)
+
+        assert inner.order == ["agent", "agent", CALLER_MODERATION, CALLER_NEWS]
+        assert governor.stats()["classes"]["background"]["wait_max_ms"] > 0
+
+    @pytest.mark.asyncio
+    async def test_request_rate_budget_delays_excess(self):
+        inner = RecordingProvider()
+        governor = GovernedProvider(inner, ModelBudget(requests_per_minute=600))
+
+        # 600/min: a burst of 600 then one every 0.1s
+        governor._gate("test").requests.level = 1
+        start = asyncio.get_running_loop().time()
+        await governor.chat(MESSAGES)
+        await governor.chat(MESSAGES)
+        elapsed = asyncio.get_running_loop().time() - start
+
+        assert 0.05 < elapsed < 0.5
+
+    @pytest.mark.asyncio
+    async def test_token_budget_charges_reported_usage(self):
+        inner = RecordingProvider(total_tokens=900)
+        governor = GovernedProvider(inner, ModelBudget(tokens_per_minute=1000))
+
+        await governor.chat(MESSAGES)
+
+        assert governor.stats()["models"]["test"]["tokens_available"] == pytest.approx(100, abs=5)
+
+    @pytest.mark.asyncio
+    async def test_deadline_drops_low_priority_request(self):
+        inner = RecordingProvider()
+        inner.release.clear()
+        governor = GovernedProvider(
+            inner, ModelBudget(max_concurrency=1), deadlines={"background": 0.02}
+        )
+
+        blocker = asyncio.create_task(governor.chat(MESSAGES))
+        await asyncio.sleep(0)
+        response = await tagged_chat(governor, CALLER_NEWS)
+        inner.release.set()
+        await blocker
+
+        assert response.finish_reason == "error"
+        assert inner.order == ["agent"]
+        assert governor.stats()["classes"]["background"]["dropped"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_holds_slot_until_done(self):
+        inner = RecordingProvider()
+        governor = GovernedProvider(inner, ModelBudget(max_concurrency=1))
+
+        deltas = [d async for d in governor.chat_stream(MESSAGES)]
+
+        assert deltas[-1].response.content == "ok"
+        assert governor.stats()["models"]["test"]["active"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_releases_slot_at_final_delta(self):
+        inner = RecordingProvider(total_tokens=10)
+        governor = GovernedProvider(inner, ModelBudget(max_concurrency=1))
+
+        # Read like AgentLoop: stop at the final delta and leave the stream open
+        stream = governor.chat_stream(MESSAGES)
+        async for delta in stream:
+            if delta.response is not None:
+                break
+
+        assert governor.stats()["models"]["test"]["active"] == 0
+        response = await asyncio.wait_for(governor.chat(MESSAGES), timeout=0.5)
+        assert response.content == "ok"
+        await stream.aclose()
+        assert governor.stats()["models"]["test"]["active"] == 0
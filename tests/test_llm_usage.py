@@ -0,0 +1,189 @@
+"""Tests for LLM usage, latency and cost accounting."""
+
+import json
+
+import pytest
+
+from tokamak.agent.loop import AgentLoop
+from tokamak.providers import (
+    InstrumentedProvider,
+    LLMProvider,
+    LLMResponse,
+    StreamDelta,
+    UsageRecorder,
+)
+from tokamak.providers.caller import CALLER_MODERATION, llm_caller
+from tokamak.providers.usage import ModelPrice, UsageBucket, load_usage, summarize_usage
+from tokamak.session import Session
+
+
+class UsageProvider(LLMProvider):
+    """Provider returning fixed usage, or raising when asked to."""
+
+    def __init__(self, raises: bool = False):
+        super().__init__()
+        self.raises = raises
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        if self.raises:
+            raise ConnectionError("reset")
+        return LLMResponse(
+            content="ok",
+            usage={
+                "prompt_tokens": 1000,
+                "completion_tokens": 200,
+                "total_tokens": 1200,
+                "cached_tokens": 800,
+            },
+        )
+
+    def get_default_model(self) -> str:
+        return "default-model"
+
+
+class StreamingUsageProvider(UsageProvider):
+    """Provider streaming its answer in two chunks before the final delta."""
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        raise AssertionError("expected a streamed call")
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        yield StreamDelta(content="o")
+        yield StreamDelta(content="k")
+        yield StreamDelta(response=await super().chat(messages))
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestUsageBucket:
+    """Tests for the per-minute aggregate."""
+
+    def test_latency_histogram_quantiles(self):
+        bucket = UsageBucket()
+        for latency in [0.1, 0.3, 0.7, 1.5, 70.0]:
+            bucket.add(latency, {}, "ok")
+
+        assert bucket.latency_quantile(0.5) == 1.0
+        assert bucket.latency_quantile(0.95) == float("inf")
+
+    def test_record_round_trip(self):
+        bucket = UsageBucket()
+        bucket.add(0.4, {"prompt_tokens": 10, "completion_tokens": 5}, "error")
+
+        restored = UsageBucket.from_record(bucket.to_record(0, "agent", "m"))
+
+        assert restored == bucket
+
+    def test_cost_discounts_cached_tokens(self):
+        price = ModelPrice(prompt=3.0, completion=15.0, cached=0.3)
+
+        assert price.cost(1_000_000, 0, 500_000) == pytest.approx(1.65)
+        assert ModelPrice(prompt=3.0, completion=15.0).cost(0, 1_000_000, 0) == 15.0
+
+
+class TestInstrumentedProvider:
+    """Tests for recording calls by caller and model."""
+
+    @pytest.mark.asyncio
+    async def test_records_caller_model_tokens_and_outcome(self):
+        recorder = UsageRecorder(prices={"default-model": ModelPrice(3.0, 15.0, 0.3)})
+        provider = InstrumentedProvider(UsageProvider(), recorder)
+
+        await provider.chat(MESSAGES)
+        with llm_caller(CALLER_MODERATION):
+            await provider.chat(MESSAGES, model="fast")
+
+        rows = {row["caller"]: row for row in recorder.stats()}
+        assert rows["agent"]["prompt_tokens"] == 1000
+        assert rows["agent"]["cached_tokens"] == 800
+        assert rows["agent"]["cost_usd"] == pytest.approx(0.00384)
+        assert rows[CALLER_MODERATION]["cost_usd"] is None
+
+    @pytest.mark.asyncio
+    async def test_exceptions_are_recorded_and_reraised(self):
+        recorder = UsageRecorder()
+        provider = InstrumentedProvider(UsageProvider(raises=True), recorder)
+
+        with pytest.raises(ConnectionError):
+            await provider.chat(MESSAGES)
+
+        assert recorder.stats()[0]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_streams_are_recorded(self):
+        recorder = UsageRecorder()
+        provider = InstrumentedProvider(UsageProvider(), recorder)
+
+        [d async for d in provider.chat_stream(MESSAGES)]
+
+        assert recorder.stats()[0]["completion_tokens"] == 200
+
+    @pytest.mark.asyncio
+    async def test_streamed_agent_runs_are_recorded(self):
+        recorder = UsageRecorder()
+        provider = InstrumentedProvider(StreamingUsageProvider(), recorder)
+        agent = AgentLoop(provider=provider, stream=True, enable_korean_review=False)
+        partials: list[str] = []
+
+        async def on_partial(text: str) -> None:
+            partials.append(text)
+
+        for _ in range(3):
+            assert await agent.run(Session(key="k"), "hi", on_partial=on_partial) == "ok"
+
+        assert partials
+        assert recorder.stats()[0]["calls"] == 3
+        assert recorder.stats()[0]["completion_tokens"] == 600
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_is_recorded_once(self):
+        recorder = UsageRecorder()
+        provider = InstrumentedProvider(StreamingUsageProvider(), recorder)
+
+        stream = provider.chat_stream(MESSAGES)
+        await anext(stream)
+        await stream.aclose()
+
+        assert recorder.stats()[0]["calls"] == 1
+        assert recorder.stats()[0]["errors"] == 1
+
+
+class TestUsageLog:
+    """Tests for persisting and summarizing the usage log."""
+
+    @pytest.mark.asyncio
+    async def test_close_writes_compact_lines(self, tmp_path):
+        path = tmp_path / "usage.jsonl"
+        recorder = UsageRecorder(path=path)
+        provider = InstrumentedProvider(UsageProvider(), recorder)
+        for _ in range(3):
+            await provider.chat(MESSAGES)
+
+        await recorder.close()
+        await recorder.close()
+
+        lines = path.read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["n"] == 3
+
+    def test_summary_window_and_grouping(self, tmp_path):
+        path = tmp_path / "usage.jsonl"
+        records = []
+        for minute, caller, model in [
+            (0, "agent", "big"),
+            (6000, "agent", "big"),
+            (6000, "news", "small"),
+            (6060, "agent", "small"),
+        ]:
+            bucket = UsageBucket()
+            bucket.add(1.2, {"prompt_tokens": 100, "completion_tokens": 10}, "ok")
+            records.append(bucket.to_record(minute, caller, model))
+        path.write_text("".join(json.dumps(r) + "\n" for r in records))
+
+        recent = load_usage(path, since=6000)
+        by_caller = summarize_usage(recent, ("caller",))
+        by_model = summarize_usage(recent, ("caller", "model"))
+
+        assert [(r["caller"], r["calls"]) for r in by_caller] == [("agent", 2), ("news", 1)]
+        assert len(by_model) == 3
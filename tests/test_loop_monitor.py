@@ -0,0 +1,92 @@
+"""Tests for the event loop lag monitor and slow-callback profiler."""
+
+import asyncio
+import time
+
+import pytest
+
+from tokamak.utils.loop_monitor import PROFILER_ENV, LoopMonitor, SlowCallbackProfiler
+
+
+def block_the_loop(seconds: float) -> None:
+    time.sleep(seconds)
+
+
+class TestLoopMonitor:
+    """Tests for lag sampling and profiler toggling."""
+
+    @pytest.mark.asyncio
+    async def test_measures_lag(self):
+        monitor = LoopMonitor(interval_seconds=0.02)
+        await monitor.start()
+        await asyncio.sleep(0.03)
+        block_the_loop(0.1)
+        await asyncio.sleep(0.05)
+        await monitor.close()
+        assert monitor.samples >= 2
+        assert monitor.max_lag >= 0.05
+        assert monitor.stats()["profiler"] is False
+
+    @pytest.mark.asyncio
+    async def test_toggle_file_switches_profiler(self, tmp_path):
+        toggle = tmp_path / "loop_profiler.enable"
+        monitor = LoopMonitor(
+            interval_seconds=0.01,
+            profiler_toggle_path=toggle,
+            profiler_report_path=tmp_path / "report.log",
+            toggle_check_seconds=0.01,
+        )
+        await monitor.start()
+        await asyncio.sleep(0.05)
+        assert monitor.profiler is None
+
+        toggle.touch()
+        await asyncio.sleep(0.05)
+        assert monitor.profiler is not None and monitor.profiler.running
+
+        toggle.unlink()
+        await asyncio.sleep(0.05)
+        assert monitor.profiler is None
+        await monitor.close()
+
+    def test_env_enables_profiler(self, monkeypatch):
+        monitor = LoopMonitor()
+        assert not monitor.profiler_wanted()
+        monkeypatch.setenv(PROFILER_ENV, "1")
+        assert monitor.profiler_wanted()
+
+
+class TestSlowCallbackProfiler:
+    """Tests for stall detection and the report."""
+
+    @pytest.mark.asyncio
+    async def test_reports_blocking_stack(self, tmp_path):
+        report = tmp_path / "slow.log"
+        profiler = SlowCallbackProfiler(
+            asyncio.get_running_loop(),
+            report_path=report,
+            threshold_seconds=0.02,
+            sample_interval_seconds=0.002,
+        )
+        profiler.start()
+        await asyncio.sleep(0.05)
+        block_the_loop(0.2)
+        await asyncio.sleep(0.05)
+        await asyncio.to_thread(profiler.stop)
+
+        assert profiler.stalls == 1
+        text = report.read_text()
+        assert "event loop blocked for" in text
+        assert "in block_the_loop" in text
+
+    @pytest.mark.asyncio
+    async def test_no_report_without_stall(self, tmp_path):
+        report = tmp_path / "slow.log"
+        profiler = SlowCallbackProfiler(
+            asyncio.get_running_loop(), report_path=report, threshold_seconds=0.05
+        )
+        profiler.start()
+        await asyncio.sleep(0.15)
+        await asyncio.to_thread(profiler.stop)
+        assert profiler.stalls == 0
+        assert not report.exists()
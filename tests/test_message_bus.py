@@ -0,0 +1,201 @@
+"""Tests for the priority lanes, backpressure and outbound dispatch of the message bus."""
+
+import asyncio
+
+import pytest
+
+from tokamak.bus import LaneLimit, MessageBus, OutboundMessage
+from tokamak.bus.queue import BUS_OVERFLOW
+
+
+def out(content: str, lane: str = "interactive") -> OutboundMessage:
+    return OutboundMessage(channel="discord", chat_id="1", content=content, lane=lane)
+
+
+class TestLanes:
+    """Tests for lane ordering and stats."""
+
+    @pytest.mark.asyncio
+    async def test_higher_lane_consumed_first(self):
+        bus = MessageBus()
+        await bus.publish_outbound(out("news", "news"))
+        await bus.publish_outbound(out("alert", "moderation"))
+        await bus.publish_outbound(out("admin", "admin"))
+        await bus.publish_outbound(out("reply"))
+
+        order = [(await bus.consume_outbound()).content for _ in range(4)]
+        assert order == ["reply", "admin", "alert", "news"]
+
+    @pytest.mark.asyncio
+    async def test_fifo_within_lane(self):
+        bus = MessageBus()
+        for i in range(3):
+            await bus.publish_outbound(out(str(i)))
+        assert [(await bus.consume_outbound()).content for _ in range(3)] == ["0", "1", "2"]
+
+    @pytest.mark.asyncio
+    async def test_sizes_and_stats(self):
+        bus = MessageBus()
+        await bus.publish_outbound(out("a"))
+        await bus.publish_outbound(out("b", "news"))
+        assert bus.outbound_size == 2
+        assert bus.lane_sizes()["outbound"]["news"] == 1
+
+        await bus.consume_outbound()
+        stats = bus.stats()["outbound"]
+        assert stats["interactive"]["published"] == 1
+        assert stats["interactive"]["wait_p50_ms"] is not None
+        assert stats["news"]["depth"] == 1
+
+    @pytest.mark.asyncio
+    async def test_interactive_not_delayed_by_flood(self):
+        bus = MessageBus()
+        for i in range(500):
+            await bus.publish_outbound(out(f"news {i}", "news"))
+        await bus.publish_outbound(out("reply"))
+
+        assert (await bus.consume_outbound()).content == "reply"
+        # The news lane stayed within its capacity
+        assert bus.lane_sizes()["outbound"]["news"] <= 50
+
+
+class TestOverflow:
+    """Tests for the overflow policies of a full lane."""
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest(self):
+        bus = MessageBus(outbound_lanes={"news": LaneLimit(2, "drop_oldest")})
+        for i in range(4):
+            assert await bus.publish_outbound(out(str(i), "news"))
+        assert [(await bus.consume_outbound()).content for _ in range(2)] == ["2", "3"]
+        assert bus.stats()["outbound"]["news"]["dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_reject(self):
+        bus = MessageBus(outbound_lanes={"news": LaneLimit(1, "reject")})
+        before = BUS_OVERFLOW.value(queue="outbound", lane="news", policy="reject")
+        assert await bus.publish_outbound(out("a", "news"))
+        assert not await bus.publish_outbound(out("b", "news"))
+        assert bus.stats()["outbound"]["news"]["rejected"] == 1
+        after = BUS_OVERFLOW.value(queue="outbound", lane="news", policy="reject")
+        assert after == before + 1
+
+    @pytest.mark.asyncio
+    async def test_block_waits_for_room(self):
+        bus = MessageBus(outbound_lanes={"interactive": LaneLimit(1, "block")})
+        await bus.publish_outbound(out("a"))
+        blocked = asyncio.create_task(bus.publish_outbound(out("b")))
+        await asyncio.sleep(0.01)
+        assert not blocked.done()
+
+        assert (await bus.consume_outbound()).content == "a"
+        assert await asyncio.wait_for(blocked, timeout=1.0)
+        assert (await bus.consume_outbound()).content == "b"
+
+    @pytest.mark.asyncio
+    async def test_full_lane_does_not_block_other_lanes(self):
+        bus = MessageBus(outbound_lanes={"news": LaneLimit(1, "block")})
+        await bus.publish_outbound(out("n1", "news"))
+        blocked = asyncio.create_task(bus.publish_outbound(out("n2", "news")))
+        await asyncio.wait_for(bus.publish_outbound(out("reply")), timeout=1.0)
+        assert (await bus.consume_outbound()).content == "reply"
+        assert (await bus.consume_outbound()).content == "n1"
+        await asyncio.wait_for(blocked, timeout=1.0)
+
+
+class Recorder:
+    """Subscriber that records deliveries and sleeps per chat."""
+
+    def __init__(self, delays: dict[str, float] | None = None):
+        self.delays = delays or {}
+        self.sent: list[tuple[str, str]] = []
+
+    async def __call__(self, msg: OutboundMessage) -> None:
+        await asyncio.sleep(self.delays.get(msg.chat_id, 0))
+        self.sent.append((msg.chat_id, msg.content))
+
+
+def to(chat_id: str, content: str) -> OutboundMessage:
+    return OutboundMessage(channel="discord", chat_id=chat_id, content=content)
+
+
+async def wait_until(condition, timeout: float = 1.0) -> None:
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not condition():
+        assert asyncio.get_running_loop().time() < deadline, "condition not met"
+        await asyncio.sleep(0.005)
+
+
+class TestDispatch:
+    """Tests for per-destination outbound dispatch."""
+
+    @pytest.mark.asyncio
+    async def test_slow_chat_does_not_block_others(self):
+        bus = MessageBus()
+        recorder = Recorder({"slow": 0.5})
+        bus.subscribe_outbound("discord", recorder)
+        dispatcher = asyncio.create_task(bus.dispatch_outbound())
+
+        await bus.publish_outbound(to("slow", "s1"))
+        await bus.publish_outbound(to("fast", "f1"))
+        await wait_until(lambda: ("fast", "f1") in recorder.sent, timeout=0.3)
+        assert ("slow", "s1") not in recorder.sent
+
+        bus.stop()
+        await asyncio.wait_for(dispatcher, timeout=1.0)
+        assert ("slow", "s1") in recorder.sent
+
+    @pytest.mark.asyncio
+    async def test_order_kept_per_chat(self):
+        bus = MessageBus()
+        recorder = Recorder({"a": 0.01})
+        bus.subscribe_outbound("discord", recorder)
+        dispatcher = asyncio.create_task(bus.dispatch_outbound())
+
+        for i in range(5):
+            await bus.publish_outbound(to("a", str(i)))
+            await bus.publish_outbound(to("b", str(i)))
+        await wait_until(lambda: len(recorder.sent) == 10)
+        for chat in ("a", "b"):
+            assert [c for chat_id, c in recorder.sent if chat_id == chat] == list("01234")
+
+        bus.stop()
+        await asyncio.wait_for(dispatcher, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_subscriber_timeout(self):
+        bus = MessageBus(subscriber_timeout_seconds=0.05)
+        recorder = Recorder({"hung": 10})
+        bus.subscribe_outbound("discord", recorder)
+        dispatcher = asyncio.create_task(bus.dispatch_outbound())
+
+        await bus.publish_outbound(to("hung", "1"))
+        await bus.publish_outbound(to("hung", "2"))
+        await wait_until(lambda: bus.stats()["dispatch"]["timeouts"] == 2)
+        assert bus.stats()["dispatch"]["destinations"] == 0
+
+        bus.stop()
+        await asyncio.wait_for(dispatcher, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_stop_is_immediate_when_idle(self):
+        bus = MessageBus()
+        dispatcher = asyncio.create_task(bus.dispatch_outbound())
+        await asyncio.sleep(0.01)
+        bus.stop()
+        await asyncio.wait_for(dispatcher, timeout=0.1)
+
+    @pytest.mark.asyncio
+    async def test_errors_are_counted(self):
+        bus = MessageBus()
+
+        async def broken(msg: OutboundMessage) -> None:
+            raise RuntimeError("boom")
+
+        bus.subscribe_outbound("discord", broken)
+        dispatcher = asyncio.create_task(bus.dispatch_outbound())
+        await bus.publish_outbound(to("a", "1"))
+        await wait_until(lambda: bus.stats()["dispatch"]["errors"] == 1)
+
+        bus.stop()
+        await asyncio.wait_for(dispatcher, timeout=1.0)
@@ -0,0 +1,105 @@
+"""Tests for coalescing quick consecutive Discord messages into one turn."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tests.discord_helpers import idle, make_channel, make_message
+from tokamak.agent.loop import AgentLoop
+from tokamak.session import Session
+
+
+class FakeAgent:
+    """Agent callback recording the content of each run."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.runs: list[str] = []
+        self.finished: list[str] = []
+
+    async def __call__(self, session, content, **kwargs) -> str:
+        self.runs.append(content)
+        await asyncio.sleep(self.delay)
+        self.finished.append(content)
+        return f"answer to {content!r}"
+
+
+class TestCoalescing:
+    """Tests for the debounce window and superseded runs."""
+
+    @pytest.mark.asyncio
+    async def test_quick_messages_become_one_turn(self):
+        agent = FakeAgent()
+        channel = make_channel(agent, coalesce_window_seconds=0.05)
+        messages = [make_message(i, text) for i, text in enumerate(["hi", "about staking", "?"])]
+        for message in messages:
+            await channel._on_message(message)
+            await asyncio.sleep(0.01)
+        await idle(channel)
+
+        assert agent.runs == ["hi\nabout staking\n?"]
+        messages[-1].reply.assert_awaited_once()
+        messages[0].reply.assert_not_awaited()
+
+    @pytest.mark.asyncio
+    async def test_messages_after_the_window_are_separate_turns(self):
+        agent = FakeAgent()
+        channel = make_channel(agent, coalesce_window_seconds=0.02)
+        await channel._on_message(make_message(1, "first"))
+        await idle(channel)
+        await channel._on_message(make_message(2, "second"))
+        await idle(channel)
+        assert agent.runs == ["first", "second"]
+
+    @pytest.mark.asyncio
+    async def test_new_input_restarts_unanswered_run(self):
+        agent = FakeAgent(delay=0.2)
+        channel = make_channel(agent, coalesce_window_seconds=0)
+        await channel._on_message(make_message(1, "what is"))
+        await asyncio.sleep(0.05)
+        await channel._on_message(make_message(2, "TON staking"))
+        await idle(channel)
+
+        assert agent.runs == ["what is", "what is\nTON staking"]
+        assert agent.finished == ["what is\nTON staking"]
+        session = channel.session_manager.get("discord:1:1")
+        assert [m.role for m in session.messages] == ["user", "user", "assistant"]
+
+    @pytest.mark.asyncio
+    async def test_restart_disabled_answers_each_turn(self):
+        agent = FakeAgent(delay=0.05)
+        channel = make_channel(agent, coalesce_window_seconds=0, cancel_superseded_runs=False)
+        await channel._on_message(make_message(1, "one"))
+        await asyncio.sleep(0.01)
+        await channel._on_message(make_message(2, "two"))
+        await idle(channel)
+        assert agent.finished == ["one", "two"]
+
+    @pytest.mark.asyncio
+    async def test_messages_while_queued_join_the_turn(self):
+        agent = FakeAgent(delay=0.05)
+        channel = make_channel(agent, coalesce_window_seconds=0, cancel_superseded_runs=False)
+        await channel._on_message(make_message(1, "one"))
+        await asyncio.sleep(0.01)
+        await channel._on_message(make_message(2, "two"))
+        await channel._on_message(make_message(3, "three"))
+        await idle(channel)
+        assert agent.finished == ["one", "two\nthree"]
+
+
+class TestCoalescedHistory:
+    """Tests for the agent recognising a coalesced turn in the session."""
+
+    def test_recorded_messages_are_not_repeated(self):
+        agent = AgentLoop(provider=AsyncMock(), enable_korean_review=False)
+        agent.provider.format_system_content = MagicMock(return_value="system")
+        session = Session(key="discord:1:1")
+        session.add_message(role="user", content="earlier")
+        session.add_message(role="assistant", content="reply")
+        session.add_message(role="user", content="what is")
+        session.add_message(role="user", content="TON staking")
+
+        messages = agent._build_messages(session, "what is\nTON staking")
+        contents = [m["content"] for m in messages[1:]]
+        assert contents == ["earlier", "reply", "what is\nTON staking"]
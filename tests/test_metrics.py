@@ -0,0 +1,127 @@
+"""Tests for the Prometheus metrics registry and endpoint."""
+
+import asyncio
+
+import pytest
+
+from tokamak.agent.tools import Tool, ToolRegistry
+from tokamak.agent.tools.registry import TOOL_CALL_SECONDS
+from tokamak.utils.metrics import MetricsRegistry, MetricsServer, measure_loop_lag
+
+
+class SleepTool(Tool):
+    name = "sleep_metrics"
+    description = "sleeps briefly"
+    parameters = {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs) -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+
+async def scrape(port: int, path: str = "/metrics") -> tuple[str, str]:
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode())
+    await writer.drain()
+    raw = (await reader.read()).decode()
+    writer.close()
+    head, _, body = raw.partition("\r\n\r\n")
+    return head.splitlines()[0], body
+
+
+class TestRegistry:
+    """Tests for metric types and the text format."""
+
+    @pytest.mark.asyncio
+    async def test_counter_and_labels(self):
+        registry = MetricsRegistry()
+        counter = registry.counter("requests_total", "Requests", ("route",))
+        counter.inc(route="a")
+        counter.inc(2, route='say "hi"')
+
+        text = await registry.render()
+
+        assert "# TYPE requests_total counter" in text
+        assert 'requests_total{route="a"} 1' in text
+        assert 'requests_total{route="say \\"hi\\""} 2' in text
+
+    @pytest.mark.asyncio
+    async def test_histogram_buckets_are_cumulative(self):
+        registry = MetricsRegistry()
+        histogram = registry.histogram("latency_seconds", "Latency", buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value)
+
+        text = await registry.render()
+
+        assert 'latency_seconds_bucket{le="0.1"} 1' in text
+        assert 'latency_seconds_bucket{le="1"} 3' in text
+        assert 'latency_seconds_bucket{le="+Inf"} 4' in text
+        assert "latency_seconds_count 4" in text
+        assert "latency_seconds_sum 4.25" in text
+
+    @pytest.mark.asyncio
+    async def test_gauge_callback_and_collector_run_at_scrape(self):
+        registry = MetricsRegistry()
+        calls = []
+        registry.gauge("depth", "Queue depth", ("queue",), callback=lambda: {("in",): 3})
+        lag = registry.gauge("lag_seconds", "Lag")
+
+        async def collect():
+            calls.append(1)
+            lag.set(0.5)
+
+        registry.add_collector("lag", collect)
+        assert calls == []
+
+        text = await registry.render()
+
+        assert 'depth{queue="in"} 3' in text
+        assert "lag_seconds 0.5" in text
+        assert calls == [1]
+
+    def test_same_name_returns_same_metric(self):
+        registry = MetricsRegistry()
+        first = registry.counter("x_total", "X", ("a",))
+
+        assert registry.counter("x_total", "X", ("a",)) is first
+        with pytest.raises(ValueError):
+            registry.histogram("x_total", "X")
+
+    @pytest.mark.asyncio
+    async def test_loop_lag_is_small_when_idle(self):
+        assert 0 <= await measure_loop_lag() < 0.1
+
+
+class TestInstrumentation:
+    """Tests for metrics recorded by components."""
+
+    @pytest.mark.asyncio
+    async def test_tool_call_duration(self):
+        tools = ToolRegistry()
+        tools.register(SleepTool())
+        before = TOOL_CALL_SECONDS.count(tool="sleep_metrics", outcome="ok")
+
+        await tools.execute("sleep_metrics", {})
+
+        assert TOOL_CALL_SECONDS.count(tool="sleep_metrics", outcome="ok") == before + 1
+
+
+class TestMetricsServer:
+    """Tests for the HTTP endpoint."""
+
+    @pytest.mark.asyncio
+    async def test_serves_metrics_and_404(self):
+        registry = MetricsRegistry()
+        registry.counter("hits_total", "Hits").inc()
+        server = MetricsServer(registry, port=0)
+        await server.start()
+        try:
+            status, body = await scrape(server.port)
+            missing, _ = await scrape(server.port, "/other")
+        finally:
+            await server.close()
+
+        assert status == "HTTP/1.1 200 OK"
+        assert "hits_total 1" in body
+        assert missing == "HTTP/1.1 404 Not Found"
@@ -0,0 +1,202 @@
+"""Tests for background moderation and suppressing answers to flagged messages."""
+
+import asyncio
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tests.discord_helpers import idle, make_channel, make_message
+from tokamak.moderation import ModerationPipeline, ModerationResult, ModerationSeverity
+
+HIGH = ModerationResult(is_toxic=True, severity=ModerationSeverity.HIGH, confidence=0.9)
+LOW = ModerationResult(is_toxic=True, severity=ModerationSeverity.LOW, confidence=0.9)
+CLEAN = ModerationResult(is_toxic=False)
+
+
+class FakeDetector:
+    """Detector returning a fixed result per message after an optional release."""
+
+    def __init__(self, results: dict[str, ModerationResult] | None = None, delay: float = 0.0):
+        self.results = results or {}
+        self.delay = delay
+        self.release = asyncio.Event()
+        self.release.set()
+        self.running = 0
+        self.max_running = 0
+
+    async def detect(self, message: str) -> ModerationResult:
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await self.release.wait()
+            await asyncio.sleep(self.delay)
+            return self.results.get(message, CLEAN)
+        finally:
+            self.running -= 1
+
+
+class TestModerationPipeline:
+    """Tests for the worker pool, result lookup and overflow."""
+
+    @pytest.mark.asyncio
+    async def test_results_are_delivered_and_kept_by_message_id(self):
+        pipeline = ModerationPipeline(FakeDetector({"bad": HIGH}))
+        seen: dict[int, ModerationResult] = {}
+
+        def on_result(message_id: int):
+            async def record(result: ModerationResult) -> None:
+                seen[message_id] = result
+
+            return record
+
+        assert pipeline.submit(1, "fine", on_result(1))
+        assert pipeline.submit(2, "bad", on_result(2))
+        await pipeline.join()
+
+        assert seen == {1: CLEAN, 2: HIGH}
+        assert pipeline.result(2) is HIGH
+        assert pipeline.stats()["flagged"] == 1
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_worker_pool_is_bounded(self):
+        detector = FakeDetector(delay=0.01)
+        pipeline = ModerationPipeline(detector, workers=3)
+        for i in range(10):
+            pipeline.submit(i, "text", AsyncMock())
+        await pipeline.join()
+        assert detector.max_running == 3
+        assert pipeline.checked == 10
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_full_queue_drops_new_messages(self):
+        detector = FakeDetector()
+        detector.release.clear()
+        pipeline = ModerationPipeline(detector, workers=1, queue_size=2)
+        assert pipeline.submit(1, "a", AsyncMock())
+        await asyncio.sleep(0)
+        assert pipeline.submit(2, "b", AsyncMock())
+        assert pipeline.submit(3, "c", AsyncMock())
+        assert not pipeline.submit(4, "d", AsyncMock())
+        assert pipeline.stats()["dropped"] == 1
+        await pipeline.close()
+
+    @pytest.mark.asyncio
+    async def test_failing_callback_does_not_stop_the_worker(self):
+        pipeline = ModerationPipeline(FakeDetector(), workers=1)
+        pipeline.submit(1, "a", AsyncMock(side_effect=RuntimeError("boom")))
+        done = AsyncMock()
+        pipeline.submit(2, "b", done)
+        await pipeline.join()
+        done.assert_awaited_once_with(CLEAN)
+        await pipeline.close()
+
+
+class TestDiscordModeration:
+    """Tests for replies running alongside moderation."""
+
+    @pytest.mark.asyncio
+    async def test_reply_does_not_wait_for_moderation(self):
+        detector = FakeDetector()
+        detector.release.clear()
+
+        async def agent(session, content, **kwargs) -> str:
+            return "answer"
+
+        channel = make_channel(agent, moderation=ModerationPipeline(detector, workers=2))
+        message = make_message(1, "hello")
+        await asyncio.wait_for(channel._on_message(message), timeout=0.1)
+        for _ in range(50):
+            if message.reply.await_count:
+                break
+            await asyncio.sleep(0.01)
+        message.reply.assert_awaited_once_with("answer")
+
+        detector.release.set()
+        await idle(channel)
+        await channel.moderation.close()
+
+    @pytest.mark.asyncio
+    async def test_flagged_message_is_reported(self):
+        reported = AsyncMock()
+
+        async def agent(session, content, **kwargs) -> str:
+            return "answer"
+
+        channel = make_channel(
+            agent,
+            moderation=ModerationPipeline(FakeDetector({"rude": LOW}), workers=2),
+            on_toxic_content=reported,
+        )
+        message = make_message(1, "rude")
+        posted = message.reply.return_value
+        await channel._on_message(message)
+        await idle(channel)
+
+        event = reported.await_args.args[0]
+        assert event.message_id == 1 and event.result is LOW
+        # Only high severity takes the answer down
+        posted.delete.assert_not_awaited()
+        await channel.moderation.close()
+
+    @pytest.mark.asyncio
+    async def test_posted_answer_is_retracted_on_high_severity(self):
+        detector = FakeDetector({"threat": HIGH})
+        detector.release.clear()
+
+        async def agent(session, content, **kwargs) -> str:
+            return "answer"
+
+        channel = make_channel(agent, moderation=ModerationPipeline(detector, workers=2))
+        message = make_message(1, "threat")
+        posted = message.reply.return_value
+        await channel._on_message(message)
+        await asyncio.sleep(0.02)
+        message.reply.assert_awaited_once()
+
+        detector.release.set()
+        await idle(channel)
+        posted.delete.assert_awaited_once()
+        await channel.moderation.close()
+
+    @pytest.mark.asyncio
+    async def test_running_answer_is_cancelled_on_high_severity(self):
+        finished: list[str] = []
+
+        async def agent(session, content, **kwargs) -> str:
+            await asyncio.sleep(0.2)
+            finished.append(content)
+            return "answer"
+
+        channel = make_channel(
+            agent, moderation=ModerationPipeline(FakeDetector({"threat": HIGH}), workers=2)
+        )
+        message = make_message(1, "threat")
+        await channel._on_message(message)
+        await idle(channel)
+
+        assert finished == []
+        message.reply.assert_not_awaited()
+        await channel.moderation.close()
+
+    @pytest.mark.asyncio
+    async def test_suppression_can_be_disabled(self):
+        detector = FakeDetector({"threat": HIGH}, delay=0.05)
+
+        async def agent(session, content, **kwargs) -> str:
+            return "answer"
+
+        channel = make_channel(
+            agent,
+            moderation=ModerationPipeline(detector, workers=2),
+            suppress_flagged_replies=False,
+        )
+        message = make_message(1, "threat")
+        posted = message.reply.return_value
+        await channel._on_message(message)
+        await idle(channel)
+
+        message.reply.assert_awaited_once_with("answer")
+        posted.delete.assert_not_awaited()
+        await channel.moderation.close()
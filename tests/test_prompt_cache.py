@@ -0,0 +1,121 @@
+"""Tests for the cacheable system prompt prefix and cached-token reporting."""
+
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+
+from tokamak.agent.loop import AgentLoop
+from tokamak.agent.prompts import build_system_prompt, build_system_prompt_parts
+from tokamak.providers import LLMProvider, LLMResponse
+from tokamak.providers.openai_provider import OpenAICompatibleProvider
+from tokamak.session import Session
+
+
+class UsageProvider(LLMProvider):
+    """Provider returning a fixed response with usage counts."""
+
+    def __init__(self, usage: dict[str, int]):
+        super().__init__()
+        self.usage = usage
+        self.messages: list[dict] = []
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.messages = messages
+        return LLMResponse(content="answer", usage=self.usage)
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+class TestSystemPromptParts:
+    """Tests for the static prefix / dynamic suffix split."""
+
+    def test_prefix_identical_across_messages(self):
+        first = build_system_prompt_parts(user_message="스테이킹 방법 알려주세요")
+        second = build_system_prompt_parts(user_message="오늘 날씨 어때요?")
+
+        assert first.prefix == second.prefix
+        assert first.suffix != second.suffix
+
+    def test_time_and_patterns_only_in_suffix(self):
+        parts = build_system_prompt_parts(user_message="스테이킹 방법 알려주세요")
+        now = datetime.now().strftime("%Y-%m-%d")
+
+        assert "Current Time" not in parts.prefix
+        assert now not in parts.prefix
+        assert now in parts.suffix
+        assert "Answer Patterns (for this question)" in parts.suffix
+
+    def test_joined_text_matches_build_system_prompt(self):
+        parts = build_system_prompt_parts(user_message="hello")
+        assert parts.text.startswith(parts.prefix)
+        assert build_system_prompt(user_message="hello").startswith(parts.prefix)
+
+
+class TestCacheHints:
+    """Tests for cache_control hints on the system message."""
+
+    def test_auto_marks_prefix_for_claude(self):
+        provider = OpenAICompatibleProvider(default_model="anthropic/claude-sonnet-4")
+
+        content = provider.format_system_content("static", "dynamic")
+
+        assert content == [
+            {"type": "text", "text": "static", "cache_control": {"type": "ephemeral"}},
+            {"type": "text", "text": "dynamic"},
+        ]
+
+    def test_auto_plain_string_for_other_models(self):
+        provider = OpenAICompatibleProvider(default_model="gpt-4o")
+        assert provider.format_system_content("static", "dynamic") == "static\n\n\ndynamic"
+
+    def test_off_and_on_override_model(self):
+        off = OpenAICompatibleProvider(default_model="claude-3-haiku", cache_hints="off")
+        on = OpenAICompatibleProvider(default_model="gpt-4o", cache_hints="on")
+
+        assert isinstance(off.format_system_content("a", "b"), str)
+        assert on.format_system_content("a")[0]["cache_control"] == {"type": "ephemeral"}
+
+
+class TestCachedTokenUsage:
+    """Tests for reading and accumulating cached-token counts."""
+
+    def test_parse_openai_prompt_tokens_details(self):
+        usage = SimpleNamespace(
+            prompt_tokens=1000,
+            completion_tokens=50,
+            total_tokens=1050,
+            prompt_tokens_details=SimpleNamespace(cached_tokens=768),
+        )
+        parsed = OpenAICompatibleProvider()._parse_usage(usage)
+        assert parsed["cached_tokens"] == 768
+
+    def test_parse_deepseek_cache_hit_tokens(self):
+        usage = SimpleNamespace(
+            prompt_tokens=1000,
+            completion_tokens=50,
+            total_tokens=1050,
+            prompt_tokens_details=None,
+            prompt_cache_hit_tokens=512,
+        )
+        assert OpenAICompatibleProvider()._parse_usage(usage)["cached_tokens"] == 512
+
+    def test_parse_without_cache_fields(self):
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=5, total_tokens=15)
+        assert OpenAICompatibleProvider()._parse_usage(usage)["cached_tokens"] == 0
+
+    @pytest.mark.asyncio
+    async def test_agent_accumulates_cache_stats(self):
+        provider = UsageProvider({"prompt_tokens": 400, "cached_tokens": 300})
+        agent = AgentLoop(provider=provider, enable_korean_review=False)
+
+        await agent.run(Session(key="a"), "hi")
+        await agent.run(Session(key="b"), "hello")
+
+        assert agent.prompt_cache_stats() == {
+            "prompt_tokens": 800,
+            "cached_tokens": 600,
+            "hit_rate": 0.75,
+        }
+        assert "Current Time" in provider.messages[0]["content"]
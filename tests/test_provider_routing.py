@@ -0,0 +1,230 @@
+"""Tests for failover, circuit breaking and hedging across LLM backends."""
+
+import asyncio
+
+import pytest
+
+from tokamak.providers import LLMProvider, LLMResponse, RoutingProvider, StreamDelta
+
+
+class FakeBackend(LLMProvider):
+    """Provider answering with its name after a delay, or failing on demand."""
+
+    def __init__(self, name: str, delay: float = 0.0, fail: bool = False, raises: bool = False):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+        self.fail = fail
+        self.raises = raises
+        self.calls = 0
+        self.cancelled = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        try:
+            await asyncio.sleep(self.delay)
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        if self.raises:
+            raise ConnectionError("connection reset")
+        if self.fail:
+            return LLMResponse(content="error", finish_reason="error")
+        return LLMResponse(content=self.name)
+
+    def get_default_model(self) -> str:
+        return f"{self.name}-model"
+
+
+class StreamingBackend(FakeBackend):
+    """Backend streaming a few text deltas before the final response."""
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        for chunk in ("o", "k"):
+            yield StreamDelta(content=chunk)
+        finish_reason = "error" if self.fail else "stop"
+        yield StreamDelta(response=LLMResponse(content="ok", finish_reason=finish_reason))
+
+
+async def read_until_response(stream) -> LLMResponse:
+    """Read a stream the way AgentLoop does, abandoning it at the final delta."""
+    async for delta in stream:
+        if delta.response is not None:
+            return delta.response
+    raise AssertionError("stream ended without a response")
+
+
+def router(*backends: FakeBackend, **kwargs) -> RoutingProvider:
+    return RoutingProvider([(b.name, b) for b in backends], **kwargs)
+
+
+MESSAGES = [{"role": "user", "content": "hi"}]
+
+
+class TestFailover:
+    """Tests for failing over between backends."""
+
+    @pytest.mark.asyncio
+    async def test_error_response_fails_over(self):
+        primary, secondary = FakeBackend("a", fail=True), FakeBackend("b")
+        provider = router(primary, secondary)
+
+        response = await provider.chat(MESSAGES)
+
+        assert response.content == "b"
+        stats = provider.stats()
+        assert stats["a"]["errors"] == 1
+        assert stats["b"]["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_exception_and_timeout_fail_over(self):
+        broken = FakeBackend("a", raises=True)
+        slow = FakeBackend("b", delay=1.0)
+        healthy = FakeBackend("c")
+        provider = router(broken, slow, healthy, timeout_seconds=0.05)
+
+        response = await provider.chat(MESSAGES)
+
+        assert response.content == "c"
+        assert provider.stats()["b"]["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_all_failing_returns_error_response(self):
+        provider = router(FakeBackend("a", fail=True), FakeBackend("b", raises=True))
+
+        response = await provider.chat(MESSAGES)
+
+        assert response.finish_reason == "error"
+
+    def test_delegates_to_primary(self):
+        provider = router(FakeBackend("a"), FakeBackend("b"))
+
+        assert provider.get_default_model() == "a-model"
+        assert provider.format_system_content("p", "s") == "p\n\n\ns"
+
+
+class TestCircuitBreaker:
+    """Tests for taking failing backends out of rotation."""
+
+    @pytest.mark.asyncio
+    async def test_opens_after_threshold_and_probes_after_cooldown(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("tokamak.providers.router.time.monotonic", lambda: clock[0])
+        primary, secondary = FakeBackend("a", fail=True), FakeBackend("b")
+        provider = router(primary, secondary, failure_threshold=2, cooldown_seconds=30)
+
+        for _ in range(4):
+            await provider.chat(MESSAGES)
+        assert provider.stats()["a"]["state"] == "open"
+        assert primary.calls == 2
+
+        clock[0] += 31
+        primary.fail = False
+        await provider.chat(MESSAGES)
+
+        assert provider.stats()["a"]["state"] == "closed"
+        assert primary.calls == 3
+
+    @pytest.mark.asyncio
+    async def test_failed_probe_reopens(self, monkeypatch):
+        clock = [1000.0]
+        monkeypatch.setattr("tokamak.providers.router.time.monotonic", lambda: clock[0])
+        primary = FakeBackend("a", fail=True)
+        provider = router(primary, FakeBackend("b"), failure_threshold=1, cooldown_seconds=30)
+
+        await provider.chat(MESSAGES)
+        clock[0] += 31
+        await provider.chat(MESSAGES)
+
+        assert provider.stats()["a"]["state"] == "open"
+        assert primary.calls == 2
+
+
+class TestSelection:
+    """Tests for latency-aware ordering and hedging."""
+
+    @pytest.mark.asyncio
+    async def test_prefers_faster_backend(self):
+        slow, fast = FakeBackend("slow", delay=0.03), FakeBackend("fast")
+        provider = router(slow, fast)
+
+        # Both get measured once, then the faster one is preferred
+        await provider.chat(MESSAGES)
+        await provider.chat(MESSAGES)
+        responses = [await provider.chat(MESSAGES) for _ in range(3)]
+
+        assert [r.content for r in responses] == ["fast"] * 3
+        assert slow.calls == 1
+
+    @pytest.mark.asyncio
+    async def test_hedge_wins_and_cancels_slow_request(self):
+        primary, secondary = FakeBackend("a", delay=0.01), FakeBackend("b", delay=0.02)
+        provider = router(primary, secondary, hedge=True, hedge_min_samples=3)
+        backend_a = provider.backends[0]
+        for _ in range(3):
+            backend_a.latency.add(0.01)
+        provider.backends[1].latency.add(0.02)
+
+        primary.delay = 1.0
+        response = await provider.chat(MESSAGES)
+        await asyncio.sleep(0.01)  # let the cancellation reach the losing request
+
+        assert response.content == "b"
+        assert primary.cancelled == 1
+        stats = provider.stats()["b"]
+        assert stats["hedges"] == 1
+        assert stats["hedge_wins"] == 1
+
+    @pytest.mark.asyncio
+    async def test_no_hedge_without_latency_samples(self):
+        primary, secondary = FakeBackend("a", delay=0.05), FakeBackend("b")
+        provider = router(primary, secondary, hedge=True)
+
+        response = await provider.chat(MESSAGES)
+
+        assert response.content == "a"
+        assert secondary.calls == 0
+
+
+class TestStreamFailover:
+    """Tests for failing over streams before their first delta and recording their outcome."""
+
+    @pytest.mark.asyncio
+    async def test_stream_fails_over_on_error_delta(self):
+        provider = router(FakeBackend("a", fail=True), FakeBackend("b"))
+
+        deltas: list[StreamDelta] = [d async for d in provider.chat_stream(MESSAGES)]
+
+        assert deltas[-1].response.content == "b"
+        assert provider.stats()["b"]["failovers"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_times_out_waiting_for_first_delta(self):
+        provider = router(FakeBackend("a", delay=1.0), FakeBackend("b"), timeout_seconds=0.05)
+
+        deltas = [d async for d in provider.chat_stream(MESSAGES)]
+
+        assert deltas[-1].response.content == "b"
+        assert provider.stats()["a"]["timeouts"] == 1
+
+    @pytest.mark.asyncio
+    async def test_stream_is_recorded_when_consumer_stops_at_final_delta(self):
+        provider = router(StreamingBackend("a"))
+
+        response = await read_until_response(provider.chat_stream(MESSAGES))
+
+        assert response.content == "ok"
+        stats = provider.stats()["a"]
+        assert stats["latency_p50_ms"] is not None
+        assert stats["errors"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stream_ending_in_error_is_recorded_at_final_delta(self):
+        provider = router(StreamingBackend("a", fail=True))
+
+        response = await read_until_response(provider.chat_stream(MESSAGES))
+
+        assert response.finish_reason == "error"
+        assert provider.stats()["a"]["errors"] == 1
+        assert provider.stats()["a"]["latency_p50_ms"] is None
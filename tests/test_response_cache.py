@@ -0,0 +1,179 @@
+"""Tests for the FAQ response cache."""
+
+import time
+
+import pytest
+
+from tokamak.agent.loop import AgentLoop
+from tokamak.agent.response_cache import ResponseCache, is_time_sensitive, normalize_question
+from tokamak.agent.tools import Tool, ToolRegistry
+from tokamak.providers import LLMProvider, LLMResponse, ToolCallRequest
+from tokamak.session import Session
+
+
+class CountingProvider(LLMProvider):
+    """Provider answering every request with the same text, counting calls."""
+
+    def __init__(self, responses: list[LLMResponse] | None = None):
+        super().__init__()
+        self.responses = responses
+        self.calls = 0
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        self.calls += 1
+        if self.responses:
+            return self.responses.pop(0)
+        return LLMResponse(content="Staking guide", usage={"total_tokens": 1500})
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+class PriceTool(Tool):
+    name = "price"
+    description = "returns a price"
+    parameters = {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs) -> str:
+        return "1.23"
+
+
+def fresh_session(key: str, message: str) -> Session:
+    session = Session(key=key)
+    session.add_message("user", message)
+    return session
+
+
+class TestResponseCache:
+    """Tests for the cache itself."""
+
+    def test_normalizes_case_spacing_and_punctuation(self):
+        assert normalize_question("TON 가격 알려줘?!") == normalize_question("ton가격  알려줘")
+
+    def test_hit_counts_saved_tokens(self):
+        cache = ResponseCache()
+        cache.put("What is staking?", "answer", tokens=1200)
+
+        assert cache.get("what is staking") == "answer"
+        assert cache.get("something else") is None
+        assert cache.stats()["tokens_saved"] == 1200
+        assert cache.stats()["hit_rate"] == 0.5
+
+    def test_expired_entries_miss(self, monkeypatch):
+        cache = ResponseCache(ttl_seconds=10)
+        cache.put("q", "a")
+        now = time.monotonic()
+        monkeypatch.setattr(time, "monotonic", lambda: now + 11)
+
+        assert cache.get("q") is None
+        assert len(cache) == 0
+
+    def test_lru_eviction(self):
+        cache = ResponseCache(max_entries=2)
+        cache.put("a", "1")
+        cache.put("b", "2")
+        cache.get("a")
+        cache.put("c", "3")
+
+        assert cache.get("b") is None
+        assert cache.get("a") == "1"
+        assert cache.stats()["evictions"] == 1
+
+    def test_version_change_invalidates(self):
+        cache = ResponseCache()
+        cache.put("q", "a", version="v1")
+
+        assert cache.get("q", version="v2") is None
+        assert cache.stats()["invalidations"] == 1
+
+    def test_similarity_match(self):
+        cache = ResponseCache(similarity_threshold=0.6)
+        cache.put("스테이킹 방법 알려주세요", "guide")
+
+        assert cache.get("스테이킹 방법 좀 알려주세요") == "guide"
+        assert cache.get("DAO 투표 방법") is None
+
+    @pytest.mark.parametrize(
+        "question",
+        [
+            "TON price?",
+            "What's the latest news?",
+            "오늘 TON 시세",
+            "지금 가스비 얼마야",
+            "TON 가격 알려줘",
+        ],
+    )
+    def test_time_sensitive_questions(self, question):
+        assert is_time_sensitive(question)
+
+    @pytest.mark.parametrize("question", ["How do I know my wallet address?", "스테이킹 방법"])
+    def test_evergreen_questions(self, question):
+        assert not is_time_sensitive(question)
+
+    def test_time_sensitive_answers_not_cached(self):
+        cache = ResponseCache(similarity_threshold=0.5)
+        cache.put("TON 시세 알려줘", "2.1 USD")
+        cache.put("TON staking guide", "guide")
+
+        assert cache.get("TON 시세 알려줘") is None
+        # Nor served from a similar evergreen entry
+        assert cache.get("TON staking guide today") is None
+        assert len(cache) == 1
+        assert cache.stats()["skipped"] == 1
+
+
+class TestAgentLoopCache:
+    """Tests for the cache in front of AgentLoop.run."""
+
+    @pytest.mark.asyncio
+    async def test_repeated_question_skips_llm(self):
+        provider = CountingProvider()
+        agent = AgentLoop(
+            provider=provider, enable_korean_review=False, response_cache=ResponseCache()
+        )
+
+        first = await agent.run(fresh_session("a", "How to stake?"), "How to stake?")
+        second = await agent.run(fresh_session("b", "how to stake"), "how to stake")
+
+        assert first == second == "Staking guide"
+        assert provider.calls == 1
+        assert agent.response_cache.stats()["tokens_saved"] == 1500
+
+    @pytest.mark.asyncio
+    async def test_session_with_history_not_cached(self):
+        provider = CountingProvider()
+        agent = AgentLoop(
+            provider=provider, enable_korean_review=False, response_cache=ResponseCache()
+        )
+        session = fresh_session("a", "hi")
+        session.add_message("assistant", "hello")
+        session.add_message("user", "How to stake?")
+
+        await agent.run(session, "How to stake?")
+
+        assert len(agent.response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_tool_answers_not_cached(self):
+        provider = CountingProvider(
+            [
+                LLMResponse(
+                    content=None,
+                    tool_calls=[ToolCallRequest(id="1", name="price", arguments={})],
+                ),
+                LLMResponse(content="Price is 1.23"),
+            ]
+        )
+        tools = ToolRegistry()
+        tools.register(PriceTool())
+        agent = AgentLoop(
+            provider=provider,
+            tools=tools,
+            enable_korean_review=False,
+            response_cache=ResponseCache(),
+        )
+
+        result = await agent.run(fresh_session("a", "TON supply?"), "TON supply?")
+
+        assert result == "Price is 1.23"
+        assert len(agent.response_cache) == 0
@@ -0,0 +1,128 @@
+"""Tests for the BM25 retrieval index over prompt content."""
+
+import json
+
+import pytest
+
+from tokamak.agent.prompts import build_system_prompt_parts, get_tokamak_knowledge
+from tokamak.agent.retrieval import (
+    _HEADER,
+    INDEX_MAGIC,
+    INDEX_VERSION,
+    Chunk,
+    RetrievalIndex,
+    build_corpus,
+    chunk_knowledge,
+    load_or_build_index,
+    tokenize,
+)
+
+
+@pytest.fixture(scope="module")
+def index() -> RetrievalIndex:
+    return RetrievalIndex.build()
+
+
+class TestTokenize:
+    """Tests for index term extraction."""
+
+    def test_hangul_bigrams_and_latin_words(self):
+        assert tokenize("TON 스테이킹") == ["ton", "스테", "테이", "이킹"]
+
+    def test_drops_question_words(self):
+        assert tokenize("How do I stake?") == ["stake"]
+
+
+class TestCorpus:
+    """Tests for chunking the prompt content."""
+
+    def test_knowledge_split_by_section(self):
+        chunks = chunk_knowledge(get_tokamak_knowledge())
+        titles = [c.title for c in chunks]
+        assert "Core Technology" in titles
+        assert all(c.text.startswith("## ") for c in chunks)
+
+    def test_corpus_contains_patterns_and_knowledge(self):
+        kinds = {c.kind for c in build_corpus()}
+        assert kinds == {"pattern", "knowledge"}
+
+
+class TestRetrievalIndex:
+    """Tests for ranking and persistence."""
+
+    def test_paraphrase_finds_pattern(self, index):
+        results = index.search("업비트에서 톤 팔 수 있어요?", k=1, kind="pattern")
+        assert "구매" in results[0][0].title
+
+    def test_unrelated_query_returns_nothing(self, index):
+        assert index.search("오늘 날씨 어때요?") == []
+
+    def test_saved_index_matches_in_memory(self, index, tmp_path):
+        path = tmp_path / "retrieval.idx"
+        index.save(path)
+        loaded = RetrievalIndex.load(path)
+        try:
+            for query in ["What happened to Titan?", "스테이킹 보상", "contract address"]:
+                assert loaded.search(query) == index.search(query)
+        finally:
+            loaded.close()
+
+    def test_rejects_foreign_file(self, tmp_path):
+        path = tmp_path / "bogus.idx"
+        path.write_bytes(b"not an index at all")
+        with pytest.raises(ValueError):
+            RetrievalIndex.load(path)
+
+    @pytest.mark.parametrize(
+        "content",
+        [
+            INDEX_MAGIC[:2],
+            _HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 2) + b"{}",
+            _HEADER.pack(INDEX_MAGIC, INDEX_VERSION, 7) + b'{"x": 1',
+        ],
+        ids=["truncated_header", "missing_metadata", "broken_json"],
+    )
+    def test_corrupt_file_raises_value_error(self, tmp_path, content):
+        path = tmp_path / "retrieval.idx"
+        path.write_bytes(content)
+        with pytest.raises(ValueError):
+            RetrievalIndex.load(path)
+
+    def test_corrupt_index_is_rebuilt(self, tmp_path):
+        path = tmp_path / "retrieval.idx"
+        meta = json.dumps({"fingerprint": "x"}).encode()
+        path.write_bytes(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(meta)) + meta)
+
+        index = load_or_build_index(path)
+
+        assert len(index.chunks) == len(build_corpus())
+
+    def test_stale_index_is_rebuilt(self, tmp_path):
+        path = tmp_path / "retrieval.idx"
+        RetrievalIndex.build([Chunk(kind="knowledge", title="old", text="## old")]).save(path)
+
+        index = load_or_build_index(path)
+
+        assert len(index.chunks) == len(build_corpus())
+        reloaded = RetrievalIndex.load(path)
+        assert reloaded.fingerprint == index.fingerprint
+        reloaded.close()
+
+
+class TestRetrievalPrompt:
+    """Tests for retrieval-backed system prompts."""
+
+    def test_knowledge_moves_to_suffix(self, index):
+        parts = build_system_prompt_parts(user_message="What happened to Titan?", retriever=index)
+
+        assert "# Tokamak Network Knowledge Base\n" not in parts.prefix
+        assert "relevant sections" in parts.suffix
+        assert "Titan" in parts.suffix
+
+    def test_retrieval_shrinks_prompt(self, index):
+        message = "스테이킹 방법 알려주세요"
+        full = build_system_prompt_parts(user_message=message).text
+        retrieved = build_system_prompt_parts(user_message=message, retriever=index).text
+
+        assert len(retrieved) < len(full) * 0.8
+        assert "COPY THIS ANSWER EXACTLY" in retrieved
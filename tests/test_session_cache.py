@@ -0,0 +1,96 @@
+"""Tests for the LRU-bounded session cache."""
+
+import pytest
+
+from tokamak.session import SessionManager, SQLiteSessionStore
+from tokamak.session.manager import SESSION_OVERHEAD_BYTES
+
+
+class TestSessionCache:
+    """Tests for LRU eviction, byte budgets and stats."""
+
+    def test_evicts_least_recently_used(self):
+        manager = SessionManager(max_sessions=2)
+        manager.get_or_create("a").add_message("user", "hi")
+        manager.get_or_create("b").add_message("user", "hi")
+        manager.get_or_create("a")  # touch
+        manager.get_or_create("c")
+
+        assert manager.get("b") is None
+        assert manager.get("a") is not None
+        assert manager.stats()["evictions"] == 1
+
+    def test_raid_stays_under_memory_ceiling(self):
+        ceiling = 200_000
+        manager = SessionManager(max_total_bytes=ceiling)
+        for i in range(5000):
+            manager.get_or_create(f"discord:1:{i}").add_message("user", "안녕하세요 " * 20)
+
+        stats = manager.stats()
+        assert stats["bytes"] <= ceiling
+        assert stats["sessions"] < 5000
+        assert stats["evictions"] == 5000 - stats["sessions"]
+
+    def test_per_session_byte_budget(self):
+        manager = SessionManager(max_session_bytes=4096)
+        session = manager.get_or_create("a")
+        for i in range(50):
+            session.add_message("user", f"{i} " + "x" * 500)
+
+        assert session.nbytes <= 4096
+        assert session.messages[-1]["content"].startswith("49 ")
+        assert session.nbytes == sum(m.nbytes for m in session.messages)
+
+    def test_oversized_message_is_kept(self):
+        manager = SessionManager(max_session_bytes=100)
+        session = manager.get_or_create("a")
+        session.add_message("user", "x" * 1000)
+
+        assert len(session.messages) == 1
+
+    def test_bytes_tracked_through_clear_and_delete(self):
+        manager = SessionManager()
+        session = manager.get_or_create("a")
+        session.add_message("user", "hello")
+        assert manager.stats()["bytes"] == SESSION_OVERHEAD_BYTES + session.nbytes
+
+        session.clear()
+        assert manager.stats()["bytes"] == SESSION_OVERHEAD_BYTES
+
+        manager.delete("a")
+        assert manager.stats()["bytes"] == 0
+
+    def test_hits_and_misses(self):
+        manager = SessionManager()
+        manager.get_or_create("a")
+        manager.get_or_create("a")
+        manager.get_or_create("b")
+
+        stats = manager.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 2
+
+    def test_evicted_session_in_use_is_readmitted(self):
+        manager = SessionManager(max_sessions=1)
+        held = manager.get_or_create("a")
+        manager.get_or_create("b")
+        assert manager.get("a") is None
+
+        held.add_message("assistant", "late reply")
+
+        assert manager.get("a") is held
+
+    @pytest.mark.asyncio
+    async def test_evicted_unwritten_session_is_not_lost(self, tmp_path):
+        manager = SessionManager(
+            store=SQLiteSessionStore(tmp_path / "sessions.db"),
+            flush_interval_seconds=60,
+            max_sessions=1,
+        )
+        await manager.start()
+        manager.get_or_create("a").add_message("user", "not yet written")
+        manager.get_or_create("b")
+
+        revived = manager.get_or_create("a")
+        assert [m["content"] for m in revived.messages] == ["not yet written"]
+        await manager.close()
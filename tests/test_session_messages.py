@@ -0,0 +1,98 @@
+"""Tests for compact message records and the history ring buffer."""
+
+import sys
+
+from tokamak.session import Message, Session
+from tokamak.session.messages import MessageBuffer
+
+
+def make_buffer(capacity: int, count: int) -> MessageBuffer:
+    buffer = MessageBuffer(capacity)
+    for i in range(count):
+        buffer.append(Message("user", f"m{i}"))
+    return buffer
+
+
+class TestMessage:
+    """Tests for the slotted message record."""
+
+    def test_roles_are_interned(self):
+        role = "".join(["assis", "tant"])
+        assert Message(role, "x").role is sys.intern("assistant")
+
+    def test_mapping_access(self):
+        msg = Message("user", "hi", extra={"author_name": "kim", "message_id": "7", "lang": "ko"})
+
+        assert msg["content"] == "hi"
+        assert msg["author_name"] == "kim"
+        assert msg["lang"] == "ko"
+        assert msg.get("missing") is None
+
+    def test_round_trip_and_legacy_timestamp(self):
+        msg = Message("user", "hi", extra={"message_id": "7"})
+        assert Message.from_dict(msg.to_dict()).to_dict() == msg.to_dict()
+
+        legacy = Message.from_dict(
+            {"role": "user", "content": "hi", "timestamp": "2026-01-01T09:00:00"}
+        )
+        assert isinstance(legacy.timestamp, float)
+
+
+class TestMessageBuffer:
+    """Tests for ring buffer ordering and O(1) trimming."""
+
+    def test_overwrites_oldest_when_full(self):
+        buffer = make_buffer(3, 5)
+
+        assert [m.content for m in buffer] == ["m2", "m3", "m4"]
+        assert buffer[0].content == "m2"
+        assert buffer[-1].content == "m4"
+
+    def test_append_returns_displaced(self):
+        buffer = make_buffer(2, 2)
+
+        evicted = buffer.append(Message("user", "new"))
+
+        assert evicted.content == "m0"
+
+    def test_popleft(self):
+        buffer = make_buffer(3, 4)
+
+        assert buffer.popleft().content == "m1"
+        assert [m.content for m in buffer] == ["m2", "m3"]
+
+    def test_tail_view(self):
+        buffer = make_buffer(5, 7)
+
+        view = buffer.tail(3)
+
+        assert view == [
+            {"role": "user", "content": "m4"},
+            {"role": "user", "content": "m5"},
+            {"role": "user", "content": "m6"},
+        ]
+        assert view[-1] is buffer[-1].as_llm()
+        assert list(view[:-1]) == list(buffer.tail(3))[:2]
+        assert len(buffer.tail(50)) == 5
+
+
+class TestSessionHistory:
+    """Tests for Session.get_history on top of the ring buffer."""
+
+    def test_history_limited_and_ordered(self):
+        session = Session(key="t", max_messages=4)
+        for i in range(6):
+            session.add_message("user" if i % 2 == 0 else "assistant", f"m{i}")
+
+        history = session.get_history(max_messages=3)
+
+        assert [m["content"] for m in history] == ["m3", "m4", "m5"]
+        assert len(session.messages) == 4
+
+    def test_clear(self):
+        session = Session(key="t")
+        session.add_message("user", "hi")
+        session.clear()
+
+        assert len(session.get_history()) == 0
+        assert session.nbytes == 0
@@ -0,0 +1,212 @@
+"""Tests for SQLite-backed session persistence."""
+
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+
+from tokamak.session import SessionManager, SQLiteSessionStore
+from tokamak.session.store import SessionOp
+
+
+def make_manager(tmp_path, **kwargs) -> SessionManager:
+    kwargs.setdefault("flush_interval_seconds", 60)
+    return SessionManager(store=SQLiteSessionStore(tmp_path / "sessions.db"), **kwargs)
+
+
+class CountingStore(SQLiteSessionStore):
+    """Store that records the size of each write batch."""
+
+    def __init__(self, path):
+        super().__init__(path)
+        self.batches: list[int] = []
+
+    def write(self, ops: list[SessionOp], max_messages: int) -> None:
+        self.batches.append(len(ops))
+        super().write(ops, max_messages)
+
+
+class TestSessionPersistence:
+    """Tests for write-behind persistence and lazy loading."""
+
+    @pytest.mark.asyncio
+    async def test_round_trip_across_restart(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        session = manager.get_or_create("discord:1:2")
+        session.add_message("user", "안녕하세요", message_id="42")
+        session.add_message("assistant", "반가워요")
+        session.end()
+        await manager.close()
+
+        restarted = make_manager(tmp_path)
+        await restarted.start()
+        loaded = restarted.get_or_create("discord:1:2")
+
+        assert [m["content"] for m in loaded.messages] == ["안녕하세요", "반가워요"]
+        assert loaded.messages[0]["message_id"] == "42"
+        assert loaded.is_ended
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_replaced_content_is_persisted(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        session = manager.get_or_create("discord:1:2")
+        session.add_message("user", "질문")
+        answer = session.add_message("assistant", "처음 답변")
+        session.add_message("user", "다음 질문")
+        assert session.replace_content(answer, "고친 답변")
+        await manager.close()
+
+        restarted = make_manager(tmp_path)
+        await restarted.start()
+        loaded = restarted.get_or_create("discord:1:2")
+
+        assert [m.content for m in loaded.messages] == ["질문", "고친 답변", "다음 질문"]
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_appends_are_batched(self, tmp_path):
+        store = CountingStore(tmp_path / "sessions.db")
+        manager = SessionManager(store=store, flush_interval_seconds=60)
+        await manager.start()
+
+        session = manager.get_or_create("discord:1:2")
+        for i in range(10):
+            session.add_message("user", f"message {i}")
+        assert store.batches == []
+
+        await manager.flush()
+        assert store.batches == [10]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_batch_size_triggers_early_flush(self, tmp_path):
+        store = CountingStore(tmp_path / "sessions.db")
+        manager = SessionManager(store=store, flush_interval_seconds=60, flush_batch_size=3)
+        await manager.start()
+
+        session = manager.get_or_create("discord:1:2")
+        for i in range(3):
+            session.add_message("user", f"message {i}")
+        for _ in range(50):
+            if store.batches:
+                break
+            await asyncio.sleep(0.01)
+
+        assert store.batches == [3]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_stale_session_evicted_but_kept_on_disk(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        session = manager.get_or_create("discord:1:2")
+        session.add_message("user", "hello")
+        session.updated_at = datetime.now() - timedelta(hours=2)
+
+        # Unwritten changes keep the session in memory
+        assert manager.cleanup_stale(max_age_seconds=3600) == 0
+        await manager.flush()
+        assert manager.cleanup_stale(max_age_seconds=3600) == 1
+        assert manager.get("discord:1:2") is None
+
+        reloaded = manager.get_or_create("discord:1:2")
+        assert [m["content"] for m in reloaded.messages] == ["hello"]
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_stored_history_is_trimmed(self, tmp_path):
+        manager = make_manager(tmp_path, max_messages=3)
+        await manager.start()
+        session = manager.get_or_create("discord:1:2")
+        for i in range(5):
+            session.add_message("user", f"message {i}")
+        await manager.close()
+
+        restarted = make_manager(tmp_path, max_messages=10)
+        await restarted.start()
+        loaded = restarted.get_or_create("discord:1:2")
+        assert [m["content"] for m in loaded.messages] == ["message 2", "message 3", "message 4"]
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_rehydrates_recent_sessions(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        manager.get_or_create("discord:1:recent").add_message("user", "hi")
+        old = manager.get_or_create("discord:1:old")
+        old.add_message("user", "hi")
+        old.updated_at = datetime.now() - timedelta(days=1)
+        manager._on_session_change(old, "state", None)
+        await manager.close()
+
+        restarted = make_manager(tmp_path)
+        await restarted.start()
+        await restarted._rehydrate_task
+
+        assert restarted.get("discord:1:recent") is not None
+        assert restarted.get("discord:1:old") is None
+        await restarted.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_removes_from_disk(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        manager.get_or_create("discord:1:2").add_message("user", "hello")
+        await manager.flush()
+
+        assert manager.delete("discord:1:2")
+        await manager.flush()
+        assert manager.store.load("discord:1:2", 10) is None
+        assert not manager.delete("discord:1:2")
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_deleted_session_is_not_loaded_before_flush(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        manager.get_or_create("k").add_message("user", "secret")
+        await manager.flush()
+        manager._evict("k")
+
+        assert manager.delete("k")
+        assert list(manager.get_or_create("k").messages) == []
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_delete_checks_existence_without_loading(self, tmp_path, monkeypatch):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        manager.get_or_create("k").add_message("user", "hello")
+        await manager.flush()
+        manager._evict("k")
+
+        def no_load(*args):
+            raise AssertionError("delete should not load the history")
+
+        monkeypatch.setattr(manager.store, "load", no_load)
+        assert manager.delete("k")
+        assert not manager.delete("missing")
+        await manager.close()
+
+    @pytest.mark.asyncio
+    async def test_purge_stored(self, tmp_path):
+        manager = make_manager(tmp_path)
+        await manager.start()
+        session = manager.get_or_create("discord:1:2")
+        session.add_message("user", "hello")
+        session.updated_at = datetime.now() - timedelta(days=40)
+        manager._on_session_change(session, "state", None)
+
+        assert await manager.purge_stored(max_age_seconds=30 * 86400) == 1
+        await manager.close()
+
+    def test_memory_only_without_store(self):
+        manager = SessionManager()
+        session = manager.get_or_create("discord:1:2")
+        session.add_message("user", "hello")
+
+        assert manager.get_or_create("discord:1:2") is session
+        assert manager.delete("discord:1:2")
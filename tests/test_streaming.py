@@ -0,0 +1,215 @@
+"""Tests for streamed LLM output and progressively edited Discord replies."""
+
+import asyncio
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from tokamak.agent.loop import AgentLoop
+from tokamak.agent.tools import Tool, ToolRegistry
+from tokamak.channels.discord import StreamingReply
+from tokamak.providers import LLMProvider, LLMResponse, StreamDelta, ToolCallRequest
+from tokamak.providers.openai_provider import OpenAICompatibleProvider
+from tokamak.session import Session
+
+
+class ScriptedProvider(LLMProvider):
+    """Provider that streams a fixed list of deltas per turn."""
+
+    def __init__(self, turns: list[list[StreamDelta]]):
+        super().__init__()
+        self.turns = list(turns)
+
+    async def chat(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        raise AssertionError("chat should not be called when streaming")
+
+    async def chat_stream(self, messages, tools=None, model=None, max_tokens=4096, temperature=0.7):
+        for delta in self.turns.pop(0):
+            yield delta
+
+    def get_default_model(self) -> str:
+        return "test"
+
+
+class NoopTool(Tool):
+    name = "noop"
+    description = "does nothing"
+    parameters = {"type": "object", "properties": {}}
+
+    async def execute(self, **kwargs) -> str:
+        return "ok"
+
+
+def make_fake_message():
+    """Create a Discord message double whose replies record their content."""
+    sent = []
+
+    def make_sent(content):
+        msg = MagicMock()
+        msg.content = content
+
+        async def edit(content):
+            msg.content = content
+
+        msg.edit = AsyncMock(side_effect=edit)
+        msg.delete = AsyncMock(side_effect=lambda: sent.remove(msg))
+        sent.append(msg)
+        return msg
+
+    source = MagicMock()
+    source.reply = AsyncMock(side_effect=make_sent)
+    source.channel.send = AsyncMock(side_effect=make_sent)
+    return source, sent
+
+
+class TestAgentLoopStreaming:
+    """Tests for AgentLoop streaming mode."""
+
+    @pytest.mark.asyncio
+    async def test_partials_grow_and_final_is_returned(self):
+        provider = ScriptedProvider(
+            [
+                [
+                    StreamDelta(content="Hello"),
+                    StreamDelta(content=" world"),
+                    StreamDelta(response=LLMResponse(content="Hello world")),
+                ]
+            ]
+        )
+        agent = AgentLoop(provider=provider, enable_korean_review=False, stream=True)
+        partials = []
+
+        async def on_partial(text):
+            partials.append(text)
+
+        result = await agent.run(Session(key="t"), "hi", on_partial=on_partial)
+
+        assert result == "Hello world"
+        assert partials == ["Hello", "Hello world"]
+
+    @pytest.mark.asyncio
+    async def test_text_tool_calls_are_never_shown(self):
+        tool_text = '<tool_call>{"name": "noop", "arguments": {}}</tool_call>'
+        provider = ScriptedProvider(
+            [
+                [
+                    StreamDelta(content="Checking "),
+                    StreamDelta(content=tool_text[:8]),
+                    StreamDelta(content=tool_text[8:]),
+                    StreamDelta(
+                        response=LLMResponse(
+                            content="Checking",
+                            tool_calls=[ToolCallRequest(id="1", name="noop", arguments={})],
+                        )
+                    ),
+                ],
+                [StreamDelta(content="Done"), StreamDelta(response=LLMResponse(content="Done"))],
+            ]
+        )
+        tools = ToolRegistry()
+        tools.register(NoopTool())
+        agent = AgentLoop(provider=provider, tools=tools, enable_korean_review=False, stream=True)
+        partials = []
+
+        async def on_partial(text):
+            partials.append(text)
+
+        result = await agent.run(Session(key="t"), "hi", on_partial=on_partial)
+
+        assert result == "Done"
+        assert all("<tool" not in p and "<" not in p for p in partials)
+        assert partials[-1] == "Done"
+
+    def test_visible_partial_hides_end_marker_prefix(self):
+        agent = AgentLoop(provider=AsyncMock(), enable_korean_review=False)
+        assert agent._visible_partial("Bye! ===END_CONV") == "Bye!"
+        assert agent._visible_partial("Bye! ===END_CONVERSATION===") == "Bye!"
+
+    @pytest.mark.asyncio
+    async def test_streaming_disabled_uses_chat(self):
+        provider = AsyncMock(spec=LLMProvider)
+        provider.chat.return_value = LLMResponse(content="plain")
+        agent = AgentLoop(provider=provider, enable_korean_review=False)
+        on_partial = AsyncMock()
+
+        result = await agent.run(Session(key="t"), "hi", on_partial=on_partial)
+
+        assert result == "plain"
+        on_partial.assert_not_called()
+
+
+class TestOpenAIStreamAssembly:
+    """Tests for assembling streamed OpenAI chunks into an LLMResponse."""
+
+    @staticmethod
+    def chunk(content=None, tool_calls=None, finish_reason=None, usage=None):
+        delta = SimpleNamespace(content=content, tool_calls=tool_calls)
+        choices = [SimpleNamespace(delta=delta, finish_reason=finish_reason)]
+        return SimpleNamespace(choices=choices if usage is None else [], usage=usage)
+
+    @staticmethod
+    def tool_delta(index, id=None, name=None, arguments=None):
+        return SimpleNamespace(
+            index=index, id=id, function=SimpleNamespace(name=name, arguments=arguments)
+        )
+
+    @pytest.mark.asyncio
+    async def test_tool_call_fragments_are_joined(self):
+        chunks = [
+            self.chunk(tool_calls=[self.tool_delta(0, id="call_1", name="web_fetch")]),
+            self.chunk(tool_calls=[self.tool_delta(0, arguments='{"url": ')]),
+            self.chunk(tool_calls=[self.tool_delta(0, arguments='"https://x.io"}')]),
+            self.chunk(finish_reason="tool_calls"),
+            self.chunk(usage=SimpleNamespace(prompt_tokens=5, completion_tokens=3, total_tokens=8)),
+        ]
+
+        async def fake_stream():
+            for c in chunks:
+                yield c
+
+        provider = OpenAICompatibleProvider(api_key="k")
+        provider.client = MagicMock()
+        provider.client.chat.completions.create = AsyncMock(return_value=fake_stream())
+
+        deltas = [d async for d in provider.chat_stream(messages=[])]
+        response = deltas[-1].response
+
+        assert response.finish_reason == "tool_calls"
+        assert response.tool_calls[0].name == "web_fetch"
+        assert response.tool_calls[0].arguments == {"url": "https://x.io"}
+        assert response.usage["total_tokens"] == 8
+        assert deltas[0].tool_calls[0].name == "web_fetch"
+
+
+class TestStreamingReply:
+    """Tests for the progressively edited Discord reply."""
+
+    @pytest.mark.asyncio
+    async def test_first_update_posts_immediately(self):
+        source, sent = make_fake_message()
+        reply = StreamingReply(source, edit_interval=60)
+
+        await reply.update("안녕하세요")
+        await asyncio.sleep(0)
+        await reply.update("안녕하세요, 반가워요")  # throttled
+
+        assert [m.content for m in sent] == ["안녕하세요"]
+        assert reply.first_visible_after is not None
+
+        await reply.finish("안녕하세요, 반가워요!")
+        assert [m.content for m in sent] == ["안녕하세요, 반가워요!"]
+
+    @pytest.mark.asyncio
+    async def test_long_answer_is_split_and_surplus_deleted(self):
+        source, sent = make_fake_message()
+        reply = StreamingReply(source, edit_interval=0)
+        long_text = "\n".join(["line " + "x" * 90] * 40)
+
+        await reply.update(long_text)
+        await asyncio.sleep(0)
+        assert len(sent) == 3
+        assert all(len(m.content) <= 1900 for m in sent)
+
+        await reply.finish("short answer")
+        assert [m.content for m in sent] == ["short answer"]
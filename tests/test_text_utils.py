@@ -0,0 +1,81 @@
+"""Tests for script detection and statistics."""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from tokamak.config.schema import ModerationConfig
+from tokamak.moderation.detector import ToxicityDetector
+from tokamak.news.summarizer import NewsSummarizer
+from tokamak.providers import LLMProvider, LLMResponse
+from tokamak.utils.text import contains_hangul, detect_language, korean_ratio, script_stats
+
+
+class TestContainsHangul:
+    """Tests for Hangul detection."""
+
+    def test_syllables_and_jamo(self):
+        assert contains_hangul("hello 세계")
+        assert contains_hangul("ㅋㅋㅋ")
+        assert contains_hangul("ㅏ")
+
+    def test_non_korean(self):
+        assert not contains_hangul("plain ascii")
+        assert not contains_hangul("日本語とemoji 🚀")
+        assert not contains_hangul("")
+
+
+class TestScriptStats:
+    """Tests for per-script counts and ratios."""
+
+    def test_counts(self):
+        stats = script_stats("Hello 세계 123 🚀!")
+        assert stats == (2, 5, 3, 2)
+        assert stats.letters == 7
+
+    def test_ratios(self):
+        assert korean_ratio("가나 ab") == 0.5
+        assert script_stats("").korean_ratio == 0.0
+        assert script_stats("TON 스테이킹").english_ratio == 3 / 7
+
+    def test_detect_language(self):
+        assert detect_language("토카막 네트워크는 이더리움 레이어2 플랫폼이에요") == "ko"
+        assert detect_language("Tokamak Network is an L2 platform") == "en"
+        assert detect_language("TON staking 방법 알려줘") == "mixed"
+        assert detect_language("🚀🚀 123 !!") == "unknown"
+
+
+class TestSummarizerLanguageFallback:
+    """Tests for splitting a summary without section headers."""
+
+    def test_paragraphs_sorted_by_language(self):
+        summarizer = NewsSummarizer(provider=None, model="test")
+        korean, english = summarizer._parse_response(
+            "비트코인이 상승했어요.\n\nBitcoin rose today.\n\n이더리움도 올랐어요."
+        )
+        assert korean == "비트코인이 상승했어요.\n\n이더리움도 올랐어요."
+        assert english == "Bitcoin rose today."
+
+
+class TestDetectorPrefilter:
+    """Tests for skipping the toxicity LLM call on letterless messages."""
+
+    @pytest.mark.asyncio
+    async def test_emoji_only_message_skips_llm(self):
+        provider = AsyncMock(spec=LLMProvider)
+        detector = ToxicityDetector(provider, ModerationConfig(enabled=True))
+
+        result = await detector.detect("🚀🚀🔥 100!!")
+
+        assert not result.is_toxic
+        provider.chat.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_other_scripts_still_checked(self):
+        provider = AsyncMock(spec=LLMProvider)
+        provider.chat.return_value = LLMResponse(content='{"is_toxic": false}')
+        detector = ToxicityDetector(provider, ModerationConfig(enabled=True))
+
+        await detector.detect("こんにちは")
+
+        provider.chat.assert_called_once()
@@ -0,0 +1,108 @@
+"""Tests for approximate token counting and token-budgeted history."""
+
+from functools import partial
+from unittest.mock import AsyncMock
+
+from tokamak.agent.loop import AgentLoop
+from tokamak.providers import LLMProvider
+from tokamak.session import Session
+from tokamak.utils.tokens import estimate_message_tokens, estimate_tokens
+
+
+def make_session(contents: list[str]) -> Session:
+    session = Session(key="t")
+    for i, content in enumerate(contents):
+        session.add_message("user" if i % 2 == 0 else "assistant", content)
+    return session
+
+
+def make_provider() -> AsyncMock:
+    """Mock provider whose system-content formatting behaves like the base class."""
+    provider = AsyncMock(spec=LLMProvider)
+    provider.format_system_content.side_effect = partial(LLMProvider.format_system_content, None)
+    return provider
+
+
+class TestEstimateTokens:
+    """Tests for the approximate counter."""
+
+    def test_english(self):
+        assert estimate_tokens("") == 0
+        assert estimate_tokens("abcd" * 10) == 10
+
+    def test_korean_costs_more_per_character(self):
+        korean = "토카막 네트워크 스테이킹"
+        assert estimate_tokens(korean) > estimate_tokens("a" * len(korean))
+
+    def test_mixed(self):
+        assert estimate_tokens("TON 스테이킹") == 1 + 4  # 4 ASCII chars + 4 syllables
+
+
+class TestTokenBudgetedHistory:
+    """Tests for Session.get_history with a token budget."""
+
+    def test_counts_are_memoized(self):
+        session = make_session(["hello"])
+        msg = session.messages[0]
+
+        assert msg.tokens == estimate_message_tokens("hello")
+        msg.content = "changed after counting"
+        assert msg.tokens == estimate_message_tokens("hello")
+
+    def test_keeps_newest_messages_that_fit(self):
+        session = make_session(["x" * 4000, "short", "recent"])
+        budget = estimate_message_tokens("short") + estimate_message_tokens("recent")
+
+        history = session.get_history(max_messages=20, max_tokens=budget)
+
+        assert [m["content"] for m in history] == ["short", "recent"]
+
+    def test_large_old_message_cuts_history(self):
+        session = make_session(["old", "x" * 4000, "recent"])
+
+        history = session.get_history(max_messages=20, max_tokens=100)
+
+        assert [m["content"] for m in history] == ["recent"]
+
+    def test_message_cap_still_applies(self):
+        session = make_session(["a", "b", "c"])
+
+        assert len(session.get_history(max_messages=2, max_tokens=10_000)) == 2
+
+
+class TestBuildMessagesBudget:
+    """Tests for AgentLoop._build_messages under a context budget."""
+
+    def test_fits_history_after_system_prompt(self):
+        agent = AgentLoop(
+            provider=make_provider(),
+            system_prompt="s" * 400,  # 100 tokens
+            max_context_tokens=200,
+            enable_korean_review=False,
+        )
+        session = make_session(["y" * 400, "older answer", "latest question"])
+
+        messages = agent._build_messages(session, "latest question")
+
+        contents = [m["content"] for m in messages]
+        assert contents[0] == "s" * 400
+        assert "y" * 400 not in contents
+        assert contents[-2:] == ["older answer", "latest question"]
+
+    def test_without_budget_uses_message_count(self):
+        agent = AgentLoop(provider=make_provider(), system_prompt="s", max_history_messages=2)
+        session = make_session(["a", "b", "c", "d"])
+
+        messages = agent._build_messages(session, "new")
+
+        assert [m["content"] for m in messages] == ["s", "c", "d", "new"]
+
+    def test_tool_definitions_reduce_budget(self):
+        agent = AgentLoop(provider=make_provider(), system_prompt="s", max_context_tokens=1000)
+        session = make_session(["z" * 2000, "hi"])
+        tools = [{"type": "function", "function": {"description": "d" * 2000}}]
+
+        without_tools = agent._build_messages(session, "hi")
+        with_tools = agent._build_messages(session, "hi", tools)
+
+        assert len(with_tools) < len(without_tools)
@@ -0,0 +1,105 @@
+"""Tests for ToolRegistry batched execution."""
+
+import asyncio
+import time
+from typing import Any
+
+import pytest
+
+from tokamak.agent.tools import Tool, ToolRegistry
+
+
+class SleepTool(Tool):
+    """Tool that sleeps and records start/end order."""
+
+    def __init__(self, name: str, delay: float, log: list, parallel_safe: bool = True):
+        self._name = name
+        self._delay = delay
+        self._log = log
+        self._parallel_safe = parallel_safe
+
+    @property
+    def name(self) -> str:
+        return self._name
+
+    @property
+    def description(self) -> str:
+        return "sleep"
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        return {"type": "object", "properties": {}}
+
+    @property
+    def parallel_safe(self) -> bool:
+        return self._parallel_safe
+
+    async def execute(self, **kwargs: Any) -> str:
+        tag = kwargs.get("tag", self._name)
+        self._log.append(f"start:{tag}")
+        await asyncio.sleep(self._delay)
+        self._log.append(f"end:{tag}")
+        return tag
+
+
+class TestExecuteBatch:
+    """Tests for execute_batch."""
+
+    @pytest.mark.asyncio
+    async def test_parallel_safe_calls_run_concurrently_in_order(self):
+        log: list[str] = []
+        registry = ToolRegistry(max_concurrency=4)
+        registry.register(SleepTool("fetch", 0.05, log))
+
+        started = time.monotonic()
+        results = await registry.execute_batch([("fetch", {"tag": str(i)}) for i in range(3)])
+        elapsed = time.monotonic() - started
+
+        assert results == ["0", "1", "2"]
+        assert elapsed < 0.12
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap_is_respected(self):
+        log: list[str] = []
+        registry = ToolRegistry(max_concurrency=1)
+        registry.register(SleepTool("fetch", 0.01, log))
+
+        await registry.execute_batch([("fetch", {"tag": "a"}), ("fetch", {"tag": "b"})])
+
+        assert log == ["start:a", "end:a", "start:b", "end:b"]
+
+    @pytest.mark.asyncio
+    async def test_unsafe_tool_acts_as_barrier(self):
+        log: list[str] = []
+        registry = ToolRegistry(max_concurrency=4)
+        registry.register(SleepTool("fetch", 0.02, log))
+        registry.register(SleepTool("post", 0.01, log, parallel_safe=False))
+
+        results = await registry.execute_batch(
+            [
+                ("fetch", {"tag": "f1"}),
+                ("post", {"tag": "p1"}),
+                ("post", {"tag": "p2"}),
+                ("fetch", {"tag": "f2"}),
+            ]
+        )
+
+        assert results == ["f1", "p1", "p2", "f2"]
+        assert log.index("end:f1") < log.index("start:p1")
+        assert log.index("end:p1") < log.index("start:p2")
+        assert log.index("end:p2") < log.index("start:f2")
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_error_string(self):
+        registry = ToolRegistry(timeout_seconds=0.01)
+        registry.register(SleepTool("slow", 1.0, []))
+
+        results = await registry.execute_batch([("slow", {})])
+
+        assert "timed out" in results[0]
+
+    @pytest.mark.asyncio
+    async def test_unknown_tool_reports_error(self):
+        registry = ToolRegistry()
+        results = await registry.execute_batch([("missing", {})])
+        assert results == ["Error: Tool 'missing' not found"]
@@ -201,5 +201,83 @@ def show_system_prompt(
     print(system_prompt)
 
 
+@app.command("build-index")
+def build_index(
+    output: str = typer.Option("data/retrieval.idx", "--output", "-o", help="Index file to write"),
+    query: str = typer.Option(None, "--query", "-q", help="Query to test against the index"),
+):
+    """Build the retrieval index over answer patterns and knowledge base sections."""
+    import time
+    from pathlib import Path
+
+    from tokamak.agent.retrieval import RetrievalIndex
+
+    path = Path(output)
+    RetrievalIndex.build().save(path)
+    index = RetrievalIndex.load(path)
+    print(f"Wrote {path} ({len(index.chunks)} chunks, {path.stat().st_size:,} bytes)")
+
+    if query:
+        start = time.perf_counter()
+        results = index.search(query, k=5)
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        for chunk, score in results:
+            print(f"{score:6.2f}  [{chunk.kind}] {chunk.title}")
+        print(f"Lookup took {elapsed_ms:.2f} ms")
+    index.close()
+
+
+@app.command("usage")
+def usage(
+    since: str = typer.Option("24h", "--since", "-s", help="Time window, e.g. 30m, 24h, 7d"),
+    by: str = typer.Option("caller", "--by", help="Group by caller, model or caller,model"),
+    config_path: str = typer.Option("config.json", "--config", "-c", help="Config file path"),
+    data_dir: str = typer.Option("data", "--data", "-d", help="Data directory path"),
+):
+    """Print LLM usage, latency and cost by caller and model for a time window."""
+    import time
+    from pathlib import Path
+
+    from tokamak.config import load_config_or_exit
+    from tokamak.providers.usage import load_usage, model_prices, summarize_usage
+
+    units = {"m": 60, "h": 3600, "d": 86400}
+    try:
+        window = float(since[:-1]) * units[since[-1]]
+    except (KeyError, ValueError):
+        raise typer.BadParameter("use a number followed by m, h or d", param_hint="--since")
+    group_by = tuple(part.strip() for part in by.split(","))
+    if not set(group_by) <= {"caller", "model"}:
+        raise typer.BadParameter("group by caller and/or model", param_hint="--by")
+
+    config = load_config_or_exit(config_path)
+    path = Path(config.usage.path) if config.usage.path else Path(data_dir) / "llm_usage.jsonl"
+    rows = summarize_usage(
+        load_usage(path, since=time.time() - window), group_by, model_prices(config.usage.prices)
+    )
+    if not rows:
+        print(f"No LLM usage recorded in the last {since} ({path})")
+        return
+
+    def latency(value: float | None) -> str:
+        return "-" if value is None else ">64" if value == float("inf") else f"<{value:g}"
+
+    name_width = max(len("/".join(str(r[g]) for g in group_by)) for r in rows) + 2
+    header = (
+        f"{'/'.join(group_by):<{name_width}}{'calls':>7}{'errors':>8}{'prompt':>11}"
+        f"{'cached':>10}{'completion':>12}{'avg s':>8}{'p50 s':>7}{'p95 s':>7}{'cost $':>10}"
+    )
+    print(header)
+    print("-" * len(header))
+    for r in rows:
+        cost = "-" if r["cost_usd"] is None else f"{r['cost_usd']:.4f}"
+        print(
+            f"{'/'.join(str(r[g]) for g in group_by):<{name_width}}{r['calls']:>7}"
+            f"{r['errors']:>8}{r['prompt_tokens']:>11,}{r['cached_tokens']:>10,}"
+            f"{r['completion_tokens']:>12,}{r['avg_latency_s']:>8.2f}"
+            f"{latency(r['p50_latency_s']):>7}{latency(r['p95_latency_s']):>7}{cost:>10}"
+        )
+
+
 if __name__ == "__main__":
     app()
@@ -11,6 +11,7 @@ from loguru import logger
 from tokamak.agent.skills import BUILTIN_SKILLS_DIR, SkillsLoader
 from tokamak.agent.tools import InternalStateTool, ToolRegistry, WebFetchTool, WebPostTool
 from tokamak.config.schema import AdminConfig
+from tokamak.providers.caller import CALLER_ADMIN, llm_caller
 
 if TYPE_CHECKING:
     from tokamak.app import TokamakApp
@@ -109,14 +110,18 @@ class AdminHandler:
         self.tools = self._create_tools()
 
     def _create_tools(self) -> ToolRegistry:
-        registry = ToolRegistry()
+        agent_config = self.app.config.agent
+        registry = ToolRegistry(
+            max_concurrency=agent_config.tool_max_concurrency,
+            timeout_seconds=agent_config.tool_timeout_seconds,
+        )
 
         auth_tokens = {}
         if self.app.config.discord.token:
             auth_tokens["discord"] = self.app.config.discord.token
 
-        registry.register(WebFetchTool(auth_tokens=auth_tokens))
-        registry.register(WebPostTool(auth_tokens=auth_tokens))
+        registry.register(WebFetchTool(auth_tokens=auth_tokens, http=self.app.http))
+        registry.register(WebPostTool(auth_tokens=auth_tokens, http=self.app.http))
         registry.register(InternalStateTool())
 
         return registry
@@ -196,13 +201,14 @@ class AdminHandler:
 
         max_iterations = 5
         for _ in range(max_iterations):
-            response = await self.app.provider.chat(
-                messages=messages,
-                tools=tool_definitions,
-                model=self.app.config.agent.model,
-                max_tokens=1024,
-                temperature=0.3,
-            )
+            with llm_caller(CALLER_ADMIN):
+                response = await self.app.provider.chat(
+                    messages=messages,
+                    tools=tool_definitions,
+                    model=self.app.config.agent.model,
+                    max_tokens=1024,
+                    temperature=0.3,
+                )
 
             if response.finish_reason == "error":
                 logger.error(f"LLM error: {response.content}")
@@ -231,14 +237,18 @@ class AdminHandler:
                     },
                 )
 
+                calls = []
                 for tc in response.tool_calls:
                     logger.info(f"Admin tool call: {tc.name}({tc.arguments})")
 
                     params = dict(tc.arguments) if isinstance(tc.arguments, dict) else {}
                     if tc.name == "internal_state":
                         params["_app"] = self.app
+                    calls.append((tc.name, params))
+
+                results = await self.tools.execute_batch(calls)
 
-                    result = await self.tools.execute(tc.name, params)
+                for tc, result in zip(response.tool_calls, results):
                     logger.info(f"Admin tool result: {result}")
                     messages.append(
                         {
@@ -0,0 +1,134 @@
+"""Incremental summarization of long conversations."""
+
+import asyncio
+
+from loguru import logger
+
+from tokamak.providers import LLMProvider
+from tokamak.providers.caller import CALLER_COMPACTION, llm_caller
+from tokamak.session import Session
+from tokamak.utils.tokens import estimate_tokens
+
+COMPACTION_PROMPT = """You maintain a running summary of a Discord support conversation between a user and the Tokamak Network assistant.
+
+Update the summary with the new turns below. Keep facts the assistant may need later: the user's questions and goals, answers already given (numbers, links, addresses, names), decisions, and unresolved issues. Drop greetings and filler. Write in the conversation's main language, as compact bullet points, at most {max_words} words. Return only the updated summary.
+
+Current summary:
+{summary}
+
+New turns:
+{turns}"""
+
+
+class SessionCompactor:
+    """
+    Folds the oldest turns of long sessions into a running summary.
+
+    Runs after a reply has been sent, off the response path. Each pass only
+    summarizes turns newer than the existing summary (plus that summary),
+    so cost stays proportional to the new overflow.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        model: str | None = None,
+        trigger_tokens: int = 4000,
+        keep_recent_messages: int = 8,
+        max_summary_tokens: int = 512,
+    ):
+        """
+        Initialize the compactor.
+
+        Args:
+            provider: LLM provider used for summarization.
+            model: Cheap model for summaries (provider default if None).
+            trigger_tokens: Compact once unsummarized history exceeds this many tokens.
+            keep_recent_messages: Newest messages always left verbatim.
+            max_summary_tokens: Output token limit for the summary.
+        """
+        self.provider = provider
+        self.model = model
+        self.trigger_tokens = trigger_tokens
+        self.keep_recent_messages = keep_recent_messages
+        self.max_summary_tokens = max_summary_tokens
+        self._running: dict[str, asyncio.Task] = {}
+        self.compactions = 0
+        self.tokens_saved = 0
+
+    def needs_compaction(self, session: Session) -> bool:
+        """Check whether the session's unsummarized history is over the trigger."""
+        pending = session.unsummarized()
+        if len(pending) <= self.keep_recent_messages:
+            return False
+        return sum(m.tokens for m in pending) > self.trigger_tokens
+
+    def schedule(self, session: Session) -> None:
+        """Start compaction in the background if the session needs it."""
+        if session.key in self._running or not self.needs_compaction(session):
+            return
+        task = asyncio.create_task(self.compact(session))
+        self._running[session.key] = task
+        task.add_done_callback(lambda _: self._running.pop(session.key, None))
+
+    async def compact(self, session: Session) -> bool:
+        """
+        Fold all but the newest messages into the session summary.
+
+        Returns:
+            True if the summary was updated.
+        """
+        pending = session.unsummarized()
+        folded = pending[: len(pending) - self.keep_recent_messages]
+        if not folded:
+            return False
+
+        turns = "\n".join(f"{m.role}: {m.content}" for m in folded)
+        prompt = COMPACTION_PROMPT.format(
+            max_words=self.max_summary_tokens // 2,
+            summary=session.summary or "(none)",
+            turns=turns,
+        )
+        try:
+            with llm_caller(CALLER_COMPACTION):
+                response = await self.provider.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self.model,
+                    max_tokens=self.max_summary_tokens,
+                    temperature=0.2,
+                )
+        except Exception as e:
+            logger.error(f"Compaction failed for {session.key}: {e}")
+            return False
+
+        summary = (response.content or "").strip()
+        if response.finish_reason == "error" or not summary:
+            logger.warning(f"Compaction produced no summary for {session.key}")
+            return False
+
+        before = estimate_tokens(session.summary) + sum(m.tokens for m in folded)
+        after = estimate_tokens(summary)
+        session.apply_summary(summary, until=folded[-1].timestamp)
+
+        saved = before - after
+        self.compactions += 1
+        self.tokens_saved += max(saved, 0)
+        logger.info(
+            f"Compacted {len(folded)} messages for {session.key}: "
+            f"{before} -> {after} tokens ({saved} saved per request)"
+        )
+        return True
+
+    async def close(self) -> None:
+        """Cancel compactions still in flight."""
+        tasks = list(self._running.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "compactions": self.compactions,
+            "tokens_saved": self.tokens_saved,
+            "running": len(self._running),
+        }
@@ -0,0 +1,140 @@
+"""Deterministic fixes for the mechanical rules of the Korean quality review."""
+
+import re
+from dataclasses import dataclass, field
+
+# Terms whose trailing particle we can correct, with whether their (Korean)
+# reading ends in a final consonant: TON = 톤, WTON = 더블유톤, DAO = 다오 ...
+PARTICLE_TERMS: dict[str, bool] = {
+    "토카막 네트워크": False,
+    "$TOKAMAK": True,
+    "WTON": True,
+    "TON": True,
+    "타이탄": True,
+    "Titan": True,
+    "스테이킹": True,
+    "DAO": False,
+    "DEX": False,
+    "TRH": False,
+    "L2": False,
+}
+
+# Particle pairs: (after final consonant, after vowel)
+_PARTICLE_FORMS = {
+    "은": ("은", "는"),
+    "는": ("은", "는"),
+    "이": ("이", "가"),
+    "가": ("이", "가"),
+    "을": ("을", "를"),
+    "를": ("을", "를"),
+    "과": ("과", "와"),
+    "와": ("과", "와"),
+    "으로": ("으로", "로"),
+    "로": ("으로", "로"),
+}
+_PARTICLE = "으로|[은는이가을를과와로]"
+
+MAX_EMOJIS = 3
+
+_EMOJI = "[\U0001f000-\U0001faff☀-➿⭐⭕]️?"
+_EMOJI_RE = re.compile(_EMOJI)
+_EMOJI_HEADER_RE = re.compile(rf"\*\*[ \t]*(?:{_EMOJI}[ \t]*)+")
+_TRAILING_SPACE_RE = re.compile(r"[ \t]+$", re.MULTILINE)
+_BRAND_TYPO_RE = re.compile(r"토라막|토큰막|토카믹|토카마크")
+_WTON_RE = re.compile(r"더블유\s?톤")
+_TON_RE = re.compile(rf"(?<![가-힣A-Za-z])톤(?=(?:{_PARTICLE}|의|도|만|에)?(?![가-힣]))")
+_BARE_BRAND_RE = re.compile(rf"토카막(?:({_PARTICLE})(?![가-힣])|(?=[.,!?)]|$))")
+_BRAND_BEFORE_WORD_RE = re.compile(r"토카막\s+(?!네트워크)[가-힣]")
+_TERM_PARTICLE_RE = re.compile(
+    "(?<![A-Za-z$가-힣])("
+    + "|".join(re.escape(t) for t in sorted(PARTICLE_TERMS, key=len, reverse=True))
+    + rf")({_PARTICLE})(?![가-힣])"
+)
+_URL_RE = re.compile(r"https?://[^\s<>)\]]+")
+
+
+@dataclass
+class RuleResult:
+    """Outcome of the rule pass: fixed text, rules applied, and unfixable issues."""
+
+    text: str
+    fixes: list[str] = field(default_factory=list)
+    flags: list[str] = field(default_factory=list)
+
+    @property
+    def needs_llm(self) -> bool:
+        """Whether something was found that only the LLM review can fix."""
+        return bool(self.flags)
+
+
+def _particle_for(particle: str, final_consonant: bool) -> str:
+    with_consonant, with_vowel = _PARTICLE_FORMS[particle]
+    return with_consonant if final_consonant else with_vowel
+
+
+def _fix_term_particle(match: re.Match) -> str:
+    term, particle = match.group(1), match.group(2)
+    return term + _particle_for(particle, PARTICLE_TERMS[term])
+
+
+def _fix_bare_brand(match: re.Match) -> str:
+    particle = match.group(1)
+    if particle:
+        return "토카막 네트워크" + _particle_for(particle, final_consonant=False)
+    return "토카막 네트워크"
+
+
+def apply_korean_rules(text: str) -> RuleResult:
+    """
+    Apply the mechanical review rules.
+
+    Fixes brand-name typos and "토카막" used alone before a particle, Korean
+    spellings of token symbols, particles after known terms, decorative
+    emoji headers, emoji count and trailing spaces. Flags issues it cannot
+    fix safely (bare "토카막" before another word, duplicated URLs).
+
+    Args:
+        text: Korean answer text.
+
+    Returns:
+        RuleResult with the corrected text.
+    """
+    result = RuleResult(text=text)
+
+    def sub(name: str, pattern: re.Pattern, repl) -> None:
+        new, count = pattern.subn(repl, result.text)
+        if count and new != result.text:
+            result.text = new
+            result.fixes.append(name)
+
+    sub("brand_typo", _BRAND_TYPO_RE, "토카막")
+    sub("brand_name", _BARE_BRAND_RE, _fix_bare_brand)
+    sub("token_symbol", _WTON_RE, "WTON")
+    sub("token_symbol", _TON_RE, "TON")
+    sub("particle", _TERM_PARTICLE_RE, _fix_term_particle)
+    sub("emoji_header", _EMOJI_HEADER_RE, "**")
+
+    emojis = list(_EMOJI_RE.finditer(result.text))
+    if len(emojis) > MAX_EMOJIS:
+        text = result.text
+        parts = []
+        last = 0
+        for match in emojis[MAX_EMOJIS:]:
+            parts.append(text[last : match.start()])
+            last = match.end()
+            # Drop the space the emoji was separated by, so no double space remains
+            if text[last : last + 1] == " " and text[match.start() - 1 : match.start()] in " \n":
+                last += 1
+        parts.append(text[last:])
+        result.text = "".join(parts)
+        result.fixes.append("emoji_limit")
+
+    sub("trailing_space", _TRAILING_SPACE_RE, "")
+
+    if _BRAND_BEFORE_WORD_RE.search(result.text):
+        result.flags.append("brand_name")
+    urls = _URL_RE.findall(result.text)
+    if len(urls) != len(set(urls)):
+        result.flags.append("duplicate_url")
+
+    return result
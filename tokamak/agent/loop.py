@@ -1,14 +1,49 @@
 """Agent loop with tool support."""
 
+import asyncio
 import json
 import re
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Literal
 
 from loguru import logger
 
-from tokamak.agent.prompts import build_system_prompt
+from tokamak.agent.korean_rules import apply_korean_rules
+from tokamak.agent.prompts import SystemPrompt, build_system_prompt_parts, get_prompt_version
+from tokamak.agent.response_cache import ResponseCache
+from tokamak.agent.retrieval import RetrievalIndex
 from tokamak.agent.tools import ToolRegistry
-from tokamak.providers import LLMProvider
-from tokamak.session import Session
+from tokamak.providers import LLMProvider, LLMResponse
+from tokamak.providers.caller import CALLER_KOREAN_REVIEW, llm_caller
+from tokamak.session import Message, Session
+from tokamak.utils.metrics import MESSAGE_STAGE_SECONDS
+from tokamak.utils.text import contains_hangul
+from tokamak.utils.tokens import (
+    MESSAGE_OVERHEAD_TOKENS,
+    estimate_json_tokens,
+    estimate_message_tokens,
+    estimate_tokens,
+)
+
+# Receives the full text produced so far each time the streamed output grows
+PartialCallback = Callable[[str], Awaitable[None]]
+
+# Receives the corrected answer when a deferred review changed an already-sent reply
+RevisionCallback = Callable[[str], Awaitable[None]]
+
+# llm: always run the LLM review; rules: local rule engine only;
+# hybrid: rule engine, then the LLM only for issues the rules cannot fix
+KoreanReviewMode = Literal["llm", "rules", "hybrid"]
+
+TOOL_CALL_TAG = "<tool_call>"
+
+
+@dataclass
+class _RunUsage:
+    """What one run spent, tracked per run because runs overlap."""
+
+    tokens: int = 0
+    tool_calls: int = 0
 
 
 class AgentLoop:
@@ -21,22 +56,40 @@ class AgentLoop:
         model: str | None = None,
         system_prompt: str | None = None,
         max_history_messages: int = 20,
+        max_context_tokens: int | None = None,
         max_tokens: int = 1024,
         temperature: float = 0.7,
         max_iterations: int = 10,
         enable_korean_review: bool = True,
         korean_review_model: str | None = None,
+        korean_review_mode: KoreanReviewMode = "hybrid",
+        korean_review_deferred: bool = False,
+        stream: bool = False,
+        retriever: RetrievalIndex | None = None,
+        retrieval_top_k: int = 4,
+        response_cache: ResponseCache | None = None,
     ):
         self.provider = provider
         self.tools = tools
         self.model = model
         self._custom_system_prompt = system_prompt
         self.max_history_messages = max_history_messages
+        self.max_context_tokens = max_context_tokens
+        self._tool_tokens: tuple[tuple[str, ...], int] | None = None
         self.max_tokens = max_tokens
         self.temperature = temperature
         self.max_iterations = max_iterations
         self.enable_korean_review = enable_korean_review
         self.korean_review_model = korean_review_model
+        self.korean_review_mode = korean_review_mode
+        self.korean_review_deferred = korean_review_deferred
+        self._review_tasks: set[asyncio.Task] = set()
+        self.stream = stream
+        self.retriever = retriever
+        self.retrieval_top_k = retrieval_top_k
+        self.response_cache = response_cache
+        self.prompt_tokens = 0
+        self.cached_prompt_tokens = 0
 
     @property
     def system_prompt(self) -> str:
@@ -76,12 +129,13 @@ Original message:
 
             review_model = self.korean_review_model or self.model
 
-            response = await self.provider.chat(
-                messages=messages,
-                model=review_model,
-                max_tokens=self.max_tokens,
-                temperature=0.3,  # Lower temperature for consistent corrections
-            )
+            with llm_caller(CALLER_KOREAN_REVIEW):
+                response = await self.provider.chat(
+                    messages=messages,
+                    model=review_model,
+                    max_tokens=self.max_tokens,
+                    temperature=0.3,  # Lower temperature for consistent corrections
+                )
 
             if response.finish_reason == "error" or not response.content:
                 logger.warning("Korean review failed, using original")
@@ -109,6 +163,45 @@ Original message:
             logger.error(f"Korean review failed: {e}")
             return content
 
+    async def _review_korean(self, content: str, on_revised: RevisionCallback | None) -> str:
+        """
+        Review a Korean answer according to korean_review_mode.
+
+        The rule engine always runs first (except in "llm" mode). When the
+        LLM pass is still needed and deferral is enabled with a revision
+        callback, the rule-fixed text is returned right away and the LLM
+        review runs in the background, handing any change to on_revised.
+        """
+        if not self.enable_korean_review:
+            return content
+
+        if self.korean_review_mode != "llm":
+            result = apply_korean_rules(content)
+            if result.fixes:
+                logger.debug(f"Korean rules applied: {', '.join(result.fixes)}")
+            content = result.text
+            if self.korean_review_mode == "rules" or not result.needs_llm:
+                return content
+            logger.debug(f"Korean rules flagged {', '.join(result.flags)}, running LLM review")
+
+        if self.korean_review_deferred and on_revised:
+            task = asyncio.create_task(self._deferred_review(content, on_revised))
+            self._review_tasks.add(task)
+            task.add_done_callback(self._review_tasks.discard)
+            return content
+
+        return await self._review_korean_quality(content)
+
+    async def _deferred_review(self, content: str, on_revised: RevisionCallback) -> None:
+        reviewed = await self._review_korean_quality(content)
+        if reviewed == content:
+            return
+        try:
+            await on_revised(reviewed)
+            logger.debug("Deferred Korean review edited the sent reply")
+        except Exception as e:
+            logger.warning(f"Could not apply deferred Korean review: {e}")
+
     def _detect_korean(self, text: str) -> bool:
         """
         Detect if text contains Korean characters.
@@ -116,12 +209,7 @@ Original message:
         Checks for Hangul syllables (U+AC00-U+D7AF) and Jamo (U+3131-U+318E).
         Returns True if Korean detected, False otherwise.
         """
-        for char in text:
-            if "\uac00" <= char <= "\ud7af":  # Hangul syllables (가-힣)
-                return True
-            if "\u3131" <= char <= "\u318e":  # Hangul Jamo (ㄱ-ㅎ, ㅏ-ㅣ)
-                return True
-        return False
+        return contains_hangul(text)
 
     END_MARKER = "===END_CONVERSATION==="
 
@@ -131,19 +219,96 @@ Original message:
 
     def _get_system_prompt(self, user_message: str | None = None) -> str:
         """Build system prompt, optionally injecting relevant answer patterns."""
-        if self._custom_system_prompt:
-            return self._custom_system_prompt
+        return self._get_system_prompt_parts(user_message).text
 
-        return build_system_prompt(skills_summary=None, user_message=user_message)
+    def _get_system_prompt_parts(self, user_message: str | None = None) -> SystemPrompt:
+        """Build the system prompt split into a cacheable prefix and per-request suffix."""
+        if self._custom_system_prompt:
+            return SystemPrompt(prefix=self._custom_system_prompt)
+
+        return build_system_prompt_parts(
+            skills_summary=None,
+            user_message=user_message,
+            retriever=self.retriever,
+            top_k=self.retrieval_top_k,
+        )
+
+    def _tool_definition_tokens(self, tool_definitions: list[dict[str, Any]] | None) -> int:
+        """Approximate prompt tokens taken by tool definitions, cached per tool set."""
+        if not tool_definitions:
+            return 0
+        names = tuple(d.get("function", {}).get("name", "") for d in tool_definitions)
+        if self._tool_tokens is None or self._tool_tokens[0] != names:
+            self._tool_tokens = (names, estimate_json_tokens(tool_definitions))
+        return self._tool_tokens[1]
+
+    def _history_token_budget(
+        self,
+        system_prompt: str,
+        current_message: str,
+        tool_definitions: list[dict[str, Any]] | None,
+    ) -> int | None:
+        """Tokens left for history once the fixed parts of the prompt are counted."""
+        if not self.max_context_tokens:
+            return None
+        fixed = (
+            estimate_tokens(system_prompt)
+            + MESSAGE_OVERHEAD_TOKENS
+            + estimate_message_tokens(current_message)
+            + self._tool_definition_tokens(tool_definitions)
+        )
+        return max(0, self.max_context_tokens - fixed)
+
+    @staticmethod
+    def _recorded_current(session: Session, current_message: str) -> list[Message]:
+        """Trailing user messages that make up the current message.
+
+        Usually that is the last message; a turn coalesced from several quick
+        messages is recorded as one message each and joined with newlines.
+        """
+        parts: list[Message] = []
+        for msg in reversed(session.messages):
+            if msg.role != "user":
+                break
+            parts.insert(0, msg)
+            if "\n".join(m.content for m in parts) == current_message:
+                return parts
+        return []
+
+    def _build_messages(
+        self,
+        session: Session,
+        current_message: str,
+        tool_definitions: list[dict[str, Any]] | None = None,
+    ) -> list[dict]:
+        """Build messages list for LLM call, fitting history into the token budget."""
+        prompt = self._get_system_prompt_parts(current_message)
+        if session.summary:
+            # Per-session text goes after the shared prefix so the prefix stays cacheable
+            summary = f"## Earlier in this conversation\n{session.summary}"
+            prompt = SystemPrompt(
+                prefix=prompt.prefix,
+                suffix=f"{prompt.suffix}\n\n{summary}" if prompt.suffix else summary,
+            )
+        system_prompt = prompt.text
+        content = self.provider.format_system_content(prompt.prefix, prompt.suffix, self.model)
+        messages = [{"role": "system", "content": content}]
 
-    def _build_messages(self, session: Session, current_message: str) -> list[dict]:
-        """Build messages list for LLM call."""
-        messages = [{"role": "system", "content": self._get_system_prompt(current_message)}]
+        # The channel records the incoming message(s) before the agent runs
+        recorded = self._recorded_current(session, current_message)
+        budget = self._history_token_budget(system_prompt, current_message, tool_definitions)
+        if budget is not None and recorded:
+            budget += sum(m.tokens for m in recorded)
 
         # Add history
-        history = session.get_history(max_messages=self.max_history_messages)
-        if history and history[-1]["role"] == "user" and history[-1]["content"] == current_message:
-            history = history[:-1]
+        history = session.get_history(max_messages=self.max_history_messages, max_tokens=budget)
+        if recorded:
+            history = history[: -len(recorded)] if len(history) > len(recorded) else []
+        if budget is not None:
+            logger.debug(
+                f"History: {len(history)} messages within {budget} token budget "
+                f"({len(session.messages)} stored)"
+            )
         # Sanitize user messages in history
         for msg in history:
             if msg["role"] == "user":
@@ -154,19 +319,175 @@ Original message:
         messages.append({"role": "user", "content": self._sanitize_input(current_message)})
         return messages
 
-    async def run(self, session: Session, message: str) -> str | None:
+    def _visible_partial(self, text: str) -> str:
+        """Trim streamed text to the part that is safe to show to users.
+
+        Text-based tool calls and the conversation end marker are control
+        output, so everything from their first occurrence is hidden, as is a
+        trailing fragment that might be the start of either.
+        """
+        for marker in (TOOL_CALL_TAG, self.END_MARKER):
+            idx = text.find(marker)
+            if idx != -1:
+                text = text[:idx]
+            for size in range(min(len(marker) - 1, len(text)), 0, -1):
+                if text.endswith(marker[:size]):
+                    text = text[:-size]
+                    break
+        return text.strip()
+
+    async def _complete(
+        self,
+        messages: list[dict[str, Any]],
+        tool_definitions: list[dict[str, Any]] | None,
+        on_partial: PartialCallback | None,
+    ) -> LLMResponse:
+        """Run one LLM turn, streaming partial text to on_partial when enabled."""
+        if not (self.stream and on_partial):
+            return await self.provider.chat(
+                messages=messages,
+                tools=tool_definitions,
+                model=self.model,
+                max_tokens=self.max_tokens,
+                temperature=self.temperature,
+            )
+
+        text = ""
+        shown = ""
+        response: LLMResponse | None = None
+        async for delta in self.provider.chat_stream(
+            messages=messages,
+            tools=tool_definitions,
+            model=self.model,
+            max_tokens=self.max_tokens,
+            temperature=self.temperature,
+        ):
+            if delta.response is not None:
+                response = delta.response
+                break
+            if not delta.content:
+                continue
+            text += delta.content
+            visible = self._visible_partial(text)
+            if visible and visible != shown:
+                shown = visible
+                await on_partial(visible)
+
+        if response is None:
+            return LLMResponse(content="LLM stream ended unexpectedly", finish_reason="error")
+        return response
+
+    def _record_usage(self, response: LLMResponse, run: _RunUsage | None = None) -> None:
+        """Accumulate prompt and provider-cached token counts from one LLM turn."""
+        usage = response.usage
+        if not usage:
+            return
+        prompt_tokens = usage.get("prompt_tokens", 0)
+        cached_tokens = usage.get("cached_tokens", 0)
+        if run is not None:
+            run.tokens += usage.get("total_tokens", 0)
+        self.prompt_tokens += prompt_tokens
+        self.cached_prompt_tokens += cached_tokens
+        logger.debug(
+            f"LLM usage: {prompt_tokens} prompt ({cached_tokens} cached), "
+            f"{usage.get('completion_tokens', 0)} completion tokens"
+        )
+
+    def prompt_cache_stats(self) -> dict[str, Any]:
+        """Prompt tokens sent so far and how many the provider served from its cache."""
+        return {
+            "prompt_tokens": self.prompt_tokens,
+            "cached_tokens": self.cached_prompt_tokens,
+            "hit_rate": (
+                round(self.cached_prompt_tokens / self.prompt_tokens, 3)
+                if self.prompt_tokens
+                else 0.0
+            ),
+        }
+
+    def _is_standalone(self, session: Session, message: str) -> bool:
+        """Whether the message opens a session, so its answer depends on nothing else."""
+        if session.summary or len(session.messages) > 1:
+            return False
+        if not session.messages:
+            return True
+        first = session.messages[0]
+        return first.role == "user" and first.content == message
+
+    def _cache_version(self) -> str:
+        return f"{get_prompt_version()}:{self.model}:{hash(self._custom_system_prompt)}"
+
+    async def run(
+        self,
+        session: Session,
+        message: str,
+        on_partial: PartialCallback | None = None,
+        on_revised: RevisionCallback | None = None,
+    ) -> str | None:
         """
         Process a message with tool support.
 
+        Standalone questions (first message of a session) are answered from
+        the response cache when possible.
+
         Args:
             session: User session
             message: User message
+            on_partial: Optional async callback receiving the visible text so far
+                while the answer streams in (only used when streaming is enabled).
+                The returned string is always the final, reviewed answer.
+            on_revised: Optional async callback for deferred Korean review; when
+                given (and deferral is enabled) the answer is returned before the
+                LLM review, and the callback receives the corrected text.
         """
         if not message.strip():
             return None
 
-        messages = self._build_messages(session, message)
+        cacheable = self.response_cache is not None and self._is_standalone(session, message)
+        version = self._cache_version()
+        if cacheable:
+            cached = self.response_cache.get(message, version)
+            if cached is not None:
+                logger.info(f"Response cache hit for {session.key}")
+                return cached
+
+        run = _RunUsage()
+        stored = False
+        revision: str | None = None
+
+        async def revise_cached(text: str) -> None:
+            # The deferred review corrects the cached answer as well as the sent one
+            nonlocal revision
+            revision = text
+            if stored:
+                self.response_cache.put(message, text, run.tokens, version)
+            await on_revised(text)
+
+        content = await self._run(
+            session,
+            message,
+            on_partial,
+            revise_cached if cacheable and on_revised else on_revised,
+            run,
+        )
+
+        # Answers built from tool output (live data) or that ended the session are not reused
+        if cacheable and content and not run.tool_calls and not session.is_ended:
+            self.response_cache.put(message, revision or content, run.tokens, version)
+            stored = True
+        return content
+
+    async def _run(
+        self,
+        session: Session,
+        message: str,
+        on_partial: PartialCallback | None,
+        on_revised: RevisionCallback | None,
+        run: _RunUsage,
+    ) -> str | None:
+        """Run the LLM/tool loop for one message, recording usage into run."""
         tool_definitions = self.tools.get_definitions() if self.tools else None
+        messages = self._build_messages(session, message, tool_definitions)
 
         logger.debug(f"AgentLoop: {len(messages)} messages, {len(tool_definitions or [])} tools")
 
@@ -174,13 +495,8 @@ Original message:
             consecutive_tool_errors = 0
 
             for iteration in range(self.max_iterations):
-                response = await self.provider.chat(
-                    messages=messages,
-                    tools=tool_definitions,
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                )
+                response = await self._complete(messages, tool_definitions, on_partial)
+                self._record_usage(response, run)
 
                 if response.finish_reason == "error":
                     logger.error(f"LLM error: {response.content}")
@@ -188,6 +504,7 @@ Original message:
 
                 # Handle tool calls
                 if response.has_tool_calls and self.tools:
+                    run.tool_calls += len(response.tool_calls)
                     # Add assistant message with tool calls
                     assistant_msg = {"role": "assistant", "content": response.content}
                     assistant_msg["tool_calls"] = [
@@ -200,11 +517,15 @@ Original message:
                     ]
                     messages.append(assistant_msg)
 
-                    # Execute tools and add results
-                    has_error = False
+                    # Execute tools (independent calls concurrently) and add results in order
                     for tc in response.tool_calls:
                         logger.info(f"Tool call: {tc.name}({tc.arguments})")
-                        result = await self.tools.execute(tc.name, tc.arguments)
+                    results = await self.tools.execute_batch(
+                        [(tc.name, tc.arguments) for tc in response.tool_calls]
+                    )
+
+                    has_error = False
+                    for tc, result in zip(response.tool_calls, results):
                         logger.info(
                             f"Tool result: {tc.name} -> {result[:200]}{'...' if len(result) > 200 else ''}"
                         )
@@ -242,7 +563,8 @@ Original message:
 
                     # Apply Korean quality review if output contains Korean
                     if self._detect_korean(content):
-                        content = await self._review_korean_quality(content)
+                        with MESSAGE_STAGE_SECONDS.time(stage="review"):
+                            content = await self._review_korean(content, on_revised)
                     else:
                         logger.debug("Skipping Korean review (English output)")
 
@@ -263,10 +585,12 @@ Original message:
         session: Session,
         message: str,
         max_retries: int = 1,
+        on_partial: PartialCallback | None = None,
+        on_revised: RevisionCallback | None = None,
     ) -> str | None:
         """Process a message with retry on failure."""
         for attempt in range(max_retries + 1):
-            result = await self.run(session, message)
+            result = await self.run(session, message, on_partial=on_partial, on_revised=on_revised)
             if result:
                 return result
             if attempt < max_retries:
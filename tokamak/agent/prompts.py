@@ -1,21 +1,52 @@
 """System prompts for the agent."""
 
+import hashlib
+from dataclasses import dataclass
 from datetime import datetime
+from typing import TYPE_CHECKING
 
-# Cache for base prompt sections (invalidated each minute due to timestamp)
-_base_prompt_cache: dict[str, str] = {"key": "", "value": ""}
+from tokamak.utils.keywords import KeywordMatcher
 
+if TYPE_CHECKING:
+    from tokamak.agent.retrieval import RetrievalIndex
 
-def get_base_identity() -> str:
-    """Get the base identity section."""
-    now = datetime.now().strftime("%Y-%m-%d %H:%M (%A)")
+# Cache for the static prompt prefix, keyed by skills summary
+_base_prompt_cache: dict[str, str] = {}
 
-    return f"""# AI_Tokamak - Tokamak Network Community Assistant
+PROMPT_SECTION_SEPARATOR = "\n\n\n"
 
-You are AI_Tokamak, an AI community manager for Tokamak Network - an on-demand Ethereum Layer 2 platform.
+# Retrieved patterns must score at least this (BM25) to be injected
+RETRIEVAL_PATTERN_MIN_SCORE = 5.0
+RETRIEVAL_MAX_PATTERNS = 2
+RETRIEVAL_KNOWLEDGE_MIN_SCORE = 1.0
 
-## Current Time
-{now}
+
+@dataclass(frozen=True)
+class SystemPrompt:
+    """
+    A system prompt split for provider-side prompt caching.
+
+    ``prefix`` (identity, guidelines, knowledge base) is byte-identical
+    across requests and over time; ``suffix`` holds everything that varies
+    per request (current time, matched answer patterns).
+    """
+
+    prefix: str
+    suffix: str = ""
+
+    @property
+    def text(self) -> str:
+        """The full prompt as a single string."""
+        if not self.suffix:
+            return self.prefix
+        return self.prefix + PROMPT_SECTION_SEPARATOR + self.suffix
+
+
+def get_base_identity() -> str:
+    """Get the base identity section (static; the current time is in the suffix)."""
+    return """# AI_Tokamak - Tokamak Network Community Assistant
+
+You are AI_Tokamak, an AI community manager for Tokamak Network - an on-demand Ethereum Layer 2 platform.
 
 ## Your Role
 You help community members by:
@@ -575,14 +606,44 @@ Titan은 토카막 네트워크의 첫 L2 메인넷으로, 기술 검증용으
 ]
 
 
+# Keyword automaton over ANSWER_PATTERNS and a hash of all static prompt
+# content, both computed at import
+_pattern_matcher: KeywordMatcher
+_prompt_version: str
+
+
+def reload_patterns() -> None:
+    """Recompile the keyword automaton after ANSWER_PATTERNS changes."""
+    global _pattern_matcher, _prompt_version
+    _pattern_matcher = KeywordMatcher([p["keywords"] for p in ANSWER_PATTERNS])
+    _base_prompt_cache.clear()
+
+    digest = hashlib.sha256()
+    for text in (get_base_identity(), get_discord_guidelines(), get_tokamak_knowledge()):
+        digest.update(text.encode())
+    for pattern in ANSWER_PATTERNS:
+        digest.update(pattern["content"].encode())
+        digest.update("\0".join(pattern["keywords"]).encode())
+    _prompt_version = digest.hexdigest()[:16]
+
+
+reload_patterns()
+
+
+def get_prompt_version() -> str:
+    """Short hash of the static prompt, knowledge base and answer patterns."""
+    return _prompt_version
+
+
+def match_pattern_ids(user_message: str) -> list[int]:
+    """Return indexes into ANSWER_PATTERNS whose keywords occur in the message."""
+    return _pattern_matcher.match(user_message)
+
+
 def get_matching_patterns(user_message: str) -> str:
     """Return answer patterns matching the user's question based on keywords."""
-    message_lower = user_message.lower()
-    matched = []
-    for pattern in ANSWER_PATTERNS:
-        if any(kw in message_lower for kw in pattern["keywords"]):
-            matched.append(pattern["content"])
-    return "\n\n".join(matched)
+    matched = match_pattern_ids(user_message)
+    return "\n\n".join(ANSWER_PATTERNS[i]["content"] for i in matched)
 
 
 def get_all_patterns() -> str:
@@ -590,22 +651,30 @@ def get_all_patterns() -> str:
     return "\n\n".join(p["content"] for p in ANSWER_PATTERNS)
 
 
-def _get_base_prompt(skills_summary: str | None = None) -> str:
+def get_current_context(now: datetime | None = None) -> str:
+    """Get the per-request context section (current time)."""
+    now_text = (now or datetime.now()).strftime("%Y-%m-%d %H:%M (%A)")
+    return f"""# Current Context
+
+## Current Time
+{now_text}"""
+
+
+def _get_base_prompt(skills_summary: str | None = None, include_knowledge: bool = True) -> str:
     """Get cached base prompt (identity + guidelines + knowledge + skills).
 
-    Rebuilds only when the minute changes (timestamp in identity section).
+    Contains nothing time- or message-dependent, so it is built once per
+    skills summary and stays byte-identical for provider prefix caching.
+    The knowledge base is left out when it is retrieved per message instead.
     """
-    # Cache key includes minute and skills_summary presence
-    cache_key = datetime.now().strftime("%Y-%m-%d %H:%M") + str(bool(skills_summary))
-
-    if _base_prompt_cache["key"] == cache_key:
-        return _base_prompt_cache["value"]
+    cache_key = f"{include_knowledge:d}:{skills_summary or ''}"
+    cached = _base_prompt_cache.get(cache_key)
+    if cached is not None:
+        return cached
 
-    sections = [
-        get_base_identity(),
-        get_discord_guidelines(),
-        get_tokamak_knowledge(),
-    ]
+    sections = [get_base_identity(), get_discord_guidelines()]
+    if include_knowledge:
+        sections.append(get_tokamak_knowledge())
 
     if skills_summary:
         sections.append(f"""# Available Skills
@@ -620,37 +689,95 @@ You have access to specialized skills for specific tasks. When a user request ma
 3. Follow the instructions in that skill
 4. If no skill matches, use your general knowledge and tools""")
 
-    result = "\n\n\n".join(sections)
-    _base_prompt_cache["key"] = cache_key
-    _base_prompt_cache["value"] = result
+    result = PROMPT_SECTION_SEPARATOR.join(sections)
+    _base_prompt_cache[cache_key] = result
     return result
 
 
-def build_system_prompt(
+def _retrieve_sections(retriever: "RetrievalIndex", user_message: str, top_k: int) -> list[str]:
+    """Relevant knowledge sections plus keyword- or retrieval-matched patterns."""
+    sections = []
+    knowledge = retriever.search(
+        user_message, k=top_k, kind="knowledge", min_score=RETRIEVAL_KNOWLEDGE_MIN_SCORE
+    )
+    if knowledge:
+        chunks = "\n\n".join(chunk.text for chunk, _ in knowledge)
+        sections.append(f"# Tokamak Network Knowledge Base (relevant sections)\n\n{chunks}")
+
+    pattern_ids = match_pattern_ids(user_message)
+    for chunk, _ in retriever.search(
+        user_message,
+        k=RETRIEVAL_MAX_PATTERNS,
+        kind="pattern",
+        min_score=RETRIEVAL_PATTERN_MIN_SCORE,
+    ):
+        if chunk.source not in pattern_ids:
+            pattern_ids.append(chunk.source)
+    if pattern_ids:
+        patterns = "\n\n".join(ANSWER_PATTERNS[i]["content"] for i in sorted(pattern_ids))
+        sections.append(f"# Answer Patterns (for this question)\n\n{patterns}")
+    return sections
+
+
+def build_system_prompt_parts(
     skills_summary: str | None = None,
     user_message: str | None = None,
     include_all_patterns: bool = False,
-) -> str:
+    retriever: "RetrievalIndex | None" = None,
+    top_k: int = 4,
+) -> SystemPrompt:
     """
-    Build the complete system prompt.
+    Build the system prompt as a cacheable prefix and a per-request suffix.
 
     Args:
         skills_summary: Optional XML summary of available skills.
         user_message: Current user message for dynamic pattern matching.
         include_all_patterns: If True, include all answer patterns (for evaluation).
+        retriever: If given, the full knowledge base is replaced by the top_k
+            sections retrieved for user_message, and paraphrased questions
+            can match answer patterns without a keyword hit.
+        top_k: Knowledge sections to inject when retrieving.
 
     Returns:
-        Complete system prompt string.
+        SystemPrompt with static prefix and dynamic suffix.
     """
-    base = _get_base_prompt(skills_summary)
+    use_retrieval = retriever is not None and not include_all_patterns
+    prefix = _get_base_prompt(skills_summary, include_knowledge=not use_retrieval)
+    suffix = [get_current_context()]
 
     if include_all_patterns:
-        return base + f"\n\n\n# All Answer Patterns\n\n{get_all_patterns()}"
-
-    # Inject only matching answer patterns based on user message
-    if user_message:
+        suffix.append(f"# All Answer Patterns\n\n{get_all_patterns()}")
+    elif user_message and use_retrieval:
+        suffix.extend(_retrieve_sections(retriever, user_message, top_k))
+    elif user_message:
+        # Inject only matching answer patterns based on user message
         patterns = get_matching_patterns(user_message)
         if patterns:
-            return base + f"\n\n\n# Answer Patterns (for this question)\n\n{patterns}"
+            suffix.append(f"# Answer Patterns (for this question)\n\n{patterns}")
+
+    return SystemPrompt(prefix=prefix, suffix=PROMPT_SECTION_SEPARATOR.join(suffix))
+
 
-    return base
+def build_system_prompt(
+    skills_summary: str | None = None,
+    user_message: str | None = None,
+    include_all_patterns: bool = False,
+    retriever: "RetrievalIndex | None" = None,
+    top_k: int = 4,
+) -> str:
+    """
+    Build the complete system prompt.
+
+    Args:
+        skills_summary: Optional XML summary of available skills.
+        user_message: Current user message for dynamic pattern matching.
+        include_all_patterns: If True, include all answer patterns (for evaluation).
+        retriever: Optional retrieval index (see build_system_prompt_parts).
+        top_k: Knowledge sections to inject when retrieving.
+
+    Returns:
+        Complete system prompt string.
+    """
+    return build_system_prompt_parts(
+        skills_summary, user_message, include_all_patterns, retriever, top_k
+    ).text
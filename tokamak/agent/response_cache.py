@@ -0,0 +1,180 @@
+"""Cache of final answers to repeated standalone questions."""
+
+import re
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from tokamak.agent.retrieval import tokenize
+from tokamak.utils.keywords import normalize_text
+
+# Punctuation and symbols that don't change the question ("TON 가격?!" == "ton 가격")
+_PUNCTUATION_RE = re.compile(r"[^\w$]+")
+
+# Questions whose answer goes stale within minutes (prices, news, "today").
+# Korean has no word boundaries, so those terms match anywhere in the text.
+_TIME_SENSITIVE_RE = re.compile(
+    r"\b(?:prices?|news|today|tonight|now|current(?:ly)?|latest|recent(?:ly)?|live)\b"
+    r"|가격|시세|환율|뉴스|소식|오늘|지금|현재|최신|최근|요즘|실시간"
+)
+
+
+def normalize_question(text: str) -> str:
+    """Cache key form of a question: NFKC, case-folded, no whitespace or punctuation."""
+    return _PUNCTUATION_RE.sub("", normalize_text(text))
+
+
+def is_time_sensitive(text: str) -> bool:
+    """Whether a question asks for something that changes over time (prices, news, today)."""
+    return _TIME_SENSITIVE_RE.search(normalize_text(text)) is not None
+
+
+@dataclass
+class CachedResponse:
+    """A cached answer and what producing it cost."""
+
+    response: str
+    terms: frozenset[str]
+    tokens: int
+    expires_at: float
+    hits: int = 0
+
+
+class ResponseCache:
+    """
+    TTL + LRU cache of agent answers keyed on the normalized question.
+
+    Entries belong to one prompt version; when the version passed to ``get``
+    or ``put`` changes (prompt, knowledge or patterns edited), every entry
+    is dropped. With a similarity threshold, a miss on the exact key falls
+    back to the most similar cached question by term-set Jaccard overlap.
+    Time-sensitive questions (see ``is_time_sensitive``) are never cached or
+    served from the cache, since the TTL is far longer than their answers last.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        similarity_threshold: float | None = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Entries kept before the least recently used is evicted.
+            ttl_seconds: Lifetime of an entry.
+            similarity_threshold: Minimum Jaccard similarity (0-1) for a
+                near-duplicate question to reuse an answer; None disables it.
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity_threshold = similarity_threshold
+        self.version = ""
+        self._entries: OrderedDict[str, CachedResponse] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+        self.skipped = 0
+        self.tokens_saved = 0
+
+    def _check_version(self, version: str) -> None:
+        if version != self.version:
+            if self._entries:
+                self.invalidations += 1
+            self._entries.clear()
+            self.version = version
+
+    def get(self, question: str, version: str = "") -> str | None:
+        """
+        Look up a cached answer.
+
+        Args:
+            question: The user's message.
+            version: Current prompt version.
+
+        Returns:
+            The cached answer, or None on a miss.
+        """
+        self._check_version(version)
+        if is_time_sensitive(question):
+            self.misses += 1
+            return None
+        key = normalize_question(question)
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is None and self.similarity_threshold is not None:
+            key, entry = self._most_similar(question, now)
+        if entry is None or entry.expires_at <= now:
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        entry.hits += 1
+        self.hits += 1
+        self.tokens_saved += entry.tokens
+        return entry.response
+
+    def _most_similar(self, question: str, now: float) -> tuple[str, CachedResponse | None]:
+        terms = frozenset(tokenize(question))
+        if not terms:
+            return "", None
+        best_key, best_entry, best_score = "", None, self.similarity_threshold
+        for key, entry in self._entries.items():
+            if entry.expires_at <= now or not entry.terms:
+                continue
+            score = len(terms & entry.terms) / len(terms | entry.terms)
+            if score >= best_score:
+                best_key, best_entry, best_score = key, entry, score
+        return best_key, best_entry
+
+    def put(self, question: str, response: str, tokens: int = 0, version: str = "") -> None:
+        """
+        Store an answer.
+
+        Args:
+            question: The user's message.
+            response: Final answer sent to the user.
+            tokens: LLM tokens spent producing it (counted as saved on each hit).
+            version: Prompt version the answer was produced with.
+        """
+        self._check_version(version)
+        key = normalize_question(question)
+        if not key:
+            return
+        if is_time_sensitive(question):
+            self.skipped += 1
+            return
+        self._entries[key] = CachedResponse(
+            response=response,
+            terms=frozenset(tokenize(question)),
+            tokens=tokens,
+            expires_at=time.monotonic() + self.ttl_seconds,
+        )
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "tokens_saved": self.tokens_saved,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "skipped": self.skipped,
+        }
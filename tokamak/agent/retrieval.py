@@ -0,0 +1,289 @@
+"""Local BM25 retrieval over answer patterns and knowledge base sections."""
+
+import hashlib
+import heapq
+import json
+import math
+import mmap
+import re
+import struct
+import unicodedata
+from array import array
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Literal
+
+from loguru import logger
+
+from tokamak.agent.prompts import ANSWER_PATTERNS, get_tokamak_knowledge
+
+ChunkKind = Literal["pattern", "knowledge"]
+
+INDEX_MAGIC = b"TKRI"
+INDEX_VERSION = 1
+_HEADER = struct.Struct("<4sII")
+
+_TOKEN_RE = re.compile(r"[a-z0-9$]+|[가-힣]+")
+
+# Question words and polite endings that say nothing about the topic
+_STOPWORDS = frozenset(
+    "a an and are can do does for how i in is it me my of on or the to what when where "
+    "why you 어떻 떻게 하나 나요 가요 인가 뭔가 무엇 엇인 알려 려주 주세 세요 해요 있나 "
+    "있는 수있 어디 디서 언제 는지 은지 한가 할까 까요 이에 에요 예요".split()
+)
+
+
+def tokenize(text: str) -> list[str]:
+    """
+    Split text into index terms.
+
+    Latin words and numbers are kept whole; Hangul runs become overlapping
+    syllable bigrams, which tolerates particles and spacing without a
+    morphological analyzer ("스테이킹은" and "스테이킹" share most terms).
+    """
+    terms = []
+    for token in _TOKEN_RE.findall(unicodedata.normalize("NFKC", text).casefold()):
+        if token[0] < "가" or len(token) == 1:
+            terms.append(token)
+        else:
+            terms.extend(token[i : i + 2] for i in range(len(token) - 1))
+    return [term for term in terms if term not in _STOPWORDS]
+
+
+@dataclass(frozen=True)
+class Chunk:
+    """A retrievable unit of prompt text."""
+
+    kind: ChunkKind
+    title: str
+    text: str
+    source: int = -1  # Index into ANSWER_PATTERNS for pattern chunks
+
+
+def chunk_knowledge(knowledge: str) -> list[Chunk]:
+    """Split the knowledge base into its ``## `` sections."""
+    chunks = []
+    for section in re.split(r"\n(?=## )", knowledge):
+        section = section.strip()
+        if not section.startswith("## "):
+            continue  # Top-level heading
+        title = section.splitlines()[0][3:].strip()
+        chunks.append(Chunk(kind="knowledge", title=title, text=section))
+    return chunks
+
+
+def build_corpus() -> list[Chunk]:
+    """Chunks for every answer pattern and knowledge base section."""
+    chunks = [
+        Chunk(
+            kind="pattern",
+            title=pattern["content"].splitlines()[0].lstrip("# ").strip(),
+            text=pattern["content"],
+            source=i,
+        )
+        for i, pattern in enumerate(ANSWER_PATTERNS)
+    ]
+    chunks.extend(chunk_knowledge(get_tokamak_knowledge()))
+    return chunks
+
+
+def corpus_fingerprint(chunks: list[Chunk]) -> str:
+    """Hash of the indexed text, used to detect a stale index file."""
+    digest = hashlib.sha256()
+    for chunk in chunks:
+        digest.update(f"{chunk.kind}\0{chunk.source}\0{chunk.text}\0".encode())
+    return digest.hexdigest()
+
+
+class RetrievalIndex:
+    """
+    BM25 index with postings in a flat uint32 array.
+
+    Built in memory from chunks, or loaded from a file written by ``save``;
+    loaded indexes memory-map the postings so startup does not parse them.
+    Each term maps to (offset, df): ``df`` document ids at ``offset``
+    followed by their ``df`` term frequencies.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(
+        self,
+        chunks: list[Chunk],
+        terms: dict[str, tuple[int, int]],
+        lengths: list[int],
+        postings: "array[int] | memoryview",
+        fingerprint: str,
+    ):
+        self.chunks = chunks
+        self.fingerprint = fingerprint
+        self._terms = terms
+        self._lengths = lengths
+        self._postings = postings
+        self._avg_length = sum(lengths) / len(lengths) if lengths else 0.0
+        self._mmap: mmap.mmap | None = None
+
+    @classmethod
+    def build(cls, chunks: list[Chunk] | None = None) -> "RetrievalIndex":
+        """Index chunks (the prompt corpus by default)."""
+        chunks = build_corpus() if chunks is None else chunks
+        counts = [Counter(tokenize(f"{c.title}\n{c.text}")) for c in chunks]
+        by_term: dict[str, list[tuple[int, int]]] = {}
+        for doc_id, counter in enumerate(counts):
+            for term, tf in counter.items():
+                by_term.setdefault(term, []).append((doc_id, tf))
+
+        postings = array("I")
+        terms: dict[str, tuple[int, int]] = {}
+        for term, entries in by_term.items():
+            terms[term] = (len(postings), len(entries))
+            postings.extend(doc_id for doc_id, _ in entries)
+            postings.extend(tf for _, tf in entries)
+
+        lengths = [sum(counter.values()) for counter in counts]
+        return cls(chunks, terms, lengths, postings, corpus_fingerprint(chunks))
+
+    def save(self, path: Path) -> None:
+        """Write the index to path (JSON metadata followed by raw postings)."""
+        meta = json.dumps(
+            {
+                "fingerprint": self.fingerprint,
+                "chunks": [[c.kind, c.title, c.text, c.source] for c in self.chunks],
+                "lengths": self._lengths,
+                "terms": self._terms,
+            },
+            ensure_ascii=False,
+        ).encode()
+        meta += b" " * (-(_HEADER.size + len(meta)) % 4)  # Align postings to 4 bytes
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(INDEX_MAGIC, INDEX_VERSION, len(meta)))
+            f.write(meta)
+            f.write(array("I", self._postings).tobytes())
+        tmp.replace(path)
+
+    @classmethod
+    def load(cls, path: Path) -> "RetrievalIndex":
+        """
+        Open an index file, memory-mapping its postings.
+
+        Raises:
+            ValueError: If the file is not a compatible index.
+        """
+        with open(path, "rb") as f:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        postings: memoryview | None = None
+        try:
+            magic, version, meta_len = _HEADER.unpack_from(mapped, 0)
+            if magic != INDEX_MAGIC or version != INDEX_VERSION:
+                raise ValueError(f"Not a retrieval index (version {INDEX_VERSION}): {path}")
+            start = _HEADER.size + meta_len
+            meta = json.loads(mapped[_HEADER.size : start])
+            with memoryview(mapped) as view, view[start:] as region:
+                postings = region.cast("I")
+            index = cls(
+                chunks=[
+                    Chunk(kind, title, text, source) for kind, title, text, source in meta["chunks"]
+                ],
+                terms={term: tuple(entry) for term, entry in meta["terms"].items()},
+                lengths=meta["lengths"],
+                postings=postings,
+                fingerprint=meta["fingerprint"],
+            )
+        except Exception as e:
+            # Truncated or corrupt file: release the map and report it like a bad header
+            if postings is not None:
+                postings.release()
+            mapped.close()
+            if isinstance(e, ValueError):
+                raise
+            raise ValueError(f"Corrupt retrieval index {path}: {e!r}") from e
+        index._mmap = mapped
+        return index
+
+    def close(self) -> None:
+        """Release the memory map of a loaded index."""
+        if self._mmap is not None:
+            self._postings.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def search(
+        self,
+        query: str,
+        k: int = 4,
+        kind: ChunkKind | None = None,
+        min_score: float = 0.0,
+    ) -> list[tuple[Chunk, float]]:
+        """
+        Rank chunks against a query with BM25.
+
+        Args:
+            query: Free text (usually the user's message).
+            k: Maximum results.
+            kind: Only return chunks of this kind.
+            min_score: Drop results scoring below this.
+
+        Returns:
+            (chunk, score) pairs, best first.
+        """
+        total = len(self.chunks)
+        if not total:
+            return []
+        postings = self._postings
+        lengths = self._lengths
+        k1, b, avg = self.K1, self.B, self._avg_length
+        scores: dict[int, float] = {}
+        for term in set(tokenize(query)):
+            entry = self._terms.get(term)
+            if entry is None:
+                continue
+            offset, df = entry
+            idf = math.log(1 + (total - df + 0.5) / (df + 0.5))
+            for i in range(offset, offset + df):
+                doc_id = postings[i]
+                tf = postings[i + df]
+                norm = tf * (k1 + 1) / (tf + k1 * (1 - b + b * lengths[doc_id] / avg))
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * norm
+
+        ranked = heapq.nlargest(
+            k,
+            (
+                (score, doc_id)
+                for doc_id, score in scores.items()
+                if score >= min_score and (kind is None or self.chunks[doc_id].kind == kind)
+            ),
+        )
+        return [(self.chunks[doc_id], score) for score, doc_id in ranked]
+
+
+def load_or_build_index(path: Path | None) -> RetrievalIndex:
+    """
+    Load the index at path, rebuilding it when missing or stale.
+
+    The index is rebuilt in memory (and rewritten to path when given) if the
+    file is absent, unreadable, or was built from different prompt text.
+    """
+    chunks = build_corpus()
+    fingerprint = corpus_fingerprint(chunks)
+    if path and path.exists():
+        try:
+            index = RetrievalIndex.load(path)
+            if index.fingerprint == fingerprint:
+                logger.info(f"Loaded retrieval index: {path} ({len(index.chunks)} chunks)")
+                return index
+            index.close()
+            logger.info(f"Retrieval index {path} is stale, rebuilding")
+        except (OSError, ValueError) as e:
+            logger.warning(f"Could not load retrieval index {path}: {e}")
+
+    index = RetrievalIndex.build(chunks)
+    if path:
+        try:
+            index.save(path)
+        except OSError as e:
+            logger.warning(f"Could not save retrieval index {path}: {e}")
+    return index
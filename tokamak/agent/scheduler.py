@@ -0,0 +1,175 @@
+"""Bounded, fair scheduling of agent runs across users."""
+
+import asyncio
+import time
+from collections import OrderedDict, deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from tokamak.utils.metrics import REGISTRY, LatencyWindow
+
+AGENT_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "tokamak_agent_queue_wait_seconds",
+    "Time agent runs wait for a worker slot",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0),
+)
+AGENT_RUNS = REGISTRY.counter("tokamak_agent_runs_total", "Agent runs by outcome", ("outcome",))
+
+Job = Callable[[], Awaitable[None]]
+
+
+@dataclass
+class _Run:
+    job: Job
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class AgentScheduler:
+    """
+    Runs agent jobs on a bounded number of slots, fairly across users.
+
+    Jobs of one user run one at a time in submission order. Free slots go
+    round-robin over groups (guilds) and, within a group, over the users
+    with queued jobs, so a single busy user or server can't take every
+    slot. When the queue is at its limit, or a user already has too many
+    jobs waiting, ``submit`` refuses the job so the caller can answer
+    right away instead of letting the backlog grow.
+    """
+
+    def __init__(self, max_concurrency: int = 8, max_queue: int = 100, max_user_queue: int = 3):
+        """
+        Initialize the scheduler.
+
+        Args:
+            max_concurrency: Jobs running at once.
+            max_queue: Jobs waiting for a slot before new ones are shed.
+            max_user_queue: Jobs one user may have waiting.
+        """
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.max_user_queue = max_user_queue
+        # group -> users with queued jobs, both in round-robin order
+        self._groups: OrderedDict[str, OrderedDict[str, deque[_Run]]] = OrderedDict()
+        self._running_users: set[str] = set()
+        self._tasks: set[asyncio.Task] = set()
+        self._queued = 0
+        self.completed = 0
+        self.failed = 0
+        self.shed = 0
+        self._wait = LatencyWindow()
+
+    @property
+    def queued(self) -> int:
+        return self._queued
+
+    @property
+    def running(self) -> int:
+        return len(self._running_users)
+
+    def submit(self, user: str, group: str, job: Job) -> bool:
+        """
+        Queue a job for a user.
+
+        Args:
+            user: Key of the user; the user's jobs run in order, one at a time.
+            group: Fairness group of the user, e.g. the guild.
+            job: Coroutine function to run.
+
+        Returns:
+            False if the job was shed because the queue or the user's queue is full.
+        """
+        users = self._groups.get(group)
+        pending = users.get(user) if users else None
+        if self._queued >= self.max_queue:
+            limit = f"agent queue full ({self._queued} waiting)"
+        elif pending is not None and len(pending) >= self.max_user_queue:
+            limit = f"{len(pending)} jobs already queued for this user"
+        else:
+            limit = None
+        if limit is not None:
+            self.shed += 1
+            AGENT_RUNS.inc(outcome="shed")
+            logger.warning(f"Shedding job of {user}: {limit}")
+            return False
+
+        if users is None:
+            users = self._groups[group] = OrderedDict()
+        if pending is None:
+            pending = users[user] = deque()
+        pending.append(_Run(job))
+        self._queued += 1
+        self._dispatch()
+        return True
+
+    def _next(self) -> tuple[str, _Run] | None:
+        """Pop the next job in round-robin order whose user isn't running."""
+        for group, users in self._groups.items():
+            for user, pending in users.items():
+                if user in self._running_users:
+                    continue
+                run = pending.popleft()
+                if pending:
+                    users.move_to_end(user)
+                else:
+                    del users[user]
+                if users:
+                    self._groups.move_to_end(group)
+                else:
+                    del self._groups[group]
+                return user, run
+        return None
+
+    def _dispatch(self) -> None:
+        while len(self._running_users) < self.max_concurrency:
+            picked = self._next()
+            if picked is None:
+                return
+            user, run = picked
+            self._queued -= 1
+            self._running_users.add(user)
+            waited = time.monotonic() - run.enqueued
+            self._wait.add(waited)
+            AGENT_QUEUE_WAIT_SECONDS.observe(waited)
+            task = asyncio.create_task(self._run(user, run.job))
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+    async def _run(self, user: str, job: Job) -> None:
+        try:
+            await job()
+            self.completed += 1
+            AGENT_RUNS.inc(outcome="completed")
+        except asyncio.CancelledError:
+            AGENT_RUNS.inc(outcome="cancelled")
+            raise
+        except Exception as e:
+            self.failed += 1
+            AGENT_RUNS.inc(outcome="failed")
+            logger.error(f"Agent job of {user} failed: {e}")
+        finally:
+            self._running_users.discard(user)
+            self._dispatch()
+
+    async def close(self) -> None:
+        """Drop queued jobs and cancel running ones."""
+        self._groups.clear()
+        self._queued = 0
+        tasks = list(self._tasks)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        p50, p95 = self._wait.percentile(50), self._wait.percentile(95)
+        return {
+            "running": self.running,
+            "queued": self._queued,
+            "completed": self.completed,
+            "failed": self.failed,
+            "shed": self.shed,
+            "wait_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "wait_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
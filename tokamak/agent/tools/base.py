@@ -30,6 +30,15 @@ class Tool(ABC):
         """JSON Schema for tool parameters."""
         pass
 
+    @property
+    def parallel_safe(self) -> bool:
+        """Whether calls may run concurrently with other calls from the same turn.
+
+        Tools with side effects (e.g. HTTP mutations) should return False so
+        they run one at a time, in the order the LLM requested them.
+        """
+        return True
+
     @abstractmethod
     async def execute(self, **kwargs: Any) -> str:
         """
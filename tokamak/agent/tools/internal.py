@@ -20,6 +20,11 @@ class InternalStateTool(Tool):
     def description(self) -> str:
         return "봇 내부 상태 관리. 세션 목록 조회, 상태 확인, 세션 삭제 등."
 
+    @property
+    def parallel_safe(self) -> bool:
+        # delete_session mutates shared state
+        return False
+
     @property
     def parameters(self) -> dict[str, Any]:
         return {
@@ -62,7 +67,7 @@ class InternalStateTool(Tool):
             return json.dumps({"error": f"알 수 없는 액션: {action}"}, ensure_ascii=False)
 
     def _get_status(self, app: "TokamakApp") -> str:
-        session_count = len(app.session_manager._sessions)
+        session_count = len(app.session_manager)
         conversation_count = app.discord.active_conversation_count
         news_feed_status = "활성" if app.news_feed else "비활성"
 
@@ -72,6 +77,18 @@ class InternalStateTool(Tool):
                 "active_sessions": session_count,
                 "active_conversations": conversation_count,
                 "news_feed": news_feed_status,
+                "session_cache": app.session_manager.stats(),
+                "compaction": app.compactor.stats() if app.compactor else None,
+                "prompt_cache": app.agent.prompt_cache_stats(),
+                "response_cache": app.response_cache.stats() if app.response_cache else None,
+                "dns_cache": app.resolver.stats(),
+                "llm_providers": app.router.stats() if app.router else None,
+                "llm_governor": app.governor.stats() if app.governor else None,
+                "llm_usage": app.usage.stats() if app.usage else None,
+                "event_loop": app.loop_monitor.stats() if app.loop_monitor else None,
+                "message_bus": app.bus.stats(),
+                "agent_scheduler": app.scheduler.stats(),
+                "moderation": app.moderation.stats() if app.moderation else None,
             },
             ensure_ascii=False,
         )
@@ -101,14 +118,11 @@ class InternalStateTool(Tool):
         return json.dumps({"success": True, "sessions": session_list}, ensure_ascii=False)
 
     def _delete_session(self, app: "TokamakApp", session_key: str) -> str:
-        sessions = app.session_manager._sessions
-
-        if session_key not in sessions:
+        if not app.session_manager.delete(session_key):
             return json.dumps(
                 {"error": f"세션을 찾을 수 없습니다: `{session_key}`"}, ensure_ascii=False
             )
 
-        del sessions[session_key]
         return json.dumps(
             {"success": True, "message": f"세션이 삭제되었습니다: `{session_key}`"},
             ensure_ascii=False,
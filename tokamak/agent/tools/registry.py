@@ -1,8 +1,15 @@
 """Tool registry for dynamic tool management."""
 
+import asyncio
+import time
 from typing import Any
 
 from tokamak.agent.tools.base import Tool
+from tokamak.utils.metrics import REGISTRY
+
+TOOL_CALL_SECONDS = REGISTRY.histogram(
+    "tokamak_tool_call_seconds", "Tool call duration", ("tool", "outcome")
+)
 
 
 class ToolRegistry:
@@ -12,8 +19,17 @@ class ToolRegistry:
     Allows dynamic registration and execution of tools.
     """
 
-    def __init__(self):
+    def __init__(self, max_concurrency: int = 4, timeout_seconds: float | None = 30.0):
+        """
+        Initialize the registry.
+
+        Args:
+            max_concurrency: Maximum tool calls running at once in execute_batch.
+            timeout_seconds: Per-call timeout (None disables it).
+        """
         self._tools: dict[str, Tool] = {}
+        self.max_concurrency = max(1, max_concurrency)
+        self.timeout_seconds = timeout_seconds
 
     def register(self, tool: Tool) -> None:
         """Register a tool."""
@@ -53,10 +69,56 @@ class ToolRegistry:
         if not tool:
             return f"Error: Tool '{name}' not found"
 
+        start = time.perf_counter()
+        outcome = "ok"
         try:
-            return await tool.execute(**params)
+            return await asyncio.wait_for(tool.execute(**params), timeout=self.timeout_seconds)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            return f"Error executing {name}: timed out after {self.timeout_seconds}s"
         except Exception as e:
+            outcome = "error"
             return f"Error executing {name}: {str(e)}"
+        finally:
+            TOOL_CALL_SECONDS.observe(time.perf_counter() - start, tool=name, outcome=outcome)
+
+    async def execute_batch(self, calls: list[tuple[str, dict[str, Any]]]) -> list[str]:
+        """
+        Execute the tool calls of one LLM turn, concurrently where allowed.
+
+        Consecutive parallel-safe calls run together (bounded by max_concurrency).
+        A call to a tool that is not parallel-safe waits for everything before
+        it and runs alone, so side effects keep the order the LLM asked for.
+
+        Args:
+            calls: (tool name, parameters) pairs in the order the LLM issued them.
+
+        Returns:
+            Results in the same order as ``calls``.
+        """
+        results: list[str] = [""] * len(calls)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(index: int, name: str, params: dict[str, Any]) -> None:
+            async with semaphore:
+                results[index] = await self.execute(name, params)
+
+        pending: list[asyncio.Task] = []
+        for index, (name, params) in enumerate(calls):
+            tool = self._tools.get(name)
+            if tool is None or tool.parallel_safe:
+                pending.append(asyncio.create_task(run(index, name, params)))
+                continue
+
+            if pending:
+                await asyncio.gather(*pending)
+                pending = []
+            results[index] = await self.execute(name, params)
+
+        if pending:
+            await asyncio.gather(*pending)
+
+        return results
 
     @property
     def tool_names(self) -> list[str]:
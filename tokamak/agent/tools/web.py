@@ -1,16 +1,19 @@
 """Web tools for HTTP requests."""
 
 import html
-import ipaddress
 import json
 import re
 import socket
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
 from typing import Any
 from urllib.parse import urlencode, urlparse, urlunparse
 
 import httpx
 
 from tokamak.agent.tools.base import Tool
+from tokamak.utils.dns import AsyncResolver, UnsafeAddressError, get_default_resolver
+from tokamak.utils.http import HttpClientPool, pinned_transport
 
 USER_AGENT = "Mozilla/5.0 (Macintosh; Intel Mac OS X 14_7_2) AppleWebKit/537.36"
 
@@ -29,6 +32,43 @@ def _normalize(text: str) -> str:
     return re.sub(r"\n{3,}", "\n\n", text).strip()
 
 
+@asynccontextmanager
+async def _open_client(
+    http: HttpClientPool | None, resolver: AsyncResolver, url: str
+) -> AsyncIterator[httpx.AsyncClient]:
+    """Use the shared pool when available, otherwise a one-off pinned client."""
+    if http is None:
+        async with httpx.AsyncClient(timeout=30.0, transport=pinned_transport(resolver)) as client:
+            yield client
+    else:
+        async with http.acquire(url) as client:
+            yield client
+
+
+async def _check_url(resolver: AsyncResolver, url: str) -> str | None:
+    """Return an error message if url must not be fetched, else None."""
+    try:
+        parsed = urlparse(url)
+    except Exception:
+        return "Invalid URL"
+
+    if parsed.scheme not in ("http", "https"):
+        return f"Unsupported scheme: {parsed.scheme}"
+
+    hostname = parsed.hostname
+    if not hostname:
+        return "No hostname in URL"
+
+    try:
+        await resolver.resolve_public(hostname)
+    except UnsafeAddressError:
+        return "Access to internal networks is not allowed"
+    except (socket.gaierror, OSError, ValueError):
+        return f"Cannot resolve hostname: {hostname}"
+
+    return None
+
+
 def _build_url_with_params(url: str, params: dict[str, Any] | None) -> str:
     if not params:
         return url
@@ -90,31 +130,20 @@ class WebFetchTool(Tool):
             "required": ["url"],
         }
 
-    def __init__(self, max_chars: int = 50000, auth_tokens: dict[str, str] | None = None):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        auth_tokens: dict[str, str] | None = None,
+        http: HttpClientPool | None = None,
+        resolver: AsyncResolver | None = None,
+    ):
         self.max_chars = max_chars
         self.auth_tokens = auth_tokens or {}
+        self.http = http
+        self.resolver = resolver or (http.resolver if http else get_default_resolver())
 
-    def _is_safe_url(self, url: str) -> str | None:
-        try:
-            parsed = urlparse(url)
-        except Exception:
-            return "Invalid URL"
-
-        if parsed.scheme not in ("http", "https"):
-            return f"Unsupported scheme: {parsed.scheme}"
-
-        hostname = parsed.hostname
-        if not hostname:
-            return "No hostname in URL"
-
-        try:
-            ip = ipaddress.ip_address(socket.gethostbyname(hostname))
-            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved:
-                return "Access to internal networks is not allowed"
-        except (socket.gaierror, ValueError):
-            return f"Cannot resolve hostname: {hostname}"
-
-        return None
+    async def _is_safe_url(self, url: str) -> str | None:
+        return await _check_url(self.resolver, url)
 
     def _get_auth_headers(self, auth_provider: str) -> dict[str, str]:
         if auth_provider == "discord":
@@ -134,7 +163,7 @@ class WebFetchTool(Tool):
     ) -> str:
         max_chars = max_chars or self.max_chars
 
-        safety_error = self._is_safe_url(url)
+        safety_error = await self._is_safe_url(url)
         if safety_error:
             return json.dumps({"error": safety_error, "url": url})
 
@@ -153,10 +182,8 @@ class WebFetchTool(Tool):
             request_headers.update(headers)
 
         try:
-            async with httpx.AsyncClient() as client:
-                r = await client.get(
-                    url, headers=request_headers, follow_redirects=True, timeout=30.0
-                )
+            async with _open_client(self.http, self.resolver, url) as client:
+                r = await client.get(url, headers=request_headers, follow_redirects=True)
 
             ctype = r.headers.get("content-type", "")
 
@@ -238,6 +265,10 @@ class WebPostTool(Tool):
     def name(self) -> str:
         return "web_post"
 
+    @property
+    def parallel_safe(self) -> bool:
+        return False
+
     @property
     def description(self) -> str:
         return (
@@ -280,31 +311,20 @@ class WebPostTool(Tool):
             "required": ["url"],
         }
 
-    def __init__(self, max_chars: int = 50000, auth_tokens: dict[str, str] | None = None):
+    def __init__(
+        self,
+        max_chars: int = 50000,
+        auth_tokens: dict[str, str] | None = None,
+        http: HttpClientPool | None = None,
+        resolver: AsyncResolver | None = None,
+    ):
         self.max_chars = max_chars
         self.auth_tokens = auth_tokens or {}
+        self.http = http
+        self.resolver = resolver or (http.resolver if http else get_default_resolver())
 
-    def _is_safe_url(self, url: str) -> str | None:
-        try:
-            parsed = urlparse(url)
-        except Exception:
-            return "Invalid URL"
-
-        if parsed.scheme not in ("http", "https"):
-            return f"Unsupported scheme: {parsed.scheme}"
-
-        hostname = parsed.hostname
-        if not hostname:
-            return "No hostname in URL"
-
-        try:
-            ip = ipaddress.ip_address(socket.gethostbyname(hostname))
-            if ip.is_private or ip.is_loopback or ip.is_link_local or ip.is_reserved:
-                return "Access to internal networks is not allowed"
-        except (socket.gaierror, ValueError):
-            return f"Cannot resolve hostname: {hostname}"
-
-        return None
+    async def _is_safe_url(self, url: str) -> str | None:
+        return await _check_url(self.resolver, url)
 
     def _get_auth_headers(self, auth_provider: str) -> dict[str, str]:
         if auth_provider == "discord":
@@ -334,7 +354,7 @@ class WebPostTool(Tool):
                 }
             )
 
-        safety_error = self._is_safe_url(url)
+        safety_error = await self._is_safe_url(url)
         if safety_error:
             return json.dumps({"error": safety_error, "url": url})
 
@@ -351,23 +371,21 @@ class WebPostTool(Tool):
             request_headers.update(headers)
 
         try:
-            async with httpx.AsyncClient() as client:
+            async with _open_client(self.http, self.resolver, url) as client:
                 if method == "POST":
                     r = await client.post(
-                        url, headers=request_headers, json=body, follow_redirects=True, timeout=30.0
+                        url, headers=request_headers, json=body, follow_redirects=True
                     )
                 elif method == "PUT":
                     r = await client.put(
-                        url, headers=request_headers, json=body, follow_redirects=True, timeout=30.0
+                        url, headers=request_headers, json=body, follow_redirects=True
                     )
                 elif method == "PATCH":
                     r = await client.patch(
-                        url, headers=request_headers, json=body, follow_redirects=True, timeout=30.0
+                        url, headers=request_headers, json=body, follow_redirects=True
                     )
                 elif method == "DELETE":
-                    r = await client.delete(
-                        url, headers=request_headers, follow_redirects=True, timeout=30.0
-                    )
+                    r = await client.delete(url, headers=request_headers, follow_redirects=True)
                 else:
                     return json.dumps({"error": f"Unsupported method: {method}", "url": url})
 
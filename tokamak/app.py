@@ -9,17 +9,38 @@ from tokamak.admin import AdminHandler
 from tokamak.admin.ban_handler import BanHandler
 from tokamak.admin.notifier import AdminNotifier
 from tokamak.agent import AgentLoop
+from tokamak.agent.compaction import SessionCompactor
+from tokamak.agent.loop import PartialCallback, RevisionCallback
+from tokamak.agent.response_cache import ResponseCache
+from tokamak.agent.retrieval import RetrievalIndex, load_or_build_index
+from tokamak.agent.scheduler import AgentScheduler
 from tokamak.agent.tools import InternalStateTool, ToolRegistry, WebFetchTool
-from tokamak.bus import MessageBus
+from tokamak.bus import LaneLimit, MessageBus
+from tokamak.bus.events import Lane
+from tokamak.bus.queue import DEFAULT_INBOUND_LANES, DEFAULT_OUTBOUND_LANES
 from tokamak.channels import DiscordChannel
 from tokamak.channels.telegram import TelegramChannel
 from tokamak.config import Config
+from tokamak.config.schema import BusLaneConfig, ModelBudgetConfig
 from tokamak.cron.service import CronService
 from tokamak.cron.types import CronSchedule
-from tokamak.moderation import ToxicContentEvent, ToxicityDetector
+from tokamak.moderation import ModerationPipeline, ToxicContentEvent, ToxicityDetector
 from tokamak.news import NewsFeedService, NewsFetcher, NewsSummarizer
-from tokamak.providers import OpenAICompatibleProvider
-from tokamak.session import Session, SessionManager
+from tokamak.providers import (
+    GovernedProvider,
+    InstrumentedProvider,
+    LLMProvider,
+    ModelBudget,
+    OpenAICompatibleProvider,
+    RoutingProvider,
+    UsageRecorder,
+)
+from tokamak.providers.usage import model_prices
+from tokamak.session import Session, SessionManager, SQLiteSessionStore
+from tokamak.utils.dns import AsyncResolver
+from tokamak.utils.http import HttpClientPool
+from tokamak.utils.loop_monitor import LoopMonitor
+from tokamak.utils.metrics import REGISTRY, MetricsServer, measure_loop_lag
 
 
 class TokamakApp:
@@ -29,29 +50,81 @@ class TokamakApp:
         self.config = config
         self.data_dir = data_dir
 
-        self.bus = MessageBus()
-        self.session_manager = SessionManager(max_messages=config.session.max_messages)
+        self.bus = self._create_bus()
+        self.resolver = AsyncResolver(
+            ttl_seconds=config.http.dns_cache_ttl_seconds,
+            negative_ttl_seconds=config.http.dns_negative_ttl_seconds,
+        )
+        self.http = HttpClientPool(config.http, resolver=self.resolver)
+        self.session_manager = self._create_session_manager()
 
         self.provider = self._create_provider()
+        self.router: RoutingProvider | None = (
+            self.provider if isinstance(self.provider, RoutingProvider) else None
+        )
+        self.governor: GovernedProvider | None = None
+        if config.providers.governor.enabled:
+            self.governor = self._create_governor(self.provider)
+            self.provider = self.governor
+        self.usage: UsageRecorder | None = None
+        if config.usage.enabled:
+            self.usage = UsageRecorder(
+                path=self._usage_path(),
+                prices=model_prices(config.usage.prices),
+                flush_interval_seconds=config.usage.flush_interval_seconds,
+            )
+            self.provider = InstrumentedProvider(self.provider, self.usage)
 
         self.tools = self._create_tools()
 
+        self.retriever: RetrievalIndex | None = None
+        if config.agent.retrieval_enabled:
+            self.retriever = load_or_build_index(self._retrieval_index_path())
+
+        self.response_cache: ResponseCache | None = None
+        if config.agent.response_cache_enabled:
+            self.response_cache = ResponseCache(
+                max_entries=config.agent.response_cache_max_entries,
+                ttl_seconds=config.agent.response_cache_ttl_seconds,
+                similarity_threshold=config.agent.response_cache_similarity,
+            )
+
         self.agent = AgentLoop(
             provider=self.provider,
             tools=self.tools,
             model=config.agent.model,
+            max_history_messages=config.agent.max_history_messages,
+            max_context_tokens=config.agent.max_context_tokens,
             max_tokens=config.agent.max_tokens,
             temperature=config.agent.temperature,
             enable_korean_review=config.agent.enable_korean_review,
             korean_review_model=config.agent.korean_review_model,
+            korean_review_mode=config.agent.korean_review_mode,
+            korean_review_deferred=config.agent.korean_review_deferred,
+            stream=config.agent.stream_responses,
+            retriever=self.retriever,
+            retrieval_top_k=config.agent.retrieval_top_k,
+            response_cache=self.response_cache,
         )
 
+        self.compactor: SessionCompactor | None = None
+        if config.agent.compaction_enabled:
+            self.compactor = SessionCompactor(
+                provider=self.provider,
+                model=config.agent.compaction_model
+                or config.agent.korean_review_model
+                or config.agent.model,
+                trigger_tokens=config.agent.compaction_trigger_tokens,
+                keep_recent_messages=config.agent.compaction_keep_messages,
+            )
+
         self.admin_handler: AdminHandler | None = None
         if config.admin.admin_channel_ids:
             self.admin_handler = AdminHandler(config.admin, self)
 
         # Moderation system
         self.moderation_detector: ToxicityDetector | None = None
+        self.moderation: ModerationPipeline | None = None
         self.telegram_channel: TelegramChannel | None = None
         self.admin_notifier: AdminNotifier | None = None
         self.ban_handler: BanHandler | None = None
@@ -61,15 +134,27 @@ class TokamakApp:
                 provider=self.provider,
                 config=config.moderation,
             )
+            self.moderation = ModerationPipeline(
+                self.moderation_detector,
+                workers=config.moderation.workers,
+                queue_size=config.moderation.queue_size,
+            )
 
+        self.scheduler = AgentScheduler(
+            max_concurrency=config.agent.max_concurrent_runs,
+            max_queue=config.agent.max_queued_runs,
+            max_user_queue=config.agent.max_queued_runs_per_user,
+        )
         self.discord = DiscordChannel(
             config=config.discord,
             bus=self.bus,
             session_manager=self.session_manager,
             on_message_callback=self._handle_message,
             admin_handler=self.admin_handler,
-            moderation_detector=self.moderation_detector,
+            moderation=self.moderation,
             on_toxic_content=self._handle_toxic_content if config.moderation.enabled else None,
+            on_reply_sent=self.compactor.schedule if self.compactor else None,
+            scheduler=self.scheduler,
         )
 
         if config.moderation.enabled:
@@ -93,45 +178,163 @@ class TokamakApp:
             )
 
         self._running = False
+
+        self.metrics_server: MetricsServer | None = None
+        if config.metrics.enabled:
+            self.metrics_server = MetricsServer(
+                REGISTRY, host=config.metrics.host, port=config.metrics.port
+            )
+        self._register_metrics()
+
+        self.loop_monitor: LoopMonitor | None = None
+        if config.diagnostics.loop_monitor:
+            self.loop_monitor = self._create_loop_monitor()
+
         self.cron: CronService | None = None
         self.news_feed: NewsFeedService | None = None
 
         if config.news_feed.enabled:
             self.news_feed = self._create_news_feed()
 
-    def _create_provider(self) -> OpenAICompatibleProvider:
+    def _retrieval_index_path(self) -> Path:
+        path = self.config.agent.retrieval_index_path
+        return Path(path) if path else self.data_dir / "retrieval.idx"
+
+    def _create_bus(self) -> MessageBus:
+        cfg = self.config.bus
+
+        def limits(
+            defaults: dict[Lane, LaneLimit], overrides: dict[Lane, BusLaneConfig]
+        ) -> dict[Lane, LaneLimit]:
+            merged = dict(defaults)
+            for lane, lane_cfg in overrides.items():
+                merged[lane] = LaneLimit(capacity=lane_cfg.capacity, overflow=lane_cfg.overflow)
+            return merged
+
+        return MessageBus(
+            inbound_lanes=limits(DEFAULT_INBOUND_LANES, cfg.inbound),
+            outbound_lanes=limits(DEFAULT_OUTBOUND_LANES, cfg.outbound),
+            dispatch_concurrency=cfg.dispatch_concurrency,
+            subscriber_timeout_seconds=cfg.subscriber_timeout_seconds,
+            max_in_flight=cfg.max_in_flight,
+        )
+
+    def _create_loop_monitor(self) -> LoopMonitor:
+        cfg = self.config.diagnostics
+        return LoopMonitor(
+            interval_seconds=cfg.loop_monitor_interval_seconds,
+            warn_seconds=cfg.loop_lag_warn_seconds,
+            profiler_enabled=cfg.slow_callback_profiler,
+            profiler_toggle_path=(
+                Path(cfg.profiler_toggle_path)
+                if cfg.profiler_toggle_path
+                else self.data_dir / "loop_profiler.enable"
+            ),
+            profiler_report_path=(
+                Path(cfg.profiler_report_path)
+                if cfg.profiler_report_path
+                else self.data_dir / "slow_callbacks.log"
+            ),
+            profiler_threshold_seconds=cfg.slow_callback_threshold_seconds,
+            profiler_sample_interval_seconds=cfg.profiler_sample_interval_seconds,
+        )
+
+    def _usage_path(self) -> Path:
+        path = self.config.usage.path
+        return Path(path) if path else self.data_dir / "llm_usage.jsonl"
+
+    def _create_session_manager(self) -> SessionManager:
+        """Create session manager, backed by SQLite when persistence is enabled."""
+        cfg = self.config.session
+        store = None
+        if cfg.persist:
+            db_path = Path(cfg.db_path) if cfg.db_path else self.data_dir / "sessions.db"
+            store = SQLiteSessionStore(db_path)
+        return SessionManager(
+            max_messages=cfg.max_messages,
+            store=store,
+            flush_interval_seconds=cfg.flush_interval_seconds,
+            flush_batch_size=cfg.flush_batch_size,
+            rehydrate_window_seconds=cfg.rehydrate_window_seconds,
+            max_sessions=cfg.max_cached_sessions,
+            max_total_bytes=cfg.max_cache_bytes,
+            max_session_bytes=cfg.max_session_bytes,
+        )
+
+    def _create_provider(self) -> LLMProvider:
         """Create LLM provider from config."""
-        api_key = None
-        api_base = None
-
-        # Try providers in order: openrouter, anthropic, openai
-        if self.config.providers.openrouter:
-            api_key = self.config.providers.openrouter.api_key
-            api_base = self.config.providers.openrouter.api_base
-        elif self.config.providers.anthropic:
-            api_key = self.config.providers.anthropic.api_key
-            api_base = self.config.providers.anthropic.api_base
-        elif self.config.providers.openai:
-            api_key = self.config.providers.openai.api_key
-            api_base = self.config.providers.openai.api_base
-
-        if not api_key:
+        # Providers in priority order: openrouter, anthropic, openai
+        configured = [
+            (name, provider_config)
+            for name, provider_config in (
+                ("openrouter", self.config.providers.openrouter),
+                ("anthropic", self.config.providers.anthropic),
+                ("openai", self.config.providers.openai),
+            )
+            if provider_config and provider_config.api_key
+        ]
+        if not configured:
             raise ValueError("No LLM provider API key configured")
 
-        return OpenAICompatibleProvider(
-            api_key=api_key,
-            api_base=api_base,
-            default_model=self.config.agent.model,
+        backends: list[tuple[str, LLMProvider]] = [
+            (
+                name,
+                OpenAICompatibleProvider(
+                    api_key=provider_config.api_key,
+                    api_base=provider_config.api_base,
+                    default_model=self.config.agent.model,
+                    cache_hints=self.config.agent.prompt_cache_hints,
+                ),
+            )
+            for name, provider_config in configured
+        ]
+        routing = self.config.providers.routing
+        if not routing.enabled or len(backends) == 1:
+            return backends[0][1]
+
+        logger.info(f"Routing LLM requests across {', '.join(name for name, _ in backends)}")
+        return RoutingProvider(
+            backends,
+            failure_threshold=routing.failure_threshold,
+            cooldown_seconds=routing.cooldown_seconds,
+            timeout_seconds=routing.timeout_seconds,
+            hedge=routing.hedge,
+            hedge_min_samples=routing.hedge_min_samples,
+        )
+
+    def _create_governor(self, provider: LLMProvider) -> GovernedProvider:
+        """Wrap the provider in the rate limiter configured under providers.governor."""
+        cfg = self.config.providers.governor
+
+        def budget(model_cfg: ModelBudgetConfig) -> ModelBudget:
+            return ModelBudget(
+                requests_per_minute=model_cfg.requests_per_minute,
+                tokens_per_minute=model_cfg.tokens_per_minute,
+                max_concurrency=model_cfg.max_concurrency,
+            )
+
+        return GovernedProvider(
+            provider,
+            default_budget=budget(cfg.default_budget),
+            model_budgets={model: budget(model_cfg) for model, model_cfg in cfg.models.items()},
+            deadlines={
+                "interactive": cfg.interactive_deadline_seconds,
+                "moderation": cfg.moderation_deadline_seconds,
+                "background": cfg.background_deadline_seconds,
+            },
         )
 
     def _create_tools(self) -> ToolRegistry:
-        registry = ToolRegistry()
+        registry = ToolRegistry(
+            max_concurrency=self.config.agent.tool_max_concurrency,
+            timeout_seconds=self.config.agent.tool_timeout_seconds,
+        )
 
         auth_tokens = {}
         if self.config.discord.token:
             auth_tokens["discord"] = self.config.discord.token
 
-        registry.register(WebFetchTool(auth_tokens=auth_tokens))
+        registry.register(WebFetchTool(auth_tokens=auth_tokens, http=self.http))
         registry.register(InternalStateTool())
 
         return registry
@@ -139,7 +342,7 @@ class TokamakApp:
     def _create_news_feed(self) -> NewsFeedService:
         """Create news feed service."""
         news_config = self.config.news_feed
-        fetcher = NewsFetcher(sources=news_config.news_sources)
+        fetcher = NewsFetcher(sources=news_config.news_sources, http=self.http)
         summarizer = NewsSummarizer(
             provider=self.provider,
             model=news_config.summary_model or self.config.agent.model,
@@ -154,13 +357,21 @@ class TokamakApp:
             max_news_per_fetch=news_config.max_news_per_fetch,
         )
 
-    async def _handle_message(self, session: Session, content: str) -> str | None:
+    async def _handle_message(
+        self,
+        session: Session,
+        content: str,
+        on_partial: PartialCallback | None = None,
+        on_revised: RevisionCallback | None = None,
+    ) -> str | None:
         """
         Handle incoming message from Discord.
 
         Args:
             session: User session
             content: Message content
+            on_partial: Optional callback for streamed partial answers
+            on_revised: Optional callback applying a deferred review to the sent reply
 
         Returns:
             Bot response or None
@@ -169,8 +380,61 @@ class TokamakApp:
             session,
             content,
             max_retries=1,
+            on_partial=on_partial,
+            on_revised=on_revised,
         )
 
+    def _register_metrics(self) -> None:
+        """Register gauges read from live components when metrics are scraped."""
+        REGISTRY.gauge(
+            "tokamak_bus_queue_depth",
+            "Messages waiting in the message bus",
+            ("queue", "lane"),
+            callback=lambda: {
+                (queue, lane): size
+                for queue, sizes in self.bus.lane_sizes().items()
+                for lane, size in sizes.items()
+            },
+        )
+        REGISTRY.gauge(
+            "tokamak_agent_runs",
+            "Agent runs running or waiting for a slot",
+            ("state",),
+            callback=lambda: {
+                ("running",): self.scheduler.running,
+                ("queued",): self.scheduler.queued,
+            },
+        )
+        REGISTRY.gauge(
+            "tokamak_moderation_queue_depth",
+            "Messages waiting for a moderation check",
+            callback=lambda: self.moderation.queued if self.moderation else 0,
+        )
+        REGISTRY.gauge(
+            "tokamak_session_cache_sessions",
+            "Sessions held in memory",
+            callback=lambda: len(self.session_manager),
+        )
+        REGISTRY.gauge(
+            "tokamak_session_cache_bytes",
+            "Approximate size of the sessions held in memory",
+            callback=lambda: self.session_manager.stats()["bytes"],
+        )
+        REGISTRY.gauge(
+            "tokamak_active_conversations",
+            "Users in an active conversation with the bot",
+            callback=lambda: self.discord.active_conversation_count,
+        )
+        loop_lag = REGISTRY.gauge(
+            "tokamak_event_loop_lag_seconds",
+            "Delay before the event loop runs a newly scheduled callback, measured at scrape",
+        )
+
+        async def probe_loop_lag() -> None:
+            loop_lag.set(await measure_loop_lag())
+
+        REGISTRY.add_collector("event_loop_lag", probe_loop_lag)
+
     async def _handle_toxic_content(self, event: ToxicContentEvent) -> None:
         """Handle toxic content detection event."""
         if self.admin_notifier:
@@ -193,6 +457,9 @@ class TokamakApp:
             await asyncio.sleep(interval_seconds)
             try:
                 removed_sessions = self.session_manager.cleanup_stale(max_age_seconds=3600)
+                await self.session_manager.purge_stored(
+                    max_age_seconds=self.config.session.retention_days * 86400
+                )
                 removed_convos = self.discord.cleanup_expired_conversations()
                 if removed_sessions or removed_convos:
                     logger.info(
@@ -207,6 +474,15 @@ class TokamakApp:
         logger.info("Starting Tokamak bot...")
         self._running = True
 
+        if self.loop_monitor:
+            await self.loop_monitor.start()
+        await self.http.start()
+        await self.session_manager.start()
+        if self.usage:
+            await self.usage.start()
+        if self.metrics_server:
+            await self.metrics_server.start()
+
         bus_task = asyncio.create_task(self.bus.dispatch_outbound())
         cleanup_task = asyncio.create_task(self._periodic_cleanup())
 
@@ -255,5 +531,20 @@ class TokamakApp:
 
         self.bus.stop()
         await self.discord.stop()
+        await self.scheduler.close()
+        if self.moderation:
+            await self.moderation.close()
+        if self.compactor:
+            await self.compactor.close()
+        await self.http.close()
+        await self.session_manager.close()
+        if self.usage:
+            await self.usage.close()
+        if self.metrics_server:
+            await self.metrics_server.close()
+        if self.loop_monitor:
+            await self.loop_monitor.close()
+        if self.retriever:
+            self.retriever.close()
 
         logger.info("Tokamak bot stopped")
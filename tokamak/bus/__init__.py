@@ -1,6 +1,6 @@
 """Message bus for decoupled communication."""
 
 from tokamak.bus.events import InboundMessage, OutboundMessage
-from tokamak.bus.queue import MessageBus
+from tokamak.bus.queue import LaneLimit, MessageBus
 
-__all__ = ["InboundMessage", "OutboundMessage", "MessageBus"]
+__all__ = ["InboundMessage", "OutboundMessage", "LaneLimit", "MessageBus"]
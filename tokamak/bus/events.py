@@ -2,7 +2,11 @@
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any
+from typing import Any, Literal
+
+# Bus lanes, highest priority first
+Lane = Literal["interactive", "admin", "moderation", "news"]
+LANES: tuple[Lane, ...] = ("interactive", "admin", "moderation", "news")
 
 
 @dataclass
@@ -16,6 +20,7 @@ class InboundMessage:
     timestamp: datetime = field(default_factory=datetime.now)
     media: list[str] = field(default_factory=list)  # Media URLs
     metadata: dict[str, Any] = field(default_factory=dict)  # Channel-specific data
+    lane: Lane = "interactive"  # Bus priority lane
 
     @property
     def session_key(self) -> str:
@@ -33,3 +38,4 @@ class OutboundMessage:
     reply_to: str | None = None
     media: list[str] = field(default_factory=list)
     metadata: dict[str, Any] = field(default_factory=dict)
+    lane: Lane = "interactive"
@@ -1,11 +1,185 @@
 """Async message queue for decoupled channel-agent communication."""
 
 import asyncio
-from typing import Awaitable, Callable
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Generic, Literal, TypeVar
 
 from loguru import logger
 
-from tokamak.bus.events import InboundMessage, OutboundMessage
+from tokamak.bus.events import LANES, InboundMessage, Lane, OutboundMessage
+from tokamak.utils.metrics import REGISTRY, LatencyWindow
+
+OverflowPolicy = Literal["block", "drop_oldest", "reject"]
+
+T = TypeVar("T", InboundMessage, OutboundMessage)
+
+# Outbound destination: (channel, chat_id)
+Destination = tuple[str, str]
+
+BUS_WAIT_SECONDS = REGISTRY.histogram(
+    "tokamak_bus_wait_seconds",
+    "Time messages wait in a bus lane before being consumed",
+    ("queue", "lane"),
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0, 120.0),
+)
+BUS_OVERFLOW = REGISTRY.counter(
+    "tokamak_bus_overflow_total",
+    "Messages dropped or rejected because a bus lane was full",
+    ("queue", "lane", "policy"),
+)
+
+
+@dataclass
+class LaneLimit:
+    """Capacity of one lane and what publishing into a full lane does."""
+
+    capacity: int = 1000
+    overflow: OverflowPolicy = "block"
+
+
+# Nothing may be consuming inbound, so a full lane never blocks a channel handler
+DEFAULT_INBOUND_LANES: dict[Lane, LaneLimit] = {
+    "interactive": LaneLimit(1000, "drop_oldest"),
+    "admin": LaneLimit(200, "drop_oldest"),
+    "moderation": LaneLimit(500, "drop_oldest"),
+    "news": LaneLimit(100, "drop_oldest"),
+}
+DEFAULT_OUTBOUND_LANES: dict[Lane, LaneLimit] = {
+    "interactive": LaneLimit(1000, "block"),
+    "admin": LaneLimit(200, "block"),
+    "moderation": LaneLimit(500, "drop_oldest"),
+    "news": LaneLimit(50, "drop_oldest"),
+}
+
+
+@dataclass
+class _Lane(Generic[T]):
+    limit: LaneLimit
+    items: deque[tuple[float, T]] = field(default_factory=deque)
+    published: int = 0
+    dropped: int = 0
+    rejected: int = 0
+    wait: LatencyWindow = field(default_factory=LatencyWindow)
+
+    def stats(self) -> dict[str, Any]:
+        p50, p95 = self.wait.percentile(50), self.wait.percentile(95)
+        oldest = time.monotonic() - self.items[0][0] if self.items else 0.0
+        return {
+            "depth": len(self.items),
+            "capacity": self.limit.capacity,
+            "overflow": self.limit.overflow,
+            "published": self.published,
+            "dropped": self.dropped,
+            "rejected": self.rejected,
+            "wait_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "wait_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "oldest_ms": round(oldest * 1000, 1),
+        }
+
+
+@dataclass
+class _DispatchStats:
+    delivered: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    latency: LatencyWindow = field(default_factory=LatencyWindow)
+
+    def stats(self) -> dict[str, Any]:
+        p50, p95 = self.latency.percentile(50), self.latency.percentile(95)
+        return {
+            "delivered": self.delivered,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "send_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "send_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+
+class LaneQueue(Generic[T]):
+    """
+    Bounded queue with one lane per priority, consumed highest lane first.
+
+    Each lane has its own capacity, so a flood in a low lane can neither
+    take the space of a higher one nor delay its messages: ``get`` always
+    returns from the highest non-empty lane. When a lane is full, publishing
+    blocks until there is room, drops the lane's oldest message, or rejects
+    the new message, depending on the lane's overflow policy.
+    """
+
+    def __init__(self, name: str, limits: dict[Lane, LaneLimit]):
+        """
+        Initialize the queue.
+
+        Args:
+            name: Queue name used in logs and metrics.
+            limits: Capacity and overflow policy per lane; lanes not listed
+                get the defaults of LaneLimit.
+        """
+        self.name = name
+        self._lanes: dict[Lane, _Lane[T]] = {
+            lane: _Lane(limits.get(lane, LaneLimit())) for lane in LANES
+        }
+        self._changed = asyncio.Condition()
+
+    def _has_items(self) -> bool:
+        return any(lane.items for lane in self._lanes.values())
+
+    async def put(self, item: T) -> bool:
+        """
+        Add an item to its lane.
+
+        Returns:
+            False if the lane was full and its policy rejected the item.
+        """
+        lane = self._lanes[item.lane]
+        async with self._changed:
+            if len(lane.items) >= lane.limit.capacity:
+                policy = lane.limit.overflow
+                if policy == "reject":
+                    lane.rejected += 1
+                    BUS_OVERFLOW.inc(queue=self.name, lane=item.lane, policy=policy)
+                    logger.warning(f"Bus {self.name}/{item.lane} lane full, message rejected")
+                    return False
+                if policy == "drop_oldest":
+                    lane.items.popleft()
+                    lane.dropped += 1
+                    BUS_OVERFLOW.inc(queue=self.name, lane=item.lane, policy=policy)
+                    logger.warning(f"Bus {self.name}/{item.lane} lane full, dropped oldest")
+                else:
+                    await self._changed.wait_for(lambda: len(lane.items) < lane.limit.capacity)
+            lane.items.append((time.monotonic(), item))
+            lane.published += 1
+            self._changed.notify_all()
+        return True
+
+    async def get(self) -> T:
+        """Remove and return the oldest item of the highest non-empty lane."""
+        async with self._changed:
+            await self._changed.wait_for(self._has_items)
+            for name, lane in self._lanes.items():
+                if lane.items:
+                    enqueued, item = lane.items.popleft()
+                    waited = time.monotonic() - enqueued
+                    lane.wait.add(waited)
+                    BUS_WAIT_SECONDS.observe(waited, queue=self.name, lane=name)
+                    self._changed.notify_all()
+                    return item
+        raise AssertionError("unreachable")
+
+    def qsize(self, lane: Lane | None = None) -> int:
+        """Items waiting in one lane, or in all lanes."""
+        if lane is not None:
+            return len(self._lanes[lane].items)
+        return sum(len(lane.items) for lane in self._lanes.values())
+
+    def sizes(self) -> dict[Lane, int]:
+        return {name: len(lane.items) for name, lane in self._lanes.items()}
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Depth, overflow counts and wait times per lane."""
+        return {name: lane.stats() for name, lane in self._lanes.items()}
 
 
 class MessageBus:
@@ -13,28 +187,64 @@ class MessageBus:
     Async message bus that decouples chat channels from the agent core.
 
     Channels push messages to the inbound queue, and the agent processes
-    them and pushes responses to the outbound queue.
+    them and pushes responses to the outbound queue. Both queues are
+    bounded and split into priority lanes (see LaneQueue); a message's
+    ``lane`` field picks its lane.
+
+    Outbound messages are delivered by one worker per destination (channel
+    and chat), so a slow send only holds up later messages to the same
+    chat: order is kept per chat while different chats go out in parallel.
     """
 
-    def __init__(self):
-        self.inbound: asyncio.Queue[InboundMessage] = asyncio.Queue()
-        self.outbound: asyncio.Queue[OutboundMessage] = asyncio.Queue()
+    def __init__(
+        self,
+        inbound_lanes: dict[Lane, LaneLimit] | None = None,
+        outbound_lanes: dict[Lane, LaneLimit] | None = None,
+        dispatch_concurrency: int = 16,
+        subscriber_timeout_seconds: float | None = 30.0,
+        max_in_flight: int = 256,
+    ):
+        """
+        Initialize the bus.
+
+        Args:
+            inbound_lanes: Lane limits of the inbound queue.
+            outbound_lanes: Lane limits of the outbound queue.
+            dispatch_concurrency: Outbound deliveries running at once.
+            subscriber_timeout_seconds: Time one subscriber callback may take
+                for one message (None: no limit).
+            max_in_flight: Outbound messages taken off the queue but not yet
+                delivered; beyond it the lanes' backpressure applies again.
+        """
+        self.inbound: LaneQueue[InboundMessage] = LaneQueue(
+            "inbound", inbound_lanes or DEFAULT_INBOUND_LANES
+        )
+        self.outbound: LaneQueue[OutboundMessage] = LaneQueue(
+            "outbound", outbound_lanes or DEFAULT_OUTBOUND_LANES
+        )
         self._outbound_subscribers: dict[
             str, list[Callable[[OutboundMessage], Awaitable[None]]]
         ] = {}
-        self._running = False
+        self.subscriber_timeout_seconds = subscriber_timeout_seconds
+        self.max_in_flight = max_in_flight
+        self._stopped = asyncio.Event()
+        self._delivery_slots = asyncio.Semaphore(dispatch_concurrency)
+        self._in_flight = asyncio.Semaphore(max_in_flight)
+        self._destinations: dict[Destination, deque[OutboundMessage]] = {}
+        self._workers: dict[Destination, asyncio.Task] = {}
+        self._dispatch_stats = _DispatchStats()
 
-    async def publish_inbound(self, msg: InboundMessage) -> None:
-        """Publish a message from a channel to the agent."""
-        await self.inbound.put(msg)
+    async def publish_inbound(self, msg: InboundMessage) -> bool:
+        """Publish a message from a channel to the agent (False if rejected)."""
+        return await self.inbound.put(msg)
 
     async def consume_inbound(self) -> InboundMessage:
         """Consume the next inbound message (blocks until available)."""
         return await self.inbound.get()
 
-    async def publish_outbound(self, msg: OutboundMessage) -> None:
-        """Publish a response from the agent to channels."""
-        await self.outbound.put(msg)
+    async def publish_outbound(self, msg: OutboundMessage) -> bool:
+        """Publish a response from the agent to channels (False if rejected)."""
+        return await self.outbound.put(msg)
 
     async def consume_outbound(self) -> OutboundMessage:
         """Consume the next outbound message (blocks until available)."""
@@ -50,25 +260,88 @@ class MessageBus:
 
     async def dispatch_outbound(self) -> None:
         """
-        Dispatch outbound messages to subscribed channels.
+        Dispatch outbound messages to subscribed channels until stop() is called.
         Run this as a background task.
         """
-        self._running = True
-        while self._running:
-            try:
-                msg = await asyncio.wait_for(self.outbound.get(), timeout=1.0)
-                subscribers = self._outbound_subscribers.get(msg.channel, [])
-                for callback in subscribers:
+        self._stopped.clear()
+        stop_wait = asyncio.create_task(self._stopped.wait())
+        try:
+            while True:
+                getter = asyncio.create_task(self._next_outbound())
+                await asyncio.wait({getter, stop_wait}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
                     try:
-                        await callback(msg)
-                    except Exception as e:
-                        logger.error(f"Error dispatching to {msg.channel}: {e}")
+                        await getter
+                    except asyncio.CancelledError:
+                        pass
+                if not getter.cancelled():
+                    self._route(getter.result())
+                if stop_wait.done():
+                    break
+        except asyncio.CancelledError:
+            for worker in self._workers.values():
+                worker.cancel()
+            raise
+        finally:
+            stop_wait.cancel()
+        # Let deliveries already running finish
+        await asyncio.gather(*self._workers.values(), return_exceptions=True)
+
+    async def _next_outbound(self) -> OutboundMessage:
+        await self._in_flight.acquire()
+        try:
+            return await self.outbound.get()
+        except BaseException:
+            self._in_flight.release()
+            raise
+
+    def _route(self, msg: OutboundMessage) -> None:
+        key = (msg.channel, msg.chat_id)
+        pending = self._destinations.setdefault(key, deque())
+        pending.append(msg)
+        if key not in self._workers:
+            self._workers[key] = asyncio.create_task(self._drain_destination(key, pending))
+
+    async def _drain_destination(self, key: Destination, pending: deque[OutboundMessage]) -> None:
+        """Deliver one destination's messages in order; exits once it has none left."""
+        try:
+            while pending and not self._stopped.is_set():
+                msg = pending.popleft()
+                try:
+                    async with self._delivery_slots:
+                        await self._deliver(msg)
+                finally:
+                    self._in_flight.release()
+        finally:
+            if pending:
+                logger.warning(f"Bus stopped with {len(pending)} undelivered for {key[1]}")
+                for _ in range(len(pending)):
+                    self._in_flight.release()
+            del self._workers[key]
+            del self._destinations[key]
+
+    async def _deliver(self, msg: OutboundMessage) -> None:
+        stats = self._dispatch_stats
+        for callback in self._outbound_subscribers.get(msg.channel, []):
+            start = time.monotonic()
+            try:
+                await asyncio.wait_for(callback(msg), timeout=self.subscriber_timeout_seconds)
+                stats.delivered += 1
             except asyncio.TimeoutError:
-                continue
+                stats.timeouts += 1
+                logger.error(
+                    f"Dispatch to {msg.channel}:{msg.chat_id} timed out after "
+                    f"{self.subscriber_timeout_seconds}s"
+                )
+            except Exception as e:
+                stats.errors += 1
+                logger.error(f"Error dispatching to {msg.channel}: {e}")
+            stats.latency.add(time.monotonic() - start)
 
     def stop(self) -> None:
         """Stop the dispatcher loop."""
-        self._running = False
+        self._stopped.set()
 
     @property
     def inbound_size(self) -> int:
@@ -79,3 +352,19 @@ class MessageBus:
     def outbound_size(self) -> int:
         """Number of pending outbound messages."""
         return self.outbound.qsize()
+
+    def lane_sizes(self) -> dict[str, dict[Lane, int]]:
+        """Pending messages per lane of each queue."""
+        return {"inbound": self.inbound.sizes(), "outbound": self.outbound.sizes()}
+
+    def stats(self) -> dict[str, Any]:
+        """Per-lane stats of both queues and outbound delivery stats."""
+        return {
+            "inbound": self.inbound.stats(),
+            "outbound": self.outbound.stats(),
+            "dispatch": {
+                "destinations": len(self._workers),
+                "queued": sum(len(pending) for pending in self._destinations.values()),
+                **self._dispatch_stats.stats(),
+            },
+        }
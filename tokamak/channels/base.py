@@ -3,7 +3,7 @@
 from abc import ABC, abstractmethod
 from typing import Any
 
-from tokamak.bus.events import InboundMessage, OutboundMessage
+from tokamak.bus.events import InboundMessage, Lane, OutboundMessage
 from tokamak.bus.queue import MessageBus
 
 
@@ -16,6 +16,7 @@ class BaseChannel(ABC):
     """
 
     name: str = "base"
+    lane: Lane = "interactive"  # Bus lane of the messages this channel publishes
 
     def __init__(self, config: Any, bus: MessageBus):
         """
@@ -111,6 +112,7 @@ class BaseChannel(ABC):
             content=content,
             media=media or [],
             metadata=metadata or {},
+            lane=self.lane,
         )
 
         await self.bus.publish_inbound(msg)
@@ -3,22 +3,27 @@
 import asyncio
 import re
 import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING, Awaitable, Callable
 
 import discord
 from discord import Intents, Message
 from loguru import logger
 
+from tokamak.agent.scheduler import AgentScheduler
 from tokamak.bus.events import OutboundMessage
 from tokamak.bus.queue import MessageBus
 from tokamak.channels.base import BaseChannel
 from tokamak.config.schema import DiscordConfig
+from tokamak.session import Message as SessionMessage
 from tokamak.session import Session, SessionManager
+from tokamak.utils.metrics import MESSAGE_STAGE_SECONDS, REGISTRY
 
 if TYPE_CHECKING:
     from tokamak.admin.handler import AdminHandler
-    from tokamak.moderation.detector import ToxicityDetector
-    from tokamak.moderation.types import ToxicContentEvent
+    from tokamak.moderation.pipeline import ModerationPipeline
+    from tokamak.moderation.types import ModerationResult, ToxicContentEvent
 
 
 def format_discord_message(content: str) -> str:
@@ -89,6 +94,36 @@ def format_discord_message(content: str) -> str:
 DISCORD_MAX_LENGTH = 2000
 DISCORD_SAFE_LENGTH = 1900
 
+# How long a deferred review waits for the original reply to be delivered
+REVISION_WAIT_SECONDS = 60.0
+
+ERROR_REPLY = (
+    "죄송합니다, 응답 처리 중 오류가 발생했어요. 잠시 후 다시 시도해주세요.\n"
+    "Sorry, an error occurred. Please try again shortly."
+)
+
+BUSY_REPLY = (
+    "지금 요청이 많아 답변드리기 어려워요. 잠시 후 다시 시도해주세요.\n"
+    "I'm handling a lot of requests right now. Please try again in a moment."
+)
+
+
+# A turn is answered right away once it has this many messages
+MAX_TURN_MESSAGES = 10
+
+# Recent messages whose turn can still be found when moderation flags them
+MAX_TRACKED_MESSAGES = 1000
+
+COALESCED_MESSAGES = REGISTRY.counter(
+    "tokamak_coalesced_messages_total",
+    "Messages answered together with an earlier message of the same turn",
+)
+SUPPRESSED_REPLIES = REGISTRY.counter(
+    "tokamak_suppressed_replies_total",
+    "Answers withheld or deleted because moderation flagged the message they answer",
+    ("stage",),
+)
+
 
 def split_message(content: str, max_length: int = DISCORD_SAFE_LENGTH) -> list[str]:
     """Split a message into chunks that fit within Discord's character limit.
@@ -116,6 +151,119 @@ def split_message(content: str, max_length: int = DISCORD_SAFE_LENGTH) -> list[s
     return chunks
 
 
+class StreamingReply:
+    """A Discord reply that is posted early and edited as the answer grows.
+
+    Partial text is rendered with format_discord_message and split_message on
+    every flush; chunks that already exist are edited in place, new chunks are
+    sent as follow-up messages. Edits are throttled to ``edit_interval`` and
+    run in the background so the agent never waits on Discord while streaming.
+    """
+
+    def __init__(self, message: Message, edit_interval: float = 1.0):
+        self._source = message
+        self.edit_interval = edit_interval
+        self._sent: list[Message] = []
+        self._sent_chunks: list[str] = []
+        self._text = ""
+        self._last_flush = 0.0
+        self._flush_task: asyncio.Task | None = None
+        self._lock = asyncio.Lock()
+        self._started_at = time.monotonic()
+        self.first_visible_after: float | None = None
+
+    @property
+    def has_output(self) -> bool:
+        """Whether any part of the reply is already visible in Discord."""
+        return bool(self._sent)
+
+    async def update(self, text: str) -> None:
+        """Record the latest partial text and flush it if the throttle allows."""
+        self._text = text
+        if self._flush_task and not self._flush_task.done():
+            return
+        if time.monotonic() - self._last_flush < self.edit_interval:
+            return
+        self._flush_task = asyncio.create_task(self._background_flush())
+
+    async def finish(self, text: str) -> None:
+        """Render the final text, trimming any surplus chunks from partial output."""
+        self._text = text
+        if self._flush_task:
+            await self._flush_task
+        await self._flush(final=True)
+
+    async def _background_flush(self) -> None:
+        try:
+            await self._flush()
+        except Exception as e:
+            logger.warning(f"Streaming reply update failed: {e}")
+
+    async def _flush(self, final: bool = False) -> None:
+        async with self._lock:
+            chunks = [c for c in split_message(format_discord_message(self._text)) if c.strip()]
+
+            for i, chunk in enumerate(chunks):
+                if i < len(self._sent):
+                    if self._sent_chunks[i] != chunk:
+                        await self._sent[i].edit(content=chunk)
+                        self._sent_chunks[i] = chunk
+                    continue
+                if i == 0:
+                    sent = await self._source.reply(chunk)
+                else:
+                    sent = await self._source.channel.send(chunk)
+                self._sent.append(sent)
+                self._sent_chunks.append(chunk)
+                if self.first_visible_after is None:
+                    self.first_visible_after = time.monotonic() - self._started_at
+                    logger.info(f"First reply chunk visible after {self.first_visible_after:.2f}s")
+
+            if final:
+                while len(self._sent) > max(len(chunks), 1):
+                    surplus = self._sent.pop()
+                    self._sent_chunks.pop()
+                    await surplus.delete()
+
+            self._last_flush = time.monotonic()
+
+    async def discard(self) -> None:
+        """Stop pending updates and delete everything posted so far."""
+        if self._flush_task and not self._flush_task.done():
+            self._flush_task.cancel()
+        async with self._lock:
+            for sent in self._sent:
+                try:
+                    await sent.delete()
+                except Exception as e:
+                    logger.warning(f"Failed to delete discarded reply: {e}")
+            self._sent.clear()
+            self._sent_chunks.clear()
+
+
+@dataclass
+class _Turn:
+    """Consecutive messages of one user that get a single answer."""
+
+    session: Session
+    guild_id: int
+    messages: list[Message] = field(default_factory=list)
+    contents: list[str] = field(default_factory=list)
+    debounce: asyncio.Task | None = None
+    queued: bool = False
+    task: asyncio.Task | None = None
+    reply: StreamingReply | None = None
+    # Set once the agent has answered; the run is no longer superseded then
+    committed: bool = False
+    # Set when moderation flagged one of the messages; the turn gets no answer
+    suppressed: bool = False
+
+    @property
+    def content(self) -> str:
+        # Matches how the session's separate user messages are joined by the agent
+        return "\n".join(self.contents)
+
+
 class DiscordChannel(BaseChannel):
     """Discord channel implementation with conversation tracking."""
 
@@ -126,10 +274,12 @@ class DiscordChannel(BaseChannel):
         config: DiscordConfig,
         bus: MessageBus,
         session_manager: SessionManager,
-        on_message_callback: Callable[[Session, str], Awaitable[str | None]] | None = None,
+        on_message_callback: Callable[..., Awaitable[str | None]] | None = None,
         admin_handler: "AdminHandler | None" = None,
         on_toxic_content: Callable[["ToxicContentEvent"], Awaitable[None]] | None = None,
-        moderation_detector: "ToxicityDetector | None" = None,
+        moderation: "ModerationPipeline | None" = None,
+        on_reply_sent: Callable[[Session], None] | None = None,
+        scheduler: AgentScheduler | None = None,
     ):
         """
         Initialize Discord channel.
@@ -138,10 +288,17 @@ class DiscordChannel(BaseChannel):
             config: Discord configuration
             bus: Message bus for communication
             session_manager: Session manager for conversation history
-            on_message_callback: Async callback(session, content) -> response
+            on_message_callback: Async callback(session, content, on_partial=..., on_revised=...)
+                -> response. on_partial receives partial answer text while it streams in;
+                on_revised receives a corrected answer after the reply was sent.
             admin_handler: Handler for admin DM commands
             on_toxic_content: Async callback for toxic content detection
-            moderation_detector: Toxicity detector instance
+            moderation: Pipeline checking messages for toxic content in the
+                background, so replies don't wait for the check.
+            on_reply_sent: Called with the session once a reply is fully delivered,
+                for follow-up work that must not delay the reply (e.g. compaction).
+            scheduler: Scheduler the agent runs go through; bounds concurrent
+                runs and keeps each user's replies in order.
         """
         super().__init__(config, bus)
         self.config: DiscordConfig = config
@@ -149,13 +306,19 @@ class DiscordChannel(BaseChannel):
         self.on_message_callback = on_message_callback
         self.admin_handler = admin_handler
         self.on_toxic_content = on_toxic_content
-        self.moderation_detector = moderation_detector
+        self.moderation = moderation
+        self.on_reply_sent = on_reply_sent
 
         # Active conversation tracking: {user_key: last_message_timestamp}
         self._active_conversations: dict[str, float] = {}
 
-        # Per-user locks to prevent concurrent message processing
-        self._user_locks: dict[str, asyncio.Lock] = {}
+        self.scheduler = scheduler or AgentScheduler()
+
+        # Per-user turn still collecting or waiting for a slot, and turn being answered
+        self._pending_turns: dict[str, _Turn] = {}
+        self._running_turns: dict[str, _Turn] = {}
+        # Turn each recent message belongs to, for suppressing flagged ones
+        self._message_turns: OrderedDict[int, _Turn] = OrderedDict()
 
         # Discord client setup
         intents = Intents.default()
@@ -186,6 +349,10 @@ class DiscordChannel(BaseChannel):
     async def stop(self) -> None:
         """Stop the Discord client."""
         self._running = False
+        for turn in self._pending_turns.values():
+            if turn.debounce:
+                turn.debounce.cancel()
+        self._pending_turns.clear()
         await self._client.close()
         logger.info("Discord channel stopped")
 
@@ -295,61 +462,193 @@ class DiscordChannel(BaseChannel):
             message_id=str(message.id),
         )
 
-        if user_key not in self._user_locks:
-            self._user_locks[user_key] = asyncio.Lock()
-        lock = self._user_locks[user_key]
+        if self.moderation:
+            self.moderation.submit(
+                message.id,
+                content,
+                lambda result: self._on_moderation_result(message, content, result),
+            )
 
-        async with lock:
-            if self.on_toxic_content and self.moderation_detector:
-                await self._check_toxic_content(message, content)
+        if session.is_ended:
+            logger.debug(f"Session ended for {user_key}, not responding")
+            return
 
-            if session.is_ended:
-                logger.debug(f"Session ended for {user_key}, not responding")
-                return
+        if not self.should_respond(user_key, is_mention):
+            logger.debug(f"Not responding to {user_key}")
+            return
 
-            if not self.should_respond(user_key, is_mention):
-                logger.debug(f"Not responding to {user_key}")
-                return
+        if self.on_message_callback:
+            await self._add_to_turn(user_key, guild_id, session, message, content)
+        else:
+            await self._handle_message(
+                sender_id=str(user_id),
+                chat_id=str(message.channel.id),
+                content=content,
+                metadata={
+                    "guild_id": str(guild_id),
+                    "author_name": message.author.display_name,
+                    "message_id": str(message.id),
+                    "session_key": session_key,
+                },
+            )
+
+    async def _add_to_turn(
+        self, user_key: str, guild_id: int, session: Session, message: Message, content: str
+    ) -> None:
+        """
+        Add a message to the user's next turn and answer it once the user pauses.
+
+        The turn is submitted after ``coalesce_window_seconds`` without new
+        messages. Messages arriving while it waits for a scheduler slot join
+        it as well. If the user's previous turn is still running and nothing
+        of its answer is posted yet, that run is cancelled and its messages
+        are answered together with the new one.
+        """
+        turn = self._pending_turns.get(user_key)
+        if turn is None:
+            turn = _Turn(session=session, guild_id=guild_id)
+            running = self._running_turns.get(user_key)
+            if running and self._can_supersede(running):
+                running.task.cancel()
+                turn.messages.extend(running.messages)
+                turn.contents.extend(running.contents)
+                for earlier in running.messages:
+                    self._track_message(earlier, turn)
+                logger.info(f"New message from {user_key}, restarting its unanswered turn")
+            self._pending_turns[user_key] = turn
+        if turn.messages:
+            COALESCED_MESSAGES.inc()
+        turn.messages.append(message)
+        turn.contents.append(content)
+        self._track_message(message, turn)
+
+        if turn.queued:
+            return
+        if turn.debounce:
+            turn.debounce.cancel()
+            turn.debounce = None
+        window = self.config.coalesce_window_seconds
+        if window <= 0 or len(turn.messages) >= MAX_TURN_MESSAGES:
+            await self._submit_turn(user_key, turn)
+        else:
+            turn.debounce = asyncio.create_task(self._debounce(user_key, turn, window))
+
+    def _can_supersede(self, turn: _Turn) -> bool:
+        return (
+            self.config.cancel_superseded_runs
+            and turn.task is not None
+            and not turn.committed
+            and not turn.suppressed
+            and not (turn.reply and turn.reply.has_output)
+        )
 
+    def _track_message(self, message: Message, turn: _Turn) -> None:
+        self._message_turns[message.id] = turn
+        self._message_turns.move_to_end(message.id)
+        while len(self._message_turns) > MAX_TRACKED_MESSAGES:
+            self._message_turns.popitem(last=False)
+
+    async def _debounce(self, user_key: str, turn: _Turn, window: float) -> None:
+        await asyncio.sleep(window)
+        turn.debounce = None
+        await self._submit_turn(user_key, turn)
+
+    async def _submit_turn(self, user_key: str, turn: _Turn) -> None:
+        turn.queued = True
+        if self.scheduler.submit(
+            user_key, group=str(turn.guild_id), job=lambda: self._respond(user_key, turn)
+        ):
+            return
+        if self._pending_turns.get(user_key) is turn:
+            del self._pending_turns[user_key]
+        try:
+            await turn.messages[-1].reply(BUSY_REPLY)
+        except Exception as e:
+            logger.error(f"Failed to send busy reply: {e}")
+
+    async def _respond(self, user_key: str, turn: _Turn) -> None:
+        """Run the agent for a turn and deliver its reply (scheduled per user)."""
+        if self._pending_turns.get(user_key) is turn:
+            del self._pending_turns[user_key]
+        session, message, content = turn.session, turn.messages[-1], turn.content
+        if turn.suppressed:
+            return
+        if session.is_ended:
+            # Ended by an earlier reply while this one was queued
+            logger.debug(f"Session ended for {user_key}, not responding")
+            return
+
+        if len(turn.messages) > 1:
+            logger.info(
+                f"Responding to {len(turn.messages)} messages from "
+                f"{message.author.display_name} in {message.channel}"
+            )
+        else:
             logger.info(f"Responding to {message.author.display_name} in {message.channel}")
+        reply = StreamingReply(message, edit_interval=self.config.stream_edit_interval_seconds)
+        delivered = asyncio.Event()
+        turn.task = asyncio.current_task()
+        turn.reply = reply
+        self._running_turns[user_key] = turn
+
+        answer: SessionMessage | None = None
+
+        async def on_revised(text: str) -> None:
+            # A deferred review may finish before the reply is out
+            if not turn.suppressed:
+                await asyncio.wait_for(delivered.wait(), timeout=REVISION_WAIT_SECONDS)
+            if turn.suppressed:
+                return
+            await reply.finish(text)
+            # Later turns should build on the corrected answer, not the one first sent
+            if answer is not None:
+                session.replace_content(answer, text)
 
-            if self.on_message_callback:
-                try:
-                    response = await self.on_message_callback(session, content)
-                    if response:
-                        session.add_message(role="assistant", content=response)
-                        formatted_response = format_discord_message(response)
-                        chunks = split_message(formatted_response)
-                        await message.reply(chunks[0])
-                        for chunk in chunks[1:]:
-                            await message.channel.send(chunk)
-
-                        if session.is_ended:
-                            if user_key in self._active_conversations:
-                                del self._active_conversations[user_key]
-                                logger.info(
-                                    f"Removed {user_key} from active conversations (session ended)"
-                                )
-                except Exception as e:
-                    logger.error(f"Error processing message: {e}")
-                    try:
-                        await message.reply(
-                            "죄송합니다, 응답 처리 중 오류가 발생했어요. 잠시 후 다시 시도해주세요.\nSorry, an error occurred. Please try again shortly."
-                        )
-                    except Exception:
-                        pass
-            else:
-                await self._handle_message(
-                    sender_id=str(user_id),
-                    chat_id=str(message.channel.id),
-                    content=content,
-                    metadata={
-                        "guild_id": str(guild_id),
-                        "author_name": message.author.display_name,
-                        "message_id": str(message.id),
-                        "session_key": session_key,
-                    },
+        try:
+            with MESSAGE_STAGE_SECONDS.time(stage="agent"):
+                response = await self.on_message_callback(
+                    session, content, on_partial=reply.update, on_revised=on_revised
                 )
+            turn.committed = True
+            if response:
+                answer = session.add_message(role="assistant", content=response)
+                with MESSAGE_STAGE_SECONDS.time(stage="send"):
+                    await reply.finish(response)
+                if turn.suppressed:
+                    # Flagged while the final text was going out
+                    await reply.discard()
+                    return
+                delivered.set()
+                if self.on_reply_sent:
+                    self.on_reply_sent(session)
+
+                if session.is_ended:
+                    if user_key in self._active_conversations:
+                        del self._active_conversations[user_key]
+                        logger.info(f"Removed {user_key} from active conversations (session ended)")
+            elif reply.has_output:
+                # Partial output is already visible; replace it instead of leaving it cut off
+                await reply.finish(ERROR_REPLY)
+        except asyncio.CancelledError:
+            if not turn.committed:
+                # Superseded by newer input: drop partial output the next answer replaces
+                await reply.discard()
+            raise
+        except Exception as e:
+            logger.error(f"Error processing message: {e}")
+            try:
+                if reply.has_output:
+                    await reply.finish(ERROR_REPLY)
+                else:
+                    await message.reply(ERROR_REPLY)
+            except Exception:
+                pass
+        finally:
+            if turn.suppressed:
+                # Nothing will be delivered; let a waiting revision give up now
+                delivered.set()
+            if self._running_turns.get(user_key) is turn:
+                del self._running_turns[user_key]
 
     async def send(self, msg: OutboundMessage) -> None:
         """
@@ -383,7 +682,7 @@ class DiscordChannel(BaseChannel):
         return self._client
 
     def cleanup_expired_conversations(self) -> int:
-        """Remove expired entries from active conversations and unused locks.
+        """Remove expired entries from active conversations.
 
         Returns:
             Number of entries removed.
@@ -393,9 +692,6 @@ class DiscordChannel(BaseChannel):
         expired = [key for key, ts in self._active_conversations.items() if now - ts >= timeout]
         for key in expired:
             del self._active_conversations[key]
-            # Also clean up the lock if not currently held
-            if key in self._user_locks and not self._user_locks[key].locked():
-                del self._user_locks[key]
         return len(expired)
 
     @property
@@ -416,27 +712,57 @@ class DiscordChannel(BaseChannel):
 
         await self.admin_handler.handle(message)
 
-    async def _check_toxic_content(self, message: Message, content: str) -> None:
-        """Check message for toxic content and notify if detected."""
-        if not self.moderation_detector or not self.on_toxic_content:
+    async def _on_moderation_result(
+        self, message: Message, content: str, result: "ModerationResult"
+    ) -> None:
+        """Report a flagged message and withhold the bot's answer to it if severe."""
+        if not result.is_toxic:
             return
 
-        try:
-            result = await self.moderation_detector.detect(content)
-
-            if result.is_toxic:
-                from tokamak.moderation.types import ToxicContentEvent
-
-                event = ToxicContentEvent(
-                    guild_id=message.guild.id,
-                    channel_id=message.channel.id,
-                    user_id=message.author.id,
-                    user_name=message.author.display_name,
-                    message_id=message.id,
-                    message_content=content,
-                    result=result,
-                )
-                await self.on_toxic_content(event)
+        from tokamak.moderation.types import ModerationSeverity, ToxicContentEvent
 
-        except Exception as e:
-            logger.error(f"Error checking toxic content: {e}")
+        if self.config.suppress_flagged_replies and result.severity == ModerationSeverity.HIGH:
+            await self._suppress_reply(message)
+
+        if self.on_toxic_content:
+            event = ToxicContentEvent(
+                guild_id=message.guild.id,
+                channel_id=message.channel.id,
+                user_id=message.author.id,
+                user_name=message.author.display_name,
+                message_id=message.id,
+                message_content=content,
+                result=result,
+            )
+            await self.on_toxic_content(event)
+
+    async def _suppress_reply(self, message: Message) -> None:
+        """
+        Make sure the turn containing a flagged message gets no visible answer.
+
+        A turn that hasn't started is dropped, an unfinished run is cancelled
+        (which discards its partial output) and an answer already posted is
+        deleted. Other messages coalesced into the same turn go unanswered too.
+        """
+        turn = self._message_turns.pop(message.id, None)
+        if turn is None or turn.suppressed:
+            return
+        turn.suppressed = True
+        user_key = self._get_user_key(turn.guild_id, message.author.id)
+
+        if turn.task is None:
+            if turn.debounce:
+                turn.debounce.cancel()
+                turn.debounce = None
+            if self._pending_turns.get(user_key) is turn:
+                del self._pending_turns[user_key]
+            stage = "pending"
+        elif not turn.committed and not turn.task.done():
+            turn.task.cancel()
+            stage = "running"
+        else:
+            if turn.reply:
+                await turn.reply.discard()
+            stage = "posted"
+        SUPPRESSED_REPLIES.inc(stage=stage)
+        logger.info(f"Suppressed {stage} reply to flagged message {message.id} from {user_key}")
@@ -33,6 +33,7 @@ class TelegramChannel(BaseChannel):
     """Telegram channel for admin notifications with inline buttons."""
 
     name = "telegram"
+    lane = "admin"
 
     def __init__(
         self,
@@ -1,5 +1,7 @@
 """Configuration schema using Pydantic."""
 
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
 
@@ -16,12 +18,86 @@ class DiscordConfig(BaseModel):
     conversation_timeout_seconds: int = Field(
         default=300, description="Seconds before conversation timeout (default 5 min)"
     )
+    stream_edit_interval_seconds: float = Field(
+        default=1.0,
+        ge=0.2,
+        description="Minimum seconds between edits of a reply while it streams in",
+    )
+    coalesce_window_seconds: float = Field(
+        default=1.5,
+        ge=0,
+        description="Quiet time after a message before answering, so quick consecutive "
+        "messages are answered as one turn (0 answers each message right away)",
+    )
+    cancel_superseded_runs: bool = Field(
+        default=True,
+        description="Restart an answer that hasn't been posted yet when the user adds a message",
+    )
+    suppress_flagged_replies: bool = Field(
+        default=True,
+        description="Withhold or delete the answer to a message moderation rates high severity",
+    )
 
 
 class SessionConfig(BaseModel):
     """Session management configuration."""
 
     max_messages: int = Field(default=100, description="Maximum messages to store per session")
+    persist: bool = Field(default=True, description="Keep sessions in SQLite across restarts")
+    db_path: str | None = Field(
+        default=None, description="SQLite database path (default: <data_dir>/sessions.db)"
+    )
+    flush_interval_seconds: float = Field(
+        default=1.0, gt=0, description="Maximum delay before session changes are written"
+    )
+    flush_batch_size: int = Field(
+        default=200, ge=1, description="Queued session changes that trigger an early write"
+    )
+    rehydrate_window_seconds: int = Field(
+        default=3600, ge=0, description="Sessions active this recently are preloaded on start"
+    )
+    retention_days: int = Field(
+        default=30, ge=1, description="Stored sessions idle longer than this are deleted"
+    )
+    max_cached_sessions: int = Field(
+        default=5000, ge=1, description="Maximum sessions held in memory (LRU)"
+    )
+    max_cache_bytes: int = Field(
+        default=64 * 1024 * 1024,
+        ge=1024,
+        description="Approximate memory ceiling for all cached sessions",
+    )
+    max_session_bytes: int = Field(
+        default=256 * 1024,
+        ge=0,
+        description="Approximate per-session history budget (0 = unlimited)",
+    )
+
+
+class HttpConfig(BaseModel):
+    """Shared HTTP client pool configuration (web tools, news fetcher)."""
+
+    timeout_seconds: float = Field(default=30.0, gt=0, description="Total request timeout")
+    connect_timeout_seconds: float = Field(
+        default=10.0, gt=0, description="Timeout for establishing a connection"
+    )
+    max_connections: int = Field(default=100, ge=1, description="Maximum open connections")
+    max_keepalive_connections: int = Field(
+        default=20, ge=0, description="Maximum idle connections kept alive for reuse"
+    )
+    keepalive_expiry_seconds: float = Field(
+        default=30.0, ge=0, description="Seconds an idle connection is kept alive"
+    )
+    max_connections_per_host: int = Field(
+        default=10, ge=1, description="Maximum concurrent requests to a single host"
+    )
+    http2: bool = Field(default=True, description="Use HTTP/2 when the h2 package is installed")
+    dns_cache_ttl_seconds: float = Field(
+        default=300.0, ge=0, description="Seconds a successful DNS lookup is cached"
+    )
+    dns_negative_ttl_seconds: float = Field(
+        default=30.0, ge=0, description="Seconds a failed DNS lookup is cached"
+    )
 
 
 class ProviderConfig(BaseModel):
@@ -31,12 +107,80 @@ class ProviderConfig(BaseModel):
     api_base: str | None = Field(default=None, description="Custom API base URL")
 
 
+class ProviderRoutingConfig(BaseModel):
+    """Failover and hedging across the configured providers."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Route requests across every configured provider with health checks and "
+        "failover (all providers must serve the configured model names)",
+    )
+    failure_threshold: int = Field(
+        default=3, ge=1, description="Consecutive failures that take a provider out of rotation"
+    )
+    cooldown_seconds: float = Field(
+        default=30.0, gt=0, description="Time a failed provider stays out before a probe request"
+    )
+    timeout_seconds: float = Field(
+        default=60.0, gt=0, description="Per-attempt timeout (time to first output for streams)"
+    )
+    hedge: bool = Field(
+        default=False,
+        description="Also send a non-streaming request to a second provider when it runs "
+        "longer than the first provider's p95 latency (costs extra tokens)",
+    )
+    hedge_min_samples: int = Field(
+        default=20, ge=1, description="Latency samples needed before hedging starts"
+    )
+
+
+class ModelBudgetConfig(BaseModel):
+    """Upstream rate limits for one model."""
+
+    requests_per_minute: float | None = Field(
+        default=None, gt=0, description="Requests per minute (None: unlimited)"
+    )
+    tokens_per_minute: float | None = Field(
+        default=None, gt=0, description="Prompt plus completion tokens per minute (None: unlimited)"
+    )
+    max_concurrency: int | None = Field(
+        default=8, ge=1, description="Requests in flight at once (None: unlimited)"
+    )
+
+
+class LLMGovernorConfig(BaseModel):
+    """Client-side rate limiting and prioritization of LLM requests."""
+
+    enabled: bool = Field(
+        default=False,
+        description="Queue LLM requests under per-model budgets, serving chat replies before "
+        "moderation and moderation before news and compaction",
+    )
+    default_budget: ModelBudgetConfig = Field(
+        default_factory=ModelBudgetConfig, description="Budget of models not listed in models"
+    )
+    models: dict[str, ModelBudgetConfig] = Field(
+        default_factory=dict, description="Budgets by model name"
+    )
+    interactive_deadline_seconds: float | None = Field(
+        default=60.0, gt=0, description="Longest queue wait of chat replies, review and admin"
+    )
+    moderation_deadline_seconds: float | None = Field(
+        default=30.0, gt=0, description="Longest queue wait of toxicity checks"
+    )
+    background_deadline_seconds: float | None = Field(
+        default=300.0, gt=0, description="Longest queue wait of news summaries and compaction"
+    )
+
+
 class ProvidersConfig(BaseModel):
     """LLM providers configuration."""
 
     openrouter: ProviderConfig | None = None
     anthropic: ProviderConfig | None = None
     openai: ProviderConfig | None = None
+    routing: ProviderRoutingConfig = Field(default_factory=ProviderRoutingConfig)
+    governor: LLMGovernorConfig = Field(default_factory=LLMGovernorConfig)
 
 
 class AgentConfig(BaseModel):
@@ -44,6 +188,15 @@ class AgentConfig(BaseModel):
 
     model: str = Field(default="anthropic/claude-sonnet-4", description="LLM model to use")
     max_tokens: int = Field(default=4096, description="Maximum tokens in response")
+    max_history_messages: int = Field(
+        default=20, ge=0, description="Maximum past messages sent with each request"
+    )
+    max_context_tokens: int | None = Field(
+        default=24000,
+        ge=1000,
+        description="Approximate prompt token budget (system prompt, tools, history, message); "
+        "history is trimmed to fit. None disables the budget",
+    )
     temperature: float = Field(default=0.7, ge=0.0, le=2.0, description="Sampling temperature")
     enable_korean_review: bool = Field(
         default=True, description="Enable Korean language quality review"
@@ -52,6 +205,81 @@ class AgentConfig(BaseModel):
         default=None,
         description="Model for Korean review (defaults to agent model if not specified)",
     )
+    prompt_cache_hints: Literal["auto", "on", "off"] = Field(
+        default="auto",
+        description="Mark the static system prompt prefix with cache_control breakpoints "
+        "(auto: only for Anthropic/Gemini models)",
+    )
+    retrieval_enabled: bool = Field(
+        default=False,
+        description="Replace the full knowledge base in the system prompt with the sections "
+        "retrieved for each message (BM25 index over patterns and knowledge)",
+    )
+    retrieval_index_path: str | None = Field(
+        default=None, description="Retrieval index file (default: <data_dir>/retrieval.idx)"
+    )
+    retrieval_top_k: int = Field(
+        default=4, ge=1, description="Knowledge base sections injected per message"
+    )
+    response_cache_enabled: bool = Field(
+        default=True,
+        description="Reuse answers to repeated first-message questions (answers that used "
+        "tools and time-sensitive questions such as prices, news or 'today' are never cached)",
+    )
+    response_cache_ttl_seconds: float = Field(
+        default=3600.0, gt=0, description="Lifetime of a cached answer"
+    )
+    response_cache_max_entries: int = Field(
+        default=512, ge=1, description="Cached answers kept before LRU eviction"
+    )
+    response_cache_similarity: float | None = Field(
+        default=None,
+        gt=0,
+        le=1,
+        description="Reuse the answer of a near-duplicate question at this term overlap "
+        "(Jaccard, 0-1); None matches normalized questions exactly",
+    )
+    korean_review_mode: Literal["llm", "rules", "hybrid"] = Field(
+        default="hybrid",
+        description="llm: always run the LLM review; rules: local rule engine only; "
+        "hybrid: rule engine, plus the LLM only for issues the rules cannot fix",
+    )
+    korean_review_deferred: bool = Field(
+        default=False,
+        description="Send the reply before the LLM review and edit it if the review changes it",
+    )
+    stream_responses: bool = Field(
+        default=True, description="Stream LLM output and show replies while they are generated"
+    )
+    compaction_enabled: bool = Field(
+        default=True, description="Summarize the oldest turns of long conversations"
+    )
+    compaction_model: str | None = Field(
+        default=None,
+        description="Cheap model for conversation summaries (defaults to the Korean review "
+        "model, then the agent model)",
+    )
+    compaction_trigger_tokens: int = Field(
+        default=4000, ge=500, description="Unsummarized history size that triggers compaction"
+    )
+    compaction_keep_messages: int = Field(
+        default=8, ge=2, description="Newest messages always sent verbatim"
+    )
+    tool_max_concurrency: int = Field(
+        default=4, ge=1, description="Maximum tool calls from one LLM turn running at once"
+    )
+    tool_timeout_seconds: float = Field(
+        default=30.0, gt=0, description="Timeout for a single tool call in seconds"
+    )
+    max_concurrent_runs: int = Field(
+        default=8, ge=1, description="Conversations the agent answers at once"
+    )
+    max_queued_runs: int = Field(
+        default=100, ge=0, description="Waiting replies beyond which users get a busy reply"
+    )
+    max_queued_runs_per_user: int = Field(
+        default=3, ge=1, description="Waiting replies one user may have"
+    )
 
 
 class NewsFeedConfig(BaseModel):
@@ -113,6 +341,108 @@ class ModerationConfig(BaseModel):
     ban_duration_minutes: int = Field(
         default=60, description="Default ban duration in minutes (0 = permanent)"
     )
+    workers: int = Field(default=4, ge=1, description="Messages checked at once")
+    queue_size: int = Field(
+        default=500, ge=1, description="Messages waiting for a check before new ones are skipped"
+    )
+
+
+class ModelPriceConfig(BaseModel):
+    """Price of a model in USD per million tokens."""
+
+    prompt: float = Field(ge=0, description="Uncached prompt tokens")
+    completion: float = Field(ge=0, description="Completion tokens")
+    cached: float | None = Field(
+        default=None, ge=0, description="Cached prompt tokens (default: prompt price)"
+    )
+
+
+class UsageConfig(BaseModel):
+    """LLM usage, latency and cost accounting."""
+
+    enabled: bool = Field(
+        default=True, description="Record tokens, latency and outcome of every LLM call"
+    )
+    path: str | None = Field(
+        default=None, description="Usage log file (default: <data_dir>/llm_usage.jsonl)"
+    )
+    flush_interval_seconds: float = Field(
+        default=60.0, gt=0, description="Interval for appending finished minutes to the log"
+    )
+    prices: dict[str, ModelPriceConfig] = Field(
+        default_factory=dict, description="Prices by model name, for cost figures"
+    )
+
+
+class MetricsConfig(BaseModel):
+    """Prometheus metrics endpoint."""
+
+    enabled: bool = Field(default=False, description="Serve metrics at http://host:port/metrics")
+    host: str = Field(default="127.0.0.1", description="Address the endpoint binds to")
+    port: int = Field(default=9108, ge=0, le=65535, description="Port of the endpoint")
+
+
+BusLane = Literal["interactive", "admin", "moderation", "news"]
+
+
+class BusLaneConfig(BaseModel):
+    """Capacity and overflow policy of one message bus lane."""
+
+    capacity: int = Field(default=1000, ge=1, description="Messages the lane holds")
+    overflow: Literal["block", "drop_oldest", "reject"] = Field(
+        default="block", description="What publishing into a full lane does"
+    )
+
+
+class BusConfig(BaseModel):
+    """Message bus lanes and outbound dispatch; unlisted lanes keep built-in limits."""
+
+    inbound: dict[BusLane, BusLaneConfig] = Field(
+        default_factory=dict, description="Inbound lane overrides"
+    )
+    outbound: dict[BusLane, BusLaneConfig] = Field(
+        default_factory=dict, description="Outbound lane overrides"
+    )
+    dispatch_concurrency: int = Field(
+        default=16, ge=1, description="Outbound deliveries running at once"
+    )
+    subscriber_timeout_seconds: float | None = Field(
+        default=30.0, gt=0, description="Time a channel may take to send one message"
+    )
+    max_in_flight: int = Field(
+        default=256, ge=1, description="Outbound messages held by the dispatcher at once"
+    )
+
+
+class DiagnosticsConfig(BaseModel):
+    """Event loop lag monitor and slow-callback profiler."""
+
+    loop_monitor: bool = Field(default=True, description="Sample event loop scheduling delay")
+    loop_monitor_interval_seconds: float = Field(
+        default=0.5, gt=0, description="Time between loop lag samples"
+    )
+    loop_lag_warn_seconds: float = Field(
+        default=0.25, gt=0, description="Loop lag that is logged as a warning"
+    )
+    slow_callback_profiler: bool = Field(
+        default=False,
+        description=(
+            "Capture stack samples of callbacks that block the loop. Also turned on by "
+            "TOKAMAK_LOOP_PROFILER=1 or, while running, by creating the toggle file"
+        ),
+    )
+    slow_callback_threshold_seconds: float = Field(
+        default=0.1, gt=0, description="Blocking time reported as a slow callback"
+    )
+    profiler_sample_interval_seconds: float = Field(
+        default=0.005, gt=0, description="Stack sampling period while the loop is blocked"
+    )
+    profiler_toggle_path: str | None = Field(
+        default=None, description="Toggle file (default: <data_dir>/loop_profiler.enable)"
+    )
+    profiler_report_path: str | None = Field(
+        default=None, description="Report file (default: <data_dir>/slow_callbacks.log)"
+    )
 
 
 class Config(BaseModel):
@@ -126,3 +456,8 @@ class Config(BaseModel):
     admin: AdminConfig = Field(default_factory=AdminConfig)
     telegram: TelegramConfig = Field(default_factory=TelegramConfig)
     moderation: ModerationConfig = Field(default_factory=ModerationConfig)
+    http: HttpConfig = Field(default_factory=HttpConfig)
+    usage: UsageConfig = Field(default_factory=UsageConfig)
+    metrics: MetricsConfig = Field(default_factory=MetricsConfig)
+    diagnostics: DiagnosticsConfig = Field(default_factory=DiagnosticsConfig)
+    bus: BusConfig = Field(default_factory=BusConfig)
@@ -10,6 +10,14 @@ from typing import Any, Callable, Coroutine
 from loguru import logger
 
 from tokamak.cron.types import CronJob, CronJobState, CronPayload, CronSchedule, CronStore
+from tokamak.utils.metrics import REGISTRY
+
+CRON_JOB_SECONDS = REGISTRY.histogram(
+    "tokamak_cron_job_seconds",
+    "Cron job run duration",
+    ("job", "status"),
+    buckets=(0.1, 0.5, 1.0, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0),
+)
 
 
 def _now_ms() -> int:
@@ -234,6 +242,9 @@ class CronService:
 
         job.state.last_run_at_ms = start_ms
         job.updated_at_ms = _now_ms()
+        CRON_JOB_SECONDS.observe(
+            (job.updated_at_ms - start_ms) / 1000, job=job.name, status=job.state.last_status
+        )
 
         # Handle one-shot jobs
         if job.schedule.kind == "at":
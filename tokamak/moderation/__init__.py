@@ -1,9 +1,11 @@
 """Content moderation module."""
 
 from tokamak.moderation.detector import ToxicityDetector
+from tokamak.moderation.pipeline import ModerationPipeline
 from tokamak.moderation.types import ModerationResult, ModerationSeverity, ToxicContentEvent
 
 __all__ = [
+    "ModerationPipeline",
     "ModerationResult",
     "ModerationSeverity",
     "ToxicContentEvent",
@@ -7,6 +7,8 @@ from loguru import logger
 from tokamak.config.schema import ModerationConfig
 from tokamak.moderation.types import ModerationResult, ModerationSeverity
 from tokamak.providers.base import LLMProvider
+from tokamak.providers.caller import CALLER_MODERATION, llm_caller
+from tokamak.utils.text import script_stats
 
 TOXICITY_PROMPT = """Analyze the following message for toxic content. Detect profanity, defamation, threats, and harassment in both Korean and English.
 
@@ -51,14 +53,19 @@ class ToxicityDetector:
         if not self.config.enabled:
             return ModerationResult(is_toxic=False)
 
+        # Only emoji, numbers or punctuation: nothing for the LLM to judge
+        if not script_stats(message).letters and not any(c.isalpha() for c in message):
+            return ModerationResult(is_toxic=False)
+
         try:
             prompt = TOXICITY_PROMPT.format(message=message)
-            response = await self.provider.chat(
-                messages=[{"role": "user", "content": prompt}],
-                model=self._model,
-                max_tokens=256,
-                temperature=0.1,  # Low temperature for consistent output
-            )
+            with llm_caller(CALLER_MODERATION):
+                response = await self.provider.chat(
+                    messages=[{"role": "user", "content": prompt}],
+                    model=self._model,
+                    max_tokens=256,
+                    temperature=0.1,  # Low temperature for consistent output
+                )
 
             if response.finish_reason == "error":
                 logger.error(f"LLM error in toxicity detection: {response.content}")
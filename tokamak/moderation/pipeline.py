@@ -0,0 +1,178 @@
+"""Background moderation checks, off the reply path."""
+
+import asyncio
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field
+from typing import Any
+
+from loguru import logger
+
+from tokamak.moderation.detector import ToxicityDetector
+from tokamak.moderation.types import ModerationResult
+from tokamak.utils.metrics import MESSAGE_STAGE_SECONDS, REGISTRY, LatencyWindow
+
+MODERATION_QUEUE_WAIT_SECONDS = REGISTRY.histogram(
+    "tokamak_moderation_queue_wait_seconds",
+    "Time messages wait for a moderation worker",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0),
+)
+MODERATION_CHECKS = REGISTRY.counter(
+    "tokamak_moderation_checks_total", "Moderation checks by outcome", ("outcome",)
+)
+
+OnResult = Callable[[ModerationResult], Awaitable[None]]
+
+
+@dataclass
+class _Check:
+    message_id: int
+    content: str
+    on_result: OnResult
+    enqueued: float = field(default_factory=time.monotonic)
+
+
+class ModerationPipeline:
+    """
+    Checks messages for toxic content on a pool of background workers.
+
+    ``submit`` only enqueues, so the caller (and the reply it is about to
+    produce) never waits on the detector. Each result is handed to the
+    callback given with the message and kept by message id for a while, so
+    later code can still look up how a message was judged. When the queue
+    is full new messages are dropped unchecked rather than slowing intake.
+    """
+
+    def __init__(
+        self,
+        detector: ToxicityDetector,
+        workers: int = 4,
+        queue_size: int = 500,
+        max_results: int = 1000,
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            detector: Detector judging each message.
+            workers: Checks running at once.
+            queue_size: Messages waiting for a worker before new ones are dropped.
+            max_results: Recent results kept for lookup by message id.
+        """
+        self.detector = detector
+        self.workers = workers
+        self.max_results = max_results
+        self._queue: asyncio.Queue[_Check] = asyncio.Queue(maxsize=queue_size)
+        self._workers: list[asyncio.Task] = []
+        self._results: OrderedDict[int, ModerationResult] = OrderedDict()
+        self._busy = 0
+        self.checked = 0
+        self.flagged = 0
+        self.failed = 0
+        self.dropped = 0
+        self._wait = LatencyWindow()
+        self._latency = LatencyWindow()
+
+    @property
+    def queued(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, message_id: int, content: str, on_result: OnResult) -> bool:
+        """
+        Queue a message for checking.
+
+        Args:
+            message_id: ID of the message; results are kept under it.
+            content: Text to check.
+            on_result: Awaited with the result once the message was checked.
+
+        Returns:
+            False if the queue was full and the message is not checked.
+        """
+        if not self._workers:
+            self._workers = [
+                asyncio.create_task(self._worker(), name=f"moderation-{i}")
+                for i in range(self.workers)
+            ]
+        try:
+            self._queue.put_nowait(_Check(message_id, content, on_result))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            MODERATION_CHECKS.inc(outcome="dropped")
+            logger.warning(f"Moderation queue full, message {message_id} not checked")
+            return False
+        return True
+
+    def result(self, message_id: int) -> ModerationResult | None:
+        """The result for a recently checked message, or None if unknown."""
+        return self._results.get(message_id)
+
+    async def _worker(self) -> None:
+        while True:
+            check = await self._queue.get()
+            self._busy += 1
+            try:
+                await self._check(check)
+            finally:
+                self._busy -= 1
+                self._queue.task_done()
+
+    async def _check(self, check: _Check) -> None:
+        waited = time.monotonic() - check.enqueued
+        MODERATION_QUEUE_WAIT_SECONDS.observe(waited)
+        self._wait.add(waited)
+
+        started = time.monotonic()
+        try:
+            with MESSAGE_STAGE_SECONDS.time(stage="moderation"):
+                result = await self.detector.detect(check.content)
+        except Exception as e:
+            self.failed += 1
+            MODERATION_CHECKS.inc(outcome="failed")
+            logger.error(f"Error checking message {check.message_id}: {e}")
+            return
+        self._latency.add(time.monotonic() - started)
+
+        self.checked += 1
+        if result.is_toxic:
+            self.flagged += 1
+        MODERATION_CHECKS.inc(outcome="toxic" if result.is_toxic else "clean")
+        self._results[check.message_id] = result
+        while len(self._results) > self.max_results:
+            self._results.popitem(last=False)
+
+        try:
+            await check.on_result(result)
+        except Exception as e:
+            logger.error(f"Error handling moderation result for {check.message_id}: {e}")
+
+    async def join(self) -> None:
+        """Wait until every queued message has been checked."""
+        await self._queue.join()
+
+    async def close(self) -> None:
+        """Cancel the workers; queued messages are left unchecked."""
+        workers, self._workers = self._workers, []
+        for task in workers:
+            task.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
+
+    def stats(self) -> dict[str, Any]:
+        def ms(window: LatencyWindow, p: float) -> float | None:
+            value = window.percentile(p)
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "workers": self.workers,
+            "busy": self._busy,
+            "queued": self.queued,
+            "checked": self.checked,
+            "flagged": self.flagged,
+            "failed": self.failed,
+            "dropped": self.dropped,
+            "wait_p50_ms": ms(self._wait, 50),
+            "wait_p95_ms": ms(self._wait, 95),
+            "check_p50_ms": ms(self._latency, 50),
+            "check_p95_ms": ms(self._latency, 95),
+        }
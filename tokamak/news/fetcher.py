@@ -8,6 +8,8 @@ from typing import Any
 import httpx
 from loguru import logger
 
+from tokamak.utils.http import HttpClientPool
+
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 1.0
 
@@ -37,15 +39,21 @@ class NewsFetcher:
         sources: list[str],
         timeout_seconds: float = 10.0,
         max_items_per_source: int = 10,
+        http: HttpClientPool | None = None,
     ) -> None:
         self.sources = sources
         self.timeout_seconds = timeout_seconds
         self.max_items_per_source = max_items_per_source
+        self.http = http
 
     async def fetch_all(self) -> FetchResult:
-        async with httpx.AsyncClient(timeout=self.timeout_seconds, follow_redirects=True) as client:
-            tasks = [self._fetch_feed(client, url) for url in self.sources]
+        if self.http:
+            tasks = [self._fetch_pooled(url) for url in self.sources]
             results = await asyncio.gather(*tasks, return_exceptions=True)
+        else:
+            async with httpx.AsyncClient(timeout=self.timeout_seconds) as client:
+                tasks = [self._fetch_feed(client, url) for url in self.sources]
+                results = await asyncio.gather(*tasks, return_exceptions=True)
 
         all_items: list[NewsItem] = []
         errors: list[str] = []
@@ -60,10 +68,16 @@ class NewsFetcher:
         all_items.sort(key=lambda x: x.published_at, reverse=True)
         return FetchResult(items=all_items, errors=errors)
 
+    async def _fetch_pooled(self, url: str) -> list[NewsItem]:
+        async with self.http.acquire(url) as client:
+            return await self._fetch_feed(client, url)
+
     async def _fetch_feed(self, client: httpx.AsyncClient, url: str) -> list[NewsItem]:
         for attempt in range(MAX_RETRIES):
             try:
-                response = await client.get(url)
+                response = await client.get(
+                    url, timeout=self.timeout_seconds, follow_redirects=True
+                )
                 response.raise_for_status()
                 return self._parse_rss(response.text, url)
             except httpx.TimeoutException as e:
@@ -118,6 +118,7 @@ class NewsFeedService:
                     channel="discord",
                     chat_id=str(self.korean_channel_id),
                     content=korean_content,
+                    lane="news",
                 )
             )
 
@@ -132,6 +133,7 @@ class NewsFeedService:
                     channel="discord",
                     chat_id=str(self.english_channel_id),
                     content=english_content,
+                    lane="news",
                 )
             )
 
@@ -7,6 +7,8 @@ from loguru import logger
 from tokamak.news.fetcher import NewsItem
 from tokamak.news.prompts import NEWS_SUMMARY_PROMPT
 from tokamak.providers import LLMProvider
+from tokamak.providers.caller import CALLER_NEWS, llm_caller
+from tokamak.utils.text import detect_language
 
 MAX_RETRIES = 3
 RETRY_BASE_DELAY = 2.0
@@ -42,12 +44,17 @@ class NewsSummarizer:
 
         for attempt in range(MAX_RETRIES):
             try:
-                response = await self.provider.chat(
-                    messages=[{"role": "user", "content": prompt}],
-                    model=self.model,
-                    max_tokens=self.max_tokens,
-                    temperature=self.temperature,
-                )
+                with llm_caller(CALLER_NEWS):
+                    response = await self.provider.chat(
+                        messages=[{"role": "user", "content": prompt}],
+                        model=self.model,
+                        max_tokens=self.max_tokens,
+                        temperature=self.temperature,
+                    )
+
+                if response.finish_reason == "error":
+                    logger.warning(f"News summary request failed: {response.content}")
+                    return None
 
                 if not response.content:
                     logger.warning("Empty response from LLM for news summary")
@@ -115,4 +122,21 @@ class NewsSummarizer:
         korean = "\n".join(korean_lines).strip()
         english = "\n".join(english_lines).strip()
 
+        if not korean and not english:
+            korean, english = self._split_by_language(content)
+
         return korean, english
+
+    def _split_by_language(self, content: str) -> tuple[str, str]:
+        """Fallback when section headers are missing: sort paragraphs by script."""
+        korean_parts: list[str] = []
+        english_parts: list[str] = []
+        for paragraph in content.split("\n\n"):
+            if not paragraph.strip():
+                continue
+            language = detect_language(paragraph, threshold=0.5)
+            if language == "ko":
+                korean_parts.append(paragraph)
+            elif language == "en":
+                english_parts.append(paragraph)
+        return "\n\n".join(korean_parts).strip(), "\n\n".join(english_parts).strip()
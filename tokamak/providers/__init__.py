@@ -1,6 +1,30 @@
 """LLM providers."""
 
-from tokamak.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from tokamak.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    StreamDelta,
+    ToolCallDelta,
+    ToolCallRequest,
+)
+from tokamak.providers.caller import current_caller, llm_caller
+from tokamak.providers.governor import GovernedProvider, ModelBudget
 from tokamak.providers.openai_provider import OpenAICompatibleProvider
+from tokamak.providers.router import RoutingProvider
+from tokamak.providers.usage import InstrumentedProvider, UsageRecorder
 
-__all__ = ["LLMProvider", "LLMResponse", "ToolCallRequest", "OpenAICompatibleProvider"]
+__all__ = [
+    "LLMProvider",
+    "LLMResponse",
+    "StreamDelta",
+    "ToolCallDelta",
+    "ToolCallRequest",
+    "OpenAICompatibleProvider",
+    "RoutingProvider",
+    "GovernedProvider",
+    "ModelBudget",
+    "InstrumentedProvider",
+    "UsageRecorder",
+    "llm_caller",
+    "current_caller",
+]
@@ -1,6 +1,8 @@
 """Base LLM provider interface."""
 
+import json
 from abc import ABC, abstractmethod
+from collections.abc import AsyncIterator
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -29,6 +31,33 @@ class LLMResponse:
         return len(self.tool_calls) > 0
 
 
+@dataclass
+class ToolCallDelta:
+    """Incremental fragment of a tool call in a streamed response.
+
+    Fragments sharing the same ``index`` belong to one tool call; ``id`` and
+    ``name`` usually arrive once, ``arguments`` arrives as JSON text pieces.
+    """
+
+    index: int
+    id: str | None = None
+    name: str | None = None
+    arguments: str = ""
+
+
+@dataclass
+class StreamDelta:
+    """One increment of a streamed chat completion.
+
+    The last delta of a stream carries ``response``: the fully parsed
+    LLMResponse, identical to what ``chat`` would have returned.
+    """
+
+    content: str = ""
+    tool_calls: list[ToolCallDelta] = field(default_factory=list)
+    response: LLMResponse | None = None
+
+
 class LLMProvider(ABC):
     """
     Abstract base class for LLM providers.
@@ -65,6 +94,69 @@ class LLMProvider(ABC):
         """
         pass
 
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Send a chat completion request and yield the output incrementally.
+
+        Providers without native streaming fall back to a single delta
+        built from ``chat``.
+
+        Args:
+            messages: List of message dicts with 'role' and 'content'.
+            tools: Optional list of tool definitions.
+            model: Model identifier (provider-specific).
+            max_tokens: Maximum tokens in response.
+            temperature: Sampling temperature.
+
+        Yields:
+            StreamDelta items; the last one has ``response`` set.
+        """
+        response = await self.chat(
+            messages=messages,
+            tools=tools,
+            model=model,
+            max_tokens=max_tokens,
+            temperature=temperature,
+        )
+        content = ""
+        if response.finish_reason != "error" and not response.has_tool_calls:
+            content = response.content or ""
+        yield StreamDelta(
+            content=content,
+            tool_calls=[
+                ToolCallDelta(index=i, id=tc.id, name=tc.name, arguments=json.dumps(tc.arguments))
+                for i, tc in enumerate(response.tool_calls)
+            ],
+            response=response,
+        )
+
+    def format_system_content(
+        self, prefix: str, suffix: str = "", model: str | None = None
+    ) -> str | list[dict[str, Any]]:
+        """
+        Build the system message content from a static prefix and dynamic suffix.
+
+        Providers that support explicit prompt caching can override this to
+        mark the prefix as cacheable. The default joins both into one string,
+        which still lets automatic prefix caching reuse the unchanged prefix.
+
+        Args:
+            prefix: Text identical across requests.
+            suffix: Per-request text appended after the prefix.
+            model: Model the request will go to.
+
+        Returns:
+            Content for the system message.
+        """
+        return f"{prefix}\n\n\n{suffix}" if suffix else prefix
+
     @abstractmethod
     def get_default_model(self) -> str:
         """Get the default model for this provider."""
@@ -0,0 +1,39 @@
+"""Tagging LLM requests with the feature that issued them."""
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+# Feature names used as caller tags
+CALLER_AGENT = "agent"
+CALLER_KOREAN_REVIEW = "korean_review"
+CALLER_ADMIN = "admin"
+CALLER_MODERATION = "moderation"
+CALLER_NEWS = "news"
+CALLER_COMPACTION = "compaction"
+
+_current_caller: ContextVar[str] = ContextVar("llm_caller", default=CALLER_AGENT)
+
+
+@contextmanager
+def llm_caller(name: str) -> Iterator[None]:
+    """
+    Tag the LLM requests made inside the block with a caller name.
+
+    Provider wrappers read the tag to pick a priority class or to attribute
+    usage, so call sites don't have to thread it through every signature.
+    Tasks created inside the block inherit the tag.
+
+    Args:
+        name: Caller name, one of the CALLER_* constants.
+    """
+    token = _current_caller.set(name)
+    try:
+        yield
+    finally:
+        _current_caller.reset(token)
+
+
+def current_caller() -> str:
+    """Caller tag of the current context ("agent" when untagged)."""
+    return _current_caller.get()
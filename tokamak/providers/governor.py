@@ -0,0 +1,366 @@
+"""Client-side rate limiting and prioritization of LLM requests."""
+
+import asyncio
+import heapq
+import itertools
+import math
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from loguru import logger
+
+from tokamak.providers.base import LLMProvider, LLMResponse, StreamDelta
+from tokamak.providers.caller import (
+    CALLER_ADMIN,
+    CALLER_AGENT,
+    CALLER_COMPACTION,
+    CALLER_KOREAN_REVIEW,
+    CALLER_MODERATION,
+    CALLER_NEWS,
+    current_caller,
+)
+from tokamak.utils.metrics import LatencyWindow
+from tokamak.utils.tokens import estimate_json_tokens, estimate_tokens
+
+Priority = Literal["interactive", "moderation", "background"]
+
+# Highest priority first
+PRIORITIES: tuple[Priority, ...] = ("interactive", "moderation", "background")
+
+CALLER_PRIORITY: dict[str, Priority] = {
+    CALLER_AGENT: "interactive",
+    CALLER_KOREAN_REVIEW: "interactive",
+    CALLER_ADMIN: "interactive",
+    CALLER_MODERATION: "moderation",
+    CALLER_NEWS: "background",
+    CALLER_COMPACTION: "background",
+}
+
+
+@dataclass
+class ModelBudget:
+    """Upstream limits for one model; None leaves a dimension unlimited."""
+
+    requests_per_minute: float | None = None
+    tokens_per_minute: float | None = None
+    max_concurrency: int | None = None
+
+
+class TokenBucket:
+    """Bucket holding up to one minute of budget, refilled continuously."""
+
+    def __init__(self, per_minute: float):
+        self.capacity = per_minute
+        self.rate = per_minute / 60.0
+        self.level = per_minute
+        self.updated = time.monotonic()
+
+    def _refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float, now: float) -> float:
+        """Seconds until amount (capped at capacity) is available."""
+        self._refill(now)
+        needed = min(amount, self.capacity)
+        return 0.0 if self.level >= needed else (needed - self.level) / self.rate
+
+    def available(self, now: float) -> float:
+        self._refill(now)
+        return self.level
+
+    def take(self, amount: float) -> None:
+        # The level may go negative: later requests then wait for the debt
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass(order=True)
+class _Waiter:
+    rank: int
+    seq: int
+    tokens: int = field(compare=False)
+    future: asyncio.Future = field(compare=False)
+
+
+class _ModelGate:
+    """Budget state and priority queue of one model."""
+
+    def __init__(self, budget: ModelBudget):
+        self.budget = budget
+        self.requests = (
+            TokenBucket(budget.requests_per_minute) if budget.requests_per_minute else None
+        )
+        self.tokens = TokenBucket(budget.tokens_per_minute) if budget.tokens_per_minute else None
+        self.active = 0
+        self.waiters: list[_Waiter] = []
+        self._timer: asyncio.TimerHandle | None = None
+
+    def wait_time(self, tokens: int, now: float) -> float:
+        """Seconds until a request of this size may start (inf: wait for a release)."""
+        if self.budget.max_concurrency and self.active >= self.budget.max_concurrency:
+            return math.inf
+        wait = 0.0
+        if self.requests:
+            wait = self.requests.wait_time(1, now)
+        if self.tokens:
+            wait = max(wait, self.tokens.wait_time(tokens, now))
+        return wait
+
+    def take(self, tokens: int) -> None:
+        self.active += 1
+        if self.requests:
+            self.requests.take(1)
+        if self.tokens:
+            self.tokens.take(tokens)
+
+    def release(self, estimated: int, actual: int) -> None:
+        self.active -= 1
+        if self.tokens:
+            if actual > estimated:
+                self.tokens.take(actual - estimated)
+            else:
+                self.tokens.refund(estimated - actual)
+        self.dispatch()
+
+    def queued(self) -> int:
+        return sum(1 for w in self.waiters if not w.future.done())
+
+    def dispatch(self) -> None:
+        """Admit waiters in priority order while the budget allows."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        while self.waiters:
+            waiter = self.waiters[0]
+            if waiter.future.done():
+                heapq.heappop(self.waiters)
+                continue
+            wait = self.wait_time(waiter.tokens, time.monotonic())
+            if wait > 0:
+                # Strict priority: nothing behind the head is admitted first
+                if wait != math.inf:
+                    self._timer = asyncio.get_running_loop().call_later(wait, self.dispatch)
+                return
+            heapq.heappop(self.waiters)
+            self.take(waiter.tokens)
+            waiter.future.set_result(None)
+
+
+@dataclass
+class _ClassStats:
+    requests: int = 0
+    queued: int = 0
+    dropped: int = 0
+    wait: LatencyWindow = field(default_factory=LatencyWindow)
+    wait_max: float = 0.0
+
+    def stats(self) -> dict[str, Any]:
+        p50, p95 = self.wait.percentile(50), self.wait.percentile(95)
+        return {
+            "requests": self.requests,
+            "queued": self.queued,
+            "dropped": self.dropped,
+            "wait_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "wait_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+            "wait_max_ms": round(self.wait_max * 1000, 1),
+        }
+
+
+class GovernedProvider(LLMProvider):
+    """
+    Admits LLM requests under per-model rate and concurrency budgets.
+
+    Each model has request-per-minute and token-per-minute buckets and a
+    concurrency cap. Requests that don't fit wait in a queue ordered by
+    priority class (derived from the caller tag, see ``llm_caller``), so
+    interactive replies go before moderation and moderation before
+    background work. A request still queued at its class deadline is
+    dropped with an error response instead of piling up behind the burst.
+
+    Token budgets are charged with the estimated prompt size on admission
+    and corrected with the reported usage when the request finishes.
+    """
+
+    def __init__(
+        self,
+        provider: LLMProvider,
+        default_budget: ModelBudget,
+        model_budgets: dict[str, ModelBudget] | None = None,
+        deadlines: dict[Priority, float | None] | None = None,
+    ):
+        """
+        Initialize the governor.
+
+        Args:
+            provider: Provider the admitted requests go to.
+            default_budget: Budget of models without their own entry.
+            model_budgets: Budgets by model name.
+            deadlines: Maximum queue wait per priority class in seconds;
+                missing or None waits indefinitely.
+        """
+        super().__init__()
+        self.provider = provider
+        self.default_budget = default_budget
+        self.model_budgets = model_budgets or {}
+        self.deadlines = deadlines or {}
+        self._gates: dict[str, _ModelGate] = {}
+        self._classes = {priority: _ClassStats() for priority in PRIORITIES}
+        self._seq = itertools.count()
+
+    def _gate(self, model: str) -> _ModelGate:
+        gate = self._gates.get(model)
+        if gate is None:
+            gate = _ModelGate(self.model_budgets.get(model, self.default_budget))
+            self._gates[model] = gate
+        return gate
+
+    async def _acquire(self, gate: _ModelGate, priority: Priority, tokens: int) -> bool:
+        """Wait for admission; False when the class deadline passed first."""
+        stats = self._classes[priority]
+        stats.requests += 1
+        start = time.monotonic()
+        if not gate.waiters and gate.wait_time(tokens, start) == 0:
+            gate.take(tokens)
+            stats.wait.add(0.0)
+            return True
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(
+            gate.waiters, _Waiter(PRIORITIES.index(priority), next(self._seq), tokens, future)
+        )
+        stats.queued += 1
+        gate.dispatch()
+        try:
+            await asyncio.wait_for(future, timeout=self.deadlines.get(priority))
+        except TimeoutError:
+            stats.dropped += 1
+            logger.warning(
+                f"Dropped {priority} LLM request after {time.monotonic() - start:.1f}s in queue"
+            )
+            gate.dispatch()
+            return False
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                gate.release(tokens, 0)
+            else:
+                gate.dispatch()
+            raise
+        finally:
+            stats.queued -= 1
+
+        waited = time.monotonic() - start
+        stats.wait.add(waited)
+        stats.wait_max = max(stats.wait_max, waited)
+        return True
+
+    def _request_tokens(self, messages: list[dict[str, Any]], tools: Any) -> int:
+        return estimate_json_tokens(messages) + (estimate_json_tokens(tools) if tools else 0)
+
+    def _used_tokens(self, response: LLMResponse | None, estimated: int) -> int:
+        if response is None:
+            return estimated
+        return response.usage.get("total_tokens") or estimated + estimate_tokens(
+            response.content or ""
+        )
+
+    def _dropped_response(self) -> LLMResponse:
+        return LLMResponse(
+            content="요청이 많아 LLM 호출을 처리하지 못했습니다.", finish_reason="error"
+        )
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Wait for admission under the model's budget, then send the request."""
+        model = model or self.provider.get_default_model()
+        priority = CALLER_PRIORITY.get(current_caller(), "interactive")
+        gate = self._gate(model)
+        tokens = self._request_tokens(messages, tools)
+        if not await self._acquire(gate, priority, tokens):
+            return self._dropped_response()
+
+        response: LLMResponse | None = None
+        try:
+            response = await self.provider.chat(
+                messages=messages,
+                tools=tools,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+            return response
+        finally:
+            gate.release(tokens, self._used_tokens(response, tokens))
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """Wait for admission, then stream; the slot is held until the final delta."""
+        model = model or self.provider.get_default_model()
+        priority = CALLER_PRIORITY.get(current_caller(), "interactive")
+        gate = self._gate(model)
+        tokens = self._request_tokens(messages, tools)
+        if not await self._acquire(gate, priority, tokens):
+            yield StreamDelta(response=self._dropped_response())
+            return
+
+        released = False
+        try:
+            async for delta in self.provider.chat_stream(
+                messages=messages,
+                tools=tools,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            ):
+                if delta.response is not None and not released:
+                    # Consumers stop reading at the final delta, so free the slot before yielding it
+                    gate.release(tokens, self._used_tokens(delta.response, tokens))
+                    released = True
+                yield delta
+        finally:
+            if not released:
+                # Raised, cancelled or closed before the final delta, or ended without one
+                gate.release(tokens, tokens)
+
+    def format_system_content(
+        self, prefix: str, suffix: str = "", model: str | None = None
+    ) -> str | list[dict[str, Any]]:
+        return self.provider.format_system_content(prefix, suffix, model)
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
+
+    def stats(self) -> dict[str, Any]:
+        """Queue wait and drop counts per priority class, budget state per model."""
+        now = time.monotonic()
+        models = {
+            model: {
+                "active": gate.active,
+                "queued": gate.queued(),
+                "requests_available": (
+                    round(gate.requests.available(now), 1) if gate.requests else None
+                ),
+                "tokens_available": round(gate.tokens.available(now)) if gate.tokens else None,
+            }
+            for model, gate in self._gates.items()
+        }
+        return {
+            "classes": {priority: s.stats() for priority, s in self._classes.items()},
+            "models": models,
+        }
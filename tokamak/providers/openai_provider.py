@@ -3,12 +3,19 @@
 import json
 import re
 import uuid
+from collections.abc import AsyncIterator
 from typing import Any
 
 from loguru import logger
 from openai import AsyncOpenAI
 
-from tokamak.providers.base import LLMProvider, LLMResponse, ToolCallRequest
+from tokamak.providers.base import (
+    LLMProvider,
+    LLMResponse,
+    StreamDelta,
+    ToolCallDelta,
+    ToolCallRequest,
+)
 
 
 class OpenAICompatibleProvider(LLMProvider):
@@ -18,14 +25,30 @@ class OpenAICompatibleProvider(LLMProvider):
     Works with LiteLLM Proxy, vLLM, and any OpenAI-compatible endpoint.
     """
 
+    # Model name fragments of providers that need explicit cache breakpoints
+    CACHE_HINT_MODELS = ("claude", "anthropic", "gemini")
+
     def __init__(
         self,
         api_key: str | None = None,
         api_base: str | None = None,
         default_model: str = "gpt-4",
+        cache_hints: str = "auto",
     ):
+        """
+        Initialize the provider.
+
+        Args:
+            api_key: API key for the endpoint.
+            api_base: Base URL of the endpoint.
+            default_model: Model used when a request names none.
+            cache_hints: "on" to mark the static system prompt prefix with
+                cache_control, "off" to never do so, "auto" to do so only for
+                models whose backends require explicit breakpoints.
+        """
         super().__init__(api_key, api_base)
         self.default_model = default_model
+        self.cache_hints = cache_hints
         self.client = AsyncOpenAI(
             api_key=api_key or "dummy",
             base_url=api_base,
@@ -70,10 +93,163 @@ class OpenAICompatibleProvider(LLMProvider):
             return self._parse_response(response)
         except Exception as e:
             logger.error(f"LLM API error: {e}")
-            return LLMResponse(
-                content="LLM 호출 중 오류가 발생했습니다.",
-                finish_reason="error",
+            return self._error_response()
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """
+        Stream a chat completion via OpenAI SDK.
+
+        Content and tool-call fragments are yielded as they arrive; the final
+        delta carries the assembled LLMResponse (including text-based tool
+        calls, which can only be parsed once the whole text is known).
+        """
+        model = model or self.default_model
+
+        kwargs: dict[str, Any] = {
+            "model": model,
+            "messages": messages,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+            "stream": True,
+            "stream_options": {"include_usage": True},
+        }
+
+        if tools:
+            kwargs["tools"] = tools
+            kwargs["tool_choice"] = "auto"
+
+        content_parts: list[str] = []
+        tool_parts: dict[int, dict[str, Any]] = {}
+        finish_reason = "stop"
+        usage: dict[str, int] = {}
+
+        try:
+            stream = await self.client.chat.completions.create(**kwargs)
+            async for chunk in stream:
+                if chunk.usage:
+                    usage = self._parse_usage(chunk.usage)
+                if not chunk.choices:
+                    continue
+
+                choice = chunk.choices[0]
+                if choice.finish_reason:
+                    finish_reason = choice.finish_reason
+
+                delta = choice.delta
+                if delta is None:
+                    continue
+
+                tool_deltas = []
+                for tc in delta.tool_calls or []:
+                    part = tool_parts.setdefault(tc.index, {"id": None, "name": "", "args": []})
+                    name = tc.function.name if tc.function else None
+                    arguments = (tc.function.arguments if tc.function else None) or ""
+                    if tc.id:
+                        part["id"] = tc.id
+                    if name:
+                        part["name"] += name
+                    part["args"].append(arguments)
+                    tool_deltas.append(
+                        ToolCallDelta(index=tc.index, id=tc.id, name=name, arguments=arguments)
+                    )
+
+                if delta.content or tool_deltas:
+                    if delta.content:
+                        content_parts.append(delta.content)
+                    yield StreamDelta(content=delta.content or "", tool_calls=tool_deltas)
+
+        except Exception as e:
+            logger.error(f"LLM API stream error: {e}")
+            yield StreamDelta(response=self._error_response())
+            return
+
+        tool_calls = [
+            self._make_tool_call(part["id"], part["name"], "".join(part["args"]))
+            for _, part in sorted(tool_parts.items())
+        ]
+        content: str | None = "".join(content_parts) or None
+        if not tool_calls and content:
+            parsed_calls, cleaned_content = self._parse_text_tool_calls(content)
+            if parsed_calls:
+                tool_calls = parsed_calls
+                content = cleaned_content.strip() if cleaned_content else None
+
+        yield StreamDelta(
+            response=LLMResponse(
+                content=content,
+                tool_calls=tool_calls,
+                finish_reason=finish_reason,
+                usage=usage,
             )
+        )
+
+    def _use_cache_hints(self, model: str | None) -> bool:
+        if self.cache_hints == "on":
+            return True
+        if self.cache_hints == "off":
+            return False
+        name = (model or self.default_model).lower()
+        return any(fragment in name for fragment in self.CACHE_HINT_MODELS)
+
+    def format_system_content(
+        self, prefix: str, suffix: str = "", model: str | None = None
+    ) -> str | list[dict[str, Any]]:
+        """Mark the static prefix with a cache_control breakpoint when hints are enabled."""
+        if not self._use_cache_hints(model):
+            return super().format_system_content(prefix, suffix, model)
+        parts: list[dict[str, Any]] = [
+            {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}
+        ]
+        if suffix:
+            parts.append({"type": "text", "text": suffix})
+        return parts
+
+    def _error_response(self) -> LLMResponse:
+        return LLMResponse(
+            content="LLM 호출 중 오류가 발생했습니다.",
+            finish_reason="error",
+        )
+
+    def _make_tool_call(self, call_id: str | None, name: str, args: Any) -> ToolCallRequest:
+        """Build a ToolCallRequest, normalizing arguments into a dict."""
+        if isinstance(args, str):
+            try:
+                args = json.loads(args) if args else {}
+            except json.JSONDecodeError:
+                args = {"raw": args}
+
+        # Ensure args is always a dict
+        if not isinstance(args, dict):
+            args = {"value": args}
+
+        return ToolCallRequest(
+            id=call_id or f"call_{uuid.uuid4().hex[:8]}",
+            name=name,
+            arguments=args,
+        )
+
+    def _parse_usage(self, usage: Any) -> dict[str, int]:
+        # OpenAI/LiteLLM report prompt_tokens_details.cached_tokens; DeepSeek and
+        # Anthropic pass-through use their own field names
+        details = getattr(usage, "prompt_tokens_details", None)
+        cached = getattr(details, "cached_tokens", None) if details else None
+        if cached is None:
+            cached = getattr(usage, "prompt_cache_hit_tokens", None)
+        if cached is None:
+            cached = getattr(usage, "cache_read_input_tokens", None)
+        return {
+            "prompt_tokens": usage.prompt_tokens,
+            "completion_tokens": usage.completion_tokens,
+            "total_tokens": usage.total_tokens,
+            "cached_tokens": cached or 0,
+        }
 
     def _parse_response(self, response: Any) -> LLMResponse:
         """Parse OpenAI response into our standard format."""
@@ -86,23 +262,8 @@ class OpenAICompatibleProvider(LLMProvider):
         # 1. Native function calling (OpenAI style)
         if message.tool_calls:
             for tc in message.tool_calls:
-                args = tc.function.arguments
-                if isinstance(args, str):
-                    try:
-                        args = json.loads(args)
-                    except json.JSONDecodeError:
-                        args = {"raw": args}
-
-                # Ensure args is always a dict
-                if not isinstance(args, dict):
-                    args = {"value": args}
-
                 tool_calls.append(
-                    ToolCallRequest(
-                        id=tc.id,
-                        name=tc.function.name,
-                        arguments=args,
-                    )
+                    self._make_tool_call(tc.id, tc.function.name, tc.function.arguments)
                 )
 
         # 2. Text-based tool calls (for models that don't support native function calling)
@@ -114,11 +275,7 @@ class OpenAICompatibleProvider(LLMProvider):
 
         usage = {}
         if response.usage:
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
+            usage = self._parse_usage(response.usage)
 
         return LLMResponse(
             content=content,
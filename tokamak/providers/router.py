@@ -0,0 +1,336 @@
+"""Provider that routes requests across several LLM backends with failover."""
+
+import asyncio
+import time
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from typing import Any, Literal
+
+from loguru import logger
+
+from tokamak.providers.base import LLMProvider, LLMResponse, StreamDelta
+from tokamak.utils.metrics import LatencyWindow
+
+CircuitState = Literal["closed", "open", "half_open"]
+
+
+@dataclass
+class Backend:
+    """One upstream provider with its health and latency bookkeeping."""
+
+    name: str
+    provider: LLMProvider
+    state: CircuitState = "closed"
+    consecutive_failures: int = 0
+    opened_at: float = 0.0
+    probing: bool = False
+    latency: LatencyWindow = field(default_factory=LatencyWindow)
+    first_delta: LatencyWindow = field(default_factory=LatencyWindow)
+    requests: int = 0
+    errors: int = 0
+    timeouts: int = 0
+    failovers: int = 0
+    hedges: int = 0
+    hedge_wins: int = 0
+
+    def stats(self) -> dict[str, Any]:
+        def ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "state": self.state,
+            "requests": self.requests,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "failovers": self.failovers,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "latency_ewma_ms": ms(self.latency.ewma),
+            "latency_p50_ms": ms(self.latency.percentile(50)),
+            "latency_p95_ms": ms(self.latency.percentile(95)),
+            "first_delta_p95_ms": ms(self.first_delta.percentile(95)),
+        }
+
+
+class RoutingProvider(LLMProvider):
+    """
+    Routes each request to the healthiest, fastest of several providers.
+
+    Every backend has a circuit breaker: after ``failure_threshold``
+    consecutive failures (error responses, exceptions or timeouts) it is
+    skipped for ``cooldown_seconds``, then a single probe request decides
+    whether it closes again. Healthy backends are tried in order of their
+    recent latency (backends without samples first, so each gets measured),
+    failing over to the next one when a request fails.
+
+    With hedging enabled, a non-streaming request still running after the
+    primary backend's p95 latency is also sent to the next backend; the
+    first successful answer wins and the other request is cancelled.
+    Streams fail over only until their first delta has been delivered.
+    """
+
+    def __init__(
+        self,
+        backends: list[tuple[str, LLMProvider]],
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        timeout_seconds: float = 60.0,
+        hedge: bool = False,
+        hedge_min_samples: int = 20,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            backends: (name, provider) pairs; the first one also formats system
+                prompts and names the default model.
+            failure_threshold: Consecutive failures that open a circuit.
+            cooldown_seconds: Time an open circuit waits before a probe.
+            timeout_seconds: Per-attempt timeout (time to first delta for streams).
+            hedge: Send slow non-streaming requests to a second backend.
+            hedge_min_samples: Latency samples a backend needs before its p95
+                is trusted as the hedge delay.
+        """
+        if not backends:
+            raise ValueError("RoutingProvider needs at least one backend")
+        super().__init__()
+        self.backends = [Backend(name=name, provider=provider) for name, provider in backends]
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.timeout_seconds = timeout_seconds
+        self.hedge = hedge
+        self.hedge_min_samples = hedge_min_samples
+
+    # ----- health -----
+
+    def _available(self, backend: Backend, now: float) -> bool:
+        if backend.state == "closed":
+            return True
+        if backend.state == "open" and now - backend.opened_at >= self.cooldown_seconds:
+            backend.state = "half_open"
+            logger.info(f"LLM backend {backend.name}: circuit half-open, probing")
+        return backend.state == "half_open" and not backend.probing
+
+    def _candidates(self, streaming: bool) -> list[Backend]:
+        """Available backends, fastest first."""
+        now = time.monotonic()
+        available = [b for b in self.backends if self._available(b, now)]
+
+        def key(backend: Backend) -> float:
+            window = backend.first_delta if streaming else backend.latency
+            return window.ewma if window.ewma is not None else 0.0
+
+        return sorted(available, key=key)
+
+    def _record_success(self, backend: Backend) -> None:
+        if backend.state != "closed":
+            logger.info(f"LLM backend {backend.name}: circuit closed")
+        backend.state = "closed"
+        backend.consecutive_failures = 0
+
+    def _record_stream_end(self, backend: Backend, start: float, final: LLMResponse | None) -> None:
+        if final is not None and final.finish_reason == "error":
+            self._record_failure(backend, "stream ended with an error")
+        else:
+            backend.latency.add(time.monotonic() - start)
+            self._record_success(backend)
+
+    def _record_failure(self, backend: Backend, reason: str) -> None:
+        backend.errors += 1
+        backend.consecutive_failures += 1
+        logger.warning(f"LLM backend {backend.name} failed: {reason}")
+        if backend.state == "half_open" or (
+            backend.state == "closed" and backend.consecutive_failures >= self.failure_threshold
+        ):
+            backend.state = "open"
+            backend.opened_at = time.monotonic()
+            logger.warning(
+                f"LLM backend {backend.name}: circuit open for {self.cooldown_seconds:.0f}s "
+                f"after {backend.consecutive_failures} failures"
+            )
+
+    def _hedge_delay(self, backend: Backend) -> float | None:
+        if len(backend.latency.samples) < self.hedge_min_samples:
+            return None
+        return backend.latency.percentile(95)
+
+    def _unavailable_response(self) -> LLMResponse:
+        return LLMResponse(content="LLM 호출 중 오류가 발생했습니다.", finish_reason="error")
+
+    # ----- requests -----
+
+    async def _attempt(self, backend: Backend, kwargs: dict[str, Any]) -> LLMResponse:
+        """One request to one backend; failures come back as error responses."""
+        backend.requests += 1
+        backend.probing = backend.state == "half_open"
+        start = time.monotonic()
+        try:
+            response = await asyncio.wait_for(
+                backend.provider.chat(**kwargs), timeout=self.timeout_seconds
+            )
+        except TimeoutError:
+            backend.timeouts += 1
+            self._record_failure(backend, f"timed out after {self.timeout_seconds:.0f}s")
+            return self._unavailable_response()
+        except Exception as e:
+            self._record_failure(backend, str(e) or type(e).__name__)
+            return self._unavailable_response()
+        finally:
+            backend.probing = False
+
+        elapsed = time.monotonic() - start
+        if response.finish_reason == "error":
+            self._record_failure(backend, "error response")
+        else:
+            backend.latency.add(elapsed)
+            self._record_success(backend)
+            logger.debug(f"LLM backend {backend.name}: {elapsed:.2f}s")
+        return response
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        """Send the request to the best backend, failing over and hedging as configured."""
+        kwargs = {
+            "messages": messages,
+            "tools": tools,
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        queue = self._candidates(streaming=False)
+        if not queue:
+            logger.error("No LLM backend available: all circuits open")
+            return self._unavailable_response()
+
+        running: dict[asyncio.Task, Backend] = {}
+        hedged: Backend | None = None
+        last_response: LLMResponse | None = None
+        try:
+            while queue or running:
+                if not running:
+                    backend = queue.pop(0)
+                    if last_response is not None:
+                        backend.failovers += 1
+                        logger.warning(f"Failing over to LLM backend {backend.name}")
+                    running[asyncio.create_task(self._attempt(backend, kwargs))] = backend
+
+                delay = None
+                if self.hedge and hedged is None and queue and len(running) == 1:
+                    delay = self._hedge_delay(next(iter(running.values())))
+                done, _ = await asyncio.wait(
+                    running, timeout=delay, return_when=asyncio.FIRST_COMPLETED
+                )
+
+                if not done:
+                    backend = hedged = queue.pop(0)
+                    backend.hedges += 1
+                    logger.info(f"Hedging slow LLM request to {backend.name} after {delay:.2f}s")
+                    running[asyncio.create_task(self._attempt(backend, kwargs))] = backend
+                    continue
+
+                for task in done:
+                    backend = running.pop(task)
+                    response = task.result()
+                    if response.finish_reason != "error":
+                        if backend is hedged:
+                            backend.hedge_wins += 1
+                        return response
+                    last_response = response
+        finally:
+            for task in running:
+                task.cancel()
+
+        return last_response or self._unavailable_response()
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        """Stream from the best backend, failing over until the first delta arrives."""
+        kwargs = {
+            "messages": messages,
+            "tools": tools,
+            "model": model,
+            "max_tokens": max_tokens,
+            "temperature": temperature,
+        }
+        last_response: LLMResponse | None = None
+        for attempt, backend in enumerate(self._candidates(streaming=True)):
+            if attempt:
+                backend.failovers += 1
+                logger.warning(f"Failing over LLM stream to backend {backend.name}")
+            backend.requests += 1
+            backend.probing = backend.state == "half_open"
+            stream = backend.provider.chat_stream(**kwargs)
+            start = time.monotonic()
+            try:
+                try:
+                    first = await asyncio.wait_for(anext(stream), timeout=self.timeout_seconds)
+                except TimeoutError:
+                    backend.timeouts += 1
+                    self._record_failure(backend, f"timed out after {self.timeout_seconds:.0f}s")
+                    continue
+                except StopAsyncIteration:
+                    self._record_failure(backend, "empty stream")
+                    continue
+                except Exception as e:
+                    self._record_failure(backend, str(e) or type(e).__name__)
+                    continue
+                finally:
+                    backend.probing = False
+
+                if first.response is not None and first.response.finish_reason == "error":
+                    self._record_failure(backend, "error response")
+                    last_response = first.response
+                    continue
+
+                backend.first_delta.add(time.monotonic() - start)
+                recorded = False
+                if first.response is not None:
+                    self._record_stream_end(backend, start, first.response)
+                    recorded = True
+                yield first
+                try:
+                    async for delta in stream:
+                        if delta.response is not None and not recorded:
+                            # Consumers stop reading at the final delta, so record before yielding it
+                            self._record_stream_end(backend, start, delta.response)
+                            recorded = True
+                        yield delta
+                except Exception as e:
+                    if not recorded:
+                        self._record_failure(backend, str(e) or type(e).__name__)
+                    raise
+                if not recorded:
+                    self._record_stream_end(backend, start, None)
+                return
+            finally:
+                await stream.aclose()
+
+        if last_response is None:
+            logger.error("No LLM backend could start a stream")
+        yield StreamDelta(response=last_response or self._unavailable_response())
+
+    def format_system_content(
+        self, prefix: str, suffix: str = "", model: str | None = None
+    ) -> str | list[dict[str, Any]]:
+        """Format as the primary backend does."""
+        return self.backends[0].provider.format_system_content(prefix, suffix, model)
+
+    def get_default_model(self) -> str:
+        """Default model of the primary backend."""
+        return self.backends[0].provider.get_default_model()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Per-backend health, failover and latency metrics."""
+        return {backend.name: backend.stats() for backend in self.backends}
@@ -0,0 +1,406 @@
+"""Per-call usage, latency and cost accounting for LLM requests."""
+
+import asyncio
+import bisect
+import json
+import time
+from collections.abc import AsyncIterator, Iterable
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from tokamak.providers.base import LLMProvider, LLMResponse, StreamDelta
+from tokamak.providers.caller import current_caller
+from tokamak.utils.metrics import REGISTRY
+
+# Upper bounds (seconds) of the latency histogram buckets; the last one is open
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 16.0, 32.0, 64.0)
+
+LLM_REQUEST_SECONDS = REGISTRY.histogram(
+    "tokamak_llm_request_seconds", "LLM request latency", ("model",), buckets=LATENCY_BUCKETS
+)
+LLM_REQUESTS = REGISTRY.counter(
+    "tokamak_llm_requests_total", "LLM requests by outcome", ("model", "caller", "outcome")
+)
+LLM_TOKENS = REGISTRY.counter(
+    "tokamak_llm_tokens_total", "LLM tokens by kind", ("model", "caller", "kind")
+)
+
+
+@dataclass
+class ModelPrice:
+    """Price of a model in USD per million tokens."""
+
+    prompt: float
+    completion: float
+    cached: float | None = None
+
+    def cost(self, prompt_tokens: int, completion_tokens: int, cached_tokens: int) -> float:
+        cached_price = self.cached if self.cached is not None else self.prompt
+        uncached = max(0, prompt_tokens - cached_tokens)
+        return (
+            uncached * self.prompt
+            + cached_tokens * cached_price
+            + completion_tokens * self.completion
+        ) / 1_000_000
+
+
+def model_prices(prices: dict[str, Any]) -> dict[str, ModelPrice]:
+    """Convert configured prices (objects with prompt/completion/cached) to ModelPrice."""
+    return {
+        model: ModelPrice(prompt=p.prompt, completion=p.completion, cached=p.cached)
+        for model, p in prices.items()
+    }
+
+
+@dataclass
+class UsageBucket:
+    """Aggregated calls of one caller and model (usually within one minute)."""
+
+    calls: int = 0
+    errors: int = 0
+    exceptions: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    latency_sum: float = 0.0
+    latency_hist: list[int] = field(default_factory=lambda: [0] * (len(LATENCY_BUCKETS) + 1))
+
+    def add(self, latency: float, usage: dict[str, int], outcome: str) -> None:
+        self.calls += 1
+        if outcome == "error":
+            self.errors += 1
+        elif outcome == "exception":
+            self.exceptions += 1
+        self.prompt_tokens += usage.get("prompt_tokens", 0)
+        self.completion_tokens += usage.get("completion_tokens", 0)
+        self.cached_tokens += usage.get("cached_tokens", 0)
+        self.latency_sum += latency
+        self.latency_hist[bisect.bisect_left(LATENCY_BUCKETS, latency)] += 1
+
+    def merge(self, other: "UsageBucket") -> None:
+        self.calls += other.calls
+        self.errors += other.errors
+        self.exceptions += other.exceptions
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.latency_sum += other.latency_sum
+        self.latency_hist = [a + b for a, b in zip(self.latency_hist, other.latency_hist)]
+
+    def latency_quantile(self, q: float) -> float | None:
+        """Upper bound of the histogram bucket holding the q-quantile (inf if past the last)."""
+        if not self.calls:
+            return None
+        rank = q * self.calls
+        seen = 0
+        for i, count in enumerate(self.latency_hist):
+            seen += count
+            if count and seen >= rank:
+                return LATENCY_BUCKETS[i] if i < len(LATENCY_BUCKETS) else float("inf")
+        return float("inf")
+
+    def to_record(self, minute: int, caller: str, model: str) -> dict[str, Any]:
+        return {
+            "t": minute,
+            "caller": caller,
+            "model": model,
+            "n": self.calls,
+            "err": self.errors,
+            "exc": self.exceptions,
+            "pt": self.prompt_tokens,
+            "ct": self.completion_tokens,
+            "cached": self.cached_tokens,
+            "lat": round(self.latency_sum, 3),
+            "h": self.latency_hist,
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "UsageBucket":
+        return cls(
+            calls=record["n"],
+            errors=record.get("err", 0),
+            exceptions=record.get("exc", 0),
+            prompt_tokens=record.get("pt", 0),
+            completion_tokens=record.get("ct", 0),
+            cached_tokens=record.get("cached", 0),
+            latency_sum=record.get("lat", 0.0),
+            latency_hist=list(record["h"]),
+        )
+
+
+def summarize_usage(
+    records: Iterable[dict[str, Any]],
+    group_by: tuple[str, ...] = ("caller",),
+    prices: dict[str, ModelPrice] | None = None,
+) -> list[dict[str, Any]]:
+    """
+    Aggregate usage records into one row per group.
+
+    Args:
+        records: Records as written by UsageRecorder.
+        group_by: Record fields to group on ("caller" and/or "model").
+        prices: Model prices for the cost column; unpriced models cost None.
+
+    Returns:
+        Rows sorted by total tokens, largest first.
+    """
+    prices = prices or {}
+    groups: dict[tuple, UsageBucket] = {}
+    costs: dict[tuple, float | None] = {}
+    for record in records:
+        key = tuple(record[name] for name in group_by)
+        bucket = UsageBucket.from_record(record)
+        groups.setdefault(key, UsageBucket()).merge(bucket)
+        price = prices.get(record["model"])
+        cost = (
+            price.cost(bucket.prompt_tokens, bucket.completion_tokens, bucket.cached_tokens)
+            if price
+            else None
+        )
+        if key not in costs:
+            costs[key] = cost
+        elif costs[key] is not None and cost is not None:
+            costs[key] += cost
+        else:
+            costs[key] = None
+
+    rows = []
+    for key, bucket in groups.items():
+        rows.append(
+            {
+                **dict(zip(group_by, key)),
+                "calls": bucket.calls,
+                "errors": bucket.errors + bucket.exceptions,
+                "prompt_tokens": bucket.prompt_tokens,
+                "completion_tokens": bucket.completion_tokens,
+                "cached_tokens": bucket.cached_tokens,
+                "avg_latency_s": round(bucket.latency_sum / bucket.calls, 2),
+                "p50_latency_s": bucket.latency_quantile(0.5),
+                "p95_latency_s": bucket.latency_quantile(0.95),
+                "cost_usd": round(costs[key], 6) if costs[key] is not None else None,
+            }
+        )
+    rows.sort(key=lambda r: r["prompt_tokens"] + r["completion_tokens"], reverse=True)
+    return rows
+
+
+def load_usage(path: Path, since: float = 0.0) -> list[dict[str, Any]]:
+    """Read the usage records written at or after since (Unix time)."""
+    if not path.exists():
+        return []
+    records = []
+    with path.open(encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                continue
+            if record.get("t", 0) >= since - 60:
+                records.append(record)
+    return records
+
+
+class UsageRecorder:
+    """
+    Aggregates LLM calls into per-minute buckets by caller and model.
+
+    Finished minutes are appended to a JSON Lines file (one line per
+    minute, caller and model) by a background writer; the last hour stays
+    in memory for ``stats``.
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        prices: dict[str, ModelPrice] | None = None,
+        flush_interval_seconds: float = 60.0,
+        window_minutes: int = 60,
+    ):
+        """
+        Initialize the recorder.
+
+        Args:
+            path: File the aggregates are appended to; None keeps them in memory only.
+            prices: Model prices for cost figures.
+            flush_interval_seconds: Interval of the background writer.
+            window_minutes: Minutes kept in memory for stats().
+        """
+        self.path = path
+        self.prices = prices or {}
+        self.flush_interval_seconds = flush_interval_seconds
+        self.window_minutes = window_minutes
+        self._buckets: dict[tuple[int, str, str], UsageBucket] = {}
+        self._unwritten: set[tuple[int, str, str]] = set()
+        self._flush_task: asyncio.Task | None = None
+
+    def record(
+        self,
+        caller: str,
+        model: str,
+        latency: float,
+        usage: dict[str, int],
+        outcome: str,
+    ) -> None:
+        """
+        Account one finished call.
+
+        Args:
+            caller: Caller tag of the request.
+            model: Model the request named.
+            latency: Seconds until the response was complete.
+            usage: Token counts reported by the provider.
+            outcome: "ok", "error" (error response) or "exception".
+        """
+        minute = int(time.time() // 60 * 60)
+        key = (minute, caller, model)
+        self._buckets.setdefault(key, UsageBucket()).add(latency, usage, outcome)
+        self._unwritten.add(key)
+
+    async def start(self) -> None:
+        if self.path and not self._flush_task:
+            self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def close(self) -> None:
+        """Stop the writer and write everything recorded so far."""
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            self._flush_task = None
+        await self.flush(include_current=True)
+
+    async def flush(self, include_current: bool = False) -> None:
+        """Append finished minutes (and the current one if asked) to the file."""
+        current = int(time.time() // 60 * 60)
+        keys = sorted(k for k in self._unwritten if include_current or k[0] < current)
+        if self.path and keys:
+            lines = "".join(
+                json.dumps(self._buckets[k].to_record(*k), separators=(",", ":")) + "\n"
+                for k in keys
+            )
+            try:
+                await asyncio.to_thread(self._append, lines)
+            except OSError as e:
+                logger.error(f"Failed to write LLM usage to {self.path}: {e}")
+                return
+            # A written current minute starts a new line if more calls arrive
+            for k in keys:
+                if k[0] == current:
+                    self._buckets.pop(k)
+        self._unwritten.difference_update(keys)
+
+        oldest = current - self.window_minutes * 60
+        for key in [k for k in self._buckets if k[0] < oldest]:
+            del self._buckets[key]
+
+    def _append(self, lines: str) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as f:
+            f.write(lines)
+
+    async def _flush_loop(self) -> None:
+        while True:
+            await asyncio.sleep(self.flush_interval_seconds)
+            await self.flush()
+
+    def stats(self) -> list[dict[str, Any]]:
+        """Breakdown by caller over the in-memory window."""
+        records = [bucket.to_record(*key) for key, bucket in self._buckets.items()]
+        return summarize_usage(records, ("caller",), self.prices)
+
+
+class InstrumentedProvider(LLMProvider):
+    """Wraps a provider and reports every call to a UsageRecorder."""
+
+    def __init__(self, provider: LLMProvider, recorder: UsageRecorder):
+        super().__init__()
+        self.provider = provider
+        self.recorder = recorder
+
+    def _record(
+        self, model: str | None, start: float, response: LLMResponse | None, failed: bool
+    ) -> None:
+        if failed:
+            outcome = "exception"
+        elif response is None or response.finish_reason == "error":
+            outcome = "error"
+        else:
+            outcome = "ok"
+        caller = current_caller()
+        model = model or self.provider.get_default_model()
+        latency = time.monotonic() - start
+        usage = response.usage if response else {}
+        self.recorder.record(
+            caller=caller, model=model, latency=latency, usage=usage, outcome=outcome
+        )
+        LLM_REQUEST_SECONDS.observe(latency, model=model)
+        LLM_REQUESTS.inc(model=model, caller=caller, outcome=outcome)
+        for kind in ("prompt", "completion", "cached"):
+            if usage.get(f"{kind}_tokens"):
+                LLM_TOKENS.inc(usage[f"{kind}_tokens"], model=model, caller=caller, kind=kind)
+
+    async def chat(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> LLMResponse:
+        start = time.monotonic()
+        try:
+            response = await self.provider.chat(
+                messages=messages,
+                tools=tools,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            )
+        except Exception:
+            self._record(model, start, None, failed=True)
+            raise
+        self._record(model, start, response, failed=False)
+        return response
+
+    async def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        tools: list[dict[str, Any]] | None = None,
+        model: str | None = None,
+        max_tokens: int = 4096,
+        temperature: float = 0.7,
+    ) -> AsyncIterator[StreamDelta]:
+        start = time.monotonic()
+        recorded = False
+        failed = True
+        try:
+            async for delta in self.provider.chat_stream(
+                messages=messages,
+                tools=tools,
+                model=model,
+                max_tokens=max_tokens,
+                temperature=temperature,
+            ):
+                if delta.response is not None and not recorded:
+                    # Consumers stop reading at the final delta, so record before yielding it
+                    self._record(model, start, delta.response, failed=False)
+                    recorded = True
+                yield delta
+            failed = False
+        finally:
+            if not recorded:
+                # Raised, cancelled or closed before the final delta, or ended without one
+                self._record(model, start, None, failed=failed)
+
+    def format_system_content(
+        self, prefix: str, suffix: str = "", model: str | None = None
+    ) -> str | list[dict[str, Any]]:
+        return self.provider.format_system_content(prefix, suffix, model)
+
+    def get_default_model(self) -> str:
+        return self.provider.get_default_model()
@@ -1,5 +1,7 @@
 """Session management."""
 
 from tokamak.session.manager import Session, SessionManager
+from tokamak.session.messages import Message
+from tokamak.session.store import SessionStore, SQLiteSessionStore
 
-__all__ = ["Session", "SessionManager"]
+__all__ = ["Message", "Session", "SessionManager", "SessionStore", "SQLiteSessionStore"]
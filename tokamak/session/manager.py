@@ -1,101 +1,454 @@
-"""Session management for conversation history (memory-based)."""
+"""Session management for conversation history."""
 
+import asyncio
+import math
+import sys
+import time
+from collections import OrderedDict
+from collections.abc import Callable
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any
 
+from loguru import logger
+
+from tokamak.session.messages import HistoryView, Message, MessageBuffer
+from tokamak.session.store import OpKind, SessionOp, SessionStore, StoredSession
+
+# Rough fixed cost of a cached Session object beyond its messages
+SESSION_OVERHEAD_BYTES = 1024
+
 
 @dataclass
 class Session:
     """
     A conversation session.
 
-    Stores messages in memory for the duration of the bot's runtime.
+    Messages live in memory in a ring buffer sized to max_messages; every change is reported to the manager through
+    _on_change for memory accounting and, with a store, background writes.
+    History is trimmed to max_messages and, when max_bytes is set, to that
+    many approximate bytes (the newest message is always kept).
     """
 
     key: str  # channel:chat_id
-    messages: list[dict[str, Any]] = field(default_factory=list)
+    messages: MessageBuffer = field(init=False, repr=False)
     created_at: datetime = field(default_factory=datetime.now)
     updated_at: datetime = field(default_factory=datetime.now)
     metadata: dict[str, Any] = field(default_factory=dict)
     max_messages: int = 100
     is_ended: bool = False
+    max_bytes: int = 0
+    summary: str = ""
+    summary_until: float = 0.0
+    nbytes: int = field(default=0, repr=False, compare=False)
+    _accounted_bytes: int = field(default=0, repr=False, compare=False)
+    _on_change: Callable[["Session", OpKind, Message | None], None] | None = field(
+        default=None, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        self.messages = MessageBuffer(self.max_messages)
 
-    def add_message(self, role: str, content: str, **kwargs: Any) -> None:
-        """Add a message to the session."""
-        msg = {"role": role, "content": content, "timestamp": datetime.now().isoformat(), **kwargs}
-        self.messages.append(msg)
+    def add_message(self, role: str, content: str, **kwargs: Any) -> Message:
+        """Add a message to the session and return it."""
+        msg = Message(role, content, extra=kwargs)
+        if self.messages and msg.timestamp <= self.messages[-1].timestamp:
+            # Keep timestamps strictly increasing; summary_until relies on them
+            msg.timestamp = math.nextafter(self.messages[-1].timestamp, math.inf)
+        self.nbytes += msg.nbytes
         self.updated_at = datetime.now()
 
-        # Trim old messages if exceeding max
-        if len(self.messages) > self.max_messages:
-            self.messages = self.messages[-self.max_messages :]
+        # Full buffer drops the oldest message
+        evicted = self.messages.append(msg)
+        if evicted is not None:
+            self.nbytes -= evicted.nbytes
+        self._enforce_byte_budget()
 
-    def get_history(self, max_messages: int = 50) -> list[dict[str, Any]]:
+        self._notify("append", msg)
+        return msg
+
+    def replace_content(self, message: Message, content: str) -> bool:
+        """
+        Replace the content of a message already in the history.
+
+        Args:
+            message: Message returned by add_message.
+            content: New content, e.g. a corrected answer.
+
+        Returns:
+            False if the message is no longer in the history.
+        """
+        if not any(m is message for m in self.messages):
+            return False
+        self.nbytes -= message.nbytes
+        message.set_content(content)
+        self.nbytes += message.nbytes
+        self.updated_at = datetime.now()
+        self._enforce_byte_budget()
+        self._notify("replace", message)
+        return True
+
+    def load_messages(self, messages: list[Message]) -> None:
+        """Replace the history with already-stored messages (no change is reported)."""
+        self.messages.clear()
+        self.messages.extend(messages)
+        self.nbytes = sum(m.nbytes for m in self.messages)
+        self._enforce_byte_budget()
+
+    def _enforce_byte_budget(self) -> None:
+        while self.max_bytes and self.nbytes > self.max_bytes and len(self.messages) > 1:
+            self.nbytes -= self.messages.popleft().nbytes
+
+    def unsummarized(self) -> list[Message]:
+        """Messages newer than the compacted summary, oldest first."""
+        pending = []
+        for msg in reversed(self.messages):
+            if msg.timestamp <= self.summary_until:
+                break
+            pending.append(msg)
+        pending.reverse()
+        return pending
+
+    def apply_summary(self, summary: str, until: float) -> None:
+        """
+        Replace the summary of earlier turns.
+
+        Args:
+            summary: Summary covering every message up to and including until.
+            until: Timestamp of the newest message folded into the summary.
+        """
+        if self.summary:
+            self.nbytes -= sys.getsizeof(self.summary)
+        self.summary = summary
+        self.summary_until = until
+        self.nbytes += sys.getsizeof(summary)
+        self._notify("state")
+
+    def _notify(self, kind: OpKind, message: Message | None = None) -> None:
+        if self._on_change:
+            self._on_change(self, kind, message)
+
+    def get_history(self, max_messages: int = 50, max_tokens: int | None = None) -> HistoryView:
         """
         Get message history for LLM context.
 
+        Messages already folded into ``summary`` are never returned.
+
         Args:
             max_messages: Maximum messages to return.
+            max_tokens: Optional token budget; the newest messages that fit are returned.
+                Counts are approximate and memoized on each message.
 
         Returns:
-            List of messages in LLM format.
+            Read-only view of the newest messages in LLM format (role and content).
         """
-        # Get recent messages
-        recent = (
-            self.messages[-max_messages:] if len(self.messages) > max_messages else self.messages
-        )
+        if max_tokens is None and not self.summary_until:
+            return self.messages.tail(max_messages)
 
-        # Convert to LLM format (just role and content)
-        return [{"role": m["role"], "content": m["content"]} for m in recent]
+        count = 0
+        used = 0
+        for msg in reversed(self.messages):
+            if count >= max_messages or msg.timestamp <= self.summary_until:
+                break
+            if max_tokens is not None and used + msg.tokens > max_tokens:
+                break
+            used += msg.tokens
+            count += 1
+        return self.messages.tail(count)
 
     def clear(self) -> None:
         """Clear all messages in the session."""
-        self.messages = []
+        self.messages.clear()
+        self.nbytes = 0
+        self.summary = ""
+        self.summary_until = 0.0
         self.updated_at = datetime.now()
+        self._notify("clear")
 
     def end(self) -> None:
         """End the conversation session."""
         self.is_ended = True
         self.updated_at = datetime.now()
+        self._notify("state")
 
     def reactivate(self) -> None:
         """Reactivate an ended session for a new conversation."""
         self.is_ended = False
         self.updated_at = datetime.now()
+        self._notify("state")
 
 
 class SessionManager:
     """
-    Manages conversation sessions in memory.
+    Manages conversation sessions.
 
-    Sessions are stored only in memory and will be lost on restart.
-    This is intentional for MVP simplicity.
+    Active sessions are kept in an LRU cache bounded by session count and
+    total approximate bytes; touching and evicting are O(1). With a store,
+    changes are queued and written in batches by a background task
+    (write-behind), sessions missing from memory are loaded on demand, and
+    evicted or stale sessions stay on disk. Without a store, evicted
+    sessions are gone, as are all sessions on restart.
     """
 
-    def __init__(self, max_messages: int = 100):
+    def __init__(
+        self,
+        max_messages: int = 100,
+        store: SessionStore | None = None,
+        flush_interval_seconds: float = 1.0,
+        flush_batch_size: int = 200,
+        rehydrate_window_seconds: int = 3600,
+        max_sessions: int = 5000,
+        max_total_bytes: int = 64 * 1024 * 1024,
+        max_session_bytes: int = 256 * 1024,
+    ):
         """
         Initialize the session manager.
 
         Args:
             max_messages: Maximum messages per session.
+            store: Optional durable store; None keeps sessions in memory only.
+            flush_interval_seconds: Maximum delay before queued changes are written.
+            flush_batch_size: Queue length that triggers an early flush.
+            rehydrate_window_seconds: Sessions active this recently are preloaded on start.
+            max_sessions: Maximum sessions held in memory.
+            max_total_bytes: Memory ceiling for all cached sessions (approximate).
+            max_session_bytes: Per-session history budget (approximate, 0 for none).
         """
         self.max_messages = max_messages
-        self._sessions: dict[str, Session] = {}
+        self.store = store
+        self.flush_interval_seconds = flush_interval_seconds
+        self.flush_batch_size = flush_batch_size
+        self.rehydrate_window_seconds = rehydrate_window_seconds
+        self.max_sessions = max_sessions
+        self.max_total_bytes = max_total_bytes
+        self.max_session_bytes = max_session_bytes
+        # Least recently used first
+        self._sessions: OrderedDict[str, Session] = OrderedDict()
+        # Evicted sessions whose changes are still queued; kept until written
+        self._parked: dict[str, Session] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._pending: list[SessionOp] = []
+        self._dirty: set[str] = set()
+        # Keys whose delete is queued but not written; the store still has their rows
+        self._deleted: set[str] = set()
+        self._flush_wanted = asyncio.Event()
+        self._flush_lock = asyncio.Lock()
+        self._flush_task: asyncio.Task | None = None
+        self._rehydrate_task: asyncio.Task | None = None
+        self._store_ready = False
+        # Keys touched while rehydration runs; rehydration must not overwrite them
+        self._claimed: set[str] | None = None
+
+    async def start(self) -> None:
+        """Open the store, start the writer and rehydrate recent sessions in the background."""
+        if not self.store or self._flush_task:
+            return
+        await asyncio.to_thread(self.store.open)
+        self._store_ready = True
+        self._claimed = set()
+        self._flush_task = asyncio.create_task(self._flush_loop())
+        self._rehydrate_task = asyncio.create_task(self._rehydrate())
+
+    async def close(self) -> None:
+        """Stop background work, write everything still queued and close the store."""
+        if not self.store or not self._flush_task:
+            return
+        for task in (self._rehydrate_task, self._flush_task):
+            if task and not task.done():
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._flush_task = None
+        self._rehydrate_task = None
+        await self.flush()
+        self._store_ready = False
+        await asyncio.to_thread(self.store.close)
+        logger.info("Session store closed")
+
+    async def flush(self) -> None:
+        """Write all queued changes to the store."""
+        if not self.store:
+            return
+        async with self._flush_lock:
+            if not self._pending:
+                return
+            batch, self._pending = self._pending, []
+            self._flush_wanted.clear()
+            try:
+                await asyncio.to_thread(self.store.write, batch, self.max_messages)
+            except Exception as e:
+                # Keep the batch so the next flush retries it
+                self._pending = batch + self._pending
+                logger.error(f"Session store write failed ({len(batch)} changes): {e}")
+                return
+            self._dirty = {op.key for op in self._pending}
+            self._deleted = {op.key for op in self._pending if op.kind == "delete"}
+            for key in [k for k in self._parked if k not in self._dirty]:
+                del self._parked[key]
+
+    async def _flush_loop(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(
+                    self._flush_wanted.wait(), timeout=self.flush_interval_seconds
+                )
+            except asyncio.TimeoutError:
+                pass
+            await self.flush()
+
+    async def _rehydrate(self) -> None:
+        started = time.perf_counter()
+        since = datetime.now() - timedelta(seconds=self.rehydrate_window_seconds)
+        try:
+            stored = await asyncio.to_thread(
+                self.store.load_recent, since.isoformat(), self.max_messages
+            )
+        except Exception as e:
+            logger.error(f"Session rehydration failed: {e}")
+            return
+        finally:
+            claimed, self._claimed = self._claimed or set(), None
+        loaded = 0
+        for record in stored[: self.max_sessions]:
+            # Sessions loaded, created or deleted meanwhile are already up to date
+            if record.key not in self._sessions and record.key not in claimed:
+                session = self._from_record(record)
+                # Records arrive newest first; live sessions stay most recent
+                self._sessions[record.key] = session
+                self._sessions.move_to_end(record.key, last=False)
+                self._account(session)
+                loaded += 1
+        self._enforce_limits()
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        logger.info(f"Rehydrated {loaded} sessions in {elapsed_ms:.1f}ms")
+
+    def _on_session_change(self, session: Session, kind: OpKind, message: Message | None) -> None:
+        key = session.key
+        cached = self._sessions.get(key)
+        if cached is None and key not in self._parked:
+            # Evicted while a caller still held it (e.g. during a long agent run)
+            self._sessions[key] = cached = session
+        if cached is session:
+            self._sessions.move_to_end(key)
+            self._account(session)
+            self._enforce_limits(keep=key)
+        if self.store:
+            self._enqueue(
+                SessionOp(
+                    kind=kind,
+                    key=key,
+                    state=self._state(session),
+                    message=message.to_dict() if message else None,
+                )
+            )
+
+    def _account(self, session: Session) -> None:
+        size = SESSION_OVERHEAD_BYTES + session.nbytes
+        self._bytes += size - session._accounted_bytes
+        session._accounted_bytes = size
+
+    def _enforce_limits(self, keep: str | None = None) -> None:
+        while len(self._sessions) > self.max_sessions or (
+            self._bytes > self.max_total_bytes and len(self._sessions) > 1
+        ):
+            key = next(iter(self._sessions))
+            if key == keep:
+                break
+            self._evict(key)
+            self.evictions += 1
+
+    def _evict(self, key: str) -> Session:
+        session = self._sessions.pop(key)
+        self._bytes -= session._accounted_bytes
+        session._accounted_bytes = 0
+        if key in self._dirty:
+            self._parked[key] = session
+        return session
+
+    def _enqueue(self, op: SessionOp) -> None:
+        self._pending.append(op)
+        self._dirty.add(op.key)
+        if len(self._pending) >= self.flush_batch_size:
+            self._flush_wanted.set()
+
+    @staticmethod
+    def _state(session: Session) -> dict[str, Any]:
+        return {
+            "created_at": session.created_at.isoformat(timespec="microseconds"),
+            "updated_at": session.updated_at.isoformat(timespec="microseconds"),
+            "is_ended": session.is_ended,
+            "metadata": session.metadata,
+            "summary": session.summary,
+            "summary_until": session.summary_until,
+        }
+
+    def _new_session(self, key: str) -> Session:
+        return Session(
+            key=key,
+            max_messages=self.max_messages,
+            max_bytes=self.max_session_bytes,
+            _on_change=self._on_session_change,
+        )
+
+    def _from_record(self, record: StoredSession) -> Session:
+        session = self._new_session(record.key)
+        session.load_messages([Message.from_dict(m) for m in record.messages])
+        session.created_at = datetime.fromisoformat(record.created_at)
+        session.updated_at = datetime.fromisoformat(record.updated_at)
+        session.is_ended = record.is_ended
+        session.metadata = record.metadata
+        if record.summary:
+            session.summary = record.summary
+            session.summary_until = record.summary_until
+            session.nbytes += sys.getsizeof(record.summary)
+        return session
+
+    def _load(self, key: str) -> Session | None:
+        if not self._store_ready or key in self._deleted:
+            return None
+        try:
+            # Indexed point read on a WAL reader connection; never waits on writes
+            record = self.store.load(key, self.max_messages)
+        except Exception as e:
+            logger.error(f"Failed to load session {key}: {e}")
+            return None
+        return self._from_record(record) if record else None
 
     def get_or_create(self, key: str) -> Session:
         """
         Get an existing session or create a new one.
 
+        Sessions not in memory are loaded from the store when it has them.
+        That load is a synchronous read on the event loop, accepted on this
+        hot path: it is an indexed point lookup on the WAL reader connection
+        (well under a millisecond), it never waits on the writer, and it only
+        happens on a cache miss.
+
         Args:
             key: Session key (usually channel:guild_id:user_id).
 
         Returns:
             The session.
         """
-        if key not in self._sessions:
-            self._sessions[key] = Session(key=key, max_messages=self.max_messages)
-        return self._sessions[key]
+        session = self._sessions.get(key)
+        if session is not None:
+            self.hits += 1
+            self._sessions.move_to_end(key)
+            return session
+
+        self.misses += 1
+        if self._claimed is not None:
+            self._claimed.add(key)
+        session = self._parked.pop(key, None) or self._load(key) or self._new_session(key)
+        self._sessions[key] = session
+        self._account(session)
+        self._enforce_limits(keep=key)
+        return session
 
     def get(self, key: str) -> Session | None:
         """Get a session by key, returns None if not found."""
@@ -103,7 +456,7 @@ class SessionManager:
 
     def delete(self, key: str) -> bool:
         """
-        Delete a session.
+        Delete a session from memory and the store.
 
         Args:
             key: Session key.
@@ -111,14 +464,26 @@ class SessionManager:
         Returns:
             True if deleted, False if not found.
         """
-        if key in self._sessions:
-            del self._sessions[key]
-            return True
-        return False
+        found = key in self._sessions
+        if found:
+            self._evict(key)
+        self._parked.pop(key, None)
+        if self._claimed is not None:
+            self._claimed.add(key)
+        if self._store_ready:
+            if not found and key not in self._deleted:
+                try:
+                    found = self.store.exists(key)
+                except Exception as e:
+                    logger.error(f"Failed to look up session {key}: {e}")
+            # Until the delete is written, loads must not bring the old rows back
+            self._deleted.add(key)
+            self._enqueue(SessionOp(kind="delete", key=key))
+        return found
 
     def list_sessions(self) -> list[dict[str, Any]]:
         """
-        List all sessions.
+        List all sessions held in memory.
 
         Returns:
             List of session info dicts.
@@ -134,16 +499,54 @@ class SessionManager:
         ]
 
     def cleanup_stale(self, max_age_seconds: int = 3600) -> int:
-        """Remove sessions that haven't been updated within max_age_seconds.
+        """Drop sessions from memory that haven't been updated within max_age_seconds.
+
+        Stored sessions remain on disk and are reloaded on their next message.
+        Sessions with unwritten changes are kept until the next flush.
 
         Returns:
             Number of sessions removed.
         """
         cutoff = datetime.now() - timedelta(seconds=max_age_seconds)
-        stale_keys = [key for key, session in self._sessions.items() if session.updated_at < cutoff]
+        stale_keys = []
+        # Oldest first: stop at the first session that is still fresh
+        for key, session in self._sessions.items():
+            if session.updated_at >= cutoff:
+                break
+            if key not in self._dirty:
+                stale_keys.append(key)
         for key in stale_keys:
-            del self._sessions[key]
+            self._evict(key)
         return len(stale_keys)
 
+    async def purge_stored(self, max_age_seconds: int) -> int:
+        """Delete sessions from the store that haven't been updated within max_age_seconds.
+
+        Returns:
+            Number of stored sessions removed.
+        """
+        if not self._store_ready:
+            return 0
+        await self.flush()
+        cutoff = datetime.now() - timedelta(seconds=max_age_seconds)
+        return await asyncio.to_thread(
+            self.store.purge_before, cutoff.isoformat(timespec="microseconds")
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Cache statistics for status reporting."""
+        lookups = self.hits + self.misses
+        return {
+            "sessions": len(self._sessions),
+            "max_sessions": self.max_sessions,
+            "bytes": self._bytes,
+            "max_bytes": self.max_total_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "evictions": self.evictions,
+            "pending_writes": len(self._pending),
+        }
+
     def __len__(self) -> int:
         return len(self._sessions)
@@ -0,0 +1,265 @@
+"""Compact message records and the ring buffer that holds them."""
+
+import sys
+import time
+from collections.abc import Iterator, Sequence
+from datetime import datetime
+from typing import Any, overload
+
+from tokamak.utils.tokens import estimate_message_tokens
+
+# Fixed cost of a Message instance (object header, slots, timestamp float)
+_MESSAGE_BASE_BYTES = 128
+
+
+class Message:
+    """
+    A single conversation message.
+
+    Uses __slots__, interned roles and an epoch-float timestamp instead of a
+    dict with an ISO string. The Discord author and message id have their
+    own slots; any other fields go in ``extra``. ``nbytes`` is the approximate
+    memory held, computed once. Supports read-only mapping-style access
+    (``msg["content"]``) for code written against the old dict records.
+    """
+
+    __slots__ = (
+        "role",
+        "content",
+        "timestamp",
+        "author_name",
+        "message_id",
+        "extra",
+        "nbytes",
+        "_llm",
+        "_tokens",
+    )
+
+    def __init__(
+        self,
+        role: str,
+        content: str,
+        timestamp: float | None = None,
+        extra: dict[str, Any] | None = None,
+    ):
+        self.role = sys.intern(role)
+        self.content = content
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.author_name: str | None = None
+        self.message_id: str | None = None
+        if extra:
+            self.author_name = extra.pop("author_name", None)
+            self.message_id = extra.pop("message_id", None)
+        self.extra = extra or None
+        self._llm: dict[str, str] | None = None
+        self._tokens = -1
+        self.nbytes = self._measure()
+
+    def as_llm(self) -> dict[str, str]:
+        """The message in LLM format, built once and reused; treat as read-only."""
+        if self._llm is None:
+            self._llm = {"role": self.role, "content": self.content}
+        return self._llm
+
+    @property
+    def tokens(self) -> int:
+        """Approximate prompt tokens for this message, computed once."""
+        if self._tokens < 0:
+            self._tokens = estimate_message_tokens(self.content)
+        return self._tokens
+
+    def set_content(self, content: str) -> None:
+        """Replace the content, dropping the memoized LLM dict and token count."""
+        self.content = content
+        self._llm = None
+        self._tokens = -1
+        self.nbytes = self._measure()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize for storage."""
+        data = {"role": self.role, "content": self.content, "timestamp": self.timestamp}
+        if self.author_name is not None:
+            data["author_name"] = self.author_name
+        if self.message_id is not None:
+            data["message_id"] = self.message_id
+        if self.extra:
+            data.update(self.extra)
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Message":
+        """Deserialize a stored message; accepts legacy ISO timestamps."""
+        data = dict(data)
+        role = data.pop("role")
+        content = data.pop("content")
+        timestamp = data.pop("timestamp", None)
+        if isinstance(timestamp, str):
+            timestamp = datetime.fromisoformat(timestamp).timestamp()
+        return cls(role, content, timestamp, data)
+
+    def _measure(self) -> int:
+        size = _MESSAGE_BASE_BYTES + sys.getsizeof(self.content)
+        if self.author_name is not None:
+            size += sys.getsizeof(self.author_name)
+        if self.message_id is not None:
+            size += sys.getsizeof(self.message_id)
+        if self.extra:
+            size += sys.getsizeof(self.extra) + sum(sys.getsizeof(v) for v in self.extra.values())
+        return size
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "role":
+            return self.role
+        if key == "content":
+            return self.content
+        if key == "timestamp":
+            return self.timestamp
+        if key == "author_name" and self.author_name is not None:
+            return self.author_name
+        if key == "message_id" and self.message_id is not None:
+            return self.message_id
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __repr__(self) -> str:
+        return f"Message(role={self.role!r}, content={self.content[:40]!r})"
+
+
+class MessageBuffer:
+    """
+    Fixed-capacity ring buffer of messages.
+
+    Appending to a full buffer overwrites the oldest message, so appends and
+    trims are O(1) and never copy the list.
+    """
+
+    __slots__ = ("_items", "_start", "_len")
+
+    def __init__(self, capacity: int):
+        self._items: list[Message | None] = [None] * max(capacity, 1)
+        self._start = 0
+        self._len = 0
+
+    @property
+    def capacity(self) -> int:
+        return len(self._items)
+
+    def append(self, message: Message) -> Message | None:
+        """Add a message, returning the one it displaced when full."""
+        capacity = len(self._items)
+        if self._len < capacity:
+            self._items[(self._start + self._len) % capacity] = message
+            self._len += 1
+            return None
+        evicted = self._items[self._start]
+        self._items[self._start] = message
+        self._start = (self._start + 1) % capacity
+        return evicted
+
+    def extend(self, messages: Iterator[Message] | Sequence[Message]) -> None:
+        for message in messages:
+            self.append(message)
+
+    def popleft(self) -> Message:
+        """Remove and return the oldest message."""
+        if not self._len:
+            raise IndexError("pop from empty MessageBuffer")
+        message = self._items[self._start]
+        self._items[self._start] = None
+        self._start = (self._start + 1) % len(self._items)
+        self._len -= 1
+        return message
+
+    def clear(self) -> None:
+        self._items = [None] * len(self._items)
+        self._start = 0
+        self._len = 0
+
+    def tail(self, count: int) -> "HistoryView":
+        """A view of the newest count messages in LLM format."""
+        count = max(0, min(count, self._len))
+        return HistoryView(self, self._len - count, count)
+
+    def _at(self, index: int) -> Message:
+        return self._items[(self._start + index) % len(self._items)]
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __bool__(self) -> bool:
+        return self._len > 0
+
+    def __iter__(self) -> Iterator[Message]:
+        for i in range(self._len):
+            yield self._at(i)
+
+    def __reversed__(self) -> Iterator[Message]:
+        for i in range(self._len - 1, -1, -1):
+            yield self._at(i)
+
+    @overload
+    def __getitem__(self, index: int) -> Message: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Message]: ...
+
+    def __getitem__(self, index: int | slice) -> Message | list[Message]:
+        if isinstance(index, slice):
+            return [self._at(i) for i in range(*index.indices(self._len))]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("MessageBuffer index out of range")
+        return self._at(index)
+
+
+class HistoryView(Sequence):
+    """
+    Read-only window over a MessageBuffer yielding LLM-format dicts.
+
+    Creating a view copies nothing; items are the messages' cached dicts.
+    The view reflects the buffer at access time, so use it before the
+    session changes again.
+    """
+
+    __slots__ = ("_buffer", "_offset", "_len")
+
+    def __init__(self, buffer: MessageBuffer, offset: int, length: int):
+        self._buffer = buffer
+        self._offset = offset
+        self._len = length
+
+    def __len__(self) -> int:
+        return self._len
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(self._len)
+            if step == 1:
+                return HistoryView(self._buffer, self._offset + start, max(0, stop - start))
+            return [self[i] for i in range(start, stop, step)]
+        if index < 0:
+            index += self._len
+        if not 0 <= index < self._len:
+            raise IndexError("HistoryView index out of range")
+        return self._buffer._at(self._offset + index).as_llm()
+
+    def __iter__(self) -> Iterator[dict[str, str]]:
+        items = self._buffer._items
+        capacity = len(items)
+        start = self._buffer._start + self._offset
+        for i in range(start, start + self._len):
+            message = items[i % capacity]
+            yield message._llm or message.as_llm()
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, Sequence):
+            return list(self) == list(other)
+        return NotImplemented
@@ -0,0 +1,279 @@
+"""Persistent session storage."""
+
+import json
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Literal
+
+OpKind = Literal["append", "replace", "state", "clear", "delete"]
+
+
+@dataclass
+class SessionOp:
+    """A queued session change, applied to the store in batches."""
+
+    kind: OpKind
+    key: str
+    state: dict[str, Any] = field(default_factory=dict)
+    message: dict[str, Any] | None = None
+
+
+@dataclass
+class StoredSession:
+    """Session data as loaded from a store."""
+
+    key: str
+    created_at: str
+    updated_at: str
+    is_ended: bool
+    metadata: dict[str, Any]
+    messages: list[dict[str, Any]]
+    summary: str = ""
+    summary_until: float = 0.0
+
+
+class SessionStore(ABC):
+    """Abstract interface for durable session storage.
+
+    Methods are synchronous; SessionManager calls the write paths from a
+    worker thread so they never run on the event loop.
+    """
+
+    @abstractmethod
+    def open(self) -> None:
+        """Prepare the store for use."""
+        pass
+
+    @abstractmethod
+    def close(self) -> None:
+        """Release resources held by the store."""
+        pass
+
+    @abstractmethod
+    def load(self, key: str, max_messages: int) -> StoredSession | None:
+        """Load one session with its most recent messages, or None if unknown."""
+        pass
+
+    @abstractmethod
+    def exists(self, key: str) -> bool:
+        """Whether a session is stored under key."""
+        pass
+
+    @abstractmethod
+    def load_recent(self, since: str, max_messages: int, limit: int = 1000) -> list[StoredSession]:
+        """Load sessions updated at or after the ISO timestamp since."""
+        pass
+
+    @abstractmethod
+    def write(self, ops: list[SessionOp], max_messages: int) -> None:
+        """Apply a batch of changes atomically, trimming each session to max_messages."""
+        pass
+
+    @abstractmethod
+    def purge_before(self, cutoff: str) -> int:
+        """Delete sessions last updated before the ISO timestamp cutoff."""
+        pass
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite session store in WAL mode.
+
+    Uses separate reader and writer connections so point lookups from the
+    event loop are not blocked behind a batch write.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self._reader: sqlite3.Connection | None = None
+        self._writer: sqlite3.Connection | None = None
+        self._read_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+
+    def open(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS sessions (
+                key TEXT PRIMARY KEY,
+                created_at TEXT NOT NULL,
+                updated_at TEXT NOT NULL,
+                is_ended INTEGER NOT NULL DEFAULT 0,
+                metadata TEXT NOT NULL DEFAULT '{}'
+            );
+            CREATE INDEX IF NOT EXISTS idx_sessions_updated ON sessions(updated_at);
+            CREATE TABLE IF NOT EXISTS messages (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                session_key TEXT NOT NULL,
+                data TEXT NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS idx_messages_session ON messages(session_key, id);
+            """
+        )
+        self._migrate(self._writer)
+        self._reader = self._connect()
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Add columns introduced after the first schema version."""
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(sessions)")}
+        if "summary" not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN summary TEXT NOT NULL DEFAULT ''")
+        if "summary_until" not in columns:
+            conn.execute("ALTER TABLE sessions ADD COLUMN summary_until REAL NOT NULL DEFAULT 0")
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA busy_timeout=5000")
+        return conn
+
+    def close(self) -> None:
+        # Wait for reads and writes still running in worker threads
+        with self._read_lock, self._write_lock:
+            for conn in (self._reader, self._writer):
+                if conn:
+                    conn.close()
+            self._reader = None
+            self._writer = None
+
+    def load(self, key: str, max_messages: int) -> StoredSession | None:
+        with self._read_lock:
+            if not self._reader:
+                return None
+            row = self._reader.execute(
+                "SELECT key, created_at, updated_at, is_ended, metadata, summary, summary_until "
+                "FROM sessions WHERE key = ?",
+                (key,),
+            ).fetchone()
+            if not row:
+                return None
+            return self._build(self._reader, row, max_messages)
+
+    def exists(self, key: str) -> bool:
+        with self._read_lock:
+            if not self._reader:
+                return False
+            row = self._reader.execute("SELECT 1 FROM sessions WHERE key = ?", (key,)).fetchone()
+            return row is not None
+
+    def load_recent(self, since: str, max_messages: int, limit: int = 1000) -> list[StoredSession]:
+        with self._write_lock:
+            if not self._writer:
+                return []
+            rows = self._writer.execute(
+                "SELECT key, created_at, updated_at, is_ended, metadata, summary, summary_until "
+                "FROM sessions WHERE updated_at >= ? AND is_ended = 0 ORDER BY updated_at DESC LIMIT ?",
+                (since, limit),
+            ).fetchall()
+            return [self._build(self._writer, row, max_messages) for row in rows]
+
+    @staticmethod
+    def _build(conn: sqlite3.Connection, row: tuple, max_messages: int) -> StoredSession:
+        key, created_at, updated_at, is_ended, metadata, summary, summary_until = row
+        data = conn.execute(
+            "SELECT data FROM messages WHERE session_key = ? ORDER BY id DESC LIMIT ?",
+            (key, max_messages),
+        ).fetchall()
+        return StoredSession(
+            key=key,
+            created_at=created_at,
+            updated_at=updated_at,
+            is_ended=bool(is_ended),
+            metadata=json.loads(metadata),
+            messages=[json.loads(d) for (d,) in reversed(data)],
+            summary=summary,
+            summary_until=summary_until,
+        )
+
+    def write(self, ops: list[SessionOp], max_messages: int) -> None:
+        if not ops:
+            return
+        with self._write_lock:
+            if not self._writer:
+                return
+            conn = self._writer
+            appended: set[str] = set()
+            conn.execute("BEGIN")
+            try:
+                for op in ops:
+                    if op.kind == "delete":
+                        conn.execute("DELETE FROM messages WHERE session_key = ?", (op.key,))
+                        conn.execute("DELETE FROM sessions WHERE key = ?", (op.key,))
+                        appended.discard(op.key)
+                        continue
+
+                    conn.execute(
+                        "INSERT INTO sessions (key, created_at, updated_at, is_ended, metadata, "
+                        "summary, summary_until) VALUES (?, ?, ?, ?, ?, ?, ?) "
+                        "ON CONFLICT(key) DO UPDATE SET "
+                        "updated_at = excluded.updated_at, is_ended = excluded.is_ended, "
+                        "metadata = excluded.metadata, summary = excluded.summary, "
+                        "summary_until = excluded.summary_until",
+                        (
+                            op.key,
+                            op.state["created_at"],
+                            op.state["updated_at"],
+                            int(op.state["is_ended"]),
+                            json.dumps(op.state["metadata"], ensure_ascii=False, default=str),
+                            op.state.get("summary", ""),
+                            op.state.get("summary_until", 0.0),
+                        ),
+                    )
+                    if op.kind == "clear":
+                        conn.execute("DELETE FROM messages WHERE session_key = ?", (op.key,))
+                    elif op.kind == "append" and op.message is not None:
+                        conn.execute(
+                            "INSERT INTO messages (session_key, data) VALUES (?, ?)",
+                            (op.key, json.dumps(op.message, ensure_ascii=False, default=str)),
+                        )
+                        appended.add(op.key)
+                    elif op.kind == "replace" and op.message is not None:
+                        # Timestamps are unique within a session
+                        conn.execute(
+                            "UPDATE messages SET data = ? WHERE session_key = ? "
+                            "AND json_extract(data, '$.timestamp') = ?",
+                            (
+                                json.dumps(op.message, ensure_ascii=False, default=str),
+                                op.key,
+                                op.message["timestamp"],
+                            ),
+                        )
+
+                for key in appended:
+                    conn.execute(
+                        "DELETE FROM messages WHERE session_key = ? AND id <= ("
+                        "SELECT id FROM messages WHERE session_key = ? "
+                        "ORDER BY id DESC LIMIT 1 OFFSET ?)",
+                        (key, key, max_messages),
+                    )
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+
+    def purge_before(self, cutoff: str) -> int:
+        with self._write_lock:
+            if not self._writer:
+                return 0
+            conn = self._writer
+            conn.execute("BEGIN")
+            try:
+                conn.execute(
+                    "DELETE FROM messages WHERE session_key IN "
+                    "(SELECT key FROM sessions WHERE updated_at < ?)",
+                    (cutoff,),
+                )
+                removed = conn.execute(
+                    "DELETE FROM sessions WHERE updated_at < ?", (cutoff,)
+                ).rowcount
+                conn.execute("COMMIT")
+            except Exception:
+                conn.execute("ROLLBACK")
+                raise
+            return removed
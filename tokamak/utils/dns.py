@@ -0,0 +1,232 @@
+"""Async, TTL-cached DNS resolution for outbound requests."""
+
+import asyncio
+import ipaddress
+import socket
+import time
+from collections import OrderedDict
+from typing import Any
+
+import httpcore
+from loguru import logger
+
+
+class UnsafeAddressError(ValueError):
+    """Raised when a hostname resolves to an internal or otherwise non-public address."""
+
+
+def is_public_ip(address: str) -> bool:
+    """Check that an IP address is routable on the public internet."""
+    ip = ipaddress.ip_address(address)
+    if isinstance(ip, ipaddress.IPv6Address) and ip.ipv4_mapped:
+        ip = ip.ipv4_mapped
+    return not (
+        ip.is_private
+        or ip.is_loopback
+        or ip.is_link_local
+        or ip.is_reserved
+        or ip.is_multicast
+        or ip.is_unspecified
+    )
+
+
+class AsyncResolver:
+    """
+    DNS resolver that keeps lookups off the event loop and caches results.
+
+    Lookups go through loop.getaddrinfo (a worker thread), return every
+    A/AAAA record, and are cached for ``ttl_seconds``; failures are cached
+    for ``negative_ttl_seconds``. Concurrent lookups of the same host share
+    one query.
+    """
+
+    def __init__(
+        self,
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 30.0,
+        max_entries: int = 1024,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self.max_entries = max_entries
+        # host -> (expires_at, addresses or None for a cached failure)
+        self._cache: OrderedDict[str, tuple[float, list[str] | None]] = OrderedDict()
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.misses = 0
+        self.lookup_seconds = 0.0
+
+    async def resolve(self, host: str) -> list[str]:
+        """
+        Resolve a hostname to all of its addresses.
+
+        Args:
+            host: Hostname or IP literal.
+
+        Returns:
+            Unique addresses in resolver order.
+
+        Raises:
+            socket.gaierror: If the name does not resolve.
+        """
+        host = host.lower().rstrip(".")
+        try:
+            ipaddress.ip_address(host)
+            return [host]
+        except ValueError:
+            pass
+
+        cached = self._cache.get(host)
+        if cached and cached[0] > time.monotonic():
+            self.hits += 1
+            self._cache.move_to_end(host)
+            if cached[1] is None:
+                raise socket.gaierror(socket.EAI_NONAME, f"Cannot resolve {host} (cached)")
+            return cached[1]
+
+        inflight = self._inflight.get(host)
+        if inflight:
+            self.hits += 1
+            try:
+                return list(await asyncio.shield(inflight))
+            except asyncio.CancelledError:
+                # The caller that owned the lookup was cancelled, not us: look it up again
+                if not inflight.cancelled() or asyncio.current_task().cancelling():
+                    raise
+                return await self.resolve(host)
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[host] = future
+        started = time.monotonic()
+        try:
+            addresses = await self._lookup(host)
+        except (socket.gaierror, OSError) as e:
+            self._store(host, None, self.negative_ttl_seconds)
+            future.set_exception(e)
+            future.exception()  # mark retrieved when nobody else is waiting
+            raise
+        except BaseException:
+            # Cancelled mid-lookup: release the callers waiting on this future
+            future.cancel()
+            raise
+        finally:
+            self.lookup_seconds += time.monotonic() - started
+            del self._inflight[host]
+
+        self._store(host, addresses, self.ttl_seconds)
+        future.set_result(addresses)
+        logger.debug(f"Resolved {host} -> {addresses}")
+        return addresses
+
+    async def resolve_public(self, host: str) -> list[str]:
+        """
+        Resolve a hostname and require every address to be public.
+
+        Checking all records (not just the first) stops a name that mixes
+        public and internal addresses from slipping through.
+
+        Raises:
+            socket.gaierror: If the name does not resolve.
+            UnsafeAddressError: If any address is internal.
+        """
+        addresses = await self.resolve(host)
+        for address in addresses:
+            if not is_public_ip(address):
+                raise UnsafeAddressError(f"{host} resolves to non-public address {address}")
+        return addresses
+
+    async def _lookup(self, host: str) -> list[str]:
+        infos = await asyncio.get_running_loop().getaddrinfo(host, None, type=socket.SOCK_STREAM)
+        addresses: list[str] = []
+        for family, _, _, _, sockaddr in infos:
+            if family in (socket.AF_INET, socket.AF_INET6):
+                address = sockaddr[0].split("%", 1)[0]
+                if address not in addresses:
+                    addresses.append(address)
+        if not addresses:
+            raise socket.gaierror(socket.EAI_NONAME, f"No addresses for {host}")
+        return addresses
+
+    def _store(self, host: str, addresses: list[str] | None, ttl: float) -> None:
+        self._cache[host] = (time.monotonic() + ttl, addresses)
+        self._cache.move_to_end(host)
+        while len(self._cache) > self.max_entries:
+            self._cache.popitem(last=False)
+
+    def stats(self) -> dict[str, Any]:
+        """Cache statistics; avoided_seconds estimates loop time saved by hits."""
+        lookups = self.hits + self.misses
+        avg_lookup = self.lookup_seconds / self.misses if self.misses else 0.0
+        return {
+            "entries": len(self._cache),
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else 0.0,
+            "avg_lookup_ms": round(avg_lookup * 1000, 2),
+            "lookup_seconds": round(self.lookup_seconds, 3),
+            "avoided_seconds": round(self.hits * avg_lookup, 3),
+        }
+
+
+_default_resolver: AsyncResolver | None = None
+
+
+def get_default_resolver() -> AsyncResolver:
+    """Process-wide resolver for callers that aren't handed one explicitly."""
+    global _default_resolver
+    if _default_resolver is None:
+        _default_resolver = AsyncResolver()
+    return _default_resolver
+
+
+class PinnedNetworkBackend(httpcore.AsyncNetworkBackend):
+    """
+    httpcore network backend that connects only to vetted addresses.
+
+    Every TCP connection (including redirect hops) resolves its host through
+    the shared AsyncResolver and must pass the same public-address check as
+    the URL safety check, so the check and the connection cannot diverge.
+    The URL keeps its hostname, so TLS SNI and the Host header are unchanged.
+    """
+
+    def __init__(self, resolver: AsyncResolver, inner: httpcore.AsyncNetworkBackend | None = None):
+        self.resolver = resolver
+        self.inner = inner or httpcore.AnyIOBackend()
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: float | None = None,
+        local_address: str | None = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self.resolver.resolve_public(host)
+        except (socket.gaierror, OSError, UnsafeAddressError) as e:
+            raise httpcore.ConnectError(str(e)) from e
+
+        last_error: Exception | None = None
+        for address in addresses:
+            try:
+                return await self.inner.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        raise last_error or httpcore.ConnectError(f"Cannot connect to {host}")
+
+    async def connect_unix_socket(
+        self, path: str, timeout: float | None = None, socket_options: Any = None
+    ) -> httpcore.AsyncNetworkStream:
+        return await self.inner.connect_unix_socket(
+            path, timeout=timeout, socket_options=socket_options
+        )
+
+    async def sleep(self, seconds: float) -> None:
+        await self.inner.sleep(seconds)
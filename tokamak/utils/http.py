@@ -0,0 +1,116 @@
+"""Shared HTTP client pool."""
+
+import asyncio
+import importlib.util
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+
+import httpx
+from loguru import logger
+
+from tokamak.config.schema import HttpConfig
+from tokamak.utils.dns import AsyncResolver, PinnedNetworkBackend, get_default_resolver
+
+
+def _http2_available() -> bool:
+    """HTTP/2 support in httpx requires the optional h2 package."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def pinned_transport(resolver: AsyncResolver, **kwargs) -> httpx.AsyncHTTPTransport:
+    """
+    Build an httpx transport whose connections go only to vetted public IPs.
+
+    httpx has no public hook for the network backend, so the one httpcore
+    created is wrapped in place; pyproject pins httpcore to the 1.x layout
+    this relies on, and a changed layout fails here instead of silently
+    leaving connections unpinned. Proxy environment variables are not
+    honored: a proxy would make the connection, bypassing the address check.
+
+    Raises:
+        RuntimeError: If the installed httpx/httpcore no longer exposes the backend.
+    """
+    transport = httpx.AsyncHTTPTransport(**kwargs)
+    pool = getattr(transport, "_pool", None)
+    backend = getattr(pool, "_network_backend", None)
+    if backend is None:
+        raise RuntimeError("Unsupported httpx/httpcore version: cannot pin connections")
+    pool._network_backend = PinnedNetworkBackend(resolver, backend)
+    return transport
+
+
+class HttpClientPool:
+    """
+    Application-owned httpx.AsyncClient shared by tools and fetchers.
+
+    Keeps connections alive between requests so repeated calls to the same
+    host (Discord API, docs sites, RSS feeds) reuse warm TCP/TLS sessions.
+    httpx only limits connections globally, so a per-host semaphore caps how
+    many requests run against a single host at once. Connections are pinned
+    to addresses vetted by ``resolver`` (see PinnedNetworkBackend).
+    """
+
+    def __init__(self, config: HttpConfig | None = None, resolver: AsyncResolver | None = None):
+        self.config = config or HttpConfig()
+        self.resolver = resolver or get_default_resolver()
+        self._client: httpx.AsyncClient | None = None
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._host_users: dict[str, int] = {}
+
+    async def start(self) -> None:
+        """Create the underlying client (idempotent)."""
+        self._ensure_client()
+
+    async def close(self) -> None:
+        """Close the underlying client and drop pooled connections."""
+        if self._client:
+            await self._client.aclose()
+            self._client = None
+            logger.info("HTTP client pool closed")
+
+    @property
+    def client(self) -> httpx.AsyncClient:
+        """The shared client, created on first use if start() was not called."""
+        return self._ensure_client()
+
+    def _ensure_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            http2 = self.config.http2 and _http2_available()
+            transport = pinned_transport(
+                self.resolver,
+                http2=http2,
+                limits=httpx.Limits(
+                    max_connections=self.config.max_connections,
+                    max_keepalive_connections=self.config.max_keepalive_connections,
+                    keepalive_expiry=self.config.keepalive_expiry_seconds,
+                ),
+            )
+            self._client = httpx.AsyncClient(
+                transport=transport,
+                timeout=httpx.Timeout(
+                    self.config.timeout_seconds, connect=self.config.connect_timeout_seconds
+                ),
+            )
+            logger.info(f"HTTP client pool started (http2={'on' if http2 else 'off'})")
+        return self._client
+
+    @asynccontextmanager
+    async def acquire(self, url: str) -> AsyncIterator[httpx.AsyncClient]:
+        """Borrow the shared client for a request to url, honoring the per-host limit."""
+        host = (urlparse(url).hostname or "").lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = asyncio.Semaphore(self.config.max_connections_per_host)
+            self._host_slots[host] = slot
+
+        self._host_users[host] = self._host_users.get(host, 0) + 1
+        try:
+            async with slot:
+                yield self.client
+        finally:
+            self._host_users[host] -= 1
+            if not self._host_users[host]:
+                # Forget idle hosts so arbitrary LLM-chosen URLs don't accumulate
+                del self._host_users[host]
+                del self._host_slots[host]
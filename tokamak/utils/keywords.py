@@ -0,0 +1,147 @@
+"""Single-pass multi-keyword matching with Korean-aware normalization."""
+
+import re
+import unicodedata
+from collections import deque
+from collections.abc import Iterable, Sequence
+
+_HANGUL_FIRST = 0xAC00
+_HANGUL_LAST = 0xD7A3
+_JONGSEONG_COUNT = 28
+
+# Subject/topic particles, split by whether the preceding syllable has a final
+# consonant. A keyword ending in one of these also matches the others of the
+# same form ("토카막이" / "토카막은" / "토카막이란").
+_PARTICLES_AFTER_CONSONANT = ("이란", "이", "은")
+_PARTICLES_AFTER_VOWEL = ("란", "가", "는")
+
+# Korean spacing is inconsistent, so spaces between two syllables are dropped;
+# other spaces are kept so Latin words don't run together ("take a" -> "takea").
+_HANGUL_SPACE_RE = re.compile(r"(?<=[\uac00-\ud7a3]) (?=[\uac00-\ud7a3])")
+
+
+def normalize_text(text: str) -> str:
+    """
+    Normalize text for keyword matching.
+
+    Applies NFKC (full-width Latin, composed Hangul) and case folding,
+    collapses whitespace to single spaces, and removes spaces between Hangul
+    syllables so "토카막 네트워크" matches "토카막네트워크".
+    """
+    collapsed = " ".join(unicodedata.normalize("NFKC", text).casefold().split())
+    return _HANGUL_SPACE_RE.sub("", collapsed)
+
+
+def _has_final_consonant(char: str) -> bool | None:
+    """Whether a Hangul syllable ends in a consonant (None if not Hangul)."""
+    code = ord(char)
+    if not _HANGUL_FIRST <= code <= _HANGUL_LAST:
+        return None
+    return (code - _HANGUL_FIRST) % _JONGSEONG_COUNT != 0
+
+
+def keyword_variants(keyword: str) -> list[str]:
+    """
+    Expand a keyword into the normalized forms it should match.
+
+    Korean words that end in a subject/topic particle agreeing with the
+    preceding syllable get the other particles of that form as variants.
+    """
+    words = unicodedata.normalize("NFKC", keyword).casefold().split()
+    variants = [""]
+    for word in words:
+        forms = [word]
+        for particles in (_PARTICLES_AFTER_CONSONANT, _PARTICLES_AFTER_VOWEL):
+            particle = next((p for p in particles if word.endswith(p)), None)
+            if particle is None or len(word) - len(particle) < 2:
+                continue
+            stem = word[: -len(particle)]
+            if _has_final_consonant(stem[-1]) is (particles is _PARTICLES_AFTER_CONSONANT):
+                forms = [stem + p for p in particles]
+                break
+        variants = [f"{prefix} {form}" for prefix in variants for form in forms]
+    return [v for v in dict.fromkeys(normalize_text(v) for v in variants) if v]
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton mapping keywords to group ids.
+
+    Built once from groups of keywords; ``match`` then reports every group
+    with a keyword in the text in a single pass over the normalized text,
+    independent of how many keywords are loaded.
+    """
+
+    __slots__ = ("_goto", "_fail", "_out", "keyword_count")
+
+    def __init__(self, groups: Sequence[Iterable[str]]):
+        """
+        Compile the automaton.
+
+        Args:
+            groups: Keyword lists; group i is reported as id i when any of its
+                keywords (or their particle variants) occurs in the text.
+        """
+        goto: list[dict[str, int]] = [{}]
+        out: list[set[int]] = [set()]
+        self.keyword_count = 0
+
+        for group_id, keywords in enumerate(groups):
+            for keyword in keywords:
+                for variant in keyword_variants(keyword):
+                    state = 0
+                    for char in variant:
+                        nxt = goto[state].get(char)
+                        if nxt is None:
+                            nxt = len(goto)
+                            goto[state][char] = nxt
+                            goto.append({})
+                            out.append(set())
+                        state = nxt
+                    out[state].add(group_id)
+                    self.keyword_count += 1
+
+        # Breadth-first failure links; each state inherits its fallback's outputs
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in goto[state].items():
+                queue.append(nxt)
+                fallback = fail[state]
+                while fallback and char not in goto[fallback]:
+                    fallback = fail[fallback]
+                target = goto[fallback].get(char, 0)
+                fail[nxt] = target if target != nxt else 0
+                out[nxt] |= out[fail[nxt]]
+
+        self._goto = goto
+        self._fail = fail
+        self._out: list[frozenset[int] | None] = [frozenset(o) if o else None for o in out]
+
+    @property
+    def state_count(self) -> int:
+        return len(self._goto)
+
+    def match(self, text: str) -> list[int]:
+        """
+        Find the groups whose keywords occur in text.
+
+        Args:
+            text: Raw text; normalized the same way as the keywords.
+
+        Returns:
+            Matching group ids in ascending order.
+        """
+        goto = self._goto
+        fail = self._fail
+        out = self._out
+        found: set[int] = set()
+        state = 0
+        for char in normalize_text(text):
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state] is not None:
+                found |= out[state]
+        return sorted(found)
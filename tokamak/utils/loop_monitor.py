@@ -0,0 +1,248 @@
+"""Event loop lag monitoring and profiling of callbacks that block the loop."""
+
+import asyncio
+import collections
+import os
+import sys
+import threading
+import time
+import traceback
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+from loguru import logger
+
+from tokamak.utils.metrics import REGISTRY
+
+# Environment switch for the profiler, read on every toggle check
+PROFILER_ENV = "TOKAMAK_LOOP_PROFILER"
+
+LOOP_LAG_SECONDS = REGISTRY.histogram(
+    "tokamak_event_loop_sampled_lag_seconds",
+    "Scheduling delay of the loop monitor's periodic wakeup",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_STALLS = REGISTRY.counter(
+    "tokamak_event_loop_stalls_total", "Times the profiler caught the loop blocked"
+)
+
+# Innermost frames kept per stack sample
+STACK_DEPTH = 12
+# Distinct stacks written per stall
+REPORT_TOP_STACKS = 5
+
+
+def _env_flag(name: str) -> bool:
+    return os.environ.get(name, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+class SlowCallbackProfiler:
+    """
+    Samples the loop thread's stack while a callback blocks the loop.
+
+    A watchdog thread schedules a no-op on the loop and waits for it. If it
+    hasn't run within ``threshold_seconds``, the thread samples the loop
+    thread's stack every ``sample_interval_seconds`` until it does, then
+    appends the stall duration and its most frequent stacks to the report.
+    """
+
+    def __init__(
+        self,
+        loop: asyncio.AbstractEventLoop,
+        report_path: Path,
+        threshold_seconds: float = 0.1,
+        sample_interval_seconds: float = 0.005,
+    ):
+        self.loop = loop
+        self.report_path = report_path
+        self.threshold_seconds = threshold_seconds
+        self.sample_interval_seconds = sample_interval_seconds
+        self.stalls = 0
+        self._loop_thread_id = threading.get_ident()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def start(self) -> None:
+        """Start the watchdog; must be called from the loop's thread."""
+        if self._thread:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._watch, name="loop-profiler", daemon=True)
+        self._thread.start()
+        logger.info(
+            f"Slow callback profiler on: threshold {self.threshold_seconds * 1000:.0f}ms, "
+            f"report {self.report_path}"
+        )
+
+    def stop(self) -> None:
+        if not self._thread:
+            return
+        self._stop.set()
+        self._thread.join(timeout=5.0)
+        self._thread = None
+        logger.info("Slow callback profiler off")
+
+    def _watch(self) -> None:
+        while not self._stop.is_set():
+            ran = threading.Event()
+            sent = time.monotonic()
+            try:
+                self.loop.call_soon_threadsafe(ran.set)
+            except RuntimeError:
+                return  # loop closed
+            if ran.wait(self.threshold_seconds):
+                self._stop.wait(self.threshold_seconds)
+                continue
+
+            samples: collections.Counter[tuple[str, ...]] = collections.Counter()
+            while not ran.wait(self.sample_interval_seconds):
+                if self._stop.is_set():
+                    return
+                frame = sys._current_frames().get(self._loop_thread_id)
+                if frame is not None:
+                    samples[self._format_stack(frame)] += 1
+            self._report(time.monotonic() - sent, samples)
+
+    def _format_stack(self, frame: Any) -> tuple[str, ...]:
+        summary = traceback.extract_stack(frame)[-STACK_DEPTH:]
+        return tuple(f"{f.filename}:{f.lineno} in {f.name}" for f in summary)
+
+    def _report(self, duration: float, samples: collections.Counter) -> None:
+        self.stalls += 1
+        LOOP_STALLS.inc()
+        total = sum(samples.values())
+        top = samples.most_common(REPORT_TOP_STACKS)
+        where = top[0][0][-1] if top else "unknown"
+        logger.warning(f"Event loop blocked for {duration * 1000:.0f}ms at {where}")
+
+        lines = [
+            f"=== {datetime.now().isoformat(timespec='seconds')} event loop blocked for "
+            f"{duration * 1000:.0f}ms ({total} samples) ==="
+        ]
+        for stack, count in top:
+            lines.append(f"  {count * 100 // total}% ({count} samples)")
+            lines.extend(f"    {entry}" for entry in stack)
+        try:
+            self.report_path.parent.mkdir(parents=True, exist_ok=True)
+            with self.report_path.open("a", encoding="utf-8") as f:
+                f.write("\n".join(lines) + "\n\n")
+        except OSError as e:
+            logger.error(f"Failed to write slow callback report: {e}")
+
+
+class LoopMonitor:
+    """
+    Samples event loop scheduling delay and switches the profiler on demand.
+
+    Every ``interval_seconds`` the monitor sleeps and measures how late it
+    woke up; lags above ``warn_seconds`` are logged. The slow-callback
+    profiler runs while it is enabled in config, by the TOKAMAK_LOOP_PROFILER
+    environment variable, or by the toggle file existing, which is checked
+    while running, so it can be switched without a restart.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 0.5,
+        warn_seconds: float = 0.25,
+        profiler_enabled: bool = False,
+        profiler_toggle_path: Path | None = None,
+        profiler_report_path: Path = Path("slow_callbacks.log"),
+        profiler_threshold_seconds: float = 0.1,
+        profiler_sample_interval_seconds: float = 0.005,
+        toggle_check_seconds: float = 5.0,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval_seconds: Time between lag samples.
+            warn_seconds: Lag that gets logged as a warning.
+            profiler_enabled: Run the slow-callback profiler from the start.
+            profiler_toggle_path: File whose existence turns the profiler on.
+            profiler_report_path: File stall reports are appended to.
+            profiler_threshold_seconds: Blocking time that counts as a stall.
+            profiler_sample_interval_seconds: Stack sampling period during a stall.
+            toggle_check_seconds: How often the env variable and toggle file are checked.
+        """
+        self.interval_seconds = interval_seconds
+        self.warn_seconds = warn_seconds
+        self.profiler_enabled = profiler_enabled
+        self.profiler_toggle_path = profiler_toggle_path
+        self.profiler_report_path = profiler_report_path
+        self.profiler_threshold_seconds = profiler_threshold_seconds
+        self.profiler_sample_interval_seconds = profiler_sample_interval_seconds
+        self.toggle_check_seconds = toggle_check_seconds
+        self.profiler: SlowCallbackProfiler | None = None
+        self.samples = 0
+        self.last_lag = 0.0
+        self.max_lag = 0.0
+        self._task: asyncio.Task | None = None
+
+    def profiler_wanted(self) -> bool:
+        """Whether config, environment or toggle file ask for the profiler."""
+        if self.profiler_enabled or _env_flag(PROFILER_ENV):
+            return True
+        return bool(self.profiler_toggle_path and self.profiler_toggle_path.exists())
+
+    def _sync_profiler(self) -> None:
+        wanted = self.profiler_wanted()
+        if wanted and not self.profiler:
+            self.profiler = SlowCallbackProfiler(
+                asyncio.get_running_loop(),
+                report_path=self.profiler_report_path,
+                threshold_seconds=self.profiler_threshold_seconds,
+                sample_interval_seconds=self.profiler_sample_interval_seconds,
+            )
+            self.profiler.start()
+        elif not wanted and self.profiler:
+            self.profiler.stop()
+            self.profiler = None
+
+    async def start(self) -> None:
+        if not self._task:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self.profiler:
+            await asyncio.to_thread(self.profiler.stop)
+            self.profiler = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_toggle_check = 0.0
+        while True:
+            if loop.time() >= next_toggle_check:
+                self._sync_profiler()
+                next_toggle_check = loop.time() + self.toggle_check_seconds
+            start = loop.time()
+            await asyncio.sleep(self.interval_seconds)
+            lag = max(0.0, loop.time() - start - self.interval_seconds)
+            self.samples += 1
+            self.last_lag = lag
+            self.max_lag = max(self.max_lag, lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.warn_seconds:
+                logger.warning(f"Event loop lag {lag * 1000:.0f}ms")
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "last_lag_ms": round(self.last_lag * 1000, 1),
+            "max_lag_ms": round(self.max_lag * 1000, 1),
+            "profiler": self.profiler is not None,
+            "stalls": self.profiler.stalls if self.profiler else 0,
+        }
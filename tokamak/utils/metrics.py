@@ -0,0 +1,318 @@
+"""Minimal Prometheus-compatible metrics registry and HTTP endpoint."""
+
+import asyncio
+import bisect
+import math
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+
+from loguru import logger
+
+# Default histogram buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+LabelValues = tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(names: tuple[str, ...], values: LabelValues, extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Metric:
+    """Base class: a named metric family with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        self.name = name
+        self.help = help
+        self.label_names = labels
+
+    def _key(self, labels: dict[str, str]) -> LabelValues:
+        return tuple(str(labels[name]) for name in self.label_names)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        """(suffix, label text, value) triples."""
+        return iter(())
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        lines.extend(
+            f"{self.name}{suffix}{labels} {_format_value(value)}"
+            for suffix, labels, value in self.samples()
+        )
+        return "\n".join(lines)
+
+
+class Counter(Metric):
+    """Monotonically increasing count."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()):
+        super().__init__(name, help, labels)
+        self._values: dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, value in self._values.items():
+            yield "", _format_labels(self.label_names, key), value
+
+
+class Gauge(Metric):
+    """Value that goes up and down, set directly or read from a callback at scrape time."""
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        callback: Callable[[], float | dict[LabelValues, float]] | None = None,
+    ):
+        super().__init__(name, help, labels)
+        self._values: dict[LabelValues, float] = {}
+        self.callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        values = self._values
+        if self.callback:
+            result = self.callback()
+            values = result if isinstance(result, dict) else {(): result}
+        for key, value in values.items():
+            yield "", _format_labels(self.label_names, key), value
+
+
+class Histogram(Metric):
+    """Distribution of observations in cumulative buckets."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: [count per bucket..., count above the last bucket], sum
+        self._counts: dict[LabelValues, list[int]] = {}
+        self._sums: dict[LabelValues, float] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        counts = self._counts.get(key)
+        if counts is None:
+            counts = self._counts[key] = [0] * (len(self.buckets) + 1)
+            self._sums[key] = 0.0
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._sums[key] += value
+
+    @contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe the duration of the block."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def count(self, **labels: str) -> int:
+        return sum(self._counts.get(self._key(labels), ()))
+
+    def samples(self) -> Iterator[tuple[str, str, float]]:
+        for key, counts in self._counts.items():
+            cumulative = 0
+            for bound, count in zip((*self.buckets, math.inf), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                yield "_bucket", _format_labels(self.label_names, key, le), cumulative
+            yield "_sum", _format_labels(self.label_names, key), self._sums[key]
+            yield "_count", _format_labels(self.label_names, key), cumulative
+
+
+@dataclass
+class LatencyWindow:
+    """Recent latencies with an EWMA, for percentiles in stats() output."""
+
+    samples: deque[float] = field(default_factory=lambda: deque(maxlen=200))
+    ewma: float | None = None
+    alpha: float = 0.2
+
+    def add(self, seconds: float) -> None:
+        self.samples.append(seconds)
+        self.ewma = seconds if self.ewma is None else self.ewma + self.alpha * (seconds - self.ewma)
+
+    def percentile(self, p: float) -> float | None:
+        """The p-th percentile (0-100) of the window, or None when empty."""
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(len(ordered) * p / 100))]
+
+
+class MetricsRegistry:
+    """
+    Collection of metrics rendered in the Prometheus text format.
+
+    Counters and histograms are updated in place (a dict lookup and an
+    add); gauges backed by callbacks and async collectors only run when
+    the endpoint is scraped, so unscraped metrics cost close to nothing.
+    """
+
+    def __init__(self):
+        self._metrics: dict[str, Metric] = {}
+        self._collectors: dict[str, Callable[[], Awaitable[None]]] = {}
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            if type(existing) is not type(metric) or existing.label_names != metric.label_names:
+                raise ValueError(f"Metric {metric.name} already registered differently")
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self._register(Counter(name, help, labels))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram(name, help, labels, buckets))
+
+    def gauge(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        callback: Callable[[], float | dict[LabelValues, float]] | None = None,
+    ) -> Gauge:
+        """Get or create a gauge; a given callback replaces the existing one."""
+        gauge = self._register(Gauge(name, help, labels))
+        if callback is not None:
+            gauge.callback = callback
+        return gauge
+
+    def add_collector(self, name: str, collector: Callable[[], Awaitable[None]]) -> None:
+        """Run an async collector before each scrape (replaces one of the same name)."""
+        self._collectors[name] = collector
+
+    async def render(self) -> str:
+        for name, collector in list(self._collectors.items()):
+            try:
+                await collector()
+            except Exception as e:
+                logger.warning(f"Metrics collector {name} failed: {e}")
+        parts = []
+        for metric in self._metrics.values():
+            try:
+                parts.append(metric.render())
+            except Exception as e:
+                logger.warning(f"Rendering metric {metric.name} failed: {e}")
+        return "\n".join(parts) + "\n"
+
+
+REGISTRY = MetricsRegistry()
+
+# Shared by the channel (moderation, agent, send) and the agent loop (review)
+MESSAGE_STAGE_SECONDS = REGISTRY.histogram(
+    "tokamak_message_stage_seconds",
+    "Time spent in each stage of handling a message (agent includes review)",
+    ("stage",),
+)
+
+
+async def measure_loop_lag() -> float:
+    """Seconds a callback scheduled now waits before the event loop runs it."""
+    loop = asyncio.get_running_loop()
+    start = loop.time()
+    future = loop.create_future()
+    loop.call_soon(future.set_result, None)
+    await future
+    return loop.time() - start
+
+
+class MetricsServer:
+    """Serves ``GET /metrics`` from a registry over plain asyncio streams."""
+
+    def __init__(
+        self, registry: MetricsRegistry = REGISTRY, host: str = "127.0.0.1", port: int = 9108
+    ):
+        self.registry = registry
+        self.host = host
+        self.port = port
+        self._server: asyncio.Server | None = None
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        logger.info(f"Metrics endpoint listening on http://{self.host}:{self.port}/metrics")
+
+    async def close(self) -> None:
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), timeout=5.0)
+            # Skip headers; GET requests have no body
+            while await asyncio.wait_for(reader.readline(), timeout=5.0) not in (
+                b"\r\n",
+                b"\n",
+                b"",
+            ):
+                pass
+            parts = request_line.decode("latin-1").split()
+            if len(parts) >= 2 and parts[0] == "GET" and parts[1].split("?")[0] == "/metrics":
+                body = (await self.registry.render()).encode()
+                status = "200 OK"
+                content_type = "text/plain; version=0.0.4; charset=utf-8"
+            else:
+                body = b"Not Found\n"
+                status = "404 Not Found"
+                content_type = "text/plain; charset=utf-8"
+            writer.write(
+                f"HTTP/1.1 {status}\r\nContent-Type: {content_type}\r\n"
+                f"Content-Length: {len(body)}\r\nConnection: close\r\n\r\n".encode()
+                + body
+            )
+            await writer.drain()
+        except (TimeoutError, ConnectionError):
+            pass
+        finally:
+            writer.close()
@@ -0,0 +1,101 @@
+"""Fast script detection and statistics for Korean/English text."""
+
+import re
+import string
+from typing import Literal, NamedTuple
+
+# Hangul syllables (가-힣 block) and compatibility Jamo (ㄱ-ㅎ, ㅏ-ㅣ)
+_HANGUL = "가-힯ㄱ-ㆎ"
+HANGUL_RE = re.compile(f"[{_HANGUL}]")
+_HANGUL_RUN_RE = re.compile(f"[{_HANGUL}]+")
+
+_ASCII_LETTERS = string.ascii_letters.encode()
+_ASCII_DIGITS = string.digits.encode()
+_ASCII_SPACE = string.whitespace.encode()
+
+Language = Literal["ko", "en", "mixed", "unknown"]
+
+
+class ScriptStats(NamedTuple):
+    """Character counts by script; ASCII whitespace is not counted."""
+
+    hangul: int
+    latin: int
+    digits: int
+    other: int
+
+    @property
+    def letters(self) -> int:
+        """Hangul plus Latin letters."""
+        return self.hangul + self.latin
+
+    @property
+    def korean_ratio(self) -> float:
+        """Share of letters that are Hangul (0.0 when there are no letters)."""
+        return self.hangul / self.letters if self.letters else 0.0
+
+    @property
+    def english_ratio(self) -> float:
+        """Share of letters that are Latin (0.0 when there are no letters)."""
+        return self.latin / self.letters if self.letters else 0.0
+
+
+def contains_hangul(text: str) -> bool:
+    """Whether text contains any Hangul syllable or Jamo."""
+    if text.isascii():
+        return False
+    return HANGUL_RE.search(text) is not None
+
+
+def script_stats(text: str) -> ScriptStats:
+    """
+    Count Hangul, Latin, digit and other characters in text.
+
+    ASCII classes are counted with ``bytes.translate`` over the ASCII part of
+    the text and Hangul with a single regex scan, so no Python-level loop
+    runs per character.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        ScriptStats for the text.
+    """
+    ascii_part = text.encode("ascii", "ignore")
+    ascii_len = len(ascii_part)
+    latin = ascii_len - len(ascii_part.translate(None, _ASCII_LETTERS))
+    digits = ascii_len - len(ascii_part.translate(None, _ASCII_DIGITS))
+    spaces = ascii_len - len(ascii_part.translate(None, _ASCII_SPACE))
+
+    hangul = 0
+    if ascii_len != len(text):
+        hangul = sum(map(len, _HANGUL_RUN_RE.findall(text)))
+
+    other = len(text) - latin - digits - hangul - spaces
+    return ScriptStats(hangul=hangul, latin=latin, digits=digits, other=other)
+
+
+def korean_ratio(text: str) -> float:
+    """Share of the letters in text that are Hangul."""
+    return script_stats(text).korean_ratio
+
+
+def detect_language(text: str, threshold: float = 0.8) -> Language:
+    """
+    Classify text as Korean, English, mixed, or unknown (no letters).
+
+    Args:
+        text: Text to classify.
+        threshold: Share of letters one script needs to count as dominant.
+
+    Returns:
+        "ko", "en", "mixed" or "unknown".
+    """
+    stats = script_stats(text)
+    if not stats.letters:
+        return "unknown"
+    if stats.korean_ratio >= threshold:
+        return "ko"
+    if stats.english_ratio >= threshold:
+        return "en"
+    return "mixed"
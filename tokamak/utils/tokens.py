@@ -0,0 +1,44 @@
+"""Fast approximate token counting for Korean and English text."""
+
+import json
+import math
+from typing import Any
+
+# Role markers and separators added per chat message by most chat templates
+MESSAGE_OVERHEAD_TOKENS = 4
+
+# BPE tokenizers average ~4 ASCII characters per token for English and code,
+# while a Hangul syllable (or other non-ASCII character) costs about one.
+ASCII_CHARS_PER_TOKEN = 4.0
+NON_ASCII_TOKENS_PER_CHAR = 1.0
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Estimate the token count of text without a tokenizer.
+
+    Errs slightly high for Korean so budgets stay on the safe side.
+
+    Args:
+        text: Text to measure.
+
+    Returns:
+        Approximate token count.
+    """
+    if not text:
+        return 0
+    if text.isascii():
+        return math.ceil(len(text) / ASCII_CHARS_PER_TOKEN)
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    other_chars = len(text) - ascii_chars
+    return math.ceil(ascii_chars / ASCII_CHARS_PER_TOKEN + other_chars * NON_ASCII_TOKENS_PER_CHAR)
+
+
+def estimate_message_tokens(content: str) -> int:
+    """Estimate tokens for one chat message including per-message overhead."""
+    return estimate_tokens(content) + MESSAGE_OVERHEAD_TOKENS
+
+
+def estimate_json_tokens(value: Any) -> int:
+    """Estimate tokens for a JSON payload such as tool definitions."""
+    return estimate_tokens(json.dumps(value, ensure_ascii=False, separators=(",", ":")))